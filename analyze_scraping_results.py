@@ -1,20 +1,50 @@
 """
 Analisis Hasil Scraping Sastra.org
 Script ini akan menganalisis folder hasil scraping dan memberikan statistik lengkap
+
+CARA PAKAI:
+    python analyze_scraping_results.py                 # statistik + laporan
+    python analyze_scraping_results.py --vocab         # + profil kosakata per kategori
+    python analyze_scraping_results.py --vocab --top-n 100 --workers 8
+    python analyze_scraping_results.py --source corpus.pack   # corpus yang sudah dikemas (corpus.py --pack)
+    python analyze_scraping_results.py --sample        # cek cepat: estimasi dari ~400 naskah + interval kepercayaan
+    python analyze_scraping_results.py --sample 2000 --confidence 0.99   # lebih lama, lebih presisi
+    python analyze_scraping_results.py --watch         # pantau selama crawl, output diperbarui per naskah baru
 """
 
 import os
 import json
-from collections import defaultdict
+import math
+import time
+import heapq
+import random
+import argparse
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from operator import itemgetter
+
+from corpus import BASE_DIR, CorpusReader, split_header
+from text_utils import tokenize
 
-BASE_DIR = "data_naskah_sastra_org"
+ANALYSIS_OUTPUT_FILE = "scraping_analysis.json"
+REPORT_FILE = "SCRAPING_REPORT.md"
+VOCAB_OUTPUT_FILE = "vocabulary_analysis.json"
+DEFAULT_TOP_N = 50
+FILES_PER_TASK = 32  # Jumlah file per tugas worker
+SAMPLE_OUTPUT_FILE = "scraping_sample.json"
+DEFAULT_SAMPLE_SIZE = 400   # Total naskah yang dibaca pada --sample
+PILOT_PER_STRATUM = 5       # Sampel awal per sub-kategori (estimasi varians untuk alokasi)
+DEFAULT_CONFIDENCE = 0.95
+WATCH_STATE_FILE = "scraping_watch_state.json"   # Ukuran, mtime & jumlah kata per file (--watch)
+DEBOUNCE_SECONDS = 2.0      # --watch: tulis ulang output setelah tenang selama ini
+MAX_WRITE_DELAY = 30.0      # --watch: ... atau paling lambat selama ini saat file terus berdatangan
 
-def analyze_directory():
+def analyze_directory(source=BASE_DIR):
     """Analisis struktur dan konten folder hasil scraping"""
     
-    if not os.path.exists(BASE_DIR):
-        print(f"❌ Folder {BASE_DIR} tidak ditemukan!")
+    if not os.path.exists(source):
+        print(f"❌ Folder {source} tidak ditemukan!")
         print(f"💡 Jalankan scraper terlebih dahulu: python scraper_multi_kategori_all.py")
         return
     
@@ -29,68 +59,59 @@ def analyze_directory():
     print(f"📊 ANALISIS HASIL SCRAPING SASTRA.ORG")
     print(f"{'='*80}\n")
     
-    # Loop through categories
-    for category_name in os.listdir(BASE_DIR):
-        category_path = os.path.join(BASE_DIR, category_name)
-        
-        if not os.path.isdir(category_path):
-            continue
-        
-        stats['categories'][category_name] = {
+    # Loop through categories & subcategories
+    for category_name, subcategory_name, manuscripts in CorpusReader(source).subcategories():
+        stats['categories'].setdefault(category_name, {
             'subcategories': {},
             'total_manuscripts': 0,
             'total_size_bytes': 0,
-        }
+        })
         
-        # Loop through subcategories
-        for subcategory_name in os.listdir(category_path):
-            subcategory_path = os.path.join(category_path, subcategory_name)
-            
-            if not os.path.isdir(subcategory_path):
-                continue
-            
-            # Count manuscripts in this subcategory
-            manuscripts = [f for f in os.listdir(subcategory_path) if f.endswith('.txt')]
-            manuscript_count = len(manuscripts)
-            
-            # Calculate total size
-            total_size = sum(
-                os.path.getsize(os.path.join(subcategory_path, f)) 
-                for f in manuscripts
-            )
-            
-            # Sample word count (dari file pertama)
-            avg_words = 0
-            if manuscripts:
-                sample_file = os.path.join(subcategory_path, manuscripts[0])
-                try:
-                    with open(sample_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        words = len(content.split())
-                        avg_words = words
-                except:
-                    pass
-            
-            stats['categories'][category_name]['subcategories'][subcategory_name] = {
-                'manuscripts': manuscript_count,
-                'size_bytes': total_size,
-                'avg_words': avg_words,
-            }
+        # Count manuscripts in this subcategory
+        manuscript_count = len(manuscripts)
+        
+        # Calculate total size
+        total_size = sum(record.file_size() for record in manuscripts)
+        
+        # Sample word count (dari file pertama)
+        avg_words = 0
+        if manuscripts:
+            try:
+                content = manuscripts[0].read_bytes().decode('utf-8')
+                words = len(content.split())
+                avg_words = words
+            except:
+                pass
             
-            stats['categories'][category_name]['total_manuscripts'] += manuscript_count
-            stats['categories'][category_name]['total_size_bytes'] += total_size
-            stats['total_manuscripts'] += manuscript_count
-            stats['total_size_bytes'] += total_size
+        stats['categories'][category_name]['subcategories'][subcategory_name] = {
+            'manuscripts': manuscript_count,
+            'size_bytes': total_size,
+            'avg_words': avg_words,
+        }
+        
+        stats['categories'][category_name]['total_manuscripts'] += manuscript_count
+        stats['categories'][category_name]['total_size_bytes'] += total_size
+        stats['total_manuscripts'] += manuscript_count
+        stats['total_size_bytes'] += total_size
     
     # Print hasil
     print_statistics(stats)
     
     # Save to JSON
-    output_file = "scraping_analysis.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(stats, f, indent=2, ensure_ascii=False)
+    write_analysis(stats)
     
-    print(f"\n💾 Analisis lengkap tersimpan di: {output_file}")
+    print(f"\n💾 Analisis lengkap tersimpan di: {ANALYSIS_OUTPUT_FILE}")
+    return stats
+
+def write_atomic(path, text):
+    """Tulis ke .tmp lalu replace (pembaca tidak pernah melihat file setengah jadi)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_analysis(stats, output_file=ANALYSIS_OUTPUT_FILE):
+    write_atomic(output_file, json.dumps(stats, indent=2, ensure_ascii=False))
 
 def print_statistics(stats):
     """Print statistik dalam format yang mudah dibaca"""
@@ -147,17 +168,17 @@ def print_statistics(stats):
         
         print()
 
-def generate_report():
-    """Generate markdown report"""
+def generate_report(source=BASE_DIR, stats=None, quiet=False):
+    """Generate markdown report (stats: hasil analyze_directory / --watch, tanpa scan ulang)"""
     
-    if not os.path.exists(BASE_DIR):
+    if stats is None and not os.path.exists(source):
         print("❌ Folder tidak ditemukan")
         return
     
     report = []
     report.append("# Laporan Hasil Scraping Sastra.org\n")
     report.append(f"**Tanggal**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-    report.append(f"**Folder**: `{BASE_DIR}/`\n\n")
+    report.append(f"**Folder**: `{source}/`\n\n")
     
     total_manuscripts = 0
     total_size = 0
@@ -166,52 +187,550 @@ def generate_report():
     report.append("| Kategori | Sub-kategori | Total Naskah | Ukuran |\n")
     report.append("|----------|--------------|--------------|--------|\n")
     
-    for category_name in sorted(os.listdir(BASE_DIR)):
-        category_path = os.path.join(BASE_DIR, category_name)
-        
-        if not os.path.isdir(category_path):
-            continue
-        
-        cat_manuscripts = 0
-        cat_size = 0
-        subcategory_count = 0
-        
-        for subcategory_name in os.listdir(category_path):
-            subcategory_path = os.path.join(category_path, subcategory_name)
-            
-            if not os.path.isdir(subcategory_path):
-                continue
-            
-            subcategory_count += 1
-            manuscripts = [f for f in os.listdir(subcategory_path) if f.endswith('.txt')]
-            manuscript_count = len(manuscripts)
-            
-            size = sum(
-                os.path.getsize(os.path.join(subcategory_path, f)) 
-                for f in manuscripts
-            )
-            
-            cat_manuscripts += manuscript_count
-            cat_size += size
-        
-        total_manuscripts += cat_manuscripts
-        total_size += cat_size
+    categories = defaultdict(lambda: {'subcategories': 0, 'manuscripts': 0, 'size': 0})
+    if stats is not None:
+        for category_name, category_data in stats['categories'].items():
+            category = categories[category_name]
+            category['subcategories'] = len(category_data['subcategories'])
+            category['manuscripts'] = category_data['total_manuscripts']
+            category['size'] = category_data['total_size_bytes']
+    else:
+        for category_name, _, manuscripts in CorpusReader(source).subcategories():
+            category = categories[category_name]
+            category['subcategories'] += 1
+            category['manuscripts'] += len(manuscripts)
+            category['size'] += sum(record.file_size() for record in manuscripts)
+    
+    for category_name, category in categories.items():
+        total_manuscripts += category['manuscripts']
+        total_size += category['size']
         
-        size_mb = cat_size / (1024 * 1024)
-        report.append(f"| {category_name} | {subcategory_count} | {cat_manuscripts:,} | {size_mb:.2f} MB |\n")
+        size_mb = category['size'] / (1024 * 1024)
+        report.append(f"| {category_name} | {category['subcategories']} | {category['manuscripts']:,} | {size_mb:.2f} MB |\n")
     
     total_size_mb = total_size / (1024 * 1024)
     report.append(f"| **TOTAL** | | **{total_manuscripts:,}** | **{total_size_mb:.2f} MB** |\n\n")
     
     # Save report
-    report_file = "SCRAPING_REPORT.md"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.writelines(report)
+    write_atomic(REPORT_FILE, ''.join(report))
     
-    print(f"\n📄 Laporan tersimpan di: {report_file}")
+    if not quiet:
+        print(f"\n📄 Laporan tersimpan di: {REPORT_FILE}")
+
+# ==================== SAMPLING ====================
+
+def measure_manuscript(record):
+    """(jumlah kata isi, ukuran file) satu naskah sampel"""
+    data = record.read_bytes()
+    return len(split_header(data.decode('utf-8', errors='replace'))[1].split()), len(data)
+
+def sample_variance(values):
+    if len(values) < 2:
+        return None
+    mean = sum(values) / len(values)
+    return sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+
+def allocate_sample(strata, budget):
+    """Alokasi Neyman: sisa budget dibagi sebanding N_h * S_h (tidak melebihi N_h).
+    strata: list dict dengan 'population', 'sampled', 'std'; return tambahan per stratum"""
+    extra = [0] * len(strata)
+    while budget > 0:
+        open_strata = [i for i, stratum in enumerate(strata)
+                       if stratum['sampled'] + extra[i] < stratum['population']]
+        if not open_strata:
+            break
+        weights = {i: strata[i]['population'] * strata[i]['std'] for i in open_strata}
+        if not any(weights.values()):
+            weights = {i: strata[i]['population'] for i in open_strata}
+        total_weight = sum(weights.values())
+        given = 0
+        for i in sorted(open_strata, key=lambda i: -weights[i]):
+            room = strata[i]['population'] - strata[i]['sampled'] - extra[i]
+            share = min(room, max(1, math.floor(budget * weights[i] / total_weight)), budget - given)
+            extra[i] += share
+            given += share
+        budget -= given
+        if not given:
+            break
+    return extra
+
+def pooled_relative_variance(groups):
+    """CV^2 gabungan (s^2 / rata-rata^2, bobot derajat bebas) dari kelompok dengan >= 2 nilai"""
+    weighted, degrees = 0.0, 0
+    for values in groups:
+        variance = sample_variance(values)
+        mean = sum(values) / len(values)
+        if variance is not None and mean:
+            weighted += (len(values) - 1) * variance / mean ** 2
+            degrees += len(values) - 1
+    return weighted / degrees if degrees else 0.0
+
+def stratum_total(population, values, relative_variance):
+    """(estimasi total, varians estimasi) satu stratum, dengan koreksi populasi hingga.
+    Ukuran naskah sangat menceng: sampel kecil cenderung meremehkan varians, jadi
+    varians dibatasi bawah oleh CV^2 gabungan semua sub-kategori."""
+    n = len(values)
+    mean = sum(values) / n
+    variance = max(sample_variance(values) or 0.0, relative_variance * mean ** 2)
+    return population * mean, population ** 2 * (1 - n / population) * variance / n
+
+def confidence_interval(total, variance, z, count=None):
+    """Estimasi ± margin; count diisi -> juga rata-rata per naskah"""
+    margin = z * math.sqrt(variance)
+    result = {'estimate': round(total), 'margin': round(margin),
+              'low': round(max(total - margin, 0)), 'high': round(total + margin)}
+    if count:
+        result['mean'] = round(total / count, 1)
+        result['mean_margin'] = round(margin / count, 1)
+    return result
+
+def analyze_sample(source=BASE_DIR, sample_size=DEFAULT_SAMPLE_SIZE, confidence=DEFAULT_CONFIDENCE, seed=None):
+    """Estimasi total kata & ukuran dari sampel acak berstrata per sub-kategori (tanpa scan penuh)"""
+    from statistics import NormalDist
+
+    if not os.path.exists(source):
+        print(f"❌ Folder {source} tidak ditemukan!")
+        return None
+
+    print(f"\n{'='*80}")
+    print(f"🎲 ESTIMASI DARI SAMPEL ({sample_size:,} naskah, kepercayaan {confidence:.0%})")
+    print(f"{'='*80}\n")
+
+    rng = random.Random(seed)
+    strata = []
+    for category_name, subcategory_name, records in CorpusReader(source).subcategories():
+        if records:
+            strata.append({'category': category_name, 'subcategory': subcategory_name,
+                           'population': len(records), 'order': rng.sample(records, len(records)),
+                           'words': [], 'sizes': [], 'sampled': 0, 'std': 0.0})
+    if not strata:
+        print("⚠️  Corpus kosong")
+        return None
+
+    def read(stratum, count):
+        for record in stratum['order'][stratum['sampled']:stratum['sampled'] + count]:
+            words, size = measure_manuscript(record)
+            stratum['words'].append(words)
+            stratum['sizes'].append(size)
+        stratum['sampled'] += count
+
+    # Fase 1: pilot kecil di setiap sub-kategori (minimal satu naskah per sub-kategori)
+    pilot = max(1, min(PILOT_PER_STRATUM, sample_size // len(strata)))
+    for stratum in strata:
+        read(stratum, min(pilot, stratum['population']))
+    # Fase 2: sisa budget ke sub-kategori besar & bervariasi
+    for stratum in strata:
+        stratum['std'] = math.sqrt(sample_variance(stratum['words']) or 0)
+    budget = sample_size - sum(stratum['sampled'] for stratum in strata)
+    for stratum, extra in zip(strata, allocate_sample(strata, budget)):
+        read(stratum, extra)
+
+    pooled = {field: pooled_relative_variance(stratum[field] for stratum in strata) for field in ('words', 'sizes')}
+
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    stats = {'source': source, 'confidence': confidence, 'sample_size': sample_size, 'seed': seed,
+             'categories': {}}
+    totals = {'manuscripts': 0, 'sampled': 0, 'words': [0.0, 0.0], 'sizes': [0.0, 0.0]}
+    category_totals = defaultdict(lambda: {'manuscripts': 0, 'sampled': 0, 'words': [0.0, 0.0], 'sizes': [0.0, 0.0]})
+    for stratum in strata:
+        population = stratum['population']
+        subcategory = {'manuscripts': population, 'sampled': stratum['sampled']}
+        for field, name in (('words', 'words'), ('sizes', 'size_bytes')):
+            total, variance = stratum_total(population, stratum[field], pooled[field])
+            subcategory[name] = confidence_interval(total, variance, z, population)
+            for bucket in (category_totals[stratum['category']], totals):
+                bucket[field][0] += total
+                bucket[field][1] += variance
+        for bucket in (category_totals[stratum['category']], totals):
+            bucket['manuscripts'] += population
+            bucket['sampled'] += stratum['sampled']
+        category = stats['categories'].setdefault(stratum['category'], {'subcategories': {}})
+        category['subcategories'][stratum['subcategory']] = subcategory
+
+    def summarize(bucket):
+        return {
+            'manuscripts': bucket['manuscripts'],
+            'sampled': bucket['sampled'],
+            'words': confidence_interval(*bucket['words'], z, bucket['manuscripts']),
+            'size_bytes': confidence_interval(*bucket['sizes'], z, bucket['manuscripts']),
+        }
+
+    for category_name, bucket in category_totals.items():
+        stats['categories'][category_name].update(summarize(bucket))
+    stats['total'] = summarize(totals)
+
+    print_sample(stats)
+    with open(SAMPLE_OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(stats, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Estimasi tersimpan di: {SAMPLE_OUTPUT_FILE}")
+    return stats
+
+def print_sample(stats):
+    """Print estimasi sampel beserta interval kepercayaan"""
+    total = stats['total']
+    words, size = total['words'], total['size_bytes']
+    mb = 1024 * 1024
+    print(f"📈 ESTIMASI KESELURUHAN ({stats['confidence']:.0%} CI):")
+    print(f"   Naskah dibaca       : {total['sampled']:,}/{total['manuscripts']:,} "
+          f"({total['sampled'] / total['manuscripts']:.1%})")
+    print(f"   Total Kata          : {words['estimate']:,} ± {words['margin']:,} "
+          f"({words['margin'] / words['estimate']:.1%})" if words['estimate'] else "   Total Kata          : 0")
+    print(f"   Total Ukuran        : {size['estimate'] / mb:.2f} ± {size['margin'] / mb:.2f} MB")
+    print(f"   Rata-rata per Naskah: {words['mean']:,.0f} ± {words['mean_margin']:,.0f} kata")
+
+    print(f"\n   {'Kategori':<40} {'naskah':>8} {'sampel':>7} {'kata (estimasi ± margin)':>28}")
+    for category_name, category in sorted(stats['categories'].items(), key=lambda x: -x[1]['words']['estimate']):
+        words = category['words']
+        print(f"   {category_name[:40]:<40} {category['manuscripts']:>8,} {category['sampled']:>7,} "
+              f"{words['estimate']:>16,} ± {words['margin']:>9,}")
+
+# ==================== WATCH ====================
+
+class WatchStats:
+    """Statistik corpus yang diperbarui per file: [ukuran, mtime_ns, jumlah kata] tiap naskah.
+    Disimpan ke WATCH_STATE_FILE, jadi start ulang tidak membaca ulang file yang tidak berubah."""
+
+    def __init__(self, source, state_file=WATCH_STATE_FILE):
+        self.source = source
+        self.state_file = state_file
+        self.files = {}
+        self.cached = {}
+        if os.path.exists(state_file):
+            with open(state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('source') == os.path.abspath(source):
+                self.cached = state['files']
+
+    def relpath(self, path):
+        return os.path.relpath(path, self.source).replace(os.sep, '/')
+
+    def update(self, path, settled=True):
+        """Ukur satu file; return False jika file kelihatannya masih ditulis (coba lagi nanti).
+        settled=False: file dari scan awal, yang baru saja diubah belum dipercaya."""
+        from corpus_watch import STABLE_SECONDS, file_signature
+
+        relpath = self.relpath(path)
+        if relpath.count('/') != 2:  # Hanya Kategori/Sub/0001_Judul.txt, sama seperti analisis penuh
+            return True
+        before = file_signature(path)
+        if before is None:
+            self.files.pop(relpath, None)
+            return True
+        known = self.files.get(relpath) or self.cached.pop(relpath, None)
+        if known and tuple(known[:2]) == before:
+            self.files[relpath] = known
+            return True
+        if not settled and time.time_ns() - before[1] < STABLE_SECONDS * 1e9:
+            return False
+
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.files.pop(relpath, None)
+            return True
+        # Ditulis ulang / masih bertambah selama dibaca
+        if len(data) != before[0] or file_signature(path) != before:
+            return False
+        words = len(split_header(data.decode('utf-8', errors='replace'))[1].split())
+        self.files[relpath] = [before[0], before[1], words]
+        return True
+
+    def remove(self, path):
+        self.files.pop(self.relpath(path), None)
+
+    def reconcile(self):
+        """Cocokkan ulang dengan disk (event inotify hilang), return semua path file yang ada"""
+        from corpus_watch import walk_files
+
+        paths = list(walk_files(self.source))
+        present = {self.relpath(path) for path in paths}
+        for relpath in set(self.files) - present:
+            del self.files[relpath]
+        return paths
+
+    def to_stats(self):
+        """Dict dengan bentuk yang sama seperti analyze_directory (avg_words = rata-rata sebenarnya)"""
+        grouped = defaultdict(lambda: defaultdict(list))
+        for relpath, entry in self.files.items():
+            category_name, subcategory_name, _ = relpath.split('/')
+            grouped[category_name][subcategory_name].append(entry)
+
+        stats = {'categories': {}, 'total_manuscripts': 0, 'total_size_bytes': 0, 'total_words': 0,
+                 'updated_at': datetime.now().isoformat(timespec='seconds')}
+        for category_name in sorted(grouped):
+            category = {'subcategories': {}, 'total_manuscripts': 0, 'total_size_bytes': 0}
+            for subcategory_name in sorted(grouped[category_name]):
+                entries = grouped[category_name][subcategory_name]
+                size = sum(entry[0] for entry in entries)
+                words = sum(entry[2] for entry in entries)
+                category['subcategories'][subcategory_name] = {
+                    'manuscripts': len(entries),
+                    'size_bytes': size,
+                    'avg_words': round(words / len(entries)),
+                }
+                category['total_manuscripts'] += len(entries)
+                category['total_size_bytes'] += size
+                stats['total_words'] += words
+            stats['categories'][category_name] = category
+            stats['total_manuscripts'] += category['total_manuscripts']
+            stats['total_size_bytes'] += category['total_size_bytes']
+        return stats
+
+    def save(self):
+        state = {'source': os.path.abspath(self.source), 'files': self.files}
+        write_atomic(self.state_file, json.dumps(state, ensure_ascii=False))
+
+def write_watch_outputs(watch_stats):
+    """Tulis scraping_analysis.json + SCRAPING_REPORT.md dari statistik inkremental"""
+    stats = watch_stats.to_stats()
+    write_analysis(stats)
+    generate_report(watch_stats.source, stats, quiet=True)
+    watch_stats.save()
+    return stats
+
+def watch_directory(source=BASE_DIR, debounce=DEBOUNCE_SECONDS, polling=False):
+    """Pantau folder corpus selama crawl berjalan; statistik diperbarui per file baru,
+    output ditulis ulang setelah `debounce` detik tenang (paling lambat MAX_WRITE_DELAY)"""
+    from corpus_watch import STABLE_SECONDS, file_signature, open_watcher
+
+    if not os.path.isdir(source):
+        print(f"❌ Folder {source} tidak ditemukan! (--watch hanya untuk corpus folder)")
+        return None
+
+    watch_stats = WatchStats(source)
+    watcher = open_watcher(source, polling)
+    pending = {}  # path -> (signature, sejak) untuk file yang masih ditulis
+
+    def process(path, settled=True):
+        if watch_stats.update(path, settled):
+            pending.pop(path, None)
+        else:
+            pending[path] = (file_signature(path), time.monotonic())
+
+    for path in watcher.initial:
+        process(path, settled=False)
+    stats = write_watch_outputs(watch_stats)
+    print(f"👀 Memantau {source}/ ({watcher.mode}): {stats['total_manuscripts']:,} naskah, "
+          f"{stats['total_words']:,} kata. Ctrl+C untuk berhenti.")
+
+    dirty_since = last_change = None
+    changes = 0
+    try:
+        while True:
+            now = time.monotonic()
+            timeout = 1.0
+            if dirty_since is not None:
+                timeout = min(debounce - (now - last_change), MAX_WRITE_DELAY - (now - dirty_since))
+            if pending:
+                timeout = min(timeout, STABLE_SECONDS)
+
+            events = watcher.events(max(timeout, 0.05))
+            for action, path in events:
+                if action == 'rescan':
+                    for found in watch_stats.reconcile():
+                        process(found)
+                elif action == 'removed':
+                    watch_stats.remove(path)
+                    pending.pop(path, None)
+                else:
+                    process(path)
+
+            # File yang masih ditulis: coba lagi setelah ukuran & mtime stabil
+            now = time.monotonic()
+            for path, (signature, since) in list(pending.items()):
+                current = file_signature(path)
+                if current is None:
+                    del pending[path]
+                elif current != signature:
+                    pending[path] = (current, now)
+                elif now - since >= STABLE_SECONDS:
+                    process(path)
+                    events.append(('changed', path))
+
+            if events:
+                changes += len(events)
+                last_change = now
+                dirty_since = dirty_since or now
+            if dirty_since is not None and (now - last_change >= debounce or now - dirty_since >= MAX_WRITE_DELAY):
+                stats = write_watch_outputs(watch_stats)
+                print(f"🔄 {datetime.now().strftime('%H:%M:%S')} {changes:,} perubahan -> "
+                      f"{stats['total_manuscripts']:,} naskah, {stats['total_size_bytes'] / (1024 * 1024):.2f} MB, "
+                      f"{stats['total_words']:,} kata" + (f" ({len(pending)} masih ditulis)" if pending else ""))
+                dirty_since = None
+                changes = 0
+    except KeyboardInterrupt:
+        if dirty_since is not None:
+            write_watch_outputs(watch_stats)
+        print(f"\n👋 Berhenti memantau. Output terakhir: {ANALYSIS_OUTPUT_FILE}, {REPORT_FILE}")
+    finally:
+        watcher.close()
+    return watch_stats
+
+# ==================== PROFIL KOSAKATA ====================
+
+def tree_reduce(counters):
+    """Gabungkan daftar Counter berpasangan (tree reduction), return satu Counter"""
+    counters = [c for c in counters if c is not None]
+    if not counters:
+        return Counter()
+
+    while len(counters) > 1:
+        merged = []
+        for i in range(0, len(counters) - 1, 2):
+            left, right = counters[i], counters[i + 1]
+            # Selalu tambahkan yang kecil ke yang besar
+            if len(left) < len(right):
+                left, right = right, left
+            left.update(right)
+            merged.append(left)
+        if len(counters) % 2:
+            merged.append(counters[-1])
+        counters = merged
+
+    return counters[0]
+
+def count_terms_in_files(records):
+    """Worker: bangun Counter per naskah (corpus.ManuscriptRecord) lalu gabungkan, return (Counter, jumlah file)"""
+    file_counters = []
+    for record in records:
+        try:
+            body = record.body()
+        except (OSError, UnicodeDecodeError):
+            continue
+        file_counters.append(Counter(tokenize(body)))
+
+    return tree_reduce(file_counters), len(file_counters)
+
+def vocabulary_profile(counter, manuscript_count, top_n):
+    """Ringkas Counter menjadi profil kosakata (top-N via heap, tanpa sort penuh)"""
+    total_tokens = sum(counter.values())
+    unique_types = len(counter)
+    top_terms = heapq.nlargest(top_n, counter.items(), key=itemgetter(1))
+
+    return {
+        'manuscripts': manuscript_count,
+        'total_tokens': total_tokens,
+        'unique_types': unique_types,
+        'type_token_ratio': round(unique_types / total_tokens, 4) if total_tokens else 0,
+        'hapax_legomena': sum(1 for count in counter.values() if count == 1),
+        'avg_tokens_per_manuscript': round(total_tokens / manuscript_count) if manuscript_count else 0,
+        'top_terms': [[term, count] for term, count in top_terms],
+    }
+
+def analyze_vocabulary(top_n=DEFAULT_TOP_N, workers=None, source=BASE_DIR):
+    """Profil kosakata per kategori & sub-kategori dengan process pool"""
+    if not os.path.exists(source):
+        print(f"❌ Folder {source} tidak ditemukan!")
+        return None
+
+    print(f"\n{'='*80}")
+    print(f"🔤 PROFIL KOSAKATA PER KATEGORI")
+    print(f"{'='*80}\n")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # Bagi file tiap sub-kategori menjadi tugas-tugas kecil
+        futures = defaultdict(list)
+        for category_name, subcategory_name, records in CorpusReader(source).subcategories():
+            for i in range(0, len(records), FILES_PER_TASK):
+                futures[(category_name, subcategory_name)].append(
+                    executor.submit(count_terms_in_files, records[i:i + FILES_PER_TASK])
+                )
+            if not records:
+                futures[(category_name, subcategory_name)] = []
+
+        # Setiap tugas sudah menggabungkan batch-nya sendiri; sisa penggabungan di proses utama
+        # (mengirim Counter besar bolak-balik ke worker lebih mahal dari merge-nya)
+        vocab = {'categories': {}, 'top_n': top_n}
+        category_counters = defaultdict(list)
+        category_counts = Counter()
+
+        for (category_name, subcategory_name), subcategory_futures in futures.items():
+            results = [future.result() for future in subcategory_futures]
+            manuscript_count = sum(count for _, count in results)
+            counter = tree_reduce([c for c, _ in results])
+
+            category = vocab['categories'].setdefault(category_name, {'subcategories': {}})
+            category['subcategories'][subcategory_name] = vocabulary_profile(
+                counter, manuscript_count, top_n
+            )
+            category_counters[category_name].append(counter)
+            category_counts[category_name] += manuscript_count
+
+            print(f"   • {category_name} / {subcategory_name}: "
+                  f"{sum(counter.values()):,} token, {len(counter):,} tipe")
+
+        corpus_counters = []
+        for category_name, counters in category_counters.items():
+            counter = tree_reduce(counters)
+            vocab['categories'][category_name].update(
+                vocabulary_profile(counter, category_counts[category_name], top_n)
+            )
+            corpus_counters.append(counter)
+
+        vocab['corpus'] = vocabulary_profile(
+            tree_reduce(corpus_counters), sum(category_counts.values()), top_n
+        )
+
+    print_vocabulary(vocab)
+
+    with open(VOCAB_OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(vocab, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 Profil kosakata tersimpan di: {VOCAB_OUTPUT_FILE}")
+    return vocab
+
+def print_vocabulary(vocab):
+    """Print ringkasan profil kosakata"""
+    corpus = vocab['corpus']
+    print(f"\n📈 KOSAKATA KESELURUHAN:")
+    print(f"   Total Token         : {corpus['total_tokens']:,}")
+    print(f"   Tipe Unik           : {corpus['unique_types']:,}")
+    print(f"   Hapax Legomena      : {corpus['hapax_legomena']:,}")
+    print(f"   Rata-rata per Naskah: {corpus['avg_tokens_per_manuscript']:,} token")
+    print(f"   Top 10 Term         : {', '.join(term for term, _ in corpus['top_terms'][:10])}")
+
+    for category_name, category in sorted(vocab['categories'].items()):
+        print(f"\n📚 {category_name}")
+        print(f"   Token: {category['total_tokens']:,} | Tipe: {category['unique_types']:,}")
+        print(f"   Top: {', '.join(term for term, _ in category['top_terms'][:10])}")
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Analisis hasil scraping sastra.org")
+    parser.add_argument('--vocab', action='store_true',
+                        help="Buat profil kosakata (token, tipe unik, top-N term) per kategori")
+    parser.add_argument('--top-n', type=int, default=DEFAULT_TOP_N,
+                        help=f"Jumlah term teratas per profil (default: {DEFAULT_TOP_N})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah worker process (default: jumlah CPU)")
+    parser.add_argument('--source', default=BASE_DIR,
+                        help=f"Folder corpus atau file .pack (default: {BASE_DIR})")
+    parser.add_argument('--sample', type=int, nargs='?', const=DEFAULT_SAMPLE_SIZE, default=None, metavar='N',
+                        help=f"Estimasi dari N naskah acak berstrata per sub-kategori, bukan scan penuh "
+                             f"(default N: {DEFAULT_SAMPLE_SIZE})")
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help=f"Tingkat kepercayaan interval pada --sample (default: {DEFAULT_CONFIDENCE})")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Seed acak --sample (hasil bisa diulang)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Pantau folder corpus (inotify) dan perbarui analisis + laporan secara inkremental")
+    parser.add_argument('--debounce', type=float, default=DEBOUNCE_SECONDS,
+                        help=f"--watch: detik tenang sebelum output ditulis ulang (default: {DEBOUNCE_SECONDS:g})")
+    parser.add_argument('--poll', action='store_true',
+                        help="--watch dengan polling ukuran/mtime, bukan inotify")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    print("\n🔍 Memulai analisis...\n")
-    analyze_directory()
-    generate_report()
-    print("\n✅ Analisis selesai!\n")
+    args = parse_args()
+    if args.watch:
+        watch_directory(args.source, args.debounce, args.poll)
+    else:
+        print("\n🔍 Memulai analisis...\n")
+        if args.sample:
+            analyze_sample(args.source, args.sample, args.confidence, args.seed)
+        else:
+            generate_report(args.source, analyze_directory(args.source))
+        if args.vocab:
+            analyze_vocabulary(top_n=args.top_n, workers=args.workers, source=args.source)
+        print("\n✅ Analisis selesai!\n")
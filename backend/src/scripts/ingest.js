@@ -0,0 +1,172 @@
+/**
+ * Ingest Manuscripts into Pinecone
+ *
+ * Loads manuscripts through catalog.jsonl (manuscriptLoader.loadFromCatalog, which
+ * falls back to the directory walk when the catalog is missing), chunks them,
+ * embeds the chunks with the same service ragChat queries with, and upserts them.
+ * The content hash of every ingested manuscript is kept per manuscriptId in
+ * checkpoints/, so a rerun only embeds manuscripts that are new or changed, and
+ * manuscripts that left the corpus lose their vectors.
+ *
+ * Usage:
+ *   node src/scripts/ingest.js                # new/changed manuscripts only
+ *   node src/scripts/ingest.js --full         # re-ingest everything
+ *   node src/scripts/ingest.js --limit 50     # first 50 manuscripts (testing)
+ */
+
+require('dotenv').config();
+const fs = require('fs');
+const path = require('path');
+const manuscriptLoader = require('../services/manuscriptLoader');
+const chunker = require('../services/chunker');
+const embeddingService = require('../services/embeddingOpenAI');
+const vectorDB = require('../services/vectorDB');
+const logger = require('../utils/logger');
+
+// manuscriptId -> { hash, chunks } of everything already in the index
+const STATE_FILE = path.join(__dirname, '../../../checkpoints/ingested-manuscripts.json');
+// Chunks embedded + upserted per step; state is saved after each step
+const GROUP_CHUNKS = 200;
+
+function loadState() {
+  if (!fs.existsSync(STATE_FILE)) return {};
+  try {
+    return JSON.parse(fs.readFileSync(STATE_FILE, 'utf8'));
+  } catch (error) {
+    logger.warn(`Ignoring unreadable ingest state ${STATE_FILE}: ${error.message}`);
+    return {};
+  }
+}
+
+function saveState(state) {
+  fs.mkdirSync(path.dirname(STATE_FILE), { recursive: true });
+  fs.writeFileSync(`${STATE_FILE}.tmp`, JSON.stringify(state), 'utf8');
+  fs.renameSync(`${STATE_FILE}.tmp`, STATE_FILE);
+}
+
+/**
+ * Pinecone metadata may not contain null values
+ */
+function chunkMetadata(chunk, manuscript) {
+  const metadata = {
+    manuscriptId: chunk.manuscriptId,
+    chunkIndex: chunk.chunkIndex,
+    chunkText: chunk.chunkText,
+    title: chunk.title,
+    author: chunk.author,
+    year: chunk.year,
+    url: chunk.url,
+    category: manuscript.category,
+  };
+  return Object.fromEntries(Object.entries(metadata).filter(([, value]) => value != null));
+}
+
+/**
+ * Embed + upsert one group of manuscripts; returns false if embeddings are missing
+ */
+async function ingestGroup(group, state) {
+  const chunks = group.flatMap(({ chunks }) => chunks);
+  const embeddings = await embeddingService.generateBatchEmbeddings(chunks.map(c => c.chunkText));
+  if (embeddings.length !== chunks.length) {
+    // Failed batches are dropped by the embedding service: alignment is lost, retry next run
+    logger.error(`Embedding returned ${embeddings.length}/${chunks.length} vectors, skipping ${group.length} manuscripts`);
+    return false;
+  }
+
+  let offset = 0;
+  const vectors = [];
+  for (const { manuscript, chunks: manuscriptChunks } of group) {
+    for (const chunk of manuscriptChunks) {
+      vectors.push({ id: chunk.id, values: embeddings[offset++], metadata: chunkMetadata(chunk, manuscript) });
+    }
+  }
+  await vectorDB.upsert(vectors);
+
+  // A changed manuscript with fewer chunks leaves stale vectors behind
+  const stale = [];
+  for (const { manuscript, chunks: manuscriptChunks } of group) {
+    const previous = state[manuscript.manuscriptId];
+    for (let i = manuscriptChunks.length; previous && i < previous.chunks; i++) {
+      stale.push(`${manuscript.manuscriptId}_chunk_${i}`);
+    }
+    state[manuscript.manuscriptId] = { hash: manuscript.contentHash, chunks: manuscriptChunks.length };
+  }
+  if (stale.length > 0) await vectorDB.delete(stale);
+  saveState(state);
+  return true;
+}
+
+/**
+ * Delete vectors + state of manuscripts that are no longer in the corpus
+ * (file deleted or renamed: filename-based IDs change with the name)
+ */
+async function removeVanished(state, manuscriptIds) {
+  const vanished = Object.keys(state).filter(id => !manuscriptIds.has(id));
+  if (vanished.length === 0) return 0;
+
+  const ids = vanished.flatMap(id => Array.from({ length: state[id].chunks }, (_, i) => `${id}_chunk_${i}`));
+  if (ids.length > 0) await vectorDB.delete(ids);
+  for (const id of vanished) delete state[id];
+  saveState(state);
+  logger.info(`Removed ${vanished.length} manuscripts no longer in the corpus (${ids.length} vectors)`);
+  return vanished.length;
+}
+
+async function ingest({ full = false, limit = null } = {}) {
+  // --full re-ingests everything but keeps the state for chunk counts and cleanup
+  const state = loadState();
+  const { manuscripts, manuscriptIds } = manuscriptLoader.loadFromCatalog({
+    ingested: full ? null : state,
+    limit,
+  });
+  const removed = await removeVanished(state, manuscriptIds);
+  if (manuscripts.length === 0) {
+    logger.info('Nothing to ingest: all manuscripts are unchanged');
+    return { manuscripts: 0, chunks: 0, failed: 0, removed };
+  }
+
+  await vectorDB.initialize();
+
+  let group = [];
+  let groupChunks = 0;
+  let chunkCount = 0;
+  let failed = 0;
+  const flush = async () => {
+    if (group.length === 0) return;
+    if (await ingestGroup(group, state)) chunkCount += groupChunks;
+    else failed += group.length;
+    group = [];
+    groupChunks = 0;
+  };
+
+  for (const manuscript of manuscripts) {
+    const chunks = chunker.chunkText(manuscript);
+    if (chunks.length === 0) continue;
+    group.push({ manuscript, chunks });
+    groupChunks += chunks.length;
+    if (groupChunks >= GROUP_CHUNKS) await flush();
+  }
+  await flush();
+
+  logger.info(`Ingestion done: ${manuscripts.length - failed} manuscripts, ${chunkCount} chunks` +
+    (failed ? ` (${failed} manuscripts failed, rerun to retry)` : ''));
+  return { manuscripts: manuscripts.length - failed, chunks: chunkCount, failed, removed };
+}
+
+if (require.main === module) {
+  const args = process.argv.slice(2);
+  const limitIndex = args.indexOf('--limit');
+  const options = {
+    full: args.includes('--full'),
+    limit: limitIndex !== -1 ? parseInt(args[limitIndex + 1], 10) : null,
+  };
+
+  ingest(options)
+    .then(result => process.exit(result.failed ? 1 : 0))
+    .catch(error => {
+      logger.error('Ingestion failed:', error);
+      process.exit(1);
+    });
+}
+
+module.exports = { ingest };
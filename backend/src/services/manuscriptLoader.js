@@ -5,8 +5,17 @@
 
 const fs = require('fs');
 const path = require('path');
+const crypto = require('crypto');
 const logger = require('../utils/logger');
 
+// Header written by the scraper (save_manuscript): "Key: value" lines + separator
+const HEADER_SEPARATOR = '='.repeat(80);
+const HEADER_MAX_LINES = 20;
+// Lines after the header block that are still checked for header-like patterns
+const HEADER_WINDOW = 7;
+// Index written by the Python scraper (manuscript_catalog.py) in the data directory root
+const CATALOG_FILE = 'catalog.jsonl';
+
 class ManuscriptLoader {
   constructor() {
     this.dataDir = path.join(__dirname, '../../../data_naskah_sastra_org');
@@ -51,16 +60,53 @@ class ManuscriptLoader {
   }
 
   /**
-   * Parse manuscript content to extract URL and clean text
+   * Parse header block written by the scraper:
+   * "Key: value" lines (Judul, URL, listing metadata) up to the ==== separator.
+   * Returns header = {} and bodyStart = 0 for files without that format.
+   */
+  parseHeader(lines) {
+    const header = {};
+    for (let i = 0; i < Math.min(HEADER_MAX_LINES, lines.length); i++) {
+      const line = lines[i];
+      if (line.startsWith(HEADER_SEPARATOR)) {
+        return { header, bodyStart: i + 1 };
+      }
+      const sep = line.indexOf(': ');
+      if (sep === -1) break;
+      header[line.slice(0, sep)] = line.slice(sep + 2).trim();
+    }
+    return { header: {}, bodyStart: 0 };
+  }
+
+  /**
+   * Join body lines, skipping common header patterns in the first `window` lines
+   */
+  cleanBody(lines, window) {
+    const textLines = lines.filter((line, idx) => {
+      if (idx < window) {
+        if (line.startsWith('Judul:')) return false;
+        if (line.startsWith('URL:')) return false;
+        if (line.includes('====')) return false;
+        if (line.startsWith('Pencarian Teks')) return false;
+        if (line.startsWith('Terakhir diubah:')) return false;
+      }
+      return true;
+    });
+    return textLines.join('\n').trim();
+  }
+
+  /**
+   * Parse manuscript content to extract URL, header metadata and clean text
    */
   parseContent(content) {
     try {
       const lines = content.split('\n');
-      let url = null;
+      const { header, bodyStart } = this.parseHeader(lines);
+      let url = header.URL || null;
       let fullText = content;
 
       // Try to find URL in first few lines
-      for (let i = 0; i < Math.min(5, lines.length); i++) {
+      for (let i = 0; !url && i < Math.min(5, lines.length); i++) {
         const line = lines[i];
         if (line.startsWith('URL:') || line.startsWith('https://www.sastra.org')) {
           url = line.replace('URL:', '').trim();
@@ -68,60 +114,167 @@ class ManuscriptLoader {
         }
       }
 
-      // Clean text: remove header lines
-      const textLines = lines.filter((line, idx) => {
-        if (idx < 10) {
-          // Skip common header patterns
-          if (line.startsWith('Judul:')) return false;
-          if (line.startsWith('URL:')) return false;
-          if (line.includes('====')) return false;
-          if (line.startsWith('Pencarian Teks')) return false;
-          if (line.startsWith('Terakhir diubah:')) return false;
-        }
-        return true;
-      });
-
-      fullText = textLines.join('\n').trim();
+      // Clean text: remove header block, then header-like lines right after it
+      const windowEnd = Math.max(10, bodyStart + HEADER_WINDOW);
+      fullText = this.cleanBody(lines.slice(bodyStart), windowEnd - bodyStart);
 
-      return { url, fullText };
+      return { url, fullText, header };
     } catch (error) {
       logger.warn('Failed to parse content', error.message);
-      return { url: null, fullText: content };
+      return { url: null, fullText: content, header: {} };
     }
   }
 
+  /**
+   * Unique ID from the filename (kept filename-based so chunk IDs stay stable)
+   */
+  manuscriptIdFor(filename) {
+    return `ms_${this.parseFilename(filename).sourceId || path.basename(filename, '.txt')}`;
+  }
+
+  /**
+   * Build manuscript record; listing metadata from the header wins,
+   * filename parsing is the fallback for old files
+   */
+  buildManuscript({ filePath, category, header, url, fullText, contentHash }) {
+    const filename = path.basename(filePath);
+    const fromFilename = this.parseFilename(filename);
+    const manuscriptId = this.manuscriptIdFor(filename);
+    const wordCount = header['Jumlah kata'] ? parseInt(header['Jumlah kata'], 10) : null;
+
+    return {
+      manuscriptId,
+      title: header['Judul singkat'] || fromFilename.title,
+      author: header.Penulis || fromFilename.author,
+      year: header.Tahun || fromFilename.year,
+      sourceId: header.ID || fromFilename.sourceId,
+      koleksiId: header.Koleksi || null,
+      volume: header.Jilid || null,
+      uploadedAt: header.Diunggah || null,
+      wordCount,
+      sourceUrl: url,
+      fullText,
+      category,
+      filename,
+      filePath,
+      contentHash,
+      textLength: fullText.length
+    };
+  }
+
   /**
    * Load a single manuscript from file
    */
   loadManuscript(filePath, category = null) {
     try {
-      const filename = path.basename(filePath);
-      const content = fs.readFileSync(filePath, 'utf8');
-      
-      const { title, author, year, sourceId } = this.parseFilename(filename);
-      const { url, fullText } = this.parseContent(content);
+      const raw = fs.readFileSync(filePath);
+      const { url, fullText, header } = this.parseContent(raw.toString('utf8'));
+      const contentHash = crypto.createHash('sha256').update(raw).digest('hex');
+
+      return this.buildManuscript({ filePath, category, header, url, fullText, contentHash });
+    } catch (error) {
+      logger.error(`Failed to load manuscript: ${filePath}`, error);
+      return null;
+    }
+  }
 
-      // Generate unique ID based on file path
-      const manuscriptId = `ms_${sourceId || path.basename(filePath, '.txt')}`;
+  /**
+   * Read catalog.jsonl: last entry per path wins, deleted paths are dropped.
+   * Returns entries sorted by path, or null if there is no catalog.
+   */
+  readCatalog() {
+    const catalogPath = path.join(this.dataDir, CATALOG_FILE);
+    if (!fs.existsSync(catalogPath)) return null;
 
-      return {
-        manuscriptId,
-        title,
-        author,
-        year,
-        sourceUrl: url,
-        fullText,
-        category,
-        filename,
+    const entries = new Map();
+    for (const line of fs.readFileSync(catalogPath, 'utf8').split('\n')) {
+      if (!line.trim()) continue;
+      let entry;
+      try {
+        entry = JSON.parse(line);
+      } catch (error) {
+        continue; // truncated line from an interrupted append
+      }
+      if (entry.deleted) entries.delete(entry.path);
+      else entries.set(entry.path, entry);
+    }
+    return [...entries.values()].sort((a, b) => (a.path < b.path ? -1 : a.path > b.path ? 1 : 0));
+  }
+
+  /**
+   * Load one manuscript from a catalog entry: metadata comes from the catalog,
+   * the body is read from bodyOffset without re-parsing the header
+   */
+  loadCatalogEntry(entry) {
+    const filePath = path.join(this.dataDir, ...entry.path.split('/'));
+    const parts = entry.path.split('/');
+    // Same category as scanDirectory: top-level directory name
+    const category = parts.length > 1 ? parts[0] : null;
+    try {
+      const raw = fs.readFileSync(filePath);
+      if (entry.bodyOffset === 0) {
+        // Not in save_manuscript format: fall back to full parsing
+        return this.loadManuscript(filePath, category);
+      }
+      const bodyLines = raw.subarray(entry.bodyOffset).toString('utf8').split('\n');
+      return this.buildManuscript({
         filePath,
-        textLength: fullText.length
-      };
+        category,
+        header: entry.header || {},
+        url: (entry.header && entry.header.URL) || null,
+        fullText: this.cleanBody(bodyLines, HEADER_WINDOW),
+        contentHash: entry.sha256
+      });
     } catch (error) {
       logger.error(`Failed to load manuscript: ${filePath}`, error);
       return null;
     }
   }
 
+  /**
+   * Load manuscripts via catalog.jsonl (one read instead of scanning directories).
+   * `ingested` maps manuscriptId -> { hash }: a manuscript whose own saved hash equals
+   * its catalog sha256 is skipped without touching the file. `limit` counts loaded
+   * (new/changed) manuscripts only. Falls back to loadAll() when there is no catalog.
+   * Returns { manuscripts, manuscriptIds } where manuscriptIds holds every ID present,
+   * so callers can drop manuscripts that disappeared.
+   */
+  loadFromCatalog({ ingested = null, limit = null } = {}) {
+    const unchanged = (id, hash) => Boolean(ingested && ingested[id] && ingested[id].hash === hash);
+    const entries = this.readCatalog();
+    if (!entries) {
+      logger.warn(` No ${CATALOG_FILE} in ${this.dataDir}, scanning directories`);
+      const all = this.loadAll();
+      const changed = all.filter(m => !unchanged(m.manuscriptId, m.contentHash));
+      return {
+        manuscripts: limit ? changed.slice(0, limit) : changed,
+        manuscriptIds: new Set(all.map(m => m.manuscriptId))
+      };
+    }
+
+    const manuscripts = [];
+    const manuscriptIds = new Set();
+    let skipped = 0;
+    for (const entry of entries) {
+      const manuscriptId = this.manuscriptIdFor(entry.path.split('/').pop());
+      manuscriptIds.add(manuscriptId);
+      if (unchanged(manuscriptId, entry.sha256)) {
+        skipped++;
+        continue;
+      }
+      // Past the limit: keep collecting IDs, stop reading files
+      if (limit && manuscripts.length >= limit) continue;
+      const manuscript = this.loadCatalogEntry(entry);
+      if (manuscript && manuscript.fullText.length > 100) {
+        manuscripts.push(manuscript);
+      }
+    }
+
+    logger.info(` Loaded ${manuscripts.length} manuscripts from ${CATALOG_FILE} ` +
+      `(${entries.length} entries, ${skipped} unchanged skipped)`);
+    return { manuscripts, manuscriptIds };
+  }
+
   /**
    * Recursively scan directory and load all manuscripts
    */
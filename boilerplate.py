@@ -0,0 +1,329 @@
+"""
+Deteksi & Pembuangan Boilerplate Lintas Halaman
+div.item-page / article di sastra.org masih memuat header berulang, catatan
+editorial, teks navigasi dan footer lisensi yang sama di ribuan halaman.
+Script ini mempelajari baris-baris tersebut dari sampel naskah per
+sub-kategori, lalu scraper membuangnya saat ekstraksi (--strip-boilerplate).
+
+Cara kerja:
+1. Ambil sampel acak (seed tetap) naskah per sub-kategori dari corpus
+2. Setiap baris dinormalisasi jadi kunci (NFC, whitespace, huruf kecil,
+   angka -> 0) dan dihitung document frequency-nya (sekali per naskah)
+3. Baris yang muncul di >= --min-doc-ratio sampel (dan >= --min-docs naskah)
+   menjadi boilerplate sub-kategori; baris yang jadi boilerplate di
+   >= GLOBAL_MIN_SUBCATEGORIES sub-kategori berlaku untuk semua sub-kategori
+4. Saat ekstraksi, rangkaian baris boilerplate berurutan (baris kosong di
+   tengah ikut) dibuang jika totalnya >= --min-tokens kata, sehingga baris
+   pendek yang wajar berulang (nama pupuh/tembang) tetap utuh. Naskah yang
+   akan kehilangan > MAX_STRIP_RATIO katanya tidak disentuh.
+
+Output: boilerplate_model.json + laporan token yang dibuang per sub-kategori
+(kata dan token backend = ceil(karakter / 4), sama dengan tokenCounter.js).
+
+CARA PAKAI:
+    python boilerplate.py                            # pelajari dari sampel + laporan atas sampel
+    python boilerplate.py --sample 300 --min-doc-ratio 0.4
+    python boilerplate.py --report                   # terapkan model ke seluruh corpus (tanpa menulis)
+    python boilerplate.py --report --show 20         # + baris boilerplate paling sering
+    python scraper_cli.py scrape --all --strip-boilerplate
+"""
+
+import os
+import re
+import json
+import random
+import argparse
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from stage_profiler import PROFILER
+from text_utils import tokenize
+
+# ==================== KONFIGURASI ====================
+
+MODEL_FILE = "boilerplate_model.json"
+DEFAULT_SAMPLE = 200            # Naskah sampel per sub-kategori
+DEFAULT_MIN_DOC_RATIO = 0.3     # Baris boilerplate muncul di >= 30% sampel...
+DEFAULT_MIN_DOCS = 5            # ...dan di >= 5 naskah
+DEFAULT_MIN_TOKENS = 6          # Rangkaian baris minimal 6 kata agar dibuang
+GLOBAL_MIN_SUBCATEGORIES = 3    # Boilerplate di >= 3 sub-kategori berlaku global
+MAX_STRIP_RATIO = 0.5           # Naskah yang akan kehilangan > 50% kata tidak disentuh
+SEED = 20251119
+
+DIGITS = re.compile(r'\d+')
+
+# ==================== KUNCI BARIS ====================
+
+def line_key(line):
+    """Kunci baris: NFC, whitespace dirapikan, huruf kecil, angka -> 0 ("" untuk baris kosong)"""
+    return DIGITS.sub('0', ' '.join(unicodedata.normalize('NFC', line).split()).lower())
+
+def model_key(category_name, subcategory_name):
+    """Kunci sub-kategori di model = path folder corpus ("Kategori/Sub_kategori")"""
+    from scraper_engine import clean_folder_name
+
+    return f"{clean_folder_name(category_name)}/{clean_folder_name(subcategory_name)}"
+
+def backend_tokens(text):
+    """Token versi backend tokenCounter.countTokens: ceil(panjang / 4)"""
+    from prechunk import count_tokens
+
+    return count_tokens(text)
+
+# ==================== STRIPPER ====================
+
+class BoilerplateStripper:
+    """Buang rangkaian baris boilerplate dari isi naskah, dengan statistik per sub-kategori"""
+
+    def __init__(self, model, min_tokens=None):
+        settings = model.get('settings', {})
+        self.min_tokens = min_tokens or settings.get('min_tokens', DEFAULT_MIN_TOKENS)
+        self.global_lines = frozenset(model.get('global', ()))
+        self.lines = {key: frozenset(entry['lines']) | self.global_lines
+                      for key, entry in model.get('subcategories', {}).items()}
+        self._lock = threading.Lock()
+        self.totals = defaultdict(Counter)
+
+    @classmethod
+    def load(cls, path=MODEL_FILE, min_tokens=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), min_tokens)
+
+    def boilerplate_for(self, key):
+        return self.lines.get(key, self.global_lines)
+
+    def strip(self, text, key):
+        """(teks bersih, baris dibuang, kata dibuang, total kata) untuk sub-kategori `key`"""
+        boilerplate = self.boilerplate_for(key)
+        lines = text.split('\n')
+        word_counts = [len(tokenize(line)) for line in lines]
+        total_words = sum(word_counts)
+        if not boilerplate:
+            return text, 0, 0, total_words
+
+        remove = set()
+        run = []
+
+        def close_run():
+            while run and not lines[run[-1]].strip():
+                run.pop()  # baris kosong di ujung rangkaian tidak ikut dibuang
+            if sum(word_counts[i] for i in run) >= self.min_tokens:
+                remove.update(run)
+            run.clear()
+
+        for i, line in enumerate(lines):
+            key_line = line_key(line)
+            if key_line in boilerplate:
+                run.append(i)
+            elif not key_line and run:
+                run.append(i)
+            elif run:
+                close_run()
+        close_run()
+
+        removed_words = sum(word_counts[i] for i in remove)
+        if not remove or removed_words > total_words * MAX_STRIP_RATIO:
+            return text, 0, 0, total_words
+        kept = [line for i, line in enumerate(lines) if i not in remove]
+        return '\n'.join(kept).strip('\n'), len(remove), removed_words, total_words
+
+    def __call__(self, text, category_name, subcategory_name, stats_key=None):
+        """Strip + catat statistik di `stats_key` (default: konteks profiler)"""
+        stripped, removed_lines, removed_words, total_words = self.strip(
+            text, model_key(category_name or '', subcategory_name or ''))
+        tokens = backend_tokens(text)
+        self.record(stats_key or PROFILER.current_context(), {
+            'documents': 1,
+            'stripped': int(removed_lines > 0),
+            'lines': removed_lines,
+            'words': total_words,
+            'words_removed': removed_words,
+            'tokens': tokens,
+            'tokens_removed': tokens - backend_tokens(stripped) if removed_lines else 0,
+        })
+        return stripped
+
+    def record(self, key, counts):
+        with self._lock:
+            self.totals[key].update(counts)
+
+    def stats(self):
+        """{key: {hitungan}} (untuk digabung antar proses)"""
+        with self._lock:
+            return {key: dict(counts) for key, counts in self.totals.items()}
+
+    def merge(self, stats):
+        for key, counts in stats.items():
+            self.record(key, counts)
+
+    def print_summary(self):
+        """Laporan kata & token backend yang dibuang per sub-kategori + total"""
+        stats = self.stats()
+        if not stats:
+            return
+        print(f"\n{'='*80}")
+        print(f"✂️  BOILERPLATE DIBUANG (kata / token backend)")
+        print(f"{'='*80}")
+        overall = Counter()
+        for key in sorted(stats):
+            counts = stats[key]
+            overall.update(counts)
+            print(f"   {key[:40]:<40} {counts['stripped']:>5,}/{counts['documents']:<5,} naskah  "
+                  f"{format_removed(counts)}")
+        print(f"\n📊 TOTAL: {overall['stripped']:,}/{overall['documents']:,} naskah, {overall['lines']:,} baris, "
+              f"{format_removed(overall)}")
+
+def format_removed(counts):
+    words = counts['words_removed'] / (counts['words'] or 1) * 100
+    tokens = counts['tokens_removed'] / (counts['tokens'] or 1) * 100
+    return (f"{counts['words_removed']:>9,} kata ({words:>5.2f}%)  "
+            f"{counts['tokens_removed']:>9,} token ({tokens:>5.2f}%)")
+
+# ==================== LEARNER ====================
+
+def sample_records(key, records, sample_size, seed=SEED):
+    """Sampel acak deterministik naskah satu sub-kategori (sama untuk corpus folder maupun pack)"""
+    if len(records) > sample_size:
+        positions = sorted(random.Random(f"{seed}:{key}").sample(range(len(records)), sample_size))
+        records = [records[position] for position in positions]
+    return records
+
+def count_lines(key, records):
+    """Worker: (key, jumlah naskah, Counter document frequency kunci baris)"""
+    frequency = Counter()
+    documents = 0
+    for record in records:
+        try:
+            body = record.body()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ Error reading {record.path}: {e}")
+            continue
+        documents += 1
+        frequency.update({line_key(line) for line in body.split('\n')} - {''})
+    return key, documents, frequency
+
+def learn_model(base_dir, sample_size=DEFAULT_SAMPLE, min_doc_ratio=DEFAULT_MIN_DOC_RATIO,
+                min_docs=DEFAULT_MIN_DOCS, min_tokens=DEFAULT_MIN_TOKENS, workers=None):
+    """Pelajari baris boilerplate per sub-kategori dari sampel corpus (folder atau .pack),
+    return (model, sampel per key)"""
+    from corpus import CorpusReader
+
+    jobs = []
+    for category_name, subcategory_name, records in CorpusReader(base_dir).subcategories():
+        key = f"{category_name}/{subcategory_name}"
+        jobs.append((key, sample_records(key, records, sample_size)))
+
+    subcategories, frequencies = {}, {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        keys = [key for key, _ in jobs]
+        for key, documents, frequency in executor.map(count_lines, keys, [files for _, files in jobs]):
+            threshold = max(min_docs, min_doc_ratio * documents)
+            lines = sorted(line for line, count in frequency.items() if count >= threshold)
+            subcategories[key] = {'sampled': documents, 'lines': lines}
+            frequencies[key] = {line: frequency[line] for line in lines}
+
+    spread = Counter(line for entry in subcategories.values() for line in entry['lines'])
+    global_lines = sorted(line for line, count in spread.items() if count >= GLOBAL_MIN_SUBCATEGORIES)
+    model = {
+        'settings': {
+            'sample': sample_size, 'min_doc_ratio': min_doc_ratio, 'min_docs': min_docs,
+            'min_tokens': min_tokens, 'seed': SEED,
+        },
+        'global': global_lines,
+        'subcategories': subcategories,
+        'frequencies': frequencies,
+    }
+    return model, dict(jobs)
+
+# ==================== LAPORAN ====================
+
+def strip_files(model, key, records):
+    """Worker: terapkan model ke naskah (di memori), return statistik stripper"""
+    stripper = BoilerplateStripper(model)
+    category_name, _, subcategory_name = key.partition('/')
+    for record in records:
+        try:
+            body = record.body()
+        except (OSError, UnicodeDecodeError):
+            continue
+        stripper(body, category_name, subcategory_name, stats_key=key)
+    return stripper.stats()
+
+def report(model, jobs, workers=None):
+    """Laporan token dibuang untuk [(key, [record])] (paralel per sub-kategori)"""
+    stripper = BoilerplateStripper(model)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(strip_files, model, key, records) for key, records in jobs if records]
+        for future in futures:
+            stripper.merge(future.result())
+    stripper.print_summary()
+
+def print_top_lines(model, show):
+    """Baris boilerplate paling sering (document frequency di sampel)"""
+    ranked = []
+    for key, lines in model.get('frequencies', {}).items():
+        sampled = model['subcategories'][key]['sampled'] or 1
+        ranked += [(count / sampled, count, key, line) for line, count in lines.items()]
+    ranked.sort(reverse=True)
+    print(f"\n🔝 BARIS BOILERPLATE TERSERING (global: {len(model['global'])} baris)")
+    for ratio, count, key, line in ranked[:show]:
+        marker = '🌐' if line in model['global'] else '  '
+        print(f"   {marker} {ratio * 100:>5.1f}% {count:>5,}x  {key[:30]:<30}  {line[:70]}")
+
+# ==================== MAIN ====================
+
+def main():
+    from corpus import BASE_DIR, CorpusReader
+
+    parser = argparse.ArgumentParser(description='Pelajari & laporkan boilerplate lintas halaman per sub-kategori')
+    parser.add_argument('--source', '--dir', dest='source', default=BASE_DIR,
+                        help=f'Folder corpus atau file .pack (default: {BASE_DIR})')
+    parser.add_argument('--model', default=MODEL_FILE, help=f'File model (default: {MODEL_FILE})')
+    parser.add_argument('--report', action='store_true',
+                        help='Jangan belajar ulang: terapkan model ke seluruh corpus dan laporkan token dibuang')
+    parser.add_argument('--sample', type=int, default=DEFAULT_SAMPLE,
+                        help=f'Naskah sampel per sub-kategori (default: {DEFAULT_SAMPLE})')
+    parser.add_argument('--min-doc-ratio', type=float, default=DEFAULT_MIN_DOC_RATIO,
+                        help=f'Proporsi sampel minimum agar baris dianggap boilerplate (default: {DEFAULT_MIN_DOC_RATIO})')
+    parser.add_argument('--min-docs', type=int, default=DEFAULT_MIN_DOCS,
+                        help=f'Jumlah naskah minimum (default: {DEFAULT_MIN_DOCS})')
+    parser.add_argument('--min-tokens', type=int, default=DEFAULT_MIN_TOKENS,
+                        help=f'Kata minimum satu rangkaian baris yang dibuang (default: {DEFAULT_MIN_TOKENS})')
+    parser.add_argument('--show', type=int, default=10, help='Jumlah baris boilerplate teratas yang ditampilkan')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah worker process (default: jumlah CPU)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"❌ {args.source} tidak ditemukan!")
+        return
+
+    print(f"\n{'='*80}")
+    print(f"✂️  BOILERPLATE LINTAS HALAMAN")
+    print(f"{'='*80}\n")
+
+    if args.report:
+        with open(args.model, 'r', encoding='utf-8') as f:
+            model = json.load(f)
+        jobs = [(f"{category_name}/{subcategory_name}", records)
+                for category_name, subcategory_name, records in CorpusReader(args.source).subcategories()]
+        print(f"📖 Model {args.model}: {len(model['subcategories'])} sub-kategori, "
+              f"{len(model['global'])} baris global")
+    else:
+        model, samples = learn_model(args.source, args.sample, args.min_doc_ratio, args.min_docs,
+                                     args.min_tokens, args.workers)
+        with open(args.model, 'w', encoding='utf-8') as f:
+            json.dump(model, f, ensure_ascii=False, indent=2)
+        learned = sum(len(entry['lines']) for entry in model['subcategories'].values())
+        print(f"✅ {learned:,} baris boilerplate dari {len(model['subcategories'])} sub-kategori "
+              f"({len(model['global'])} global) -> {args.model}")
+        jobs = list(samples.items())
+        print(f"📊 Laporan atas sampel ({sum(len(files) for _, files in jobs):,} naskah):")
+
+    if args.show:
+        print_top_lines(model, args.show)
+    report(model, jobs, args.workers)
+
+if __name__ == "__main__":
+    main()
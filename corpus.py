@@ -0,0 +1,418 @@
+"""
+Utilitas Korpus Naskah Sastra.org
+Fungsi bersama untuk menelusuri folder hasil scraping dan membaca header naskah,
+plus CorpusReader: akses naskah yang malas (lazy) dan seragam untuk dua bentuk
+penyimpanan korpus:
+
+    folder   data_naskah_sastra_org/Kategori/Sub_kategori/0001_Judul.txt
+    pack     satu file .pack (isi file naskah disambung apa adanya) + indeks
+             .pack.jsonl (entri katalog + offset), dibuat dengan --pack
+
+Record naskah (ManuscriptRecord) ringan dan bisa di-pickle ke worker process:
+header dibaca tanpa membaca isi (pack: langsung dari indeks), isi baru dibaca
+saat diminta. Filter kategori hanya membuka folder kategori yang diminta.
+
+CARA PAKAI:
+    reader = CorpusReader()                       # atau CorpusReader("corpus.pack")
+    for record in reader.records(categories=["Babad"]):
+        header, body = record.read()
+    record = reader.find("https://www.sastra.org/...")   # URL, ID listing, atau path relatif
+
+    python corpus.py --pack corpus.pack           # kemas folder corpus jadi satu file
+    python corpus.py --find 5001 --source corpus.pack
+    python corpus.py --category Babad             # daftar naskah satu kategori
+"""
+
+import os
+import json
+import argparse
+
+BASE_DIR = "data_naskah_sastra_org"
+
+# Pemisah header yang ditulis save_manuscript: "Judul: ...\nURL: ...\n[metadata listing]\n====...\n\n"
+HEADER_SEPARATOR = "=" * 80
+
+PACK_SUFFIX = ".pack"
+PACK_INDEX_SUFFIX = ".jsonl"  # Indeks pack: <file>.pack.jsonl
+
+
+def iter_subcategory_dirs(base_dir=BASE_DIR):
+    """Yield (kategori, sub_kategori, path) untuk setiap folder sub-kategori"""
+    for category_name in sorted(os.listdir(base_dir)):
+        category_path = os.path.join(base_dir, category_name)
+        if not os.path.isdir(category_path):
+            continue
+
+        for subcategory_name in sorted(os.listdir(category_path)):
+            subcategory_path = os.path.join(category_path, subcategory_name)
+            if os.path.isdir(subcategory_path):
+                yield category_name, subcategory_name, subcategory_path
+
+
+def list_manuscript_files(subcategory_path):
+    """Daftar file .txt (urut nama) dalam satu folder sub-kategori"""
+    return sorted(f for f in os.listdir(subcategory_path) if f.endswith('.txt'))
+
+
+def manuscript_index(filename):
+    """Nomor urut dari nama file "0001_Judul.txt" (None jika tidak ada)"""
+    prefix, sep, _ = filename.partition('_')
+    return int(prefix) if sep and prefix.isdigit() else None
+
+
+def split_header(content):
+    """Pisahkan header naskah dari isinya, return (header_dict, body)"""
+    header = {}
+    lines = content.split('\n', 20)
+
+    for i, line in enumerate(lines[:20]):
+        if line.startswith(HEADER_SEPARATOR):
+            body = '\n'.join(lines[i + 1:]) if i + 1 < len(lines) else ''
+            return header, body.lstrip('\n')
+
+        key, sep, value = line.partition(': ')
+        if not sep:
+            break
+        header[key] = value.strip()
+
+    # Bukan format save_manuscript: anggap seluruh konten sebagai isi
+    return {}, content
+
+
+def read_header(filepath, max_lines=20):
+    """Baca header naskah saja (berhenti di garis pemisah), return header_dict"""
+    header = {}
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for _ in range(max_lines):
+            line = f.readline()
+            if not line:
+                return {}
+            if line.startswith(HEADER_SEPARATOR):
+                return header
+            key, sep, value = line.rstrip('\n').partition(': ')
+            if not sep:
+                return {}
+            header[key] = value.strip()
+    return header
+
+
+def read_manuscript(filepath):
+    """Baca file naskah, return (header_dict, body)"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return split_header(f.read())
+
+# ==================== RECORD ====================
+
+class ManuscriptRecord:
+    """Satu naskah di corpus (folder atau pack); header & isi dibaca saat diakses"""
+
+    __slots__ = ('source', 'relpath', 'offset', 'size', 'body_offset', 'sha256', '_header')
+
+    def __init__(self, source, relpath, offset=None, size=None, body_offset=None, sha256=None, header=None):
+        self.source = source          # root folder corpus atau path file .pack
+        self.relpath = relpath        # "Kategori/Sub/0001_Judul.txt"
+        self.offset = offset          # hanya pack: posisi byte file di .pack
+        self.size = size
+        self.body_offset = body_offset
+        self.sha256 = sha256
+        self._header = header
+
+    @classmethod
+    def from_path(cls, filepath, root=None):
+        """Record untuk satu file naskah di disk (root default: dua folder di atas file)"""
+        root = root or os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(filepath))))
+        return cls(root, os.path.relpath(filepath, root).replace(os.sep, '/'))
+
+    @property
+    def packed(self):
+        return self.offset is not None
+
+    @property
+    def path(self):
+        """Path file (folder) atau path semu <file.pack>/<relpath> (pack)"""
+        return os.path.join(self.source, *self.relpath.split('/'))
+
+    @property
+    def filename(self):
+        return self.relpath.rsplit('/', 1)[-1]
+
+    @property
+    def category(self):
+        parts = self.relpath.split('/')
+        return parts[-3] if len(parts) >= 3 else None
+
+    @property
+    def subcategory(self):
+        parts = self.relpath.split('/')
+        return parts[-2] if len(parts) >= 3 else None
+
+    @property
+    def index(self):
+        return manuscript_index(self.filename)
+
+    @property
+    def header(self):
+        """Header naskah (dibaca sekali, tanpa membaca isi)"""
+        if self._header is None:
+            self._header = read_header(self.path)
+        return self._header
+
+    @property
+    def title(self):
+        return self.header.get('Judul') or self.filename[:-len('.txt')]
+
+    @property
+    def url(self):
+        return self.header.get('URL')
+
+    @property
+    def source_id(self):
+        return self.header.get('ID')
+
+    def read_bytes(self):
+        """Isi file naskah apa adanya (header + isi)"""
+        if not self.packed:
+            with open(self.path, 'rb') as f:
+                return f.read()
+        with open(self.source, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.size)
+
+    def body(self):
+        """Isi naskah tanpa header"""
+        if not self.packed:
+            return read_manuscript(self.path)[1]
+        with open(self.source, 'rb') as f:
+            f.seek(self.offset + self.body_offset)
+            text = f.read(self.size - self.body_offset).decode('utf-8')
+        return text.lstrip('\n') if self.body_offset else text
+
+    def read(self):
+        """(header_dict, body) seperti read_manuscript"""
+        if not self.packed:
+            header, body = read_manuscript(self.path)
+            self._header = header
+            return header, body
+        return self.header, self.body()
+
+    def file_size(self):
+        """Ukuran file naskah (bytes)"""
+        return self.size if self.packed else os.path.getsize(self.path)
+
+    def signature(self):
+        """Penanda perubahan murah: [ukuran, mtime_ns] (folder) atau [ukuran, sha256] (pack)"""
+        if self.packed:
+            return [self.size, self.sha256]
+        stat = os.stat(self.path)
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def __repr__(self):
+        return f"ManuscriptRecord({self.relpath!r}{', packed' if self.packed else ''})"
+
+
+def as_record(source):
+    """ManuscriptRecord dari record atau path file naskah"""
+    return source if isinstance(source, ManuscriptRecord) else ManuscriptRecord.from_path(source)
+
+# ==================== STORE ====================
+
+def folder_key(name):
+    """Nama kategori tampilan atau nama folder -> kunci pembanding ("Kisah Cerita" == "Kisah_Cerita")"""
+    return name.replace(' ', '_').lower()
+
+def name_filter(names):
+    """Fungsi cocok-nama untuk filter kategori / sub-kategori (None = semua)"""
+    if not names:
+        return lambda name: True
+    keys = {folder_key(name) for name in names}
+    return lambda name: name is not None and folder_key(name) in keys
+
+class DirectoryStore:
+    """Corpus berupa folder kategori/sub-kategori hasil save_manuscript"""
+
+    def __init__(self, root=BASE_DIR):
+        self.root = root
+
+    def groups(self, category_match, subcategory_match):
+        """Yield (kategori, sub, [record]); hanya folder kategori yang cocok yang dibuka"""
+        for category_name in sorted(os.listdir(self.root)):
+            category_path = os.path.join(self.root, category_name)
+            if not os.path.isdir(category_path) or not category_match(category_name):
+                continue
+            for subcategory_name in sorted(os.listdir(category_path)):
+                subcategory_path = os.path.join(category_path, subcategory_name)
+                if not os.path.isdir(subcategory_path) or not subcategory_match(subcategory_name):
+                    continue
+                yield category_name, subcategory_name, [
+                    ManuscriptRecord(self.root, f"{category_name}/{subcategory_name}/{filename}")
+                    for filename in list_manuscript_files(subcategory_path)
+                ]
+
+    def flat_records(self):
+        """Naskah langsung di root (mode --flat)"""
+        return [ManuscriptRecord(self.root, filename) for filename in list_manuscript_files(self.root)]
+
+class PackedStore:
+    """Corpus dalam satu file .pack + indeks .pack.jsonl (lihat pack_corpus)"""
+
+    def __init__(self, path):
+        self.path = path
+        self.records = []
+        with open(path + PACK_INDEX_SUFFIX, 'r', encoding='utf-8') as f:
+            for line in f:
+                entry = json.loads(line)
+                self.records.append(ManuscriptRecord(
+                    path, entry['path'], entry['offset'], entry['size'], entry['bodyOffset'],
+                    entry['sha256'], entry['header'],
+                ))
+
+    def groups(self, category_match, subcategory_match):
+        grouped = {}
+        for record in self.records:
+            category_name, subcategory_name = record.category, record.subcategory
+            if category_name is None or not category_match(category_name) or not subcategory_match(subcategory_name):
+                continue
+            grouped.setdefault((category_name, subcategory_name), []).append(record)
+        for (category_name, subcategory_name), records in sorted(grouped.items()):
+            yield category_name, subcategory_name, records
+
+    def flat_records(self):
+        return [record for record in self.records if record.category is None]
+
+def is_pack(source):
+    return source.endswith(PACK_SUFFIX) and os.path.isfile(source)
+
+# ==================== READER ====================
+
+class CorpusReader:
+    """Iterasi & akses acak naskah di corpus folder maupun pack"""
+
+    def __init__(self, source=BASE_DIR):
+        self.source = source
+        self.store = PackedStore(source) if is_pack(source) else DirectoryStore(source)
+        self._by_url = None
+        self._by_id = None
+        self._by_path = None
+
+    def subcategories(self, categories=None, subcategories=None):
+        """Yield (kategori, sub_kategori, [record]) per sub-kategori (urut nama)"""
+        return self.store.groups(name_filter(categories), name_filter(subcategories))
+
+    def records(self, categories=None, subcategories=None):
+        """Yield record naskah satu per satu; naskah di root (--flat) ikut jika tanpa filter"""
+        if not categories and not subcategories:
+            yield from self.store.flat_records()
+        for _, _, records in self.subcategories(categories, subcategories):
+            yield from records
+
+    def __iter__(self):
+        return self.records()
+
+    def _build_index(self):
+        """Indeks URL / ID listing / path relatif (header saja, isi tidak dibaca)"""
+        by_url, by_id, by_path = {}, {}, {}
+        for record in self.records():
+            by_path[record.relpath] = record
+            if record.url:
+                by_url[record.url] = record
+            if record.source_id:
+                by_id[record.source_id] = record
+        self._by_url, self._by_id, self._by_path = by_url, by_id, by_path
+
+    def by_url(self, url):
+        if self._by_url is None:
+            self._build_index()
+        return self._by_url.get(url)
+
+    def by_id(self, source_id):
+        if self._by_id is None:
+            self._build_index()
+        return self._by_id.get(str(source_id).lstrip('#'))
+
+    def get(self, relpath):
+        if self._by_path is None:
+            self._build_index()
+        return self._by_path.get(relpath.replace(os.sep, '/'))
+
+    def register(self, record):
+        """Masukkan naskah yang baru ditulis ke indeks (jika indeks sudah dibangun)"""
+        if self._by_url is None:
+            return
+        self._by_path[record.relpath] = record
+        if record.url:
+            self._by_url[record.url] = record
+        if record.source_id:
+            self._by_id[record.source_id] = record
+
+    def refresh_index(self):
+        """Bangun ulang indeks (naskah yang ditulis proses lain)"""
+        self._by_url = self._by_id = self._by_path = None
+
+    def find(self, key):
+        """Cari naskah dari URL, ID listing ("5001" / "#5001") atau path relatif"""
+        return self.by_url(key) or self.by_id(key) or self.get(key)
+
+# ==================== PACK ====================
+
+def pack_corpus(root, pack_path):
+    """Kemas semua naskah di folder corpus ke satu file .pack + indeks, return jumlah naskah"""
+    from manuscript_catalog import catalog_entry
+
+    reader = CorpusReader(root)
+    tmp_path, tmp_index = pack_path + '.tmp', pack_path + PACK_INDEX_SUFFIX + '.tmp'
+    count = 0
+    with open(tmp_path, 'wb') as pack, open(tmp_index, 'w', encoding='utf-8') as index:
+        for record in reader.records():
+            data = record.read_bytes()
+            entry = catalog_entry(record.relpath, record.header, data)
+            entry['offset'] = pack.tell()
+            pack.write(data)
+            index.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp_path, pack_path)
+    os.replace(tmp_index, pack_path + PACK_INDEX_SUFFIX)
+    return count
+
+# ==================== MAIN ====================
+
+def main():
+    parser = argparse.ArgumentParser(description='Baca / kemas corpus naskah (folder atau .pack)')
+    parser.add_argument('--source', default=BASE_DIR, help=f'Folder corpus atau file .pack (default: {BASE_DIR})')
+    parser.add_argument('--pack', metavar='OUTPUT', help='Kemas folder --source ke file .pack')
+    parser.add_argument('--find', help='Cari naskah dari URL, ID listing atau path relatif')
+    parser.add_argument('--category', nargs='+', help='Daftar naskah kategori ini saja')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.source):
+        print(f"❌ {args.source} tidak ditemukan!")
+        return
+
+    if args.pack:
+        if not args.pack.endswith(PACK_SUFFIX):
+            print(f"❌ Nama file pack harus berakhiran {PACK_SUFFIX}")
+            return
+        count = pack_corpus(args.source, args.pack)
+        print(f"📦 {count:,} naskah dikemas -> {args.pack} ({os.path.getsize(args.pack) / 1024 / 1024:,.1f} MB)")
+        return
+
+    reader = CorpusReader(args.source)
+    if args.find:
+        record = reader.find(args.find)
+        if not record:
+            print(f"❌ Naskah {args.find!r} tidak ditemukan")
+            return
+        header, body = record.read()
+        print(f"📄 {record.relpath}")
+        for key, value in header.items():
+            print(f"   {key}: {value}")
+        print(f"   ({len(body):,} karakter isi)")
+        return
+
+    total = 0
+    for category_name, subcategory_name, records in reader.subcategories(args.category):
+        print(f"📁 {category_name}/{subcategory_name}: {len(records):,} naskah")
+        total += len(records)
+    print(f"\n📊 Total: {total:,} naskah")
+
+if __name__ == "__main__":
+    main()
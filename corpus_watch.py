@@ -0,0 +1,218 @@
+"""
+Pantau Folder Corpus (inotify / polling)
+Memberi tahu file naskah .txt mana yang selesai ditulis atau dihapus di bawah
+folder corpus, tanpa scan ulang penuh. Dipakai analyze_scraping_results.py --watch.
+
+  - Linux: inotify lewat ctypes (tanpa dependency). File dilaporkan saat
+    IN_CLOSE_WRITE (penulis menutup file) atau IN_MOVED_TO (tulis .tmp lalu
+    replace), jadi file yang masih ditulis tidak terbaca. Folder baru
+    otomatis di-watch dan isinya dilaporkan (file bisa muncul sebelum watch
+    terpasang).
+  - Lainnya / inotify gagal (mis. batas max_user_watches): polling ukuran +
+    mtime; file dilaporkan setelah tidak berubah selama STABLE_SECONDS.
+
+Event: ('changed', path), ('removed', path), atau ('rescan', None) jika
+antrian event inotify meluap dan state harus dicocokkan ulang dengan disk.
+"""
+
+import os
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+
+# ==================== KONFIGURASI ====================
+
+POLL_INTERVAL = 2.0        # Detik antar scan pada mode polling
+STABLE_SECONDS = 1.0       # File dianggap selesai ditulis jika tidak berubah selama ini
+READ_SIZE = 64 * 1024      # Buffer baca event inotify
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+# ==================== HELPER ====================
+
+def is_manuscript_file(name):
+    return name.endswith('.txt')
+
+def file_signature(path):
+    """(ukuran, mtime_ns) atau None jika file hilang"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+def walk_files(root):
+    """Semua file naskah .txt di bawah root"""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if is_manuscript_file(name):
+                yield os.path.join(dirpath, name)
+
+# ==================== INOTIFY ====================
+
+class InotifyWatcher:
+    """Watch rekursif dengan inotify (Linux) lewat ctypes"""
+
+    mode = 'inotify'
+
+    def __init__(self, root):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, "inotify tidak tersedia")
+        self._libc = libc
+        self.root = root
+        self.fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise self._error(root)
+        self.dirs = {}  # wd -> path folder
+        try:
+            self.initial = self.add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    @staticmethod
+    def _error(path):
+        code = ctypes.get_errno()
+        return OSError(code, os.strerror(code), path)
+
+    def add_tree(self, root):
+        """Watch root dan semua sub-folder, return file .txt yang sudah ada"""
+        found = []
+        for dirpath, _, filenames in os.walk(root):
+            wd = self._libc.inotify_add_watch(self.fd, os.fsencode(dirpath), WATCH_MASK)
+            if wd < 0:
+                raise self._error(dirpath)
+            self.dirs[wd] = dirpath
+            found.extend(os.path.join(dirpath, name) for name in filenames if is_manuscript_file(name))
+        return found
+
+    def events(self, timeout):
+        """Tunggu maksimal `timeout` detik, return list event"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, READ_SIZE)
+        except BlockingIOError:
+            return []
+
+        events = []
+        position = 0
+        while position + EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = EVENT_HEADER.unpack_from(data, position)
+            position += EVENT_HEADER.size
+            name = os.fsdecode(data[position:position + length].rstrip(b'\0'))
+            position += length
+
+            if mask & IN_Q_OVERFLOW:
+                events.append(('rescan', None))
+                continue
+            if mask & IN_IGNORED:
+                self.dirs.pop(wd, None)
+                continue
+            directory = self.dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = os.path.join(directory, name)
+
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        events.extend(('changed', found) for found in self.add_tree(path))
+                    except FileNotFoundError:
+                        pass
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    events.append(('rescan', None))
+            elif is_manuscript_file(name):
+                if mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                    events.append(('changed', path))
+                elif mask & (IN_DELETE | IN_MOVED_FROM):
+                    events.append(('removed', path))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+# ==================== POLLING ====================
+
+class PollingWatcher:
+    """Fallback tanpa inotify: scan ukuran + mtime, laporkan file yang sudah stabil"""
+
+    mode = 'polling'
+
+    def __init__(self, root, interval=POLL_INTERVAL):
+        self.root = root
+        self.interval = interval
+        self.known = {}    # path -> signature yang sudah dilaporkan
+        self.pending = {}  # path -> (signature, waktu pertama terlihat dengan signature itu)
+        self.initial = []
+        for path in walk_files(root):
+            signature = file_signature(path)
+            if signature:
+                self.known[path] = signature
+                self.initial.append(path)
+        self._next_scan = time.monotonic() + interval
+
+    def events(self, timeout):
+        wait = self._next_scan - time.monotonic()
+        if wait > timeout:
+            time.sleep(max(timeout, 0))
+            return []
+        time.sleep(max(wait, 0))
+        self._next_scan = time.monotonic() + self.interval
+        return self.scan()
+
+    def scan(self):
+        now = time.monotonic()
+        seen = set()
+        events = []
+        for path in walk_files(self.root):
+            seen.add(path)
+            signature = file_signature(path)
+            if signature is None or self.known.get(path) == signature:
+                self.pending.pop(path, None)
+                continue
+            previous = self.pending.get(path)
+            if previous is None or previous[0] != signature:
+                self.pending[path] = (signature, now)
+            elif now - previous[1] >= STABLE_SECONDS:
+                del self.pending[path]
+                self.known[path] = signature
+                events.append(('changed', path))
+        for path in set(self.known) - seen:
+            del self.known[path]
+            events.append(('removed', path))
+        for path in set(self.pending) - seen:
+            del self.pending[path]
+        return events
+
+    def close(self):
+        pass
+
+def open_watcher(root, polling=False):
+    """InotifyWatcher jika bisa, selain itu PollingWatcher"""
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            print(f"⚠️  inotify tidak bisa dipakai ({e}), beralih ke polling setiap {POLL_INTERVAL:g}s")
+    return PollingWatcher(root)
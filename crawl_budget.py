@@ -0,0 +1,363 @@
+"""
+Mode Crawl Berbatas Waktu (--time-budget)
+Untuk jendela maintenance yang tetap. Crawl dibagi dua fase:
+
+  1. Listing sub-kategori terpilih, yang berbobot paling tinggi lebih dulu.
+  2. Fetch naskah berdasarkan nilai:
+       a. naskah baru (belum ada di fetch_history.json / corpus)
+       b. bobot kategori / sub-kategori lebih tinggi (--weight NAMA=BOBOT)
+       c. naskah yang paling lama tidak diambil
+
+Throughput diukur terus (EWMA durasi per naskah dan naskah/detik) dan rencana
+dihitung ulang secara berkala: berapa naskah lagi yang muat dan sampai tingkat
+nilai mana. Naskah baru hanya dimulai jika durasi EWMA-nya masih muat sebelum
+deadline, sehingga crawl berhenti bersih. Checkpoint (fetch_history.json,
+progress, log) selalu konsisten, dan sisa pekerjaan ditulis ke
+budget_leftover.json.
+
+CARA PAKAI (lewat scraper_cli.py):
+    python scraper_cli.py scrape --all --time-budget 2h --weight Babad=3 --weight "Agama dan Kepercayaan=2"
+"""
+
+import os
+import re
+import json
+import time
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from crawl_state import FETCH_HISTORY_FILE, FetchHistory, corpus_fetch_times
+from scraper_engine import (
+    ListingTruncated, existing_manuscripts, listing_matches, log_to_csv, mark_progress, save_manuscript,
+    scrape_manuscript, subcategory_key,
+)
+from stage_profiler import PROFILER
+
+# ==================== KONFIGURASI ====================
+
+LEFTOVER_FILE = "budget_leftover.json"
+EWMA_ALPHA = 0.2           # Bobot pengukuran terbaru pada EWMA
+REPLAN_INTERVAL = 60       # Detik antar re-plan (maksimal; budget pendek re-plan lebih sering)
+SAFETY_MARGIN = 1.5        # Naskah dimulai hanya jika durasi EWMA x margin masih muat
+HISTORY_SAVE_EVERY = 25    # Checkpoint history setiap N naskah
+
+DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)([hms]?)")
+DURATION_UNITS = {'h': 3600, 'm': 60, 's': 1, '': 1}
+
+# ==================== HELPER ====================
+
+def parse_duration(text):
+    """'90m', '2h', '1h30m', '3600' -> detik"""
+    text = text.strip().lower().replace(' ', '')
+    parts = DURATION_PATTERN.findall(text)
+    if not parts or ''.join(number + unit for number, unit in parts) != text:
+        raise ValueError(f"durasi tidak valid: {text!r} (contoh: 90m, 2h, 1h30m)")
+    return sum(float(number) * DURATION_UNITS[unit] for number, unit in parts)
+
+def parse_weights(pairs):
+    """['Babad=3', 'Agama dan Kepercayaan=2'] -> {nama: bobot}"""
+    weights = {}
+    for pair in pairs or []:
+        name, separator, value = pair.rpartition('=')
+        if not separator or not name:
+            raise ValueError(f"bobot tidak valid: {pair!r} (format: NAMA=BOBOT)")
+        weights[name.strip()] = float(value)
+    return weights
+
+def item_weight(weights, category_name, subcategory_name):
+    """Bobot paling spesifik: kategori_sub-kategori, sub-kategori, lalu kategori (default 1)"""
+    for name in (subcategory_key(category_name, subcategory_name), subcategory_name, category_name):
+        if name in weights:
+            return weights[name]
+    return 1.0
+
+def listing_unchanged(record, files):
+    """Naskah yang terbukti tidak berubah: file dengan URL sama menyimpan tanggal unggah /
+    jumlah kata yang sama dengan baris listing (tanpa metadata tidak ada bukti, tetap di-fetch)"""
+    for _, header in files:
+        proven = any(value is not None and label in header
+                     for value, label in ((record.uploaded, 'Diunggah'), (record.word_count, 'Jumlah kata')))
+        if proven and listing_matches(record, header):
+            return True
+    return False
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(max(seconds, 0)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}j{minutes:02d}m{seconds:02d}d" if hours else f"{minutes}m{seconds:02d}d"
+
+class ThroughputMeter:
+    """EWMA durasi per naskah dan naskah per detik"""
+
+    def __init__(self, initial_item_seconds):
+        self.item_seconds = initial_item_seconds
+        self.rate = None
+        self.completed = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def add(self, duration):
+        self.item_seconds += EWMA_ALPHA * (duration - self.item_seconds)
+        self.completed += 1
+        self._window_count += 1
+
+    def sample_rate(self):
+        """Tutup jendela pengukuran, update EWMA naskah/detik"""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed > 0 and self._window_count:
+            rate = self._window_count / elapsed
+            self.rate = rate if self.rate is None else self.rate + EWMA_ALPHA * (rate - self.rate)
+        self._window_start = now
+        self._window_count = 0
+        return self.rate
+
+# ==================== CRAWLER ====================
+
+class BudgetCrawler:
+    """Crawl dengan deadline: listing, urutkan berdasarkan nilai, fetch sampai waktu habis"""
+
+    def __init__(self, scraper, time_budget, weights=None, history_file=FETCH_HISTORY_FILE,
+                 leftover_file=LEFTOVER_FILE):
+        self.scraper = scraper
+        self.time_budget = time_budget
+        self.deadline = time.monotonic() + time_budget
+        self.weights = weights or {}
+        if scraper.history is None:
+            scraper.history = FetchHistory(history_file)
+        self.history = scraper.history
+        self.leftover_file = leftover_file
+        self.meter = ThroughputMeter(scraper.request_limiter.min_interval * scraper.workers + 1.0)
+        self.replan_interval = min(REPLAN_INTERVAL, max(1.0, time_budget / 20))
+
+    def remaining(self):
+        return self.deadline - time.monotonic()
+
+    def can_start(self):
+        return self.remaining() > self.meter.item_seconds * SAFETY_MARGIN
+
+    # ---------- Fase 1: listing ----------
+
+    def list_candidates(self, selection):
+        """Listing sub-kategori (bobot tertinggi dulu), return (items, listed, unlisted)"""
+        ordered = sorted(
+            selection,
+            key=lambda entry: -item_weight(self.weights, entry[0], entry[2]['name'])
+        )
+        items, listed, unlisted = [], {}, []
+        for category_name, fc, subcategory in ordered:
+            subcategory_name = subcategory['name']
+            key = subcategory_key(category_name, subcategory_name)
+            if not self.can_start():
+                unlisted.append(key)
+                continue
+
+            status = self.scraper.status
+            if status:
+                status.begin_subcategory(key)
+            complete = True
+            try:
+                records = self.scraper.list_records(category_name, fc, subcategory,
+                                                    should_stop=lambda: not self.can_start())
+            except ListingTruncated as e:
+                # Deadline di tengah listing: pakai hasil parsial, sisanya lanjut dari checkpoint
+                print(f"⏰ {e}")
+                records, complete = e.records, False
+            except Exception as e:
+                print(f"❌ Listing {subcategory_name} gagal: {e}")
+                unlisted.append(key)
+                if status:
+                    status.end_subcategory(key, 'ERROR', str(e))
+                continue
+            listed[key] = {'category': category_name, 'subcategory': subcategory_name,
+                           'found': len(records), 'complete': complete}
+
+            weight = item_weight(self.weights, category_name, subcategory_name)
+            output_dir = self.scraper.output_dir_for(category_name, subcategory_name)
+            corpus_times = corpus_fetch_times(output_dir)
+            existing = existing_manuscripts(output_dir)
+            unchanged = 0
+            for index, record in enumerate(records, 1):
+                if listing_unchanged(record, existing.get(index, ())):
+                    unchanged += 1
+                    continue
+                entry = self.history.get(record.url)
+                fetched_at = entry['fetched_at'] if entry else corpus_times.get(index)
+                items.append({
+                    'key': key,
+                    'category': category_name,
+                    'subcategory': subcategory_name,
+                    'index': index,
+                    'url': record.url,
+                    'record': record,
+                    'new': fetched_at is None,
+                    'weight': weight,
+                    'fetched_at': fetched_at,
+                })
+            if unchanged:
+                print(f"⏭️  {subcategory_name}: {unchanged} naskah tidak berubah menurut listing (tidak di-fetch)")
+            if status:
+                status.listed(key, len(records), unchanged)
+        return items, listed, unlisted
+
+    @staticmethod
+    def prioritize(items):
+        """Baru dulu, lalu bobot tertinggi, lalu yang paling lama tidak diambil"""
+        return sorted(items, key=lambda item: (
+            not item['new'], -item['weight'], item['fetched_at'] or '', item['key'], item['index']
+        ))
+
+    # ---------- Fase 2: fetch ----------
+
+    def fetch_item(self, item):
+        """Worker: scrape + simpan satu naskah, return (ok, durasi)"""
+        start = time.monotonic()
+        metadata = {'kind': 'manuscript', 'category': item['category'],
+                    'subcategory': item['subcategory'], 'index': item['index']}
+        output_dir = self.scraper.output_dir_for(item['category'], item['subcategory'])
+        os.makedirs(output_dir, exist_ok=True)
+        status = self.scraper.status
+        token = status.start_item(item['key']) if status else None
+        with PROFILER.context(item['key']):
+            manuscript = scrape_manuscript(item['url'], self.scraper.fetcher, self.scraper.request_limiter, metadata,
+                                           self.scraper.max_body_bytes, self.scraper.memory_budget)
+            if manuscript:
+                manuscript['listing'] = item['record']
+            self.scraper.clean(manuscript, item['category'], item['subcategory'])
+            ok = save_manuscript(manuscript, item['index'], output_dir, self.scraper.index_width,
+                                 self.scraper.catalog)
+        if status:
+            status.finish_item(item['key'], token, ok)
+        if ok:
+            self.scraper.record_history(item['url'], item['key'], item['index'], output_dir, manuscript,
+                                        item['category'], item['subcategory'])
+        return ok, time.monotonic() - start
+
+    def replan(self, queue, position):
+        """Hitung ulang berapa naskah yang masih muat berdasarkan throughput terukur"""
+        rate = self.meter.sample_rate()
+        if not rate:
+            return
+        remaining = self.remaining()
+        fits = int(rate * remaining)
+        left = len(queue) - position
+        cutoff = queue[min(position + fits, len(queue)) - 1] if left else None
+        tier = 'semua selesai' if fits >= left else (
+            f"sampai {'naskah baru' if cutoff['new'] else 'refresh'} {cutoff['key']} #{cutoff['index']}"
+        )
+        print(f"\n📈 Re-plan: {rate:.2f} naskah/detik, {self.meter.item_seconds:.1f}s/naskah, "
+              f"sisa waktu {format_seconds(remaining)} -> ~{min(fits, left):,}/{left:,} naskah ({tier})\n")
+
+    def fetch(self, queue):
+        """Fetch naskah sesuai urutan nilai sampai habis atau deadline, return {url: ok}"""
+        results = {}
+        position = 0
+        in_flight = {}
+        last_replan = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.scraper.workers) as executor:
+            while True:
+                # Isi slot worker selama naskah berikutnya masih muat sebelum deadline
+                while len(in_flight) < self.scraper.workers and position < len(queue) and self.can_start():
+                    item = queue[position]
+                    in_flight[executor.submit(self.fetch_item, item)] = item
+                    position += 1
+                if not in_flight:
+                    break
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    item = in_flight.pop(future)
+                    ok, duration = future.result()
+                    results[item['url']] = ok
+                    self.meter.add(duration)
+                    tag = 'baru' if item['new'] else 'refresh'
+                    print(f"  [{len(results)}/{len(queue)}] {'✅' if ok else '❌'} ({tag}) {item['url'][:70]}")
+
+                self.history.save(every=HISTORY_SAVE_EVERY)
+                if time.monotonic() - last_replan >= self.replan_interval:
+                    self.replan(queue, position)
+                    last_replan = time.monotonic()
+
+        self.history.save()
+        return results
+
+    # ---------- Checkpoint & laporan ----------
+
+    def checkpoint(self, queue, results, listed, unlisted):
+        """Log + progress per sub-kategori, tulis laporan sisa pekerjaan"""
+        per_key = {}
+        leftover = []
+        for item in queue:
+            stats = per_key.setdefault(item['key'], {'fetched': 0, 'failed': 0, 'new_left': 0, 'refresh_left': 0})
+            ok = results.get(item['url'])
+            if ok:
+                stats['fetched'] += 1
+                continue
+            if ok is False:
+                stats['failed'] += 1
+            stats['new_left' if item['new'] else 'refresh_left'] += 1
+            leftover.append({field: item[field] for field in ('key', 'index', 'url', 'new', 'fetched_at')})
+
+        summaries = []
+        for key, info in listed.items():
+            stats = per_key.get(key, {'fetched': 0, 'failed': 0, 'new_left': 0, 'refresh_left': 0})
+            # Selesai = listing lengkap dan semua naskah pernah diambil (refresh boleh tertunda)
+            complete = info['complete'] and stats['new_left'] == 0
+            if complete:
+                status = 'SUCCESS' if info['found'] else 'NO_DATA'
+                log_to_csv(info['category'], info['subcategory'], stats['fetched'], status,
+                           log_file=self.scraper.log_file)
+                mark_progress('completed_subcategories', key, self.scraper.progress_file)
+            else:
+                log_to_csv(info['category'], info['subcategory'], stats['fetched'], 'PARTIAL',
+                           f"budget habis: {stats['new_left']} baru, {stats['refresh_left']} refresh tersisa",
+                           log_file=self.scraper.log_file)
+            if self.scraper.status:
+                self.scraper.status.end_subcategory(key, 'SUCCESS' if complete else 'PARTIAL')
+            summaries.append({'category': info['category'], 'subcategory': info['subcategory'],
+                              'found': info['found'], 'success': stats['fetched'],
+                              'status': 'SUCCESS' if complete else 'PARTIAL', **stats})
+
+        report = {
+            'generated_at': datetime.now().isoformat(timespec='seconds'),
+            'time_budget_seconds': self.time_budget,
+            'unlisted_subcategories': unlisted,
+            'remaining': {key: stats for key, stats in per_key.items()
+                          if stats['new_left'] or stats['refresh_left']},
+            'items': leftover,
+        }
+        tmp_path = self.leftover_file + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.leftover_file)
+        return summaries, report
+
+    def print_leftover(self, report):
+        remaining = report['remaining']
+        if not remaining and not report['unlisted_subcategories']:
+            print("\n🎯 Semua pekerjaan selesai dalam budget waktu")
+            return
+        print(f"\n📋 SISA PEKERJAAN (detail: {self.leftover_file}):")
+        for key, stats in sorted(remaining.items(), key=lambda entry: -entry[1]['new_left']):
+            print(f"   • {key[:55]:<55} baru: {stats['new_left']:>5,}  refresh: {stats['refresh_left']:>5,}")
+        if report['unlisted_subcategories']:
+            print(f"   ⚠️  Belum di-listing: {len(report['unlisted_subcategories'])} sub-kategori")
+            for key in report['unlisted_subcategories']:
+                print(f"      - {key}")
+
+    def run(self, selection):
+        """Listing -> prioritas -> fetch sampai deadline -> checkpoint. Return list ringkasan"""
+        print(f"⏳ Budget waktu: {format_seconds(self.time_budget)}")
+        items, listed, unlisted = self.list_candidates(selection)
+        queue = self.prioritize(items)
+        new_count = sum(1 for item in queue if item['new'])
+        print(f"\n🧮 {len(queue):,} naskah ({new_count:,} baru, {len(queue) - new_count:,} refresh), "
+              f"sisa waktu {format_seconds(self.remaining())}")
+
+        results = self.fetch(queue)
+        summaries, report = self.checkpoint(queue, results, listed, unlisted)
+        print(f"\n⏱️  Selesai dengan sisa waktu {format_seconds(self.remaining())}: "
+              f"{sum(1 for ok in results.values() if ok):,} naskah diambil")
+        self.print_leftover(report)
+        return summaries
@@ -0,0 +1,609 @@
+"""
+Antrian Kerja Crawl Terdistribusi (SQLite, berbasis lease)
+Beberapa worker process - di satu mesin atau beberapa mesin yang berbagi
+filesystem - mengambil tugas dari satu database SQLite:
+
+    subcategory  listing satu sub-kategori; jika ada naskah, dipecah menjadi
+                 tugas batch dengan nomor urut eksplisit (nama file sama
+                 persis dengan crawl satu proses)
+    batch        download sekumpulan (index, url) naskah
+
+Tugas sub-kategori bisa berupa rentang offset listing (lihat crawl_schedule.py)
+dan diambil berdasarkan prioritas (estimasi durasi, terlama dulu).
+
+Setiap tugas yang diambil mendapat lease (LEASE_SECONDS) yang diperpanjang
+oleh thread heartbeat worker. Jika worker mati, lease kedaluwarsa dan tugas
+otomatis diambil worker lain (maksimal MAX_ATTEMPTS kali). Download bersifat
+idempoten sehingga mengulang tugas aman.
+
+Politeness budget: --delay / --page-delay berlaku untuk SEMUA worker. Setiap
+worker memakai jarak delay x jumlah worker aktif, dihitung ulang setiap
+heartbeat, sehingga total request ke server tetap sesuai budget.
+
+Catatan multi-node: database memakai journal mode default (bukan WAL) karena
+WAL butuh shared memory yang tidak tersedia di network filesystem, dan lease
+memakai jam dinding sehingga jam antar mesin harus sinkron (NTP).
+
+Output naskah langsung ditulis ke folder output bersama; log CSV ditulis per
+worker di crawl_logs/ lalu digabung oleh `merge` (log ringkasan per
+sub-kategori + progress). Jalankan dari scraper_cli.py:
+
+    python scraper_cli.py queue init --all --delay 2
+    python scraper_cli.py queue run --processes 4         # worker lokal + merge
+    python scraper_cli.py queue worker                    # di mesin lain
+    python scraper_cli.py queue status
+    python scraper_cli.py queue merge
+"""
+
+import os
+import csv
+import glob
+import json
+import time
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from scraper_engine import (
+    BREAKER_COOLDOWN, BREAKER_FAILURES, CATEGORIES, LISTING_CHECKPOINT_DIR, LISTING_RETRIES, LOG_FILE,
+    MAX_BODY_BYTES, MEMORY_BUDGET_BYTES, PROGRESS_FILE, ListingRecord, Scraper, load_progress, log_to_csv,
+    mark_progress, subcategory_key,
+)
+from stage_profiler import PROFILER
+
+# ==================== KONFIGURASI ====================
+
+QUEUE_DB = "crawl_queue.db"
+WORKER_LOG_DIR = "crawl_logs"
+MERGED_WORKER_LOG = "merged.csv"
+
+LEASE_SECONDS = 120       # Lease tugas, diperpanjang heartbeat
+HEARTBEAT_INTERVAL = 30   # Detik antar heartbeat worker
+MAX_ATTEMPTS = 3          # Percobaan maksimal per tugas
+BATCH_SIZE = 50           # Naskah per tugas batch
+IDLE_POLL = 5             # Detik menunggu jika semua tugas sedang di-lease
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    key TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    parent TEXT,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    priority REAL NOT NULL DEFAULT 0,
+    owner TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    result TEXT,
+    merged INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_parent ON tasks (parent);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT,
+    pid INTEGER,
+    started_at REAL,
+    heartbeat REAL,
+    current_task TEXT,
+    status TEXT
+);
+CREATE TABLE IF NOT EXISTS config (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# ==================== QUEUE ====================
+
+class WorkQueue:
+    """Antrian tugas berbasis lease di atas satu file SQLite"""
+
+    def __init__(self, path=QUEUE_DB, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def _connect(self):
+        # Satu koneksi per operasi: aman dipakai dari thread heartbeat dan worker
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE: kunci tulis diambil di awal, claim tidak bisa bentrok"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            yield conn
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def initialize(self, config):
+        """Buat tabel dan simpan konfigurasi crawl (ditimpa jika sudah ada)"""
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+            # Database lama (sebelum ada kolom priority)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if 'priority' not in columns:
+                conn.execute("ALTER TABLE tasks ADD COLUMN priority REAL NOT NULL DEFAULT 0")
+        finally:
+            conn.close()
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in config.items()]
+            )
+
+    def config(self):
+        conn = self._connect()
+        try:
+            return {row['key']: json.loads(row['value'])
+                    for row in conn.execute("SELECT key, value FROM config")}
+        finally:
+            conn.close()
+
+    def add_tasks(self, tasks, conn=None):
+        """Tambah tugas (key, kind, parent, payload, priority); key yang sudah ada diabaikan"""
+        rows = [(key, kind, parent, json.dumps(payload, ensure_ascii=False), priority, time.time())
+                for key, kind, parent, payload, priority in tasks]
+        sql = ("INSERT OR IGNORE INTO tasks (key, kind, parent, payload, priority, updated_at) "
+               "VALUES (?, ?, ?, ?, ?, ?)")
+        if conn is not None:
+            return conn.executemany(sql, rows).rowcount
+        with self._transaction() as conn:
+            return conn.executemany(sql, rows).rowcount
+
+    def claim(self, worker_id):
+        """Ambil satu tugas pending (atau yang lease-nya kedaluwarsa), None jika tidak ada"""
+        now = time.time()
+        with self._transaction() as conn:
+            # Lease kedaluwarsa yang sudah terlalu sering dicoba -> failed
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', result = ?, updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (json.dumps({'error': 'lease kedaluwarsa'}), now, now, self.max_attempts)
+            )
+            # Batch dulu agar sub-kategori yang sudah di-listing cepat tuntas,
+            # lalu tugas dengan estimasi durasi terlama (LPT)
+            row = conn.execute(
+                "SELECT * FROM tasks WHERE status = 'pending' "
+                "OR (status = 'leased' AND lease_expires < ?) "
+                "ORDER BY kind = 'subcategory', priority DESC, id LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row['id'])
+            )
+            conn.execute(
+                "UPDATE workers SET current_task = ?, heartbeat = ? WHERE worker_id = ?",
+                (row['key'], now, worker_id)
+            )
+        task = dict(row)
+        task['payload'] = json.loads(task['payload'])
+        task['attempts'] += 1
+        return task
+
+    def complete(self, task_id, worker_id, result, children=()):
+        """Tandai tugas selesai (+ tambah tugas turunan) dalam satu transaksi.
+        Return False jika lease sudah diambil worker lain."""
+        with self._transaction() as conn:
+            updated = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'leased'",
+                (json.dumps(result, ensure_ascii=False), time.time(), task_id, worker_id)
+            ).rowcount
+            if updated and children:
+                self.add_tasks(children, conn)
+            conn.execute("UPDATE workers SET current_task = NULL WHERE worker_id = ?", (worker_id,))
+        return bool(updated)
+
+    def fail(self, task_id, worker_id, error, result=None):
+        """Kembalikan tugas ke pending, atau failed jika percobaan sudah habis
+        (result: hasil parsial yang ikut disimpan, mis. jumlah naskah sukses)"""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "owner = NULL, lease_expires = NULL, result = ?, updated_at = ? "
+                "WHERE id = ? AND owner = ? AND status = 'leased'",
+                (self.max_attempts, json.dumps(dict(result or {}, error=error), ensure_ascii=False),
+                 time.time(), task_id, worker_id)
+            )
+            conn.execute("UPDATE workers SET current_task = NULL WHERE worker_id = ?", (worker_id,))
+
+    def register_worker(self, worker_id):
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO workers "
+                "(worker_id, host, pid, started_at, heartbeat, current_task, status) "
+                "VALUES (?, ?, ?, ?, ?, NULL, 'running')",
+                (worker_id, socket.gethostname(), os.getpid(), now, now)
+            )
+
+    def unregister_worker(self, worker_id):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE workers SET status = 'stopped', current_task = NULL, heartbeat = ? "
+                "WHERE worker_id = ?",
+                (time.time(), worker_id)
+            )
+
+    def heartbeat(self, worker_id):
+        """Perpanjang lease semua tugas worker ini, return jumlah worker aktif"""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE tasks SET lease_expires = ? WHERE owner = ? AND status = 'leased'",
+                (now + self.lease_seconds, worker_id)
+            )
+            conn.execute("UPDATE workers SET heartbeat = ? WHERE worker_id = ?", (now, worker_id))
+            return self._active_workers(conn, now)
+
+    def _active_workers(self, conn, now):
+        return conn.execute(
+            "SELECT COUNT(*) FROM workers WHERE status = 'running' AND heartbeat >= ?",
+            (now - self.lease_seconds,)
+        ).fetchone()[0]
+
+    def active_workers(self):
+        conn = self._connect()
+        try:
+            return self._active_workers(conn, time.time())
+        finally:
+            conn.close()
+
+    def has_open_tasks(self):
+        """Masih ada tugas pending / sedang dikerjakan?"""
+        conn = self._connect()
+        try:
+            return conn.execute(
+                "SELECT 1 FROM tasks WHERE status IN ('pending', 'leased') LIMIT 1"
+            ).fetchone() is not None
+        finally:
+            conn.close()
+
+    def counts(self):
+        """{(kind, status): jumlah}"""
+        conn = self._connect()
+        try:
+            return {(row['kind'], row['status']): row['n'] for row in conn.execute(
+                "SELECT kind, status, COUNT(*) AS n FROM tasks GROUP BY kind, status"
+            )}
+        finally:
+            conn.close()
+
+    def workers(self):
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute("SELECT * FROM workers ORDER BY worker_id")]
+        finally:
+            conn.close()
+
+    def tasks(self, kind=None, parent=None):
+        conn = self._connect()
+        try:
+            sql, params = "SELECT * FROM tasks WHERE 1 = 1", []
+            if kind:
+                sql += " AND kind = ?"
+                params.append(kind)
+            if parent:
+                sql += " AND parent = ?"
+                params.append(parent)
+            return [dict(row) for row in conn.execute(sql + " ORDER BY id", params)]
+        finally:
+            conn.close()
+
+    def mark_merged(self, task_ids):
+        with self._transaction() as conn:
+            conn.executemany("UPDATE tasks SET merged = 1 WHERE id = ?", [(i,) for i in task_ids])
+
+# ==================== COORDINATOR ====================
+
+def seed_queue(queue, selection, config, resume=True, plan=None):
+    """Isi antrian dengan tugas listing sub-kategori terpilih, return jumlah tugas baru.
+    plan: daftar tugas dari crawl_schedule.plan_tasks (rentang offset + prioritas LPT)"""
+    queue.initialize(config)
+    completed = set()
+    if resume:
+        completed = set(load_progress(config['progress_file']).get('completed_subcategories', []))
+
+    if plan is None:
+        plan = [
+            {'key': subcategory_key(category_name, subcategory['name']), 'category': category_name,
+             'fc': fc, 'fs': subcategory['fs'], 'name': subcategory['name'], 'seconds': 0}
+            for category_name, fc, subcategory in selection
+        ]
+
+    tasks = []
+    for task in plan:
+        if subcategory_key(task['category'], task['name']) in completed:
+            continue
+        payload = {field: task[field] for field in ('category', 'fc', 'fs', 'name')}
+        if 'start_offset' in task:
+            payload['start_offset'] = task['start_offset']
+            payload['stop_offset'] = task['stop_offset']
+        tasks.append((task['key'], 'subcategory', None, payload, task['seconds']))
+    return queue.add_tasks(tasks)
+
+def merge_worker_logs(log_dir=WORKER_LOG_DIR):
+    """Gabungkan log CSV semua worker (urut waktu) ke crawl_logs/merged.csv"""
+    header, rows = None, []
+    for path in sorted(glob.glob(os.path.join(log_dir, '*.csv'))):
+        if os.path.basename(path) == MERGED_WORKER_LOG:
+            continue
+        worker_id = os.path.splitext(os.path.basename(path))[0]
+        with open(path, 'r', newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            file_header = next(reader, None)
+            if file_header is None:
+                continue
+            header = file_header + ['Worker']
+            rows.extend(row + [worker_id] for row in reader)
+
+    if header is None:
+        return None
+    rows.sort(key=lambda row: row[0])
+    merged_path = os.path.join(log_dir, MERGED_WORKER_LOG)
+    with open(merged_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return merged_path, len(rows)
+
+def merge_results(queue, log_dir=WORKER_LOG_DIR):
+    """Tulis ringkasan per sub-kategori ke log utama + progress untuk sub-kategori yang tuntas.
+    Sub-kategori yang dipecah jadi beberapa rentang offset baru diringkas setelah semua rentangnya selesai."""
+    from crawl_schedule import record_sizes
+
+    config = queue.config()
+    log_file = config.get('log_file', LOG_FILE)
+    progress_file = config.get('progress_file', PROGRESS_FILE)
+    summary = {'merged': 0, 'completed': 0, 'errors': 0, 'open': 0}
+
+    groups = {}
+    for task in queue.tasks(kind='subcategory'):
+        task['payload'] = json.loads(task['payload'])
+        key = subcategory_key(task['payload']['category'], task['payload']['name'])
+        groups.setdefault(key, []).append(task)
+
+    sizes = {}
+    for key, listing_tasks in groups.items():
+        if all(task['merged'] for task in listing_tasks):
+            continue
+        category_name = listing_tasks[0]['payload']['category']
+        subcategory_name = listing_tasks[0]['payload']['name']
+
+        batches = [batch for task in listing_tasks for batch in queue.tasks(kind='batch', parent=task['key'])]
+        if any(task['status'] in ('pending', 'leased') for task in listing_tasks + batches):
+            summary['open'] += 1
+            continue
+
+        failed_listings = [task for task in listing_tasks if task['status'] == 'failed']
+        failed_batches = [batch for batch in batches if batch['status'] == 'failed']
+        # Batch gagal ikut dihitung: naskah yang sempat tersimpan tetap ada di corpus
+        success = sum(json.loads(batch['result'] or '{}').get('success', 0)
+                      for batch in batches if batch['status'] in ('done', 'failed'))
+        found = sum(json.loads(task['result'] or '{}').get('found', 0)
+                    for task in listing_tasks if task['status'] == 'done')
+
+        if failed_listings or failed_batches:
+            errors = [json.loads(task['result'] or '{}').get('error', '') for task in failed_listings]
+            if failed_batches:
+                errors.append(f"{len(failed_batches)} batch gagal")
+            log_to_csv(category_name, subcategory_name, success, 'ERROR', '; '.join(errors), log_file=log_file)
+            summary['errors'] += 1
+        elif success < found:
+            # Tidak ditandai selesai: scrape berikutnya (resume) mengambil naskah yang kurang
+            log_to_csv(category_name, subcategory_name, success, 'PARTIAL',
+                       f"{found - success} naskah belum tersimpan", log_file=log_file)
+            summary['errors'] += 1
+        else:
+            status = 'SUCCESS' if batches else 'NO_DATA'
+            log_to_csv(category_name, subcategory_name, success, status, log_file=log_file)
+            mark_progress('completed_subcategories', key, progress_file)
+            sizes[key] = {'items': found, 'source': 'crawl'}
+            summary['completed'] += 1
+
+        queue.mark_merged([task['id'] for task in listing_tasks])
+        summary['merged'] += 1
+
+    # Jumlah naskah hasil listing jadi history estimasi ukuran crawl berikutnya
+    if sizes:
+        record_sizes(sizes)
+
+    # Kategori dianggap selesai jika semua sub-kategorinya selesai
+    completed = set(load_progress(progress_file).get('completed_subcategories', []))
+    for category_name, category_data in CATEGORIES.items():
+        if all(subcategory_key(category_name, sub['name']) in completed
+               for sub in category_data['subcategories']):
+            mark_progress('completed_categories', category_name, progress_file)
+
+    summary['worker_log'] = merge_worker_logs(log_dir)
+    return summary
+
+# ==================== WORKER ====================
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class QueueWorker:
+    """Worker process: ambil tugas dari antrian sampai habis"""
+
+    def __init__(self, queue, worker_id=None, threads=None, log_dir=WORKER_LOG_DIR):
+        self.queue = queue
+        self.worker_id = worker_id or default_worker_id()
+        self.config = queue.config()
+        self.batch_size = self.config.get('batch_size', BATCH_SIZE)
+        os.makedirs(log_dir, exist_ok=True)
+        self.log_file = os.path.join(log_dir, f"{self.worker_id}.csv")
+        self.scraper = Scraper(
+            output_dir=self.config['output_dir'],
+            listing=self.config['listing'],
+            workers=threads or self.config.get('workers', 1),
+            delay=self.config['delay'],
+            page_delay=self.config['page_delay'],
+            max_manuscripts=self.config.get('max_manuscripts'),
+            flat=self.config.get('flat', False),
+            index_width=self.config.get('index_width', 4),
+            resume=False,
+            log_file=self.log_file,
+            base_url=self.config['base_url'],
+            archive_dir=self.config.get('archive_dir'),
+            max_body_bytes=self.config.get('max_body_bytes', MAX_BODY_BYTES),
+            memory_budget=self.config.get('memory_budget', MEMORY_BUDGET_BYTES),
+            catalog=self.config.get('catalog', True),
+            normalize=self.config.get('normalize', True),
+            char_map=self.config.get('char_map'),
+            boilerplate_model=self.config.get('boilerplate_model'),
+            listing_retries=self.config.get('listing_retries', LISTING_RETRIES),
+            listing_checkpoint_dir=self.config.get('listing_checkpoint_dir', LISTING_CHECKPOINT_DIR),
+            breaker_failures=self.config.get('breaker_failures', BREAKER_FAILURES),
+            breaker_cooldown=self.config.get('breaker_cooldown', BREAKER_COOLDOWN),
+        )
+        self._stop = threading.Event()
+
+    def pace(self, active_workers):
+        """Bagi politeness budget global ke worker yang aktif"""
+        active_workers = max(1, active_workers)
+        self.scraper.request_limiter.min_interval = self.config['delay'] * active_workers
+        self.scraper.page_limiter.min_interval = self.config['page_delay'] * active_workers
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                self.pace(self.queue.heartbeat(self.worker_id))
+            except sqlite3.Error as e:
+                print(f"⚠️  Heartbeat gagal: {e}")
+
+    def process_subcategory(self, task):
+        """Listing sub-kategori lalu pecah jadi tugas batch"""
+        payload = task['payload']
+        category_name, subcategory_name = payload['category'], payload['name']
+        subcategory = {'fs': payload['fs'], 'name': subcategory_name}
+        start_offset = payload.get('start_offset', 0)
+        links = self.scraper.list_records(
+            category_name, payload['fc'], subcategory, start_offset, payload.get('stop_offset')
+        )
+
+        if not links:
+            log_to_csv(category_name, subcategory_name, 0, 'NO_DATA', log_file=self.log_file)
+            return {'found': 0}, []
+
+        children = []
+        for start in range(0, len(links), self.batch_size):
+            batch_links = links[start:start + self.batch_size]
+            first_index = start_offset + start + 1
+            children.append((f"{task['key']}:{first_index:06d}", 'batch', task['key'], {
+                'category': category_name,
+                'name': subcategory_name,
+                'total': start_offset + len(links),
+                # Baris listing lengkap (ListingRecord.to_row) agar metadata ikut ke file naskah
+                'links': [[first_index + offset, record.to_row()] for offset, record in enumerate(batch_links)],
+            }, task['priority']))
+        log_to_csv(category_name, subcategory_name, len(links), 'LISTED',
+                   f"{len(children)} batch", log_file=self.log_file)
+        return {'found': len(links), 'batches': len(children)}, children
+
+    def process_batch(self, task):
+        """Download satu batch naskah dengan nomor urut dari listing.
+        Percobaan ulang hanya mengambil naskah yang belum tersimpan (Scraper.skip_known)"""
+        payload = task['payload']
+        indexed_links = [(index, ListingRecord.from_row(row)) for index, row in payload['links']]
+        first, last = indexed_links[0][0], indexed_links[-1][0]
+        total = len(indexed_links)
+        skipped = 0
+        if task['attempts'] > 1:
+            output_dir = self.scraper.output_dir_for(payload['category'], payload['name'])
+            indexed_links, skipped = self.scraper.skip_known(output_dir, indexed_links)
+        success = skipped + self.scraper.download_links(
+            payload['category'], payload['name'], indexed_links, payload['total']
+        )
+        status = 'SUCCESS' if success == total else 'PARTIAL'
+        log_to_csv(payload['category'], payload['name'], success, status,
+                   f"naskah {first}-{last}", log_file=self.log_file)
+        return {'success': success, 'total': total}, []
+
+    def run(self):
+        """Loop ambil-kerjakan-selesai, return jumlah tugas yang dikerjakan"""
+        self.queue.register_worker(self.worker_id)
+        self.pace(self.queue.active_workers())
+        heartbeat = threading.Thread(target=self._heartbeat_loop, daemon=True)
+        heartbeat.start()
+        processed = 0
+
+        print(f"👷 Worker {self.worker_id} mulai (queue: {self.queue.path})")
+        try:
+            while True:
+                task = self.queue.claim(self.worker_id)
+                if task is None:
+                    if not self.queue.has_open_tasks():
+                        break
+                    # Tugas tersisa sedang di-lease worker lain; tunggu selesai / kedaluwarsa
+                    time.sleep(IDLE_POLL)
+                    continue
+
+                print(f"\n📌 [{self.worker_id}] {task['kind']} {task['key']} (percobaan {task['attempts']})")
+                try:
+                    if task['kind'] == 'subcategory':
+                        result, children = self.process_subcategory(task)
+                    else:
+                        result, children = self.process_batch(task)
+                    if task['kind'] == 'batch' and result['success'] < result['total']:
+                        # Naskah gagal di-retry lewat lease/attempt, bukan ditandai selesai
+                        self.queue.fail(task['id'], self.worker_id,
+                                        f"{result['total'] - result['success']} naskah gagal", result)
+                    elif not self.queue.complete(task['id'], self.worker_id, result, children):
+                        print(f"⚠️  Lease {task['key']} sudah diambil worker lain, hasil diabaikan")
+                except Exception as e:
+                    print(f"❌ Error di {task['key']}: {e}")
+                    payload = task['payload']
+                    log_to_csv(payload['category'], payload['name'], 0, 'ERROR', str(e),
+                               log_file=self.log_file)
+                    self.queue.fail(task['id'], self.worker_id, str(e))
+                processed += 1
+        finally:
+            self._stop.set()
+            heartbeat.join()
+            self.queue.unregister_worker(self.worker_id)
+
+        print(f"\n✅ Worker {self.worker_id} selesai: {processed} tugas")
+        PROFILER.print_summary()
+        self.scraper.print_cleanup_summary()
+        return processed
+
+# ==================== STATUS ====================
+
+def print_status(queue):
+    """Ringkasan tugas dan worker"""
+    counts = queue.counts()
+    now = time.time()
+    print(f"\n{'='*80}")
+    print(f"📋 STATUS ANTRIAN: {queue.path}")
+    print(f"{'='*80}")
+    for kind in ('subcategory', 'batch'):
+        parts = [f"{status}={counts.get((kind, status), 0)}"
+                 for status in ('pending', 'leased', 'done', 'failed')]
+        print(f"   {kind:<12}: {', '.join(parts)}")
+
+    print(f"\n👷 Worker:")
+    for worker in queue.workers():
+        age = now - (worker['heartbeat'] or 0)
+        alive = worker['status'] == 'running' and age < queue.lease_seconds
+        state = 'aktif' if alive else 'berhenti' if worker['status'] == 'stopped' else 'mati?'
+        print(f"   • {worker['worker_id']:<30} {state:<7} heartbeat {age:>6.0f}s lalu  "
+              f"{worker['current_task'] or '-'}")
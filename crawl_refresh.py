@@ -0,0 +1,238 @@
+"""
+Refresh Berbasis Laju Perubahan
+Sebagian besar arsip sastra.org statis; hanya beberapa koleksi (Editorial,
+Surat-menyurat, bagian Koran yang baru) yang sering berubah. Setiap fetch
+mencatat hash isi naskah di fetch_history.json (lihat crawl_state.py), jadi
+untuk tiap URL diketahui berapa kali dicek ulang, berapa lama diamati, dan
+berapa kali isinya berubah.
+
+Perubahan dimodelkan sebagai proses Poisson:
+  - per sub-kategori (pooled): estimator Cho & Garcia-Molina
+        X' = -n * ln((n - X + 0.5) / (n + 0.5))
+    (n cek, X perubahan terdeteksi) mengoreksi beberapa perubahan di antara
+    dua cek yang hanya terlihat sebagai satu, lalu laju = X' / total detik
+    pengamatan, dengan prior Gamma dari laju seluruh history.
+  - per naskah: laju sub-kategori menjadi prior, diperbarui dengan riwayat
+    naskah itu sendiri: (X_i + laju_sub * B) / (T_i + B), B = PRIOR_DAYS.
+    Naskah yang jarang dicek mengikuti sub-kategorinya; naskah dengan riwayat
+    panjang mengikuti datanya sendiri.
+
+Peluang naskah sudah berubah sejak fetch terakhir = 1 - exp(-laju * umur).
+Budget request (--budget N) dipakai untuk N naskah dengan peluang tertinggi
+(di atas --min-probability), sehingga arsip statis jarang di-fetch ulang.
+Refresh hanya mengambil URL yang sudah ada di history (tanpa listing);
+naskah baru tetap lewat `scrape`. Isi yang tidak berubah tidak ditulis ulang.
+
+CARA PAKAI (lewat scraper_cli.py):
+    python scraper_cli.py refresh --seed --dry-run          # isi history dari corpus yang sudah ada + rencana
+    python scraper_cli.py refresh --budget 500 --workers 4
+    python scraper_cli.py refresh --fc 13 --budget 100 --min-probability 0.2
+"""
+
+import os
+import math
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from crawl_state import content_hash
+from scraper_engine import (
+    CATEGORIES, ListingRecord, clean_folder_name, manuscript_filename, save_manuscript, scrape_manuscript,
+    subcategory_key,
+)
+from stage_profiler import PROFILER
+
+# ==================== KONFIGURASI ====================
+
+REFRESH_BUDGET = 200       # Request naskah per refresh
+MIN_PROBABILITY = 0.05     # Naskah dengan peluang berubah di bawah ini tidak di-fetch
+PRIOR_DAYS = 30            # Kekuatan prior Gamma (hari pengamatan semu)
+DEFAULT_CHANGE_DAYS = 365  # Prior global: rata-rata satu perubahan per N hari
+HISTORY_SAVE_EVERY = 25    # Checkpoint history setiap N naskah
+
+DAY = 86400
+
+# ==================== ESTIMASI ====================
+
+def poisson_rate(checks, changes, observed, prior_rate, prior_seconds):
+    """Laju perubahan per detik: jumlah perubahan terkoreksi (Cho & Garcia-Molina) + prior Gamma"""
+    corrected = 0.0
+    if checks:
+        changes = min(changes, checks)
+        corrected = -checks * math.log((checks - changes + 0.5) / (checks + 0.5))
+    return (corrected + prior_rate * prior_seconds) / (observed + prior_seconds)
+
+def entry_stats(entry):
+    return entry.get('checks', 0), entry.get('changes', 0), entry.get('observed', 0.0)
+
+class ChangeRateModel:
+    """Laju perubahan per sub-kategori (pooled) dan per naskah dari entri fetch_history.json"""
+
+    def __init__(self, entries, prior_days=PRIOR_DAYS, default_change_days=DEFAULT_CHANGE_DAYS):
+        self.prior_seconds = prior_days * DAY
+        pools = {}
+        for entry in entries.values():
+            if 'sha256' not in entry:
+                continue
+            pool = pools.setdefault(entry.get('key'), [0, 0, 0.0])
+            for position, value in enumerate(entry_stats(entry)):
+                pool[position] += value
+        total = [sum(pool[position] for pool in pools.values()) for position in range(3)]
+        self.global_rate = poisson_rate(*total, 1 / (default_change_days * DAY), self.prior_seconds)
+        self.pools = pools
+        self.rates = {key: poisson_rate(*pool, self.global_rate, self.prior_seconds)
+                      for key, pool in pools.items()}
+
+    def subcategory_rate(self, key):
+        return self.rates.get(key, self.global_rate)
+
+    def item_rate(self, entry):
+        return poisson_rate(*entry_stats(entry), self.subcategory_rate(entry.get('key')), self.prior_seconds)
+
+    def change_probability(self, entry, now):
+        """Peluang isi sudah berubah sejak fetch terakhir"""
+        age = (now - datetime.fromisoformat(entry['fetched_at'])).total_seconds()
+        return 1 - math.exp(-self.item_rate(entry) * max(age, 0))
+
+# ==================== RENCANA ====================
+
+def plan_refresh(entries, budget=REFRESH_BUDGET, keys=None, min_probability=MIN_PROBABILITY,
+                 now=None, model=None):
+    """Urutkan URL ber-hash berdasarkan peluang berubah, ambil maksimal `budget` di atas ambang.
+    Return dict: items terpilih, candidates (semua), model"""
+    now = now or datetime.now()
+    model = model or ChangeRateModel(entries)
+    candidates = []
+    for url, entry in entries.items():
+        if 'sha256' not in entry or not entry.get('fetched_at'):
+            continue
+        if keys is not None and entry.get('key') not in keys:
+            continue
+        candidates.append({
+            'url': url,
+            'key': entry.get('key'),
+            'category': entry.get('category'),
+            'subcategory': entry.get('subcategory'),
+            'index': entry['index'],
+            'path': entry['path'],
+            'sha256': entry['sha256'],
+            'probability': model.change_probability(entry, now),
+        })
+    candidates.sort(key=lambda item: (-item['probability'], item['key'] or '', item['index']))
+    items = [item for item in candidates[:budget] if item['probability'] >= min_probability]
+    return {'items': items, 'candidates': candidates, 'model': model}
+
+def print_refresh_plan(plan, budget):
+    """Ringkasan per sub-kategori: laju perubahan, naskah terpilih, perubahan yang diharapkan"""
+    model, items = plan['model'], plan['items']
+    per_key = {}
+    for item in plan['candidates']:
+        stats = per_key.setdefault(item['key'], {'urls': 0, 'selected': 0, 'expected': 0.0})
+        stats['urls'] += 1
+    for item in items:
+        per_key[item['key']]['selected'] += 1
+        per_key[item['key']]['expected'] += item['probability']
+
+    print(f"\n🔁 RENCANA REFRESH: {len(items):,}/{budget:,} request, "
+          f"{len(plan['candidates']):,} naskah ber-hash di history")
+    print(f"   Laju global: {model.global_rate * 30 * DAY:.3f} perubahan/naskah/30 hari\n")
+    print(f"   {'Sub-kategori':<50} {'naskah':>7} {'cek':>6} {'ubah':>5} {'/30 hari':>9} {'fetch':>6} {'E[ubah]':>8}")
+    for key, stats in sorted(per_key.items(), key=lambda entry: -model.subcategory_rate(entry[0])):
+        checks, changes, _ = model.pools.get(key, (0, 0, 0.0))
+        print(f"   {str(key)[:50]:<50} {stats['urls']:>7,} {checks:>6,} {changes:>5,} "
+              f"{model.subcategory_rate(key) * 30 * DAY:>9.3f} {stats['selected']:>6,} {stats['expected']:>8.1f}")
+    expected = sum(item['probability'] for item in items)
+    print(f"\n   📈 Perkiraan perubahan tertangkap: {expected:.1f} dari {len(items):,} request")
+
+# ==================== SEED ====================
+
+def folder_names():
+    """{(folder kategori, folder sub-kategori): (kategori, sub-kategori)} dari CATEGORIES"""
+    return {
+        (clean_folder_name(category_name), clean_folder_name(subcategory['name'])): (category_name, subcategory['name'])
+        for category_name, category_data in CATEGORIES.items()
+        for subcategory in category_data['subcategories']
+    }
+
+def seed_history(history, root):
+    """Catat naskah di corpus yang belum punya hash di history (waktu fetch = mtime file).
+    Return jumlah URL yang ditambahkan"""
+    from corpus import CorpusReader
+
+    names = folder_names()
+    added = 0
+    for record in CorpusReader(root).records():
+        url = record.url
+        if not url or 'sha256' in (history.get(url) or {}):
+            continue
+        category_name, subcategory_name = names.get((record.category, record.subcategory),
+                                                    (record.category, record.subcategory))
+        fetched_at = datetime.fromtimestamp(os.path.getmtime(record.path))
+        history.record(url, subcategory_key(category_name, subcategory_name), record.index, record.path,
+                       content_hash(record.body()), fetched_at,
+                       category=category_name, subcategory=subcategory_name)
+        added += 1
+    return added
+
+# ==================== FETCH ====================
+
+class RefreshCrawler:
+    """Fetch ulang naskah terpilih; tulis ulang file hanya jika hash isi berubah"""
+
+    def __init__(self, scraper):
+        self.scraper = scraper
+        self.history = scraper.history
+
+    def fetch_item(self, item):
+        """Worker: scrape + bandingkan hash, return 'changed' / 'unchanged' / 'failed'"""
+        scraper = self.scraper
+        output_dir = os.path.dirname(item['path'])
+        metadata = {'kind': 'manuscript', 'category': item['category'],
+                    'subcategory': item['subcategory'], 'index': item['index']}
+        with PROFILER.context(item['key']):
+            manuscript = scrape_manuscript(item['url'], scraper.fetcher, scraper.request_limiter, metadata,
+                                           scraper.max_body_bytes, scraper.memory_budget)
+            scraper.clean(manuscript, item['category'], item['subcategory'])
+        if not manuscript:
+            return 'failed'
+
+        digest = content_hash(manuscript['content'])
+        path = item['path']
+        if digest != item['sha256']:
+            # Metadata listing lama tetap di header (refresh tidak melakukan listing)
+            if os.path.exists(path):
+                from corpus import read_header
+                manuscript['listing'] = ListingRecord.from_header(item['url'], read_header(path))
+            os.makedirs(output_dir, exist_ok=True)
+            with PROFILER.context(item['key']):
+                if not save_manuscript(manuscript, item['index'], output_dir, scraper.index_width, scraper.catalog):
+                    return 'failed'
+            new_path = os.path.join(output_dir, manuscript_filename(manuscript, item['index'], scraper.index_width))
+            # Judul berubah -> nama file berubah, file lama dibuang
+            if new_path != path and os.path.exists(path):
+                os.remove(path)
+                if scraper.catalog:
+                    scraper.catalog.remove(path)
+            path = new_path
+        self.history.record(item['url'], item['key'], item['index'], path, digest,
+                            category=item['category'], subcategory=item['subcategory'])
+        return 'changed' if digest != item['sha256'] else 'unchanged'
+
+    def run(self, items):
+        """Fetch semua item, return {'changed', 'unchanged', 'failed', 'expected'}"""
+        summary = {'changed': 0, 'unchanged': 0, 'failed': 0,
+                   'expected': sum(item['probability'] for item in items)}
+        icons = {'changed': '🔄', 'unchanged': '✅', 'failed': '❌'}
+        print(f"\n📥 Refresh {len(items):,} naskah ({self.scraper.workers} worker)...")
+        with ThreadPoolExecutor(max_workers=self.scraper.workers) as executor:
+            for position, (item, outcome) in enumerate(zip(items, executor.map(self.fetch_item, items)), 1):
+                summary[outcome] += 1
+                print(f"  [{position}/{len(items)}] {icons[outcome]} (p={item['probability']:.2f}) {item['url'][:70]}")
+                self.history.save(every=HISTORY_SAVE_EVERY)
+        self.history.save()
+        return summary
+
+def print_refresh_summary(summary):
+    checked = summary['changed'] + summary['unchanged']
+    hit_rate = summary['changed'] / checked if checked else 0
+    print(f"\n🔁 Refresh selesai: {summary['changed']:,} berubah, {summary['unchanged']:,} tetap, "
+          f"{summary['failed']:,} gagal (hit rate {hit_rate:.0%}, perkiraan {summary['expected']:.1f} berubah)")
@@ -0,0 +1,298 @@
+"""
+Penjadwal Crawl Berbasis Estimasi Ukuran (makespan-aware)
+Ukuran sub-kategori sangat timpang (Galeri kecil, Babad / Serat Centhini
+besar), sehingga crawl paralel dalam urutan CATEGORIES berakhir dengan satu
+worker yang bekerja sendirian. Modul ini:
+
+  1. mengestimasi jumlah naskah & ukuran byte setiap sub-kategori dari
+     history (subcategory_sizes.json hasil crawl/probe sebelumnya,
+     scraping_log.csv, isi folder corpus) atau dari probe listing
+     (pencarian biner pada offset halaman, ~2 log2(halaman) request);
+  2. memecah sub-kategori yang terlalu besar menjadi rentang offset
+     (kelipatan ITEMS_PER_PAGE, rentang terakhir terbuka agar naskah baru
+     tetap terambil);
+  3. mengurutkan tugas longest-processing-time-first (LPT) dan
+     memproyeksikan makespan dibanding urutan CATEGORIES.
+
+Rencana dipakai oleh `scraper_cli.py queue init --schedule` (prioritas tugas
+di antrian = estimasi durasi) atau dilihat dengan `scraper_cli.py plan`.
+"""
+
+import os
+import csv
+import json
+import math
+import heapq
+from datetime import datetime
+
+from scraper_engine import (
+    BASE_OUTPUT_DIR, ITEMS_PER_PAGE, LOG_FILE, subcategory_key, subcategory_output_dir,
+)
+
+# ==================== KONFIGURASI ====================
+
+SIZE_HISTORY_FILE = "subcategory_sizes.json"
+
+DEFAULT_ITEMS = 100                # Estimasi jika tidak ada history dan tidak di-probe
+DEFAULT_MANUSCRIPT_BYTES = 20_000  # Estimasi ukuran satu naskah jika tidak ada data
+BYTES_PER_WORD = 7                 # Rata-rata byte per kata (kolom "Jumlah kata" listing)
+BYTES_PER_SECOND = 500_000         # Throughput download kasar per worker
+SPLIT_FACTOR = 2                   # Target minimal potongan per worker
+MIN_SPLIT_ITEMS = 5 * ITEMS_PER_PAGE
+MAX_PROBE_PAGES = 1 << 16
+
+# ==================== HISTORY ====================
+
+def load_size_history(history_file=SIZE_HISTORY_FILE):
+    """{subcategory_key: {'items', 'bytes', 'source', 'updated_at'}}"""
+    if os.path.exists(history_file):
+        with open(history_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {}
+
+def record_sizes(sizes, history_file=SIZE_HISTORY_FILE):
+    """Gabungkan ukuran baru ke history (tulis ke .tmp lalu replace)"""
+    history = load_size_history(history_file)
+    updated_at = datetime.now().isoformat(timespec='seconds')
+    for key, size in sizes.items():
+        entry = history.setdefault(key, {})
+        entry.update({k: v for k, v in size.items() if v is not None})
+        entry['updated_at'] = updated_at
+
+    tmp_path = history_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(history, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, history_file)
+
+def log_history(log_file=LOG_FILE):
+    """Jumlah naskah terakhir per sub-kategori dari scraping_log.csv"""
+    counts = {}
+    if not os.path.exists(log_file):
+        return counts
+    with open(log_file, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            if row.get('Status') in ('SUCCESS', 'NO_DATA'):
+                try:
+                    counts[subcategory_key(row['Category'], row['Subcategory'])] = int(row['Manuscripts'])
+                except (KeyError, ValueError):
+                    continue
+    return counts
+
+def corpus_history(output_dir, category_name, subcategory_name):
+    """(jumlah file, total byte) naskah yang sudah ada di folder corpus"""
+    path = subcategory_output_dir(output_dir, category_name, subcategory_name)
+    if not os.path.isdir(path):
+        return 0, 0
+    files = 0
+    total_bytes = 0
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.name.endswith('.txt') and entry.is_file():
+                files += 1
+                total_bytes += entry.stat().st_size
+    return files, total_bytes
+
+# ==================== PROBE ====================
+
+def probe_size(scraper, category_name, fc, subcategory):
+    """Hitung jumlah naskah dengan pencarian eksponensial + biner pada halaman listing.
+    Return (jumlah_naskah, rata-rata kata per naskah atau None, jumlah request)"""
+    per_page = scraper.listing.items_per_page
+    words = []
+    requests_made = 0
+
+    def page_count(page):
+        nonlocal requests_made
+        requests_made += 1
+        url = scraper.listing.page_url(fc, subcategory['fs'], page * per_page)
+        response = scraper.fetcher.get(url, scraper.page_limiter)
+        records = scraper.listing.extract_listing(response.content, category_name, subcategory['name'])
+        words.extend(record.word_count for record in records if record.word_count is not None)
+        return len(records)
+
+    def result(items):
+        return items, (sum(words) / len(words) if words else None), requests_made
+
+    count = page_count(0)
+    if count < per_page:
+        return result(count)
+
+    # Eksponensial: cari halaman kosong pertama (hi), lo = halaman penuh terakhir yang diketahui
+    lo, lo_count, hi = 0, count, 1
+    while hi < MAX_PROBE_PAGES:
+        count = page_count(hi)
+        if count == 0:
+            break
+        if count < per_page:
+            return result(hi * per_page + count)
+        lo, lo_count, hi = hi, count, hi * 2
+
+    # Biner antara halaman penuh (lo) dan halaman kosong (hi)
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        count = page_count(mid)
+        if count == 0:
+            hi = mid
+        elif count < per_page:
+            return result(mid * per_page + count)
+        else:
+            lo, lo_count = mid, count
+    return result(lo * per_page + lo_count)
+
+# ==================== ESTIMASI ====================
+
+def estimate_sizes(selection, output_dir=BASE_OUTPUT_DIR, log_file=LOG_FILE,
+                   history_file=SIZE_HISTORY_FILE, probe='missing', scraper=None, max_manuscripts=None):
+    """Estimasi {items, bytes, source} untuk setiap (category_name, fc, subcategory).
+    probe: 'none' (history saja), 'missing' (probe yang tidak ada history), 'all'"""
+    history = load_size_history(history_file)
+    logged = log_history(log_file)
+    corpus = {
+        subcategory_key(category_name, subcategory['name']):
+            corpus_history(output_dir, category_name, subcategory['name'])
+        for category_name, _, subcategory in selection
+    }
+
+    # Rata-rata byte per naskah seluruh corpus sebagai fallback
+    corpus_files = sum(files for files, _ in corpus.values())
+    corpus_bytes = sum(size for _, size in corpus.values())
+    default_bytes = corpus_bytes / corpus_files if corpus_files else DEFAULT_MANUSCRIPT_BYTES
+
+    estimates = []
+    probed = {}
+    for category_name, fc, subcategory in selection:
+        key = subcategory_key(category_name, subcategory['name'])
+        files, size = corpus[key]
+        items, source, avg_words = None, None, None
+
+        if probe != 'all':
+            if key in history and history[key].get('items') is not None:
+                items, source = history[key]['items'], history[key].get('source', 'history')
+            elif key in logged:
+                items, source = logged[key], 'log'
+            elif files:
+                items, source = files, 'corpus'
+
+        if items is None and probe != 'none' and scraper is not None:
+            try:
+                items, avg_words, requests_made = probe_size(scraper, category_name, fc, subcategory)
+                source = f"probe ({requests_made} req)"
+                probed[key] = {'items': items, 'source': 'probe',
+                               'avg_words': round(avg_words) if avg_words else None}
+            except Exception as e:
+                print(f"  ⚠️  Probe {subcategory['name']} gagal: {e}")
+
+        if items is None:
+            items, source = DEFAULT_ITEMS, 'default'
+        if max_manuscripts is not None:
+            items = min(items, max_manuscripts)
+
+        if files:
+            bytes_per_item = size / files
+        elif avg_words or history.get(key, {}).get('avg_words'):
+            bytes_per_item = (avg_words or history[key]['avg_words']) * BYTES_PER_WORD
+        else:
+            bytes_per_item = default_bytes
+
+        estimates.append({
+            'key': key,
+            'category': category_name,
+            'fc': fc,
+            'fs': subcategory['fs'],
+            'name': subcategory['name'],
+            'items': items,
+            'bytes': int(items * bytes_per_item),
+            'source': source,
+        })
+
+    if probed:
+        record_sizes(probed, history_file)
+    return estimates
+
+# ==================== PLANNING ====================
+
+def task_seconds(items, size_bytes, request_interval, page_interval, per_page=ITEMS_PER_PAGE):
+    """Estimasi durasi satu tugas untuk satu worker"""
+    pages = math.ceil(items / per_page) + 1  # +1 halaman kosong penutup listing
+    return items * request_interval + pages * page_interval + size_bytes / BYTES_PER_SECOND
+
+def split_size(estimates, workers, per_page=ITEMS_PER_PAGE):
+    """Ukuran rentang maksimal agar setiap worker dapat >= SPLIT_FACTOR potongan"""
+    total_items = sum(estimate['items'] for estimate in estimates)
+    target = max(MIN_SPLIT_ITEMS, math.ceil(total_items / max(1, workers * SPLIT_FACTOR)))
+    return math.ceil(target / per_page) * per_page
+
+def plan_tasks(estimates, workers, delay, page_delay, per_page=ITEMS_PER_PAGE):
+    """Pecah sub-kategori besar jadi rentang offset, urutkan LPT (terlama dulu)"""
+    # Politeness budget global: setiap worker mendapat jarak delay x workers
+    request_interval = delay * workers
+    page_interval = page_delay * workers
+    max_items = split_size(estimates, workers, per_page)
+
+    tasks = []
+    for estimate in estimates:
+        items = estimate['items']
+        bytes_per_item = estimate['bytes'] / items if items else 0
+        ranges = [(0, None)]
+        if items > max_items:
+            starts = range(0, items, max_items)
+            # Rentang terakhir terbuka: naskah baru sejak estimasi tetap terambil
+            ranges = [(start, start + max_items) for start in starts[:-1]] + [(starts[-1], None)]
+
+        for start, stop in ranges:
+            range_items = (stop if stop is not None else items) - start
+            task = {
+                'key': estimate['key'] if len(ranges) == 1 else f"{estimate['key']}@{start:06d}",
+                'category': estimate['category'],
+                'fc': estimate['fc'],
+                'fs': estimate['fs'],
+                'name': estimate['name'],
+                'items': range_items,
+                'seconds': task_seconds(range_items, range_items * bytes_per_item,
+                                        request_interval, page_interval, per_page),
+            }
+            if len(ranges) > 1:
+                task['start_offset'] = start
+                task['stop_offset'] = stop
+            tasks.append(task)
+
+    tasks.sort(key=lambda task: -task['seconds'])
+    return tasks
+
+def simulate_makespan(durations, workers):
+    """List scheduling: setiap tugas (sesuai urutan) ke worker yang paling cepat bebas"""
+    loads = [0.0] * max(1, workers)
+    heapq.heapify(loads)
+    for duration in durations:
+        heapq.heapreplace(loads, loads[0] + duration)
+    return max(loads)
+
+def format_duration(seconds):
+    """Durasi ringkas: jam jika >= 1 jam, selain itu menit"""
+    if seconds >= 3600:
+        return f"{seconds / 3600:.2f} jam"
+    return f"{seconds / 60:.1f} menit"
+
+def print_plan(estimates, tasks, workers, delay, page_delay):
+    """Tabel estimasi + perbandingan makespan urutan CATEGORIES vs LPT"""
+    print(f"\n{'='*80}")
+    print(f"🗓️  RENCANA CRAWL ({workers} worker, delay global {delay}s)")
+    print(f"{'='*80}")
+    print(f"{'Sub-kategori':<45} {'Naskah':>7} {'Ukuran':>10}  Sumber")
+    for estimate in sorted(estimates, key=lambda e: -e['items']):
+        print(f"{estimate['key'][:45]:<45} {estimate['items']:>7,} "
+              f"{estimate['bytes'] / 1_000_000:>8.1f}MB  {estimate['source']}")
+
+    naive = [
+        task_seconds(estimate['items'], estimate['bytes'], delay * workers, page_delay * workers)
+        for estimate in estimates
+    ]
+    naive_makespan = simulate_makespan(naive, workers)
+    lpt_makespan = simulate_makespan([task['seconds'] for task in tasks], workers)
+    lower_bound = max(sum(naive) / max(1, workers), max((t['seconds'] for t in tasks), default=0))
+    split = sum(1 for task in tasks if 'start_offset' in task)
+
+    print(f"\n📦 Tugas          : {len(tasks)} ({split} rentang offset dari sub-kategori besar)")
+    print(f"⏱️  Urutan kategori: {format_duration(naive_makespan)}")
+    print(f"⏱️  LPT + split    : {format_duration(lpt_makespan)}")
+    print(f"📉 Batas bawah    : {format_duration(lower_bound)}")
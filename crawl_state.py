@@ -0,0 +1,186 @@
+"""
+Riwayat Fetch Naskah
+Menyimpan kapan setiap URL naskah terakhir diambil (dan ke file mana) di
+fetch_history.json, sehingga crawl berikutnya bisa membedakan naskah baru
+dari naskah yang sudah pernah diambil serta mengutamakan yang paling lama.
+
+Untuk corpus yang di-scrape sebelum history ini ada, naskah dianggap sudah
+pernah diambil jika folder sub-kategorinya berisi file dengan nomor urut
+yang sama (waktu fetch = mtime file).
+
+Setiap fetch juga mencatat hash isi naskah: berapa kali URL dicek ulang
+('checks'), total detik pengamatan ('observed'), berapa kali isinya berubah
+('changes') dan riwayat hash ('hashes'). Statistik ini dipakai
+crawl_refresh.py untuk mengestimasi laju perubahan.
+
+ListingCheckpoint menyimpan halaman listing yang sudah diambil (satu baris
+JSONL per offset), sehingga listing yang terputus dilanjutkan dari offset
+yang gagal tanpa mengambil ulang halaman sebelumnya.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from datetime import datetime
+
+# ==================== KONFIGURASI ====================
+
+FETCH_HISTORY_FILE = "fetch_history.json"
+HASH_HISTORY = 10          # Versi isi (hash) terakhir yang disimpan per URL
+LISTING_CHECKPOINT_MAX_AGE = 24 * 3600  # Checkpoint listing lebih tua dari ini dibuang (urutan bisa bergeser)
+
+# ==================== HASH ISI ====================
+
+def content_hash(text):
+    """sha256 isi naskah (tanpa header, yang berisi metadata listing)"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def observe_change(entry, digest, fetched_at):
+    """Update statistik perubahan entri history dengan hash hasil fetch baru.
+    Satu cek = interval sejak fetch ber-hash sebelumnya, berubah atau tidak."""
+    previous = entry.get('sha256')
+    if previous and entry.get('fetched_at'):
+        interval = (fetched_at - datetime.fromisoformat(entry['fetched_at'])).total_seconds()
+        if interval > 0:
+            entry['checks'] = entry.get('checks', 0) + 1
+            entry['observed'] = round(entry.get('observed', 0) + interval, 1)
+            if digest != previous:
+                entry['changes'] = entry.get('changes', 0) + 1
+                entry['changed_at'] = fetched_at.isoformat(timespec='seconds')
+    hashes = entry.get('hashes', [])
+    if not hashes or hashes[-1][1] != digest[:16]:
+        hashes.append([fetched_at.isoformat(timespec='seconds'), digest[:16]])
+    entry['hashes'] = hashes[-HASH_HISTORY:]
+    entry['sha256'] = digest
+
+# ==================== HISTORY ====================
+
+class FetchHistory:
+    """{url: {'key', 'index', 'path', 'fetched_at', 'sha256', ...}} dengan simpan atomik, aman untuk banyak thread"""
+
+    def __init__(self, path=FETCH_HISTORY_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+
+    def __contains__(self, url):
+        return url in self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, url):
+        return self.entries.get(url)
+
+    def record(self, url, key, index, path, digest=None, fetched_at=None, **extra):
+        """Catat fetch sukses (waktu sekarang kecuali fetched_at diisi); digest = content_hash isi"""
+        fetched_at = fetched_at or datetime.now()
+        with self._lock:
+            entry = self.entries.setdefault(url, {})
+            entry.update(extra)
+            if digest:
+                observe_change(entry, digest, fetched_at)
+            entry.update({
+                'key': key,
+                'index': index,
+                'path': path,
+                'fetched_at': fetched_at.isoformat(timespec='seconds'),
+            })
+            self._dirty += 1
+
+    def move(self, url, index, path):
+        """Naskah mendapat nomor urut / path baru tanpa fetch ulang"""
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry.update({'index': index, 'path': path})
+                self._dirty += 1
+
+    def save(self, every=1):
+        """Tulis ke .tmp lalu replace; lewati jika perubahan belum mencapai `every`"""
+        with self._lock:
+            if self._dirty < every or self._dirty == 0:
+                return False
+            snapshot = json.dumps(self.entries, ensure_ascii=False)
+            self._dirty = 0
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(snapshot)
+            os.replace(tmp_path, self.path)
+        return True
+
+def corpus_fetch_times(subcategory_dir):
+    """{nomor urut: waktu fetch ISO} dari file "0001_Judul.txt" yang sudah ada"""
+    fetched = {}
+    if not os.path.isdir(subcategory_dir):
+        return fetched
+    with os.scandir(subcategory_dir) as entries:
+        for entry in entries:
+            prefix = entry.name.split('_', 1)[0]
+            if entry.name.endswith('.txt') and prefix.isdigit():
+                mtime = datetime.fromtimestamp(entry.stat().st_mtime)
+                fetched[int(prefix)] = mtime.isoformat(timespec='seconds')
+    return fetched
+
+# ==================== CHECKPOINT LISTING ====================
+
+class ListingCheckpoint:
+    """Checkpoint listing satu sub-kategori (satu rentang offset): file JSONL append-only.
+    Baris pertama {'name', 'created_at'}, lalu satu baris {'offset', 'next_offset', 'rows'}
+    per halaman; rows = ListingRecord.to_row() dari halaman itu."""
+
+    def __init__(self, directory, name, max_age=LISTING_CHECKPOINT_MAX_AGE):
+        self.path = os.path.join(directory, f"{name}.jsonl")
+        self.name = name
+        self.max_age = max_age
+
+    def resume(self):
+        """(offset berikutnya, [rows]) dari halaman yang sudah tercatat, atau None.
+        Baris terakhir yang terpotong (crash saat menulis) dibuang dari file."""
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, 'rb') as f:
+            lines = f.read().split(b'\n')
+        pages, valid_bytes = [], 0
+        for position, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            if position == 0:
+                age = (datetime.now() - datetime.fromisoformat(entry['created_at'])).total_seconds()
+                if age > self.max_age:
+                    self.clear()
+                    return None
+            else:
+                pages.append(entry)
+            valid_bytes += len(line) + 1
+        if not valid_bytes:
+            self.clear()
+            return None
+        if valid_bytes < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        if not pages:
+            return None
+        return pages[-1]['next_offset'], [row for page in pages for row in page['rows']]
+
+    def page(self, offset, next_offset, rows):
+        """Catat satu halaman listing yang selesai diambil"""
+        lines = []
+        if not os.path.exists(self.path):
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            lines.append({'name': self.name, 'created_at': datetime.now().isoformat(timespec='seconds')})
+        lines.append({'offset': offset, 'next_offset': next_offset, 'rows': rows})
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(''.join(json.dumps(line, ensure_ascii=False) + '\n' for line in lines))
+
+    def clear(self):
+        """Listing selesai (atau checkpoint kedaluwarsa): hapus file"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
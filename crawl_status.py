@@ -0,0 +1,342 @@
+"""
+Status Crawl Live (file JSON + endpoint HTTP lokal opsional)
+Crawl penuh (scrape --all) berjalan berjam-jam; modul ini membuat progres
+bisa dipantau dan di-alert tanpa membaca stdout:
+
+    crawl_status.json       ditulis ulang (atomic) setiap --status-interval detik
+    GET /status             JSON yang sama (hanya jika --status-port diisi,
+                            bind ke 127.0.0.1)
+    GET /health             200 selama crawl bergerak, 503 jika macet
+                            (tidak ada naskah selesai > STALL_SECONDS)
+
+Isi status: sub-kategori yang sedang dikerjakan, naskah selesai / gagal /
+dilewati / tersisa, throughput rata-rata bergerak (EWMA berbasis waktu),
+ETA sub-kategori dan seluruh run, tingkat error (total dan N naskah
+terakhir), state rate limiter & memory budget, serta utilisasi worker.
+
+Sisa naskah untuk sub-kategori yang belum di-listing diestimasi dari
+rata-rata jumlah naskah sub-kategori yang sudah di-listing
+(items.remaining_estimated = true).
+
+CARA PAKAI (lewat scraper_cli.py):
+    python scraper_cli.py scrape --all --status-port 8787
+    curl -s localhost:8787/status | jq .eta
+    watch -n 10 cat crawl_status.json
+"""
+
+import os
+import json
+import math
+import time
+import itertools
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+
+# ==================== KONFIGURASI ====================
+
+STATUS_FILE = "crawl_status.json"
+STATUS_HOST = "127.0.0.1"   # Endpoint hanya untuk mesin lokal
+STATUS_INTERVAL = 5         # Detik antar penulisan ulang file status
+THROUGHPUT_HALF_LIFE = 60   # Detik; bobot throughput lama berkurang separuh setiap half-life
+ERROR_WINDOW = 100          # Jumlah naskah terakhir untuk tingkat error terkini
+STALL_SECONDS = 300         # Tidak ada progres selama ini -> /health 503
+
+# ==================== STATUS ====================
+
+def iso(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat(timespec='seconds')
+
+def limiter_state(limiter):
+    return {
+        'min_interval': limiter.min_interval,
+        'backlog_seconds': round(limiter.backlog(), 3),
+        'waits': limiter.waits,
+        'waited_seconds': round(limiter.waited, 1),
+    }
+
+class CrawlStatus:
+    """Hitungan progres crawl (thread-safe) + penulis file status & server HTTP"""
+
+    def __init__(self, scraper, path=STATUS_FILE, port=None, interval=STATUS_INTERVAL):
+        self.scraper = scraper
+        self.path = path
+        self.port = port
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._threads = []
+        self._server = None
+        self._tokens = itertools.count()
+
+        self.mode = None
+        self.state = 'starting'
+        self.started_at = time.time()
+        self._started = time.monotonic()
+        self.deadline = None
+        self.total_subcategories = 0
+        self.subcategories = {}  # key -> {found, done, failed, skipped, status}
+        self.current = None
+        self.phase = None
+        self.last_error = None
+
+        self._active = {}  # token -> waktu mulai naskah
+        self._busy = 0.0
+        self._outcomes = deque(maxlen=ERROR_WINDOW)
+        self._last_progress = time.monotonic()
+        self._sample_at = time.monotonic()
+        self._sample_completed = 0
+        self._sample_busy = 0.0
+        self.rate = None          # EWMA naskah/detik
+        self.utilization = None   # EWMA fraksi waktu worker sibuk
+
+    # ---------- Hook dari crawler ----------
+
+    def begin_subcategory(self, key, phase='listing'):
+        with self._lock:
+            self.subcategories.setdefault(key, {'found': None, 'done': 0, 'failed': 0, 'skipped': 0,
+                                                'status': 'RUNNING'})
+            self.current = key
+            self.phase = phase
+            self._last_progress = time.monotonic()
+
+    def listed(self, key, found, skipped=0):
+        """Listing selesai: `found` naskah, `skipped` di antaranya tidak perlu di-fetch"""
+        with self._lock:
+            entry = self.subcategories[key]
+            entry['found'] = found
+            entry['skipped'] += skipped
+            self.phase = 'download'
+            self._last_progress = time.monotonic()
+
+    def skipped(self, key, count):
+        with self._lock:
+            self.subcategories[key]['skipped'] += count
+
+    def start_item(self, key):
+        """Naskah mulai diproses worker, return token untuk finish_item"""
+        token = next(self._tokens)
+        with self._lock:
+            self._active[token] = time.monotonic()
+            if key in self.subcategories:
+                self.current = key
+                self.phase = 'download'
+        return token
+
+    def finish_item(self, key, token, ok):
+        now = time.monotonic()
+        with self._lock:
+            self._busy += now - self._active.pop(token, now)
+            self._outcomes.append(ok)
+            self._last_progress = now
+            entry = self.subcategories.get(key)
+            if entry is not None:
+                entry['done' if ok else 'failed'] += 1
+
+    def end_subcategory(self, key, status, error=None):
+        with self._lock:
+            entry = self.subcategories.setdefault(key, {'found': None, 'done': 0, 'failed': 0, 'skipped': 0})
+            entry['status'] = status
+            if error:
+                self.last_error = {'subcategory': key, 'message': error, 'at': iso(time.time())}
+
+    # ---------- Ringkasan ----------
+
+    def _sample(self, now, completed, busy):
+        """Update EWMA throughput & utilisasi (peluruhan berbasis waktu, interval tidak harus tetap)"""
+        elapsed = now - self._sample_at
+        if elapsed < 0.5:
+            return
+        alpha = 1 - math.exp(-elapsed * math.log(2) / THROUGHPUT_HALF_LIFE)
+        rate = (completed - self._sample_completed) / elapsed
+        utilization = (busy - self._sample_busy) / (elapsed * self.scraper.workers)
+        self.rate = rate if self.rate is None else self.rate + alpha * (rate - self.rate)
+        self.utilization = utilization if self.utilization is None else (
+            self.utilization + alpha * (utilization - self.utilization))
+        self._sample_at, self._sample_completed, self._sample_busy = now, completed, busy
+
+    def snapshot(self):
+        """Status lengkap sebagai dict (siap di-serialisasi JSON)"""
+        now = time.monotonic()
+        with self._lock:
+            entries = {key: dict(entry) for key, entry in self.subcategories.items()}
+            busy = self._busy + sum(now - started for started in self._active.values())
+            active = len(self._active)
+            outcomes = list(self._outcomes)
+            done = sum(entry['done'] for entry in entries.values())
+            failed = sum(entry['failed'] for entry in entries.values())
+            self._sample(now, done + failed, busy)
+            rate, utilization = self.rate, self.utilization
+            current, phase, last_error = self.current, self.phase, self.last_error
+            last_progress = self._last_progress
+
+        elapsed = now - self._started
+        skipped = sum(entry['skipped'] for entry in entries.values())
+        listed = [entry for entry in entries.values() if entry['found'] is not None]
+        planned = sum(entry['found'] for entry in listed)
+        remaining = sum(max(0, entry['found'] - entry['done'] - entry['failed'] - entry['skipped'])
+                        for entry in listed)
+        pending = sum(1 for entry in entries.values() if entry['found'] is None and entry['status'] == 'RUNNING')
+        unlisted = max(0, self.total_subcategories - len(entries)) + pending
+        estimated = self.state == 'running' and self.mode == 'scrape' and unlisted > 0 and bool(listed)
+        if estimated:
+            remaining += round(unlisted * planned / len(listed))
+
+        current_info = None
+        if current:
+            entry = entries[current]
+            current_remaining = None if entry['found'] is None else max(
+                0, entry['found'] - entry['done'] - entry['failed'] - entry['skipped'])
+            current_info = dict(entry, subcategory=current, phase=phase, remaining=current_remaining,
+                                position=list(entries).index(current) + 1)
+
+        eta = {'subcategory_seconds': None, 'run_seconds': None, 'finish_at': None}
+        if rate:
+            if current_info and current_info['remaining'] is not None:
+                eta['subcategory_seconds'] = round(current_info['remaining'] / rate)
+            eta['run_seconds'] = round(remaining / rate)
+        if self.deadline is not None:
+            left = max(0.0, self.deadline - now)
+            eta['time_budget_left_seconds'] = round(left)
+            if eta['run_seconds'] is not None:
+                eta['run_seconds'] = min(eta['run_seconds'], round(left))
+        if eta['run_seconds'] is not None:
+            eta['finish_at'] = (datetime.now() + timedelta(seconds=eta['run_seconds'])).isoformat(timespec='seconds')
+
+        finished = sum(1 for entry in entries.values() if entry.get('status') not in (None, 'RUNNING'))
+        attempts = done + failed
+        stalled = self.state == 'running' and now - last_progress > STALL_SECONDS
+        scraper = self.scraper
+        memory = scraper.memory_budget
+        return {
+            'mode': self.mode,
+            'state': self.state,
+            'pid': os.getpid(),
+            'started_at': iso(self.started_at),
+            'updated_at': iso(time.time()),
+            'elapsed_seconds': round(elapsed),
+            'stalled': stalled,
+            'seconds_since_progress': round(now - last_progress),
+            'current': current_info,
+            'subcategories': {
+                'total': self.total_subcategories,
+                'listed': len(listed),
+                'finished': finished,
+                'errors': sum(1 for entry in entries.values() if entry.get('status') == 'ERROR'),
+            },
+            'items': {
+                'planned': planned,
+                'done': done,
+                'failed': failed,
+                'skipped': skipped,
+                'in_progress': active,
+                'remaining': remaining,
+                'remaining_estimated': estimated,
+            },
+            'throughput': {
+                'items_per_minute': round(rate * 60, 2) if rate is not None else None,
+                'average_items_per_minute': round(attempts / elapsed * 60, 2) if elapsed > 0 else None,
+                'half_life_seconds': THROUGHPUT_HALF_LIFE,
+            },
+            'eta': eta,
+            'errors': {
+                'rate': round(failed / attempts, 4) if attempts else 0.0,
+                'recent_rate': round(outcomes.count(False) / len(outcomes), 4) if outcomes else 0.0,
+                'recent_window': len(outcomes),
+                'last_error': last_error,
+            },
+            'limiter': {
+                'request': limiter_state(scraper.request_limiter),
+                'page': limiter_state(scraper.page_limiter),
+                'memory': {
+                    'limit_bytes': memory.limit, 'in_use_bytes': memory.in_use,
+                    'peak_bytes': memory.peak, 'waits': memory.waits,
+                } if memory else None,
+                'breaker': scraper.breaker.state_info() if scraper.breaker else None,
+            },
+            'workers': {
+                'threads': scraper.workers,
+                'active': active,
+                'utilization': round(utilization, 3) if utilization is not None else None,
+                'average_utilization': round(busy / (elapsed * scraper.workers), 3) if elapsed > 0 else None,
+            },
+        }
+
+    # ---------- File & HTTP ----------
+
+    def write(self):
+        """Tulis ulang file status (atomic)"""
+        if not self.path:
+            return
+        snapshot = self.snapshot()
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def _write_loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.write()
+            except OSError as e:
+                print(f"⚠️  Gagal menulis {self.path}: {e}")
+
+    def _serve(self):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        status = self
+
+        class StatusHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split('?', 1)[0].rstrip('/') or '/status'
+                if path == '/status':
+                    code, body = 200, status.snapshot()
+                elif path == '/health':
+                    snapshot = status.snapshot()
+                    code = 503 if snapshot['stalled'] else 200
+                    body = {key: snapshot[key] for key in ('state', 'stalled', 'seconds_since_progress')}
+                else:
+                    code, body = 404, {'error': 'not found', 'endpoints': ['/status', '/health']}
+                data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+                self.send_response(code)
+                self.send_header('Content-Type', 'application/json; charset=utf-8')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass  # Jangan campur log request dengan output crawl
+
+        self._server = ThreadingHTTPServer((STATUS_HOST, self.port), StatusHandler)
+        self._server.daemon_threads = True
+        thread = threading.Thread(target=self._server.serve_forever, name='crawl-status-http', daemon=True)
+        thread.start()
+        self._threads.append(thread)
+        host, port = self._server.server_address[:2]
+        print(f"📡 Status crawl: http://{host}:{port}/status")
+
+    def start(self, total_subcategories, mode='scrape', time_budget=None):
+        """Mulai run: file status berkala + server HTTP (jika port diisi)"""
+        self.mode = mode
+        self.state = 'running'
+        self.total_subcategories = total_subcategories
+        self.deadline = self._started + time_budget if time_budget else None
+        if self.port is not None:
+            self._serve()
+        if self.path:
+            self.write()
+            print(f"📄 Status crawl ditulis ke {self.path} setiap {self.interval}s")
+            thread = threading.Thread(target=self._write_loop, name='crawl-status-writer', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def close(self, state='finished'):
+        """Tulis status akhir, hentikan thread penulis & server HTTP"""
+        self.state = state
+        self._stop.set()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        for thread in self._threads:
+            thread.join(timeout=self.interval + 1)
+        self.write()
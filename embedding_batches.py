@@ -0,0 +1,252 @@
+"""
+Ekspor Batch Embedding Berbasis Token
+Menghitung token setiap chunk/naskah, mengelompokkan ke bucket panjang, lalu
+menyusun batch yang mengisi budget token per request tanpa melebihinya
+(best-fit decreasing). Juga memproyeksikan jumlah request, waktu, dan biaya.
+
+Jenis item:
+    --items chunks        data_chunks/**/*.jsonl hasil prechunk.py (default bila ada)
+    --items manuscripts   satu item per naskah di corpus --source (folder atau file .pack,
+                          default data_naskah_sastra_org)
+
+Token dihitung dengan tiktoken (cl100k_base, encoding text-embedding-3-small)
+jika terpasang; jika tidak, memakai aproksimasi backend ceil(panjang / 4).
+
+CARA PAKAI:
+    python embedding_batches.py
+    python embedding_batches.py --items manuscripts --budget-tokens 200000
+    python embedding_batches.py --items manuscripts --source corpus.pack
+    python embedding_batches.py --price-per-million 0.02 --rpm 3000
+"""
+
+import os
+import json
+import bisect
+import argparse
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import BASE_DIR, CorpusReader
+from prechunk import count_tokens as approximate_tokens
+
+# ==================== KONFIGURASI ====================
+
+CHUNKS_DIR = "data_chunks"
+OUTPUT_FILE = "embedding_batches.jsonl"
+
+# Batas API OpenAI embeddings (text-embedding-3-small)
+DEFAULT_BUDGET_TOKENS = 100_000   # Target token per request
+API_MAX_REQUEST_TOKENS = 300_000  # Batas keras token per request
+DEFAULT_MAX_ITEMS = 2048          # Maksimal input per request
+MAX_ITEM_TOKENS = 8191            # Maksimal token per input
+DEFAULT_PRICE_PER_MILLION = 0.02  # USD per 1 juta token
+DEFAULT_RPM = 3000                # Request per menit (untuk proyeksi waktu)
+DEFAULT_CONCURRENCY = 4           # Request paralel (untuk proyeksi waktu)
+ASSUMED_TOKENS_PER_SECOND = 1_000_000  # Throughput kasar server embedding per request
+
+TIKTOKEN_ENCODING = "cl100k_base"
+_ENCODER = None
+
+# ==================== TOKENIZER ====================
+
+def get_encoder():
+    """Encoder tiktoken jika tersedia, None jika tidak (fallback aproksimasi)"""
+    global _ENCODER
+    if _ENCODER is None:
+        try:
+            import tiktoken
+            _ENCODER = tiktoken.get_encoding(TIKTOKEN_ENCODING)
+        except ImportError:
+            _ENCODER = False
+    return _ENCODER or None
+
+def count_tokens(text):
+    """Jumlah token (tiktoken atau ceil(panjang/4) seperti tokenCounter.js)"""
+    encoder = get_encoder()
+    if encoder:
+        return len(encoder.encode_ordinary(text))
+    return approximate_tokens(text)
+
+def tokenizer_name():
+    return f"tiktoken/{TIKTOKEN_ENCODING}" if get_encoder() else "aproksimasi ceil(len/4)"
+
+def length_bucket(tokens):
+    """Bucket panjang pangkat dua: 64, 128, 256, ... token"""
+    return 1 << max(6, (max(tokens, 1) - 1).bit_length())
+
+# ==================== SUMBER ITEM ====================
+
+def count_chunk_file(filepath):
+    """Worker: hitung token semua chunk dalam satu file JSONL"""
+    items = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            chunk = json.loads(line)
+            items.append((chunk['id'], count_tokens(chunk['chunkText'])))
+    return items
+
+def count_manuscript_files(records):
+    """Worker: hitung token isi naskah (tanpa header) untuk sekumpulan corpus.ManuscriptRecord"""
+    items = []
+    for record in records:
+        try:
+            body = record.body()
+        except (OSError, UnicodeDecodeError):
+            continue
+        items.append((record.path, count_tokens(body)))
+    return items
+
+def collect_items(kind, workers=None, source=BASE_DIR):
+    """Kumpulkan (id, token) dari chunk atau naskah corpus `source` secara paralel"""
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        if kind == 'chunks':
+            files = [
+                os.path.join(root, name)
+                for root, _, names in os.walk(CHUNKS_DIR)
+                for name in sorted(names) if name.endswith('.jsonl')
+            ]
+            futures = [executor.submit(count_chunk_file, f) for f in sorted(files)]
+        else:
+            futures = []
+            for _, _, records in CorpusReader(source).subcategories():
+                futures.extend(
+                    executor.submit(count_manuscript_files, records[i:i + 32])
+                    for i in range(0, len(records), 32)
+                )
+
+        items = []
+        for future in futures:
+            items.extend(future.result())
+    return items
+
+# ==================== PACKING ====================
+
+def pack_batches(items, budget_tokens, max_items):
+    """Best-fit decreasing: item terpanjang dulu, masuk ke batch dengan sisa budget terkecil yang cukup"""
+    batches = []          # [{'tokens', 'items'}]
+    open_slots = []       # (sisa_budget, index_batch) terurut, hanya batch yang belum penuh
+    for item_id, tokens in sorted(items, key=lambda item: -item[1]):
+        pos = bisect.bisect_left(open_slots, (tokens, -1))
+        if pos < len(open_slots):
+            _, batch_index = open_slots.pop(pos)
+        else:
+            batch_index = len(batches)
+            # Item pertama selalu yang terpanjang di batch ini
+            batches.append({'bucket': length_bucket(tokens), 'tokens': 0, 'items': []})
+
+        batch = batches[batch_index]
+        batch['items'].append(item_id)
+        batch['tokens'] += tokens
+
+        remaining = budget_tokens - batch['tokens']
+        if remaining > 0 and len(batch['items']) < max_items:
+            bisect.insort(open_slots, (remaining, batch_index))
+    return batches
+
+def export_batches(kind=None, budget_tokens=DEFAULT_BUDGET_TOKENS, max_items=DEFAULT_MAX_ITEMS,
+                   price_per_million=DEFAULT_PRICE_PER_MILLION, rpm=DEFAULT_RPM,
+                   concurrency=DEFAULT_CONCURRENCY, workers=None, source=BASE_DIR):
+    """Hitung token, bucket, susun batch, tulis JSONL dan print proyeksi"""
+    budget_tokens = min(budget_tokens, API_MAX_REQUEST_TOKENS)
+    if kind is None:
+        kind = 'chunks' if os.path.exists(CHUNKS_DIR) else 'manuscripts'
+    if kind == 'manuscripts' and not os.path.exists(source):
+        print(f"❌ {source} tidak ditemukan!")
+        return None
+    if kind == 'chunks' and not os.path.exists(CHUNKS_DIR):
+        print(f"❌ Folder {CHUNKS_DIR} tidak ditemukan! Jalankan: python prechunk.py")
+        return None
+
+    print(f"\n{'='*80}")
+    print(f"📦 EKSPOR BATCH EMBEDDING ({kind})")
+    print(f"{'='*80}")
+    print(f"   Tokenizer      : {tokenizer_name()}")
+    print(f"   Budget/request : {budget_tokens:,} token, maks {max_items:,} item\n")
+
+    items = collect_items(kind, workers, source)
+    oversized = [(item_id, tokens) for item_id, tokens in items if tokens > MAX_ITEM_TOKENS]
+    empty = sum(1 for _, tokens in items if tokens == 0)
+    packable = [(item_id, tokens) for item_id, tokens in items if 0 < tokens <= MAX_ITEM_TOKENS]
+
+    buckets = Counter()
+    bucket_tokens = Counter()
+    for _, tokens in packable:
+        bucket = length_bucket(tokens)
+        buckets[bucket] += 1
+        bucket_tokens[bucket] += tokens
+
+    batches = pack_batches(packable, budget_tokens, max_items)
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        for batch_id, batch in enumerate(batches):
+            f.write(json.dumps({
+                'batch_id': batch_id,
+                'bucket': batch['bucket'],
+                'tokens': batch['tokens'],
+                'count': len(batch['items']),
+                'items': batch['items'],
+            }, ensure_ascii=False) + '\n')
+
+    total_tokens = sum(tokens for _, tokens in packable)
+    requests_count = len(batches)
+    fill = total_tokens / (requests_count * budget_tokens) if requests_count else 0
+    cost = total_tokens / 1_000_000 * price_per_million
+    # Proyeksi waktu: dibatasi RPM atau throughput per request, mana yang lebih lambat
+    minutes_by_rpm = requests_count / rpm if rpm else 0
+    minutes_by_throughput = total_tokens / ASSUMED_TOKENS_PER_SECOND / max(concurrency, 1) / 60
+    minutes = max(minutes_by_rpm, minutes_by_throughput)
+
+    print(f"📊 Bucket panjang (token):")
+    for bucket in sorted(buckets):
+        print(f"   ≤{bucket:>6,} : {buckets[bucket]:>7,} item, {bucket_tokens[bucket]:>12,} token")
+
+    print(f"\n📈 PROYEKSI:")
+    print(f"   Item           : {len(packable):,} (kosong: {empty:,}, terlalu panjang: {len(oversized):,})")
+    print(f"   Total token    : {total_tokens:,}")
+    print(f"   Request        : {requests_count:,} (vs {len(packable):,} jika satu item per request)")
+    print(f"   Pengisian      : {fill * 100:.1f}% budget per request")
+    print(f"   Estimasi waktu : {minutes:.1f} menit ({rpm:,} RPM, {concurrency} paralel)")
+    print(f"   Estimasi biaya : ${cost:.4f} (${price_per_million}/1M token)")
+
+    if oversized:
+        print(f"\n⚠️  {len(oversized):,} item melebihi {MAX_ITEM_TOKENS:,} token (perlu di-chunk dulu):")
+        for item_id, tokens in sorted(oversized, key=lambda item: -item[1])[:5]:
+            print(f"   • {tokens:,} token: {item_id}")
+
+    print(f"\n💾 Batch tersimpan di: {OUTPUT_FILE}")
+    return {
+        'kind': kind,
+        'items': len(packable),
+        'oversized': len(oversized),
+        'total_tokens': total_tokens,
+        'requests': requests_count,
+        'fill_ratio': fill,
+        'estimated_minutes': minutes,
+        'estimated_cost_usd': cost,
+    }
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Susun batch embedding berbasis jumlah token")
+    parser.add_argument('--items', dest='kind', choices=['chunks', 'manuscripts'], default=None,
+                        help="Jenis item (default: chunks jika data_chunks/ ada)")
+    parser.add_argument('--source', default=BASE_DIR,
+                        help=f"Folder corpus atau file .pack untuk --items manuscripts (default: {BASE_DIR})")
+    parser.add_argument('--budget-tokens', type=int, default=DEFAULT_BUDGET_TOKENS,
+                        help=f"Target token per request (default: {DEFAULT_BUDGET_TOKENS:,})")
+    parser.add_argument('--max-items', type=int, default=DEFAULT_MAX_ITEMS,
+                        help=f"Maksimal item per request (default: {DEFAULT_MAX_ITEMS})")
+    parser.add_argument('--price-per-million', type=float, default=DEFAULT_PRICE_PER_MILLION,
+                        help=f"Harga USD per 1 juta token (default: {DEFAULT_PRICE_PER_MILLION})")
+    parser.add_argument('--rpm', type=int, default=DEFAULT_RPM,
+                        help=f"Batas request per menit (default: {DEFAULT_RPM})")
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Request paralel (default: {DEFAULT_CONCURRENCY})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah worker process (default: jumlah CPU)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    export_batches(args.kind, args.budget_tokens, args.max_items, args.price_per_million,
+                   args.rpm, args.concurrency, args.workers, args.source)
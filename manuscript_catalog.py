@@ -0,0 +1,195 @@
+"""
+Katalog Naskah (catalog.jsonl)
+Satu file indeks di root folder corpus yang dicatat setiap kali scraper
+menulis naskah, supaya backend (manuscriptLoader.loadFromCatalog) bisa mulai
+dengan satu kali baca tanpa listing folder dan parsing nama file.
+
+Satu baris JSON per penulisan (append-only, entri terakhir per path menang):
+
+    path        path relatif terhadap root corpus ("Kategori/Sub/0001_Judul.txt")
+    index       nomor urut naskah di sub-kategori
+    header      header naskah apa adanya (Judul, URL, metadata listing)
+    size        ukuran file (bytes)
+    bodyOffset  offset byte baris pertama setelah garis pemisah header
+    sha256      hash seluruh isi file (skip naskah yang tidak berubah)
+    writtenAt   waktu penulisan (ISO)
+
+File yang dihapus dicatat sebagai {"path": ..., "deleted": true}. Append
+memakai satu write() per baris dengan O_APPEND sehingga aman untuk banyak
+thread dan banyak proses (worker antrian, re-ekstraksi paralel).
+
+CARA PAKAI:
+    python manuscript_catalog.py              # compact (atau bangun dari disk jika belum ada)
+    python manuscript_catalog.py --rebuild    # bangun ulang dari semua file naskah
+    python manuscript_catalog.py --verify     # cek ukuran & hash terhadap disk
+"""
+
+import os
+import json
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+
+from corpus import BASE_DIR, HEADER_SEPARATOR, CorpusReader, manuscript_index, split_header
+
+# ==================== KONFIGURASI ====================
+
+CATALOG_FILE = "catalog.jsonl"
+HEADER_SEARCH_BYTES = 8192  # Garis pemisah header dicari hanya di awal file
+
+# ==================== ENTRI ====================
+
+def body_offset(data):
+    """Offset byte baris setelah garis pemisah header (0 jika bukan format save_manuscript)"""
+    separator = ("\n" + HEADER_SEPARATOR + "\n").encode('utf-8')
+    position = data.find(separator, 0, HEADER_SEARCH_BYTES)
+    return position + len(separator) if position != -1 else 0
+
+def catalog_entry(relpath, header, data, offset=None):
+    """Entri katalog untuk isi file `data` (bytes) dengan header dict-nya"""
+    return {
+        'path': relpath,
+        'index': manuscript_index(os.path.basename(relpath)),
+        'header': header,
+        'size': len(data),
+        'bodyOffset': body_offset(data) if offset is None else offset,
+        'sha256': hashlib.sha256(data).hexdigest(),
+        'writtenAt': datetime.now().isoformat(timespec='seconds'),
+    }
+
+def file_entry(root, path):
+    """Entri katalog dari file naskah di disk"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    offset = body_offset(data)
+    header, _ = split_header(data[:offset].decode('utf-8', errors='replace')) if offset else ({}, None)
+    return catalog_entry(relative_path(root, path), header, data, offset)
+
+def relative_path(root, path):
+    return os.path.relpath(path, root).replace(os.sep, '/')
+
+# ==================== KATALOG ====================
+
+class ManuscriptCatalog:
+    """Writer catalog.jsonl di root corpus (aman untuk banyak thread & proses)"""
+
+    def __init__(self, root=BASE_DIR, filename=CATALOG_FILE):
+        self.root = root
+        self.path = os.path.join(root, filename)
+        self._lock = threading.Lock()
+
+    def _append(self, entry):
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode('utf-8')
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+    def record(self, path, header, data):
+        """Catat file naskah yang baru ditulis (data = bytes yang ditulis)"""
+        self._append(catalog_entry(relative_path(self.root, path), header, data))
+
+    def remove(self, path):
+        self._append({'path': relative_path(self.root, path), 'deleted': True})
+
+    def load(self):
+        """{path: entri} (entri terakhir per path, file terhapus dibuang)"""
+        entries = {}
+        if not os.path.exists(self.path):
+            return entries
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # baris terpotong (crash saat append)
+                if entry.get('deleted'):
+                    entries.pop(entry['path'], None)
+                else:
+                    entries[entry['path']] = entry
+        return entries
+
+    def write(self, entries):
+        """Tulis ulang katalog (atomic) dari {path: entri}"""
+        tmp_path = self.path + '.tmp'
+        with self._lock:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for path in sorted(entries):
+                    f.write(json.dumps(entries[path], ensure_ascii=False) + "\n")
+            os.replace(tmp_path, self.path)
+
+    def compact(self):
+        """Buang entri lama & tombstone, return jumlah entri"""
+        entries = self.load()
+        self.write(entries)
+        return len(entries)
+
+    def iter_files(self):
+        """Path semua file naskah di disk (nested maupun flat)"""
+        for record in CorpusReader(self.root).records():
+            yield record.path
+
+    def rebuild(self):
+        """Bangun ulang katalog dari semua file naskah di disk, return jumlah entri"""
+        entries = {}
+        for path in self.iter_files():
+            entry = file_entry(self.root, path)
+            entries[entry['path']] = entry
+        self.write(entries)
+        return len(entries)
+
+    def verify(self):
+        """Bandingkan katalog dengan disk, return (hilang, berubah, tidak tercatat)"""
+        entries = self.load()
+        on_disk = {relative_path(self.root, path): path for path in self.iter_files()}
+        missing = sorted(set(entries) - set(on_disk))
+        untracked = sorted(set(on_disk) - set(entries))
+        changed = []
+        for relpath in sorted(set(entries) & set(on_disk)):
+            entry = entries[relpath]
+            path = on_disk[relpath]
+            if os.path.getsize(path) != entry['size'] or file_entry(self.root, path)['sha256'] != entry['sha256']:
+                changed.append(relpath)
+        return missing, changed, untracked
+
+# ==================== MAIN ====================
+
+def main():
+    parser = argparse.ArgumentParser(description='Katalog naskah (catalog.jsonl) untuk manuscriptLoader')
+    parser.add_argument('--source', '--dir', dest='source', default=BASE_DIR,
+                        help=f'Folder corpus (default: {BASE_DIR})')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--rebuild', action='store_true', help='Bangun ulang dari semua file naskah di disk')
+    mode.add_argument('--verify', action='store_true', help='Cek ukuran & hash katalog terhadap disk')
+    args = parser.parse_args()
+
+    if not os.path.isdir(args.source):
+        print(f"❌ Folder {args.source} tidak ditemukan!")
+        return
+
+    catalog = ManuscriptCatalog(args.source)
+    if args.verify:
+        missing, changed, untracked = catalog.verify()
+        for label, paths in (('Hilang dari disk', missing), ('Berubah', changed), ('Tidak tercatat', untracked)):
+            print(f"{'✅' if not paths else '⚠️ '} {label}: {len(paths):,}")
+            for relpath in paths[:10]:
+                print(f"     {relpath}")
+        if missing or changed or untracked:
+            print(f"\n💡 Jalankan: python manuscript_catalog.py --rebuild --source {args.source}")
+        return
+
+    if args.rebuild or not os.path.exists(catalog.path):
+        count = catalog.rebuild()
+        print(f"✅ Katalog dibangun dari disk: {count:,} naskah -> {catalog.path}")
+    else:
+        before = os.path.getsize(catalog.path)
+        count = catalog.compact()
+        print(f"✅ Katalog di-compact: {count:,} naskah, "
+              f"{before / 1024:,.1f} KB -> {os.path.getsize(catalog.path) / 1024:,.1f} KB")
+
+if __name__ == "__main__":
+    main()
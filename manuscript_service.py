@@ -0,0 +1,427 @@
+"""
+Layanan Naskah Lokal (fetch-through)
+Server HTTP kecil untuk backend yang butuh satu naskah yang belum ada di
+corpus lokal, tanpa menjalankan scraper penuh.
+
+    GET /manuscript?url=<URL naskah>   -> JSON {url, title, content, source, path}
+    GET /stats                         -> statistik cache, coalescing & rate limit
+
+Urutan pencarian:
+  1. cache LRU di memori (dibatasi jumlah naskah dan byte isi)
+  2. corpus lokal (CorpusReader, indeks URL dari header; dibangun ulang
+     paling sering setiap INDEX_MAX_AGE detik bila URL tidak ditemukan)
+  3. fetch dengan logika scraper yang sama (scrape_manuscript, pembersihan,
+     rate limit & memory budget bersama), lalu disimpan ke corpus dan dicatat
+     di catalog.jsonl + fetch_history.json; halaman tanpa judul/isi naskah
+     (fallback extractor) -> 404/502, tidak disimpan maupun di-cache
+
+Posisi naskah di listing tidak diketahui, jadi naskah disimpan di folder
+sub-kategori (dari path URL) dengan nomor ON_DEMAND_INDEX ("0000_Judul.txt");
+scrape berikutnya memberi nomor urut listing tanpa fetch ulang. Request yang
+sama dan bersamaan digabung: hanya satu fetch, yang lain menunggu hasilnya.
+Hanya host di allow-list (host --base-url + --allow-host) yang di-fetch.
+
+CARA PAKAI:
+    python manuscript_service.py --port 8790
+    curl "http://127.0.0.1:8790/manuscript?url=https://www.sastra.org/..."
+    python manuscript_service.py --strip-boilerplate --char-map peta.json   # pembersihan sama dengan crawl
+
+    # Uji lokal dengan replay_server.py sebagai origin
+    python replay_server.py --port 8765
+    python manuscript_service.py --base-url http://127.0.0.1:8765 --output-dir /tmp/corpus_uji
+    python manuscript_service.py --selftest   # coalescing, cache, 403, 404 (replay_server in-process)
+"""
+
+import os
+import json
+import time
+import argparse
+import threading
+import urllib.parse
+from collections import Counter, OrderedDict
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from corpus import ManuscriptRecord
+from stream_extract import NO_CONTENT, UNTITLED
+from scraper_engine import (
+    BASE_OUTPUT_DIR, BASE_URL, CATEGORIES, DELAY_BETWEEN_REQUESTS, ON_DEMAND_INDEX, Scraper, absolute_url,
+    manuscript_filename, save_manuscript, scrape_manuscript, slugify, subcategory_key,
+)
+
+# ==================== KONFIGURASI ====================
+
+SERVICE_HOST = "127.0.0.1"
+SERVICE_PORT = 8790
+CACHE_ENTRIES = 256                  # Naskah maksimal di cache LRU
+CACHE_BYTES = 64 * 1024 * 1024       # Total isi naskah maksimal di cache
+INDEX_MAX_AGE = 300                  # Detik; indeks corpus dibangun ulang saat miss jika lebih tua
+
+# ==================== CACHE ====================
+
+class LRUCache:
+    """Cache LRU aman-thread, dibatasi jumlah entri dan total byte"""
+
+    def __init__(self, max_entries=CACHE_ENTRIES, max_bytes=CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._items = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            self._items.move_to_end(key)
+            return item[0]
+
+    def put(self, key, value, size):
+        """Simpan (nilai lebih besar dari max_bytes tidak di-cache)"""
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old:
+                self.bytes -= old[1]
+            self._items[key] = (value, size)
+            self.bytes += size
+            while len(self._items) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._items.popitem(last=False)
+                self.bytes -= evicted_size
+
+# ==================== SERVICE ====================
+
+class ServiceError(Exception):
+    """Error dengan kode HTTP untuk klien"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def category_slugs():
+    """{(slug kategori, slug sub-kategori): (kategori, sub-kategori)} untuk memetakan path URL naskah"""
+    return {
+        (slugify(category_name), slugify(subcategory['name'])): (category_name, subcategory['name'])
+        for category_name, category_data in CATEGORIES.items()
+        for subcategory in category_data['subcategories']
+    }
+
+class ManuscriptService:
+    """Cari naskah di cache -> corpus -> origin; fetch bersamaan untuk URL sama digabung"""
+
+    def __init__(self, scraper, base_url=BASE_URL, allowed_hosts=(), cache_entries=CACHE_ENTRIES,
+                 cache_bytes=CACHE_BYTES):
+        from corpus import CorpusReader
+
+        self.scraper = scraper
+        self.base_url = base_url
+        self.allowed_hosts = {urllib.parse.urlsplit(base_url).netloc.lower()}
+        self.allowed_hosts.update(host.lower() for host in allowed_hosts)
+        self.cache = LRUCache(cache_entries, cache_bytes)
+        os.makedirs(scraper.output_dir, exist_ok=True)
+        self.reader = CorpusReader(scraper.output_dir)
+        self.slugs = category_slugs()
+        self.stats = Counter()
+        self._indexed_at = None
+        self._inflight = {}  # url -> Future
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
+
+    def count(self, field, amount=1):
+        with self._lock:
+            self.stats[field] += amount
+
+    def normalize_url(self, url):
+        """URL absolut tanpa fragment; host harus ada di allow-list"""
+        if not url:
+            raise ServiceError(400, "parameter url wajib diisi")
+        url = absolute_url(url.strip(), self.base_url).split('#', 1)[0]
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in ('http', 'https'):
+            raise ServiceError(400, f"skema URL tidak didukung: {parts.scheme!r}")
+        if parts.netloc.lower() not in self.allowed_hosts:
+            raise ServiceError(403, f"host tidak diizinkan: {parts.netloc}")
+        return url
+
+    def get(self, url):
+        """Return (manuscript dict, sumber: cache / corpus / fetched / coalesced)"""
+        url = self.normalize_url(url)
+        manuscript = self.cache.get(url)
+        if manuscript is not None:
+            self.count('cache')
+            return manuscript, 'cache'
+
+        with self._lock:
+            future = self._inflight.get(url)
+            leader = future is None
+            if leader:
+                future = self._inflight[url] = Future()
+        if not leader:
+            self.count('coalesced')
+            return future.result()[0], 'coalesced'
+
+        try:
+            result = self._load(url)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[url]
+
+    def _lookup_corpus(self, url):
+        with self._index_lock:
+            if self._indexed_at is None:
+                self._indexed_at = time.monotonic()
+            record = self.reader.by_url(url)
+            if record is None and time.monotonic() - self._indexed_at > INDEX_MAX_AGE:
+                self.reader.refresh_index()
+                self._indexed_at = time.monotonic()
+                record = self.reader.by_url(url)
+            return record
+
+    def _load(self, url):
+        record = self._lookup_corpus(url)
+        if record is not None:
+            header, body = record.read()
+            manuscript = {'url': url, 'title': header.get('Judul', record.title), 'content': body,
+                          'path': record.relpath}
+            self.cache.put(url, manuscript, len(body))
+            self.count('corpus')
+            return manuscript, 'corpus'
+
+        manuscript = self._fetch(url)
+        self.cache.put(url, manuscript, len(manuscript['content']))
+        self.count('fetched')
+        return manuscript, 'fetched'
+
+    def _fetch(self, url):
+        """Fetch + ekstraksi + pembersihan + simpan ke corpus (dipanggil sekali per URL)"""
+        scraper = self.scraper
+        path_parts = urllib.parse.urlsplit(url).path.strip('/').split('/')
+        category_name, subcategory_name = self.slugs.get(tuple(path_parts[:2]), (None, None))
+        if len(path_parts) < 3 or category_name is None:
+            raise ServiceError(404, "URL bukan halaman naskah (/<kategori>/<sub-kategori>/<id>-<judul>)")
+
+        key = subcategory_key(category_name, subcategory_name)
+        metadata = {'kind': 'manuscript', 'category': category_name, 'subcategory': subcategory_name,
+                    'index': ON_DEMAND_INDEX}
+        manuscript = scrape_manuscript(url, scraper.fetcher, scraper.request_limiter, metadata,
+                                       scraper.max_body_bytes, scraper.memory_budget)
+        if not manuscript:
+            self.count('failed')
+            raise ServiceError(502, f"gagal mengambil naskah dari {url}")
+        # Fallback extractor = halaman tanpa naskah: jangan disimpan / di-cache
+        if manuscript['content'] == NO_CONTENT:
+            self.count('failed')
+            raise ServiceError(404, f"konten naskah tidak ditemukan di {url}")
+        if manuscript['title'] == UNTITLED:
+            self.count('failed')
+            raise ServiceError(502, f"judul naskah tidak ditemukan di {url} (struktur halaman berubah?)")
+        scraper.clean(manuscript, category_name, subcategory_name)
+
+        output_dir = scraper.output_dir_for(category_name, subcategory_name)
+        os.makedirs(output_dir, exist_ok=True)
+        relpath = None
+        if save_manuscript(manuscript, ON_DEMAND_INDEX, output_dir, scraper.index_width, scraper.catalog):
+            filepath = os.path.join(output_dir, manuscript_filename(manuscript, ON_DEMAND_INDEX, scraper.index_width))
+            record = ManuscriptRecord(scraper.output_dir,
+                                      os.path.relpath(filepath, scraper.output_dir).replace(os.sep, '/'))
+            relpath = record.relpath
+            with self._index_lock:
+                self.reader.register(record)
+            scraper.record_history(url, key, ON_DEMAND_INDEX, output_dir, manuscript, category_name, subcategory_name)
+            if scraper.history is not None:
+                scraper.history.save()
+        return {'url': url, 'title': manuscript['title'], 'content': manuscript['content'], 'path': relpath}
+
+    def snapshot(self):
+        limiter = self.scraper.request_limiter
+        with self._lock:
+            stats = dict(self.stats)
+            inflight = len(self._inflight)
+        return {
+            'requests': stats,
+            'inflight': inflight,
+            'cache': {'entries': len(self.cache), 'bytes': self.cache.bytes,
+                      'max_entries': self.cache.max_entries, 'max_bytes': self.cache.max_bytes},
+            'rate_limit': {'min_interval': limiter.min_interval, 'waits': limiter.waits,
+                           'waited_seconds': round(limiter.waited, 3)},
+            'allowed_hosts': sorted(self.allowed_hosts),
+        }
+
+# ==================== HTTP ====================
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    def send_json(self, code, body):
+        data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(code)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        service = self.server.service
+        parsed = urllib.parse.urlsplit(self.path)
+        path = parsed.path.rstrip('/')
+        if path == '/stats':
+            return self.send_json(200, service.snapshot())
+        if path != '/manuscript':
+            return self.send_json(404, {'error': 'not found', 'endpoints': ['/manuscript?url=...', '/stats']})
+
+        url = urllib.parse.parse_qs(parsed.query).get('url', [''])[0]
+        try:
+            manuscript, source = service.get(url)
+        except ServiceError as e:
+            service.count(f'http_{e.status}')
+            return self.send_json(e.status, {'error': str(e), 'url': url})
+        except Exception as e:
+            service.count('http_500')
+            return self.send_json(500, {'error': str(e), 'url': url})
+        self.send_json(200, dict(manuscript, source=source))
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+class ManuscriptServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer di depan satu ManuscriptService"""
+
+    daemon_threads = True
+
+    def __init__(self, service, port=SERVICE_PORT, host=SERVICE_HOST, verbose=False):
+        super().__init__((host, port), ServiceHandler)
+        self.service = service
+        self.verbose = verbose
+        self.url = f"http://{host}:{self.server_address[1]}"
+
+    def start_background(self):
+        """Jalankan di thread daemon (untuk uji in-process), return URL layanan"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.url
+
+# ==================== SELF-TEST ====================
+
+def selftest(clients=5):
+    """Uji in-process terhadap replay_server: coalescing, cache, allow-list, 404; return daftar kegagalan"""
+    import tempfile
+    import urllib.error
+    import urllib.request
+    from concurrent.futures import ThreadPoolExecutor
+    from replay_server import ReplayServer
+
+    # Latensi origin cukup lama agar semua klien datang selagi fetch pertama berjalan
+    replay = ReplayServer(port=0, items=3, latency_ms=300)
+    base_url = replay.start_background()
+    fs = next(iter(replay.site.subcategories))
+    category_name, subcategory_name = replay.site.subcategories[fs]
+    item_id = replay.site.item_id(fs, 0)
+    manuscript_url = f"{base_url}/{slugify(category_name)}/{slugify(subcategory_name)}/{item_id}-serat-{item_id}"
+
+    def request(url):
+        query = urllib.parse.urlencode({'url': url})
+        try:
+            with urllib.request.urlopen(f"{service_url}/manuscript?{query}", timeout=30) as response:
+                return response.status, json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            return e.code, json.loads(e.read())
+
+    failures = []
+
+    def check(condition, message):
+        print(f"   {'✅' if condition else '❌'} {message}")
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = Scraper(output_dir=os.path.join(tmp, 'corpus'), delay=0, base_url=base_url,
+                          progress_file=os.path.join(tmp, 'progress.json'), log_file=os.path.join(tmp, 'log.csv'),
+                          listing_checkpoint_dir=os.path.join(tmp, 'listing_checkpoints'))
+        service = ManuscriptService(scraper, base_url)
+        server = ManuscriptServer(service, 0)
+        service_url = server.start_background()
+        try:
+            with ThreadPoolExecutor(clients) as pool:
+                responses = list(pool.map(request, [manuscript_url] * clients))
+            sources = Counter(body.get('source') for _, body in responses)
+            check(all(status == 200 for status, _ in responses), f"{clients} request bersamaan -> 200")
+            check(replay.stats['requests'] == 1 and sources['fetched'] == 1,
+                  f"request bersamaan digabung jadi satu fetch (origin: {replay.stats['requests']}, "
+                  f"sumber: {dict(sources)})")
+
+            status, body = request(manuscript_url)
+            check(status == 200 and body.get('source') == 'cache' and replay.stats['requests'] == 1,
+                  f"request ulang dilayani dari cache (sumber: {body.get('source')})")
+
+            status, _ = request(f"http://contoh.invalid/{item_id}-serat-{item_id}")
+            check(status == 403, f"host di luar allow-list -> 403 (dapat {status})")
+
+            status, _ = request(f"{base_url}/bukan/naskah")
+            check(status == 404 and replay.stats['requests'] == 1, f"path bukan naskah -> 404 (dapat {status})")
+        finally:
+            server.shutdown()
+            replay.shutdown()
+    return failures
+
+# ==================== MAIN ====================
+
+def main():
+    from crawl_state import FETCH_HISTORY_FILE, FetchHistory
+    from scraper_cli import add_normalize_arguments, read_char_map
+
+    parser = argparse.ArgumentParser(description="Layanan naskah lokal: corpus/cache dulu, fetch jika belum ada")
+    parser.add_argument('--host', default=SERVICE_HOST, help=f"Alamat bind (default: {SERVICE_HOST})")
+    parser.add_argument('--port', type=int, default=SERVICE_PORT, help=f"Port (default: {SERVICE_PORT}, 0 = bebas)")
+    parser.add_argument('--base-url', default=BASE_URL, help=f"Origin naskah (default: {BASE_URL})")
+    parser.add_argument('--allow-host', action='append', default=[],
+                        help="Host tambahan yang boleh di-fetch (bisa diulang; host --base-url selalu boleh)")
+    parser.add_argument('--output-dir', default=BASE_OUTPUT_DIR,
+                        help=f"Folder corpus (default: {BASE_OUTPUT_DIR})")
+    parser.add_argument('--delay', type=float, default=DELAY_BETWEEN_REQUESTS,
+                        help=f"Jarak minimum antar request ke origin (default: {DELAY_BETWEEN_REQUESTS}s)")
+    parser.add_argument('--cache-entries', type=int, default=CACHE_ENTRIES,
+                        help=f"Naskah maksimal di cache LRU (default: {CACHE_ENTRIES})")
+    parser.add_argument('--cache-mb', type=float, default=CACHE_BYTES / 1024 / 1024,
+                        help=f"Total MB isi naskah di cache (default: {CACHE_BYTES // 1024 // 1024})")
+    parser.add_argument('--history-file', default=FETCH_HISTORY_FILE,
+                        help=f"Riwayat fetch & hash isi per URL (default: {FETCH_HISTORY_FILE})")
+    # Pembersihan sama dengan scraper_cli agar naskah dari layanan identik dengan hasil crawl
+    add_normalize_arguments(parser)
+    parser.add_argument('--verbose', action='store_true', help="Log setiap request")
+    parser.add_argument('--selftest', action='store_true',
+                        help="Uji in-process terhadap replay_server.py lalu keluar (exit 1 jika gagal)")
+    args = parser.parse_args()
+    if args.selftest:
+        print("🧪 Self-test layanan naskah (replay_server in-process)")
+        failures = selftest()
+        print(f"{'❌' if failures else '✅'} {len(failures)} kegagalan")
+        raise SystemExit(1 if failures else 0)
+    try:
+        char_map = read_char_map(args)
+    except (OSError, ValueError) as e:
+        parser.error(f"--char-map: {e}")
+
+    scraper = Scraper(output_dir=args.output_dir, delay=args.delay, base_url=args.base_url,
+                      normalize=not args.no_normalize, char_map=char_map,
+                      boilerplate_model=args.strip_boilerplate)
+    scraper.history = FetchHistory(args.history_file)
+    service = ManuscriptService(scraper, args.base_url, args.allow_host, args.cache_entries,
+                                int(args.cache_mb * 1024 * 1024))
+    server = ManuscriptServer(service, args.port, args.host, args.verbose)
+    print(f"📚 Layanan naskah di {server.url}/manuscript?url=... (corpus: {args.output_dir}/, "
+          f"origin: {args.base_url}, Ctrl+C untuk berhenti)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {service.snapshot()['requests']}")
+
+if __name__ == "__main__":
+    main()
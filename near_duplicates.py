@@ -0,0 +1,293 @@
+"""
+Deteksi Naskah Hampir Duplikat (MinHash + LSH)
+sastra.org sering memuat teks yang sama di beberapa sub-kategori dengan sedikit
+perbedaan editorial (mis. Radya Pustaka vs Surakarta). Script ini mencari cluster
+naskah yang hampir identik sebelum korpus di-embed.
+
+Cara kerja:
+1. Setiap naskah dipecah menjadi shingle k-kata
+2. Signature MinHash dihitung paralel di process pool
+3. LSH banding mengumpulkan kandidat (tanpa membandingkan semua pasangan)
+4. Kandidat diverifikasi dengan estimasi Jaccard, lalu digabung jadi cluster
+
+CARA PAKAI:
+    python near_duplicates.py
+    python near_duplicates.py --threshold 0.7 --shingle-size 4 --num-perm 256
+    python near_duplicates.py --source corpus.pack
+"""
+
+import os
+import json
+import random
+import argparse
+import hashlib
+from array import array
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import BASE_DIR, CorpusReader
+from text_utils import tokenize
+
+# ==================== KONFIGURASI ====================
+
+OUTPUT_FILE = "near_duplicates.json"
+DEFAULT_THRESHOLD = 0.8      # Estimasi Jaccard minimum agar dianggap duplikat
+DEFAULT_SHINGLE_SIZE = 5     # Jumlah kata per shingle
+DEFAULT_NUM_PERM = 128       # Panjang signature MinHash
+FILES_PER_TASK = 16          # Jumlah file per tugas worker
+SEED = 20251119              # Seed permutasi (harus sama di semua worker)
+
+MASK_64 = (1 << 64) - 1
+
+# Parameter permutasi, diisi di setiap worker oleh init_worker()
+_PERMUTATIONS = None
+_SHINGLE_SIZE = DEFAULT_SHINGLE_SIZE
+
+# ==================== MINHASH ====================
+
+def make_permutations(num_perm, seed=SEED):
+    """Buat pasangan (a, b) untuk hash multiply-shift h(x) = ((a*x + b) mod 2^64) >> 32"""
+    rng = random.Random(seed)
+    return [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+
+def init_worker(num_perm, shingle_size):
+    """Inisialisasi parameter global di setiap worker process"""
+    global _PERMUTATIONS, _SHINGLE_SIZE
+    _PERMUTATIONS = make_permutations(num_perm)
+    _SHINGLE_SIZE = shingle_size
+
+def shingle_hashes(tokens, shingle_size):
+    """Set hash 64-bit dari shingle k-kata"""
+    if len(tokens) < shingle_size:
+        shingles = [' '.join(tokens)] if tokens else []
+    else:
+        shingles = (
+            ' '.join(tokens[i:i + shingle_size])
+            for i in range(len(tokens) - shingle_size + 1)
+        )
+
+    return {
+        int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'little')
+        for s in shingles
+    }
+
+def minhash_signature(hashes, permutations):
+    """Signature MinHash (array 32-bit) dari set hash shingle"""
+    # min() dulu baru >> 32: urutan tidak berubah, dan shift cukup sekali per permutasi
+    mask = MASK_64
+    return array('I', (
+        min((a * x + b) & mask for x in hashes) >> 32
+        for a, b in permutations
+    ))
+
+def compute_signatures(records):
+    """Worker: hitung signature untuk sekumpulan naskah (corpus.ManuscriptRecord)"""
+    results = []
+    for record in records:
+        try:
+            header, body = record.read()
+        except (OSError, UnicodeDecodeError):
+            continue
+
+        tokens = tokenize(body)
+        hashes = shingle_hashes(tokens, _SHINGLE_SIZE)
+        if not hashes:
+            continue
+
+        results.append({
+            'path': record.path,
+            'title': header.get('Judul', record.filename),
+            'url': header.get('URL'),
+            'tokens': len(tokens),
+            'signature': minhash_signature(hashes, _PERMUTATIONS),
+        })
+    return results
+
+# ==================== LSH ====================
+
+def optimal_bands(threshold, num_perm):
+    """Pilih (bands, rows) dengan titik belok (1/b)^(1/r) paling dekat threshold"""
+    best = None
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        error = abs((1 / bands) ** (1 / rows) - threshold)
+        if best is None or error < best[0]:
+            best = (error, bands, rows)
+    return best[1], best[2]
+
+def lsh_candidate_pairs(signatures, bands, rows):
+    """Kumpulkan pasangan kandidat dari bucket LSH (sub-kuadratik)"""
+    candidates = set()
+    for band in range(bands):
+        start = band * rows
+        buckets = defaultdict(list)
+        for doc_id, signature in enumerate(signatures):
+            buckets[signature[start:start + rows].tobytes()].append(doc_id)
+
+        for members in buckets.values():
+            if len(members) < 2:
+                continue
+            for i in range(len(members)):
+                for j in range(i + 1, len(members)):
+                    candidates.add((members[i], members[j]))
+    return candidates
+
+def estimate_jaccard(sig_a, sig_b):
+    """Estimasi kemiripan Jaccard dari dua signature"""
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+def find_root(parent, i):
+    """Union-find dengan path compression"""
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+def build_clusters(documents, threshold, bands, rows):
+    """Verifikasi kandidat LSH lalu gabungkan menjadi cluster"""
+    signatures = [doc['signature'] for doc in documents]
+    candidates = lsh_candidate_pairs(signatures, bands, rows)
+
+    parent = list(range(len(documents)))
+    pairs = []
+    for i, j in candidates:
+        similarity = estimate_jaccard(signatures[i], signatures[j])
+        if similarity >= threshold:
+            pairs.append((i, j, similarity))
+            root_i, root_j = find_root(parent, i), find_root(parent, j)
+            if root_i != root_j:
+                parent[root_j] = root_i
+
+    groups = defaultdict(list)
+    for i, j, similarity in pairs:
+        groups[find_root(parent, i)].append((i, j, similarity))
+
+    clusters = []
+    for cluster_pairs in groups.values():
+        members = sorted({i for i, _, _ in cluster_pairs} | {j for _, j, _ in cluster_pairs})
+        # Simpan naskah terpanjang, sisanya kandidat untuk di-drop
+        keep = max(members, key=lambda m: documents[m]['tokens'])
+        clusters.append({
+            'size': len(members),
+            'keep': documents[keep]['path'],
+            'drop': [documents[m]['path'] for m in members if m != keep],
+            'members': [
+                {
+                    'path': documents[m]['path'],
+                    'category': documents[m]['category'],
+                    'subcategory': documents[m]['subcategory'],
+                    'title': documents[m]['title'],
+                    'url': documents[m]['url'],
+                    'tokens': documents[m]['tokens'],
+                }
+                for m in members
+            ],
+            'pairs': [
+                {
+                    'a': documents[i]['path'],
+                    'b': documents[j]['path'],
+                    'similarity': round(similarity, 3),
+                }
+                for i, j, similarity in sorted(cluster_pairs, key=lambda p: -p[2])
+            ],
+        })
+
+    clusters.sort(key=lambda c: -c['size'])
+    return clusters, len(candidates)
+
+# ==================== MAIN ====================
+
+def detect_near_duplicates(threshold=DEFAULT_THRESHOLD, shingle_size=DEFAULT_SHINGLE_SIZE,
+                           num_perm=DEFAULT_NUM_PERM, workers=None, source=BASE_DIR):
+    """Jalankan deteksi hampir duplikat di seluruh korpus (folder atau file .pack)"""
+    if not os.path.exists(source):
+        print(f"❌ {source} tidak ditemukan!")
+        return None
+
+    bands, rows = optimal_bands(threshold, num_perm)
+
+    print(f"\n{'='*80}")
+    print(f"🧬 DETEKSI NASKAH HAMPIR DUPLIKAT (MinHash + LSH)")
+    print(f"{'='*80}")
+    print(f"   Threshold Jaccard : {threshold}")
+    print(f"   Shingle           : {shingle_size} kata")
+    print(f"   Signature         : {num_perm} permutasi ({bands} band x {rows} baris)\n")
+
+    documents = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(num_perm, shingle_size)) as executor:
+        tasks = []
+        for category_name, subcategory_name, records in CorpusReader(source).subcategories():
+            for i in range(0, len(records), FILES_PER_TASK):
+                future = executor.submit(compute_signatures, records[i:i + FILES_PER_TASK])
+                tasks.append((category_name, subcategory_name, future))
+
+        for category_name, subcategory_name, future in tasks:
+            for doc in future.result():
+                doc['category'] = category_name
+                doc['subcategory'] = subcategory_name
+                documents.append(doc)
+
+    print(f"📄 Signature dihitung untuk {len(documents):,} naskah")
+
+    clusters, candidate_count = build_clusters(documents, threshold, bands, rows)
+    redundant = sum(len(c['drop']) for c in clusters)
+    redundant_tokens = sum(
+        member['tokens']
+        for c in clusters for member in c['members'] if member['path'] != c['keep']
+    )
+
+    print(f"🔎 Kandidat LSH     : {candidate_count:,} pasangan")
+    print(f"🧩 Cluster duplikat : {len(clusters):,}")
+    print(f"🗑️  Naskah redundan  : {redundant:,} ({redundant_tokens:,} token)")
+
+    for cluster in clusters[:10]:
+        print(f"\n   • {cluster['size']} naskah, simpan: {os.path.basename(cluster['keep'])}")
+        for member in cluster['members'][:5]:
+            print(f"       - {member['subcategory']}: {member['title'][:60]}")
+
+    result = {
+        'threshold': threshold,
+        'shingle_size': shingle_size,
+        'num_perm': num_perm,
+        'bands': bands,
+        'rows': rows,
+        'total_manuscripts': len(documents),
+        'candidate_pairs': candidate_count,
+        'redundant_manuscripts': redundant,
+        'redundant_tokens': redundant_tokens,
+        'clusters': clusters,
+    }
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2, ensure_ascii=False)
+
+    print(f"\n💾 Hasil tersimpan di: {OUTPUT_FILE}")
+    return result
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Deteksi naskah hampir duplikat di korpus sastra.org")
+    parser.add_argument('--source', default=BASE_DIR,
+                        help=f"Folder corpus atau file .pack (default: {BASE_DIR})")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Estimasi Jaccard minimum (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--shingle-size', type=int, default=DEFAULT_SHINGLE_SIZE,
+                        help=f"Jumlah kata per shingle (default: {DEFAULT_SHINGLE_SIZE})")
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM,
+                        help=f"Panjang signature MinHash (default: {DEFAULT_NUM_PERM})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah worker process (default: jumlah CPU)")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    detect_near_duplicates(
+        threshold=args.threshold,
+        shingle_size=args.shingle_size,
+        num_perm=args.num_perm,
+        workers=args.workers,
+        source=args.source,
+    )
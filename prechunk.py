@@ -0,0 +1,328 @@
+"""
+Pre-chunking Naskah untuk Backend (paralel)
+Memecah naskah menjadi chunk berbasis kalimat dengan batas token & overlap yang
+sama persis dengan backend/src/services/chunker.js, lalu menulis JSONL siap
+ingest. Setiap chunk punya ID stabil (`ms_<ID>_chunk_<n>`) dan contentHash
+(sha256), sehingga ingestion bisa melewati chunk yang tidak berubah.
+
+Metadata (judul, pengarang, tahun, ID) dan pembersihan header mengikuti
+manuscriptLoader.js agar manuscriptId identik dengan hasil backend: metadata
+listing di header naskah dipakai lebih dulu, parsing nama file sebagai fallback.
+
+Output:
+    data_chunks/<Kategori>/<Sub-kategori>.jsonl
+    data_chunks/manifest.json    - hash per naskah, untuk skip naskah yang tidak berubah
+
+CARA PAKAI:
+    python prechunk.py
+    python prechunk.py --max-tokens 1000 --overlap 200 --workers 8
+    python prechunk.py --force          # proses ulang semua naskah
+    python prechunk.py --source corpus.pack
+"""
+
+import os
+import re
+import json
+import math
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import BASE_DIR, HEADER_SEPARATOR, CorpusReader, as_record
+
+# ==================== KONFIGURASI ====================
+
+OUTPUT_DIR = "data_chunks"
+MANIFEST_FILE = os.path.join(OUTPUT_DIR, "manifest.json")
+
+# Samakan dengan config.chunking di backend/src/config/index.js
+MAX_TOKENS = 1000
+OVERLAP_TOKENS = 200
+MIN_TEXT_LENGTH = 100  # manuscriptLoader.scanDirectory membuang teks <= 100 karakter
+
+SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+HEADER_PREFIXES = ('Judul:', 'URL:', 'Pencarian Teks', 'Terakhir diubah:')
+HEADER_MAX_LINES = 20
+
+# ==================== PORT DARI BACKEND ====================
+
+def js_length(text):
+    """Panjang string versi JavaScript (jumlah code unit UTF-16)"""
+    return len(text.encode('utf-16-le')) // 2
+
+def count_tokens(text):
+    """Sama dengan tokenCounter.countTokens: ceil(panjang / 4)"""
+    return math.ceil(js_length(text) / 4) if text else 0
+
+def parse_filename(filename):
+    """Sama dengan manuscriptLoader.parseFilename: "0001_Judul, Pengarang, Tahun, #ID.txt" """
+    name = filename.replace('.txt', '', 1)
+    parts = name.split('_')
+    if len(parts) < 2:
+        return {'title': name, 'author': 'Tidak Diketahui', 'year': None, 'sourceId': None}
+
+    meta_parts = [p.strip() for p in '_'.join(parts[1:]).split(',')]
+    return {
+        'title': meta_parts[0] or name,
+        'author': meta_parts[1] if len(meta_parts) > 1 and meta_parts[1] else 'Tidak Diketahui',
+        'year': meta_parts[2] if len(meta_parts) > 2 and meta_parts[2] else None,
+        'sourceId': meta_parts[3].replace('#', '', 1).strip() if len(meta_parts) > 3 and meta_parts[3] else None,
+    }
+
+def parse_header(lines):
+    """Sama dengan manuscriptLoader.parseHeader: (header dict, index baris pertama isi)"""
+    header = {}
+    for idx, line in enumerate(lines[:HEADER_MAX_LINES]):
+        if line.startswith(HEADER_SEPARATOR):
+            return header, idx + 1
+        key, sep, value = line.partition(': ')
+        if not sep:
+            break
+        header[key] = value.strip()
+    return {}, 0
+
+def parse_content(content):
+    """Sama dengan manuscriptLoader.parseContent: ambil URL, header & buang baris header"""
+    lines = content.split('\n')
+    header, body_start = parse_header(lines)
+    url = header.get('URL') or None
+    if not url:
+        for line in lines[:5]:
+            if line.startswith('URL:') or line.startswith('https://www.sastra.org'):
+                url = line.replace('URL:', '', 1).strip()
+                break
+
+    window_end = max(10, body_start + 7)
+    text_lines = [
+        line for idx, line in enumerate(lines)
+        if idx >= body_start
+        and (idx >= window_end or not (line.startswith(HEADER_PREFIXES) or '====' in line))
+    ]
+    return url, '\n'.join(text_lines).strip(), header
+
+def split_into_sentences(text):
+    """Sama dengan Chunker.splitIntoSentences"""
+    return [s for s in SENTENCE_SPLIT.split(text) if s.strip()]
+
+def chunk_text(manuscript, max_tokens=MAX_TOKENS, overlap_tokens=OVERLAP_TOKENS):
+    """Port Chunker.chunkText: chunk kalimat dengan batas token & overlap"""
+    chunks = []
+    current, current_tokens = [], 0
+
+    def emit():
+        text = ' '.join(current)
+        chunk_index = len(chunks)
+        chunks.append({
+            'id': f"{manuscript['manuscriptId']}_chunk_{chunk_index}",
+            'manuscriptId': manuscript['manuscriptId'],
+            'title': manuscript['title'],
+            'author': manuscript['author'],
+            'year': manuscript['year'],
+            'url': manuscript['sourceUrl'],
+            'category': manuscript['category'],
+            'chunkIndex': chunk_index,
+            'chunkText': text,
+            'tokenCount': current_tokens,
+            'contentHash': hashlib.sha256(text.encode('utf-8')).hexdigest(),
+        })
+
+    for sentence in split_into_sentences(manuscript['fullText']):
+        sentence_tokens = count_tokens(sentence)
+
+        if current_tokens + sentence_tokens > max_tokens and current:
+            emit()
+            # Overlap: ambil kalimat terakhir selama total <= overlap_tokens
+            overlap, overlap_count = [], 0
+            for s in reversed(current):
+                t = count_tokens(s)
+                if overlap_count + t > overlap_tokens:
+                    break
+                overlap.insert(0, s)
+                overlap_count += t
+            current, current_tokens = overlap, overlap_count
+
+        current.append(sentence)
+        current_tokens += sentence_tokens
+
+    if current:
+        emit()
+    return chunks
+
+# ==================== PIPELINE ====================
+
+def load_manuscript(source, category):
+    """Load naskah (path file atau corpus.ManuscriptRecord) seperti manuscriptLoader.loadManuscript
+    (None jika terlalu pendek)"""
+    record = as_record(source)
+    raw = record.read_bytes()
+    filename = record.filename
+    meta = parse_filename(filename)
+    url, full_text, header = parse_content(raw.decode('utf-8'))
+
+    if js_length(full_text) <= MIN_TEXT_LENGTH:
+        return None, hashlib.sha256(raw).hexdigest()
+
+    base_name = filename[:-len('.txt')] if filename.endswith('.txt') else filename
+    manuscript = {
+        'manuscriptId': f"ms_{meta['sourceId'] or base_name}",
+        # Metadata listing di header lebih dulu, nama file untuk naskah lama
+        'title': header.get('Judul singkat') or meta['title'],
+        'author': header.get('Penulis') or meta['author'],
+        'year': header.get('Tahun') or meta['year'],
+        'sourceUrl': url,
+        'fullText': full_text,
+        'category': category,
+    }
+    return manuscript, hashlib.sha256(raw).hexdigest()
+
+def chunk_manuscript(source, category, max_tokens=MAX_TOKENS, overlap_tokens=OVERLAP_TOKENS):
+    """Chunk satu naskah (path atau record); bisa dipanggil langsung setelah save_manuscript"""
+    manuscript, file_hash = load_manuscript(source, category)
+    chunks = chunk_text(manuscript, max_tokens, overlap_tokens) if manuscript else []
+    return chunks, file_hash
+
+def chunk_files(records, category, max_tokens, overlap_tokens):
+    """Worker: chunk sekumpulan corpus.ManuscriptRecord, return [(path, hash, chunks)]"""
+    results = []
+    for record in records:
+        try:
+            chunks, file_hash = chunk_manuscript(record, category, max_tokens, overlap_tokens)
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"  ❌ Error chunking {record.path}: {e}")
+            continue
+        results.append((record.path, file_hash, chunks))
+    return results
+
+def load_manifest():
+    """Load manifest hash naskah dari run sebelumnya"""
+    if os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {'settings': {}, 'manuscripts': {}}
+
+def read_existing_chunks(output_file):
+    """Baca chunk lama per path naskah (untuk naskah yang tidak berubah)"""
+    existing = {}
+    if os.path.exists(output_file):
+        with open(output_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                chunk = json.loads(line)
+                existing.setdefault(chunk['sourcePath'], []).append(chunk)
+    return existing
+
+def prechunk_corpus(max_tokens=MAX_TOKENS, overlap_tokens=OVERLAP_TOKENS, workers=None, force=False,
+                    source=BASE_DIR):
+    """Chunk seluruh korpus (folder atau file .pack) ke data_chunks/ (naskah yang tidak berubah dilewati)"""
+    if not os.path.exists(source):
+        print(f"❌ {source} tidak ditemukan!")
+        return
+
+    manifest = load_manifest()
+    settings = {'maxTokens': max_tokens, 'overlapTokens': overlap_tokens}
+    if manifest['settings'] != settings:
+        # Setelan chunking berubah: semua chunk lama tidak valid
+        force = True
+    previous = {} if force else manifest['manuscripts']
+    manuscripts = {}
+
+    print(f"\n{'='*80}")
+    print(f"✂️  PRE-CHUNKING NASKAH (max {max_tokens} token, overlap {overlap_tokens})")
+    print(f"{'='*80}\n")
+
+    total_chunks = total_reused = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        jobs = []
+        for category_name, subcategory_name, records in CorpusReader(source).subcategories():
+            # Folder naskah dari record (pack: path semu <file.pack>/Kategori/Sub)
+            subcategory_path = os.path.dirname(records[0].path) if records else None
+            filepaths = [record.path for record in records]
+            # Cek cepat via ukuran + mtime, baru dihitung ulang kalau berbeda
+            output_file = os.path.join(OUTPUT_DIR, category_name, f"{subcategory_name}.jsonl")
+            signatures = {record.path: record.signature() for record in records}
+            changed = [
+                record for record in records
+                if not os.path.exists(output_file)
+                or previous.get(record.path, {}).get('stat') != signatures[record.path]
+            ]
+            futures = [
+                executor.submit(chunk_files, changed[i:i + 16], category_name, max_tokens, overlap_tokens)
+                for i in range(0, len(changed), 16)
+            ]
+            jobs.append((category_name, subcategory_name, subcategory_path, filepaths, signatures, futures))
+
+        for category_name, subcategory_name, subcategory_path, filepaths, signatures, futures in jobs:
+            output_file = os.path.join(OUTPUT_DIR, category_name, f"{subcategory_name}.jsonl")
+            fresh = {}
+            for future in futures:
+                for filepath, file_hash, chunks in future.result():
+                    fresh[filepath] = (file_hash, chunks)
+
+            previous_count = sum(1 for p in previous if os.path.dirname(p) == subcategory_path)
+            if not fresh and previous_count == len(filepaths) and os.path.exists(output_file):
+                # Tidak ada yang berubah di sub-kategori ini
+                for p in filepaths:
+                    manuscripts[p] = previous[p]
+                total_reused += sum(previous[p]['chunks'] for p in filepaths)
+                continue
+
+            existing = read_existing_chunks(output_file)
+            lines = []
+            reused = 0
+            for filepath in filepaths:
+                if filepath in fresh:
+                    file_hash, chunks = fresh[filepath]
+                    # Chunk dengan ID & hash yang sama dengan versi lama tidak perlu di-embed ulang
+                    old_hashes = {c['id']: c['contentHash'] for c in existing.get(filepath, [])}
+                    reused += sum(1 for c in chunks if old_hashes.get(c['id']) == c['contentHash'])
+                elif filepath in existing:
+                    file_hash, chunks = previous[filepath]['hash'], existing[filepath]
+                    reused += len(chunks)
+                else:
+                    continue
+
+                for chunk in chunks:
+                    chunk['sourcePath'] = filepath
+                    lines.append(json.dumps(chunk, ensure_ascii=False) + '\n')
+                manuscripts[filepath] = {
+                    'hash': file_hash,
+                    'stat': signatures[filepath],
+                    'chunks': len(chunks),
+                }
+
+            os.makedirs(os.path.dirname(output_file), exist_ok=True)
+            with open(output_file + '.tmp', 'w', encoding='utf-8') as f:
+                f.writelines(lines)
+            os.replace(output_file + '.tmp', output_file)
+
+            total_chunks += len(lines) - reused
+            total_reused += reused
+            print(f"   • {category_name} / {subcategory_name}: {len(lines):,} chunk "
+                  f"({len(lines) - reused:,} baru)")
+
+    manifest = {'settings': settings, 'manuscripts': manuscripts}
+    # Corpus kosong / --flat: belum ada file chunk yang membuat OUTPUT_DIR
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, ensure_ascii=False)
+
+    print(f"\n✅ Selesai: {total_chunks:,} chunk baru, {total_reused:,} chunk tidak berubah")
+    print(f"📁 Output: {OUTPUT_DIR}/")
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Pre-chunking naskah untuk ingestion backend")
+    parser.add_argument('--source', default=BASE_DIR,
+                        help=f"Folder corpus atau file .pack (default: {BASE_DIR})")
+    parser.add_argument('--max-tokens', type=int, default=MAX_TOKENS,
+                        help=f"Batas token per chunk (default: {MAX_TOKENS})")
+    parser.add_argument('--overlap', type=int, default=OVERLAP_TOKENS,
+                        help=f"Token overlap antar chunk (default: {OVERLAP_TOKENS})")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Jumlah worker process (default: jumlah CPU)")
+    parser.add_argument('--force', action='store_true',
+                        help="Proses ulang semua naskah walaupun tidak berubah")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    prechunk_corpus(args.max_tokens, args.overlap, args.workers, args.force, args.source)
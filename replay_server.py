@@ -0,0 +1,306 @@
+"""
+Replay Server Lokal Pengganti sastra.org
+Server HTTP lokal untuk benchmark dan uji scraper tanpa membebani sastra.org.
+
+Yang dilayani:
+    /sastra/koleksi/koleksi.inx.php?param=...   listing AJAX (format baris sama
+                                                 dengan debug_response.html)
+    /<kategori>/<sub-kategori>/<id>-<slug>      halaman naskah (h1 + div.item-page)
+
+Respons rekaman dipakai jika ada di --fixtures DIR:
+    listing_<fs>_<ps>.html   respons koleksi.inx.php (mis. debug_response.html)
+    manuscript_<id>.html     halaman naskah
+URL https://www.sastra.org di dalam rekaman ditulis ulang ke alamat server.
+Jika tidak ada rekaman, respons disintesis secara deterministik (--seed):
+ukuran sub-kategori dibuat timpang seperti situs aslinya (atau rata dengan
+--items), dan panjang naskah mengikuti kolom "Jumlah kata" di listing.
+
+Gangguan yang bisa dikonfigurasi:
+    --latency-ms / --jitter-ms   jeda sebelum respons
+    --error-rate                 proporsi respons 503
+    --throttle-rps               di atas laju ini server membalas 429 + Retry-After
+
+CARA PAKAI:
+    python replay_server.py --port 8765 --latency-ms 50 --error-rate 0.01
+    python scraper_cli.py scrape --fs 42 --base-url http://127.0.0.1:8765
+"""
+
+import os
+import re
+import json
+import time
+import random
+import argparse
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scraper_engine import AJAX_PATH, BASE_URL, CATEGORIES, slugify
+
+# ==================== KONFIGURASI ====================
+
+DEFAULT_PORT = 8765
+LISTING_TEMPLATE_FILE = "debug_response.html"
+
+MIN_ITEMS = 3            # Ukuran sub-kategori sintetis minimal
+MAX_ITEMS = 600          # Ukuran sub-kategori sintetis maksimal
+MIN_WORDS = 500
+MAX_WORDS = 15_000
+
+WORDS = (
+    "ingkang sampun punika kangjeng sinuhun kawula gusti ratu nagari tanah jawi "
+    "sang prabu pupuh dhandhanggula sinom asmarandana kinanthi pangkur durma "
+    "mijil maskumambang pocung gambuh megatruh wonten ing mangke lajeng ngandika"
+).split()
+
+ROW_TEMPLATE = (
+    "<tr><td><a class=\"ysl-lnk\" href='{href}' title=\"Koleksi #{id}\">{title}.</a> "
+    "Kategori:&#xA0;{category} > {subcategory}. "
+    "<span class=\"ysl-wrp-rmv\">Tanggal diunggah: {uploaded}.</span> "
+    "<span class=\"ysl-wrp-rmv\">Jumlah kata: {words}.</span> "
+    "<span class=\"ysl-wrp-rmv\">Berapa kali dibuka: {views}.</span></td></tr>"
+)
+
+MANUSCRIPT_TEMPLATE = (
+    "<!DOCTYPE html><html lang=\"jv\"><head><meta charset=\"utf-8\"><title>{title}</title>"
+    "<script>window.dataLayer = window.dataLayer || [];</script></head><body>"
+    "<nav class=\"menu\"><a href=\"/\">Beranda</a> <a href=\"/koleksi\">Koleksi</a></nav>"
+    "<h1>{title}</h1><div class=\"item-page\"><p>Pencarian Teks</p>{body}"
+    "<script>var ysl_id = {id};</script></div>"
+    "<footer>Yayasan Sastra Lestari</footer></body></html>"
+)
+
+MONTHS = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
+
+# ==================== DATA SINTETIS ====================
+
+class SyntheticSite:
+    """Isi situs deterministik: ukuran sub-kategori, baris listing, halaman naskah"""
+
+    def __init__(self, seed=0, items=None, base_url=''):
+        self.seed = seed
+        self.items = items
+        self.base_url = base_url
+        self.subcategories = {
+            subcategory['fs']: (category_name, subcategory['name'])
+            for category_name, category_data in CATEGORIES.items()
+            for subcategory in category_data['subcategories']
+        }
+
+    def size(self, fs):
+        """Jumlah naskah sub-kategori (distribusi Pareto: banyak kecil, sedikit sangat besar)"""
+        if self.items is not None:
+            return self.items
+        rng = random.Random(f"{self.seed}:size:{fs}")
+        return int(min(MAX_ITEMS, MIN_ITEMS * rng.paretovariate(0.8)))
+
+    def item_id(self, fs, position):
+        return fs * 100_000 + position
+
+    def words(self, item_id):
+        return random.Random(f"{self.seed}:words:{item_id}").randint(MIN_WORDS, MAX_WORDS)
+
+    def title(self, item_id):
+        return f"Serat {item_id}, Anonim, {1800 + item_id % 200}, #{item_id} (Jilid {item_id % 9 + 1:02d})"
+
+    def listing_rows(self, fs, offset, count):
+        category_name, subcategory_name = self.subcategories.get(fs, ('Lain-lain', f'Sub {fs}'))
+        path = f"/{slugify(category_name)}/{slugify(subcategory_name)}"
+        rows = []
+        for position in range(offset, min(offset + count, self.size(fs))):
+            item_id = self.item_id(fs, position)
+            rng = random.Random(f"{self.seed}:row:{item_id}")
+            rows.append(ROW_TEMPLATE.format(
+                href=f"{self.base_url}{path}/{item_id}-serat-{item_id}",
+                id=item_id,
+                title=self.title(item_id),
+                category=category_name,
+                subcategory=subcategory_name,
+                uploaded=f"{rng.randint(1, 28):02d}-{rng.choice(MONTHS)}-{rng.randint(2008, 2024)}",
+                words=f"{self.words(item_id):,}".replace(',', '.'),
+                views=f"{rng.randint(10, 50_000):,}".replace(',', '.'),
+            ))
+        return ''.join(rows)
+
+    def manuscript(self, item_id):
+        rng = random.Random(f"{self.seed}:text:{item_id}")
+        words = self.words(item_id)
+        stanzas = []
+        for number in range(1, words // 40 + 2):
+            line = ' '.join(rng.choice(WORDS) for _ in range(min(40, words)))
+            stanzas.append(f"<p>{number}. {line}</p>")
+        return MANUSCRIPT_TEMPLATE.format(title=self.title(item_id), body=''.join(stanzas), id=item_id)
+
+def load_listing_chrome(path=LISTING_TEMPLATE_FILE):
+    """(prefix, suffix) di sekitar <tbody> rekaman listing, fallback tabel polos"""
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        start, end = content.find('<tbody>'), content.find('</tbody>')
+        if start != -1 and end != -1:
+            return content[:start + len('<tbody>')], content[end:]
+    return '<table class="ysl-tbl"><tbody>', '</tbody></table>'
+
+# ==================== SERVER ====================
+
+class TokenBucket:
+    """Throttle sisi server: token bucket `rate` request/detik (burst = rate)"""
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Header dan body ditulis terpisah; tanpa ini Nagle + delayed ACK menambah ~40ms
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_body(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.count('requests')
+        if server.throttle and not server.throttle.take():
+            server.count('throttled')
+            return self.send_body(429, b'Too Many Requests', {'Retry-After': '1'})
+
+        delay = server.latency + server.rng_uniform(0, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if server.error_rate and server.rng_uniform(0, 1) < server.error_rate:
+            server.count('errors')
+            return self.send_body(503, b'Service Unavailable')
+
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path == AJAX_PATH:
+            body = server.listing(urllib.parse.parse_qs(parsed.query))
+        else:
+            match = re.search(r'/(\d+)-[^/]*$', parsed.path)
+            body = server.manuscript(int(match.group(1))) if match else None
+
+        if body is None:
+            server.count('not_found')
+            return self.send_body(404, b'Not Found')
+        server.count('bytes', len(body))
+        self.send_body(200, body)
+
+class ReplayServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer dengan rekaman/sintesis respons dan injeksi gangguan"""
+
+    daemon_threads = True
+
+    def __init__(self, port=DEFAULT_PORT, host='127.0.0.1', fixtures=None, items=None, seed=0,
+                 latency_ms=0, jitter_ms=0, error_rate=0.0, throttle_rps=None, verbose=False):
+        super().__init__((host, port), ReplayHandler)
+        self.base_url = f"http://{host}:{self.server_address[1]}"
+        self.fixtures = fixtures
+        self.site = SyntheticSite(seed, items, self.base_url)
+        self.chrome = load_listing_chrome()
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.throttle = TokenBucket(throttle_rps) if throttle_rps else None
+        self.verbose = verbose
+        self.stats = {'requests': 0, 'throttled': 0, 'errors': 0, 'not_found': 0, 'bytes': 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count(self, field, amount=1):
+        with self._lock:
+            self.stats[field] += amount
+
+    def rng_uniform(self, low, high):
+        with self._lock:
+            return self._rng.uniform(low, high)
+
+    def recorded(self, name):
+        """Respons rekaman dari --fixtures (host sastra.org ditulis ulang ke server ini)"""
+        if not self.fixtures:
+            return None
+        path = os.path.join(self.fixtures, name)
+        if not os.path.exists(path):
+            return None
+        with open(path, 'rb') as f:
+            return f.read().replace(BASE_URL.encode(), self.base_url.encode())
+
+    def listing(self, query):
+        try:
+            koleksi = json.loads(query['param'][0])['koleksi']
+            fs, offset, count = int(koleksi['fs']), int(koleksi['ps']), int(koleksi['nr'])
+        except (KeyError, ValueError, IndexError):
+            return None
+        recorded = self.recorded(f"listing_{fs}_{offset}.html")
+        if recorded is not None:
+            return recorded
+        prefix, suffix = self.chrome
+        return (prefix + self.site.listing_rows(fs, offset, count) + suffix).encode('utf-8')
+
+    def manuscript(self, item_id):
+        recorded = self.recorded(f"manuscript_{item_id}.html")
+        if recorded is not None:
+            return recorded
+        return self.site.manuscript(item_id).encode('utf-8')
+
+    def start_background(self):
+        """Jalankan di thread daemon (untuk uji in-process), return base URL"""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self.base_url
+
+# ==================== MAIN ====================
+
+def add_server_arguments(parser):
+    parser.add_argument('--host', default='127.0.0.1', help="Alamat bind (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"Port (default: {DEFAULT_PORT}, 0 = bebas)")
+    parser.add_argument('--fixtures', default=None, help="Folder respons rekaman (listing_<fs>_<ps>.html, ...)")
+    parser.add_argument('--items', type=int, default=None,
+                        help="Jumlah naskah setiap sub-kategori (default: timpang, deterministik)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed data sintetis & gangguan (default: 0)")
+    parser.add_argument('--latency-ms', type=float, default=0, help="Latensi dasar per respons (ms)")
+    parser.add_argument('--jitter-ms', type=float, default=0, help="Tambahan latensi acak 0..N ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Proporsi respons 503 (0-1)")
+    parser.add_argument('--throttle-rps', type=float, default=None, help="Batas request/detik sebelum 429")
+
+def server_from_args(args, verbose=False):
+    return ReplayServer(
+        port=args.port, host=args.host, fixtures=args.fixtures, items=args.items, seed=args.seed,
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        throttle_rps=args.throttle_rps, verbose=verbose,
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay server lokal pengganti sastra.org")
+    add_server_arguments(parser)
+    parser.add_argument('--verbose', action='store_true', help="Log setiap request")
+    args = parser.parse_args()
+
+    server = server_from_args(args, args.verbose)
+    # Baris pertama stdout = base URL (dipakai scraper_bench.py saat --port 0)
+    print(server.base_url, flush=True)
+    print(f"🛰️  Replay server berjalan di {server.base_url} (Ctrl+C untuk berhenti)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n📊 {server.stats}")
@@ -0,0 +1,290 @@
+"""
+Benchmark End-to-End Scraper
+Menjalankan scraper_engine.Scraper terhadap replay_server.py lokal (bukan
+sastra.org) untuk beberapa skenario gangguan, lalu melaporkan:
+
+    pages/s          request listing + naskah per detik (wall clock)
+    p50 / p99        latensi per request dari sisi scraper
+    CPU/page         waktu CPU (user + sys) proses scraper per request
+    peak RSS         memori puncak proses scraper
+    bytes written    total ukuran corpus yang ditulis
+
+Server dijalankan sebagai subprocess dan setiap skenario di proses anak
+sendiri, sehingga CPU dan RSS yang terukur hanya milik scraper. Hasil
+ditambahkan ke bench_results.jsonl (beserta versi git) dan dibandingkan
+dengan hasil terakhir untuk skenario & parameter yang sama; penurunan lebih
+dari REGRESSION_TOLERANCE ditandai sebagai regresi.
+
+CARA PAKAI:
+    python scraper_bench.py                                  # semua skenario
+    python scraper_bench.py --scenario baseline flaky --workers 8 --items 100
+    python scraper_bench.py --repeat 3 --fail-on-regression  # untuk CI
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+import argparse
+import subprocess
+import contextlib
+import multiprocessing
+from datetime import datetime
+
+# ==================== KONFIGURASI ====================
+
+BENCH_RESULTS_FILE = "bench_results.jsonl"
+REGRESSION_TOLERANCE = 0.10  # 10%
+DEFAULT_SUBCATEGORIES = [42, 46, 30]
+
+SCENARIOS = {
+    'baseline':  {'latency_ms': 20, 'jitter_ms': 10},
+    'slow':      {'latency_ms': 150, 'jitter_ms': 150},
+    'flaky':     {'latency_ms': 20, 'jitter_ms': 10, 'error_rate': 0.05},
+    'throttled': {'latency_ms': 20, 'jitter_ms': 10, 'throttle_rps': 25},
+}
+
+# (metrik, arah yang lebih baik): 1 = makin besar makin baik, -1 = makin kecil makin baik
+TRACKED_METRICS = [
+    ('pages_per_sec', 1),
+    ('latency_p50_ms', -1),
+    ('latency_p99_ms', -1),
+    ('cpu_ms_per_page', -1),
+    ('peak_rss_mb', -1),
+]
+
+# ==================== HELPER ====================
+
+def percentile(values, fraction):
+    """Nearest-rank percentile"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[rank]
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: byte
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def git_version():
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def directory_bytes(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path) for name in names
+    )
+
+# ==================== SERVER ====================
+
+def start_server(scenario, items, seed):
+    """Jalankan replay_server.py di port bebas, return (process, base_url)"""
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'replay_server.py'),
+               '--port', '0', '--seed', str(seed)]
+    if items is not None:
+        command += ['--items', str(items)]
+    for option, value in SCENARIOS[scenario].items():
+        command += [f"--{option.replace('_', '-')}", str(value)]
+
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    base_url = process.stdout.readline().strip()
+    if not base_url.startswith('http'):
+        process.kill()
+        raise RuntimeError(f"replay server gagal start: {base_url!r}")
+    return process, base_url
+
+# ==================== PENGUKURAN ====================
+
+def run_scenario(base_url, subcategories, workers, listing):
+    """Proses anak: jalankan Scraper end-to-end, return metrik"""
+    import tempfile
+    import resource
+    from scraper_engine import Scraper, select_subcategories
+
+    with tempfile.TemporaryDirectory() as tmp:
+        scraper = Scraper(
+            output_dir=os.path.join(tmp, 'corpus'), listing=listing, workers=workers,
+            delay=0, page_delay=0, category_delay=0, resume=False,
+            progress_file=os.path.join(tmp, 'progress.json'),
+            log_file=os.path.join(tmp, 'log.csv'), base_url=base_url,
+            listing_checkpoint_dir=os.path.join(tmp, 'listing_checkpoints'),
+        )
+
+        latencies = []
+        failures = [0]
+        stream = scraper.fetcher.stream
+
+        @contextlib.contextmanager
+        def timed_stream(url, limiter=None, *args, **kwargs):
+            # Latensi = sampai body selesai dibaca (tanpa menunggu rate limiter)
+            if limiter:
+                limiter.wait()
+            start = time.perf_counter()
+            fetched = False
+            try:
+                with stream(url, None, *args, **kwargs) as result:
+                    fetched = True
+                    latencies.append(time.perf_counter() - start)
+                    yield result
+            except Exception:
+                if not fetched:
+                    failures[0] += 1
+                    latencies.append(time.perf_counter() - start)
+                raise
+
+        # Fetcher.get juga lewat stream(), jadi listing & naskah sama-sama terukur
+        scraper.fetcher.stream = timed_stream
+        selection = select_subcategories(fs=subcategories)
+
+        usage_start = resource.getrusage(resource.RUSAGE_SELF)
+        wall_start = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            results = scraper.run(selection)
+        wall = time.perf_counter() - wall_start
+        usage_end = resource.getrusage(resource.RUSAGE_SELF)
+
+        cpu = (usage_end.ru_utime - usage_start.ru_utime) + (usage_end.ru_stime - usage_start.ru_stime)
+        pages = len(latencies)
+        return {
+            'pages': pages,
+            'manuscripts': sum(r['success'] for r in results),
+            'failed_requests': failures[0],
+            'wall_seconds': round(wall, 3),
+            'pages_per_sec': round(pages / wall, 2) if wall else 0,
+            'latency_p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+            'latency_p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+            'cpu_ms_per_page': round(cpu / pages * 1000, 3) if pages else 0,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'bytes_written': directory_bytes(os.path.join(tmp, 'corpus')),
+        }
+
+def measure(scenario, subcategories, workers, listing, items, seed):
+    """Satu pengukuran: server subprocess + scraper di proses anak baru"""
+    process, base_url = start_server(scenario, items, seed)
+    try:
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(1) as pool:
+            return pool.apply(run_scenario, (base_url, subcategories, workers, listing))
+    finally:
+        process.terminate()
+        process.wait()
+
+def median_metrics(runs):
+    """Median per metrik numerik dari beberapa pengulangan"""
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+# ==================== HASIL & REGRESI ====================
+
+def load_results(results_file=BENCH_RESULTS_FILE):
+    if not os.path.exists(results_file):
+        return []
+    with open(results_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def compare(previous, metrics, tolerance=REGRESSION_TOLERANCE):
+    """Daftar (metrik, lama, baru, perubahan, regresi?)"""
+    rows = []
+    for metric, direction in TRACKED_METRICS:
+        old, new = previous['metrics'].get(metric), metrics.get(metric)
+        if not old or new is None:
+            continue
+        change = (new - old) / old
+        rows.append((metric, old, new, change, change * direction < -tolerance))
+    return rows
+
+def print_result(record, previous):
+    metrics = record['metrics']
+    print(f"\n📊 {record['scenario']} ({record['params']['workers']} worker, "
+          f"{metrics['pages']:,} request, {metrics['manuscripts']:,} naskah)")
+    print(f"   pages/s        : {metrics['pages_per_sec']:,.2f}")
+    print(f"   latensi p50/p99: {metrics['latency_p50_ms']:.1f} / {metrics['latency_p99_ms']:.1f} ms")
+    print(f"   CPU/page       : {metrics['cpu_ms_per_page']:.3f} ms")
+    print(f"   peak RSS       : {metrics['peak_rss_mb']:.1f} MB")
+    print(f"   bytes written  : {metrics['bytes_written']:,}")
+    print(f"   request gagal  : {metrics['failed_requests']:,}")
+
+    regressions = []
+    if previous:
+        print(f"   vs {previous.get('version') or '?'} ({previous['timestamp']}):")
+        for metric, old, new, change, regressed in compare(previous, metrics):
+            flag = '⚠️  REGRESI' if regressed else ''
+            print(f"      {metric:<16} {old:>10,.2f} -> {new:>10,.2f} ({change * 100:+.1f}%) {flag}")
+            if regressed:
+                regressions.append(metric)
+        # Dengan request gagal, jumlah naskah tersimpan memang bisa berbeda
+        clean_runs = not previous['metrics'].get('failed_requests') and not metrics['failed_requests']
+        if clean_runs and previous['metrics'].get('bytes_written') != metrics['bytes_written']:
+            print(f"      ℹ️  bytes_written berubah (output ekstraksi berbeda)")
+    return regressions
+
+def run_benchmarks(scenarios, subcategories, workers, listing, items, seed, repeat,
+                   results_file=BENCH_RESULTS_FILE):
+    """Jalankan skenario, simpan hasil, return daftar regresi"""
+    history = load_results(results_file)
+    version = git_version()
+    regressions = []
+
+    print(f"\n{'='*80}")
+    print(f"🏁 BENCHMARK SCRAPER ({version or 'versi tidak diketahui'})")
+    print(f"{'='*80}")
+
+    for scenario in scenarios:
+        params = {'subcategories': subcategories, 'workers': workers, 'listing': listing,
+                  'items': items, 'seed': seed, 'server': SCENARIOS[scenario]}
+        runs = [measure(scenario, subcategories, workers, listing, items, seed) for _ in range(repeat)]
+        record = {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'version': version,
+            'python': platform.python_version(),
+            'scenario': scenario,
+            'params': params,
+            'repeat': repeat,
+            'metrics': median_metrics(runs),
+        }
+        previous = next((r for r in reversed(history)
+                         if r['scenario'] == scenario and r['params'] == params), None)
+        regressions.extend(f"{scenario}.{metric}" for metric in print_result(record, previous))
+
+        with open(results_file, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    print(f"\n💾 Hasil ditambahkan ke: {results_file}")
+    if regressions:
+        print(f"⚠️  Regresi: {', '.join(regressions)}")
+    return regressions
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Benchmark scraper end-to-end terhadap replay server lokal")
+    parser.add_argument('--scenario', nargs='+', choices=sorted(SCENARIOS), default=list(SCENARIOS),
+                        help="Skenario yang dijalankan (default: semua)")
+    parser.add_argument('--fs', type=int, nargs='+', default=DEFAULT_SUBCATEGORIES,
+                        help=f"Sub-kategori yang di-scrape (default: {DEFAULT_SUBCATEGORIES})")
+    parser.add_argument('--workers', type=int, default=4, help="Worker download (default: 4)")
+    parser.add_argument('--listing', default='ajax', help="Strategi listing (default: ajax)")
+    parser.add_argument('--items', type=int, default=50,
+                        help="Naskah per sub-kategori di replay server (default: 50)")
+    parser.add_argument('--seed', type=int, default=0, help="Seed replay server (default: 0)")
+    parser.add_argument('--repeat', type=int, default=1, help="Pengulangan per skenario, diambil median")
+    parser.add_argument('--results-file', default=BENCH_RESULTS_FILE,
+                        help=f"File hasil JSONL (default: {BENCH_RESULTS_FILE})")
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help="Exit code 1 jika ada regresi")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    found = run_benchmarks(args.scenario, args.fs, args.workers, args.listing, args.items,
+                           args.seed, max(1, args.repeat), args.results_file)
+    sys.exit(1 if found and args.fail_on_regression else 0)
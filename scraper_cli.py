@@ -0,0 +1,610 @@
+"""
+CLI Scraper Sastra.org (non-interaktif, aman untuk cron)
+
+CARA PAKAI:
+    python scraper_cli.py list                               # daftar kategori (fc) & sub-kategori (fs)
+    python scraper_cli.py scrape --all                       # semua kategori
+    python scraper_cli.py scrape --fc 11                     # satu kategori penuh
+    python scraper_cli.py scrape --fs 42 46 --workers 4 --delay 0.5
+    python scraper_cli.py scrape --fs 46 --listing limitstart --limit 100
+    python scraper_cli.py scrape --all --time-budget 2h --weight Babad=3   # jendela maintenance
+    python scraper_cli.py scrape --fs 42 --archive-dir warc   # simpan respons mentah (WARC)
+    python scraper_cli.py reextract --archive-dir warc        # ekstraksi ulang offline dari arsip
+    python scraper_cli.py scrape --fs 42 --profile            # + sampling profiler (flame graph per tahap)
+    python scraper_cli.py scrape --all --status-port 8787     # status live: crawl_status.json + HTTP lokal
+    python scraper_cli.py refresh --budget 500                # fetch ulang yang paling mungkin berubah
+
+Rencana crawl (estimasi ukuran sub-kategori + LPT, lihat crawl_schedule.py):
+    python scraper_cli.py plan --all --processes 4 --probe missing
+
+Crawl terdistribusi (antrian SQLite bersama, lihat crawl_queue.py):
+    python scraper_cli.py queue init --all --delay 2     # isi antrian + politeness budget global
+    python scraper_cli.py queue init --all --schedule --processes 4   # rentang offset + urutan LPT
+    python scraper_cli.py queue run --processes 4        # N worker lokal, lalu merge
+    python scraper_cli.py queue worker --workers 2       # worker tambahan (mesin lain, fs bersama)
+    python scraper_cli.py queue status
+    python scraper_cli.py queue merge                    # log + progress gabungan
+
+Pengganti script lama:
+    scraper.py                    -> scrape --fs 46 --listing start --limit 100
+    scraper_advanced.py           -> scrape --fs 46 --listing limitstart
+    scraper_ajax.py               -> scrape --fs 42
+    scraper_multi_kategori.py     -> scrape --fc 11
+    scraper_multi_kategori_all.py -> scrape --all
+
+Exit code 0 jika semua sub-kategori berhasil, 1 jika ada yang error.
+Setiap sub-perintah hanya meng-import modul yang dibutuhkannya.
+"""
+
+import os
+import sys
+import argparse
+
+# ==================== DEFAULT ====================
+# Salinan default modul pemilik agar membangun parser tidak meng-import modul tersebut
+
+QUEUE_DB = "crawl_queue.db"          # crawl_queue.QUEUE_DB
+WORKER_LOG_DIR = "crawl_logs"        # crawl_queue.WORKER_LOG_DIR
+QUEUE_BATCH_SIZE = 50                # crawl_queue.BATCH_SIZE
+ARCHIVE_DIR = "warc"                 # warc_archive.ARCHIVE_DIR
+BOILERPLATE_MODEL_FILE = "boilerplate_model.json"  # boilerplate.MODEL_FILE
+REFRESH_BUDGET = 200                 # crawl_refresh.REFRESH_BUDGET
+REFRESH_MIN_PROBABILITY = 0.05       # crawl_refresh.MIN_PROBABILITY
+
+# ==================== COMMANDS ====================
+
+def megabytes(value):
+    """MB dari argumen -> byte (0 = tanpa batas)"""
+    return int(value * 1024 * 1024) or None
+
+def cmd_list(args):
+    """Print daftar kategori & sub-kategori beserta fc/fs"""
+    from scraper_engine import CATEGORIES
+
+    for category_name, category_data in CATEGORIES.items():
+        print(f"📚 {category_name} (fc={category_data['fc']})")
+        for subcategory in category_data['subcategories']:
+            print(f"   • fs={subcategory['fs']:<3} {subcategory['name']}")
+    return 0
+
+def build_scraper(args, char_map=None):
+    """Scraper dari argumen add_scrape_arguments"""
+    from scraper_engine import Scraper
+
+    return Scraper(
+        output_dir=args.output_dir,
+        listing=args.listing,
+        workers=args.workers,
+        delay=args.delay,
+        page_delay=args.page_delay,
+        category_delay=args.category_delay,
+        max_manuscripts=args.limit,
+        flat=args.flat,
+        index_width=args.index_width,
+        resume=not args.no_resume,
+        progress_file=args.progress_file,
+        log_file=args.log_file,
+        base_url=args.base_url,
+        archive_dir=args.archive_dir,
+        max_body_bytes=megabytes(args.max_body_size),
+        memory_budget=megabytes(args.memory_budget),
+        catalog=not args.no_catalog,
+        normalize=not args.no_normalize,
+        char_map=char_map,
+        boilerplate_model=args.strip_boilerplate,
+        listing_retries=args.listing_retries,
+        listing_checkpoint_dir=args.listing_checkpoint_dir,
+        breaker_failures=args.breaker_failures,
+        breaker_cooldown=args.breaker_cooldown,
+    )
+
+def cmd_scrape(args):
+    """Scrape sub-kategori terpilih"""
+    from datetime import datetime
+    from crawl_state import FetchHistory
+    from scraper_engine import select_subcategories
+    from stage_profiler import PROFILER
+
+    selection = select_subcategories(args.fc, args.fs)
+    if not selection:
+        print("❌ Tidak ada sub-kategori yang cocok dengan --fc/--fs")
+        return 2
+    try:
+        char_map = read_char_map(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ --char-map: {e}")
+        return 2
+
+    scraper = build_scraper(args, char_map)
+    scraper.history = FetchHistory(args.history_file)
+
+    if args.time_budget:
+        from crawl_budget import BudgetCrawler, parse_duration, parse_weights
+        try:
+            time_budget = parse_duration(args.time_budget)
+            weights = parse_weights(args.weight)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 2
+        crawler = BudgetCrawler(scraper, time_budget, weights)
+
+    status_file = None if args.no_status else args.status_file
+    if status_file or args.status_port is not None:
+        from crawl_status import CrawlStatus
+        scraper.status = CrawlStatus(scraper, status_file, args.status_port, args.status_interval)
+
+    start_time = datetime.now()
+    print(f"""
+    {'='*80}
+    🚀 SASTRA.ORG SCRAPER
+    {'='*80}
+
+    📊 Sub-kategori : {len(selection)}
+    🔍 Listing      : {args.listing}
+    👷 Worker       : {args.workers}
+    ⚙️  Rate Limit   : {args.delay}s antar request
+    📁 Output       : {args.output_dir}/
+    📝 Log          : {args.log_file}
+
+    {'='*80}
+    """)
+
+    if scraper.status:
+        try:
+            scraper.status.start(len(selection), 'budget' if args.time_budget else 'scrape',
+                                 time_budget if args.time_budget else None)
+        except OSError as e:
+            print(f"❌ Status crawl: {e}")
+            return 2
+    if args.profile:
+        PROFILER.start_sampling(args.profile_interval / 1000)
+    completed = False
+    try:
+        results = crawler.run(selection) if args.time_budget else scraper.run(selection)
+        completed = True
+    finally:
+        if scraper.status:
+            scraper.status.close('finished' if completed else 'aborted')
+        if args.profile:
+            samples = PROFILER.stop_sampling(args.profile_output)
+            print(f"\n🔥 Profil: {samples:,} sampel -> {args.profile_output} (flamegraph.pl / speedscope)")
+        PROFILER.print_summary()
+        scraper.print_cleanup_summary()
+        if scraper.breaker and scraper.breaker.opens:
+            print(f"\n🔴 Circuit breaker terbuka {scraper.breaker.opens}x, "
+                  f"total jeda {scraper.breaker.state_info()['paused_seconds']:.0f}s")
+
+    duration = datetime.now() - start_time
+    errors = [r for r in results if r['status'] == 'ERROR']
+    print(f"""
+    {'='*80}
+    🎉 SCRAPING SELESAI!
+    {'='*80}
+
+    ⏱️  Durasi      : {duration}
+    📥 Naskah      : {sum(r['success'] for r in results)}/{sum(r['found'] for r in results)}
+    ❌ Error       : {len(errors)} sub-kategori
+    📁 Output      : {args.output_dir}/
+    📊 Log Detail  : {args.log_file}
+
+    {'='*80}
+    """)
+    return 1 if errors else 0
+
+def cmd_refresh(args):
+    """Fetch ulang naskah yang paling mungkin berubah, sebanyak budget request"""
+    from crawl_refresh import RefreshCrawler, plan_refresh, print_refresh_plan, print_refresh_summary, seed_history
+    from crawl_state import FetchHistory
+    from scraper_engine import select_subcategories, subcategory_key
+    from stage_profiler import PROFILER
+
+    history = FetchHistory(args.history_file)
+    if args.seed:
+        added = seed_history(history, args.output_dir)
+        history.save()
+        print(f"🌱 {added:,} naskah dari {args.output_dir}/ dicatat di {args.history_file}")
+
+    keys = None
+    if args.fc or args.fs:
+        keys = {subcategory_key(category_name, subcategory['name'])
+                for category_name, _, subcategory in select_subcategories(args.fc, args.fs)}
+    plan = plan_refresh(history.entries, args.budget, keys, args.min_probability)
+    print_refresh_plan(plan, args.budget)
+    if args.dry_run or not plan['items']:
+        return 0
+
+    try:
+        char_map = read_char_map(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ --char-map: {e}")
+        return 2
+    scraper = build_scraper(args, char_map)
+    scraper.history = history
+    try:
+        summary = RefreshCrawler(scraper).run(plan['items'])
+    finally:
+        PROFILER.print_summary()
+        scraper.print_cleanup_summary()
+    print_refresh_summary(summary)
+    return 1 if summary['failed'] else 0
+
+def build_schedule(args, selection):
+    """Estimasi ukuran + rencana LPT untuk --processes worker"""
+    from crawl_schedule import estimate_sizes, plan_tasks, print_plan
+    from scraper_engine import Scraper
+
+    scraper = None
+    if args.probe != 'none':
+        scraper = Scraper(listing=args.listing, page_delay=args.page_delay, base_url=args.base_url)
+        print(f"🔍 Estimasi ukuran (probe: {args.probe})...")
+
+    estimates = estimate_sizes(
+        selection, output_dir=args.output_dir, log_file=args.log_file,
+        probe=args.probe, scraper=scraper, max_manuscripts=args.limit,
+    )
+    tasks = plan_tasks(estimates, args.processes, args.delay, args.page_delay)
+    print_plan(estimates, tasks, args.processes, args.delay, args.page_delay)
+    return tasks
+
+def cmd_plan(args):
+    """Tampilkan estimasi ukuran & rencana LPT tanpa crawl"""
+    from scraper_engine import select_subcategories
+
+    selection = select_subcategories(args.fc, args.fs)
+    if not selection:
+        print("❌ Tidak ada sub-kategori yang cocok dengan --fc/--fs")
+        return 2
+    build_schedule(args, selection)
+    return 0
+
+def cmd_queue_init(args):
+    """Isi antrian dengan sub-kategori terpilih + simpan konfigurasi crawl"""
+    from crawl_queue import WorkQueue, seed_queue
+    from scraper_engine import select_subcategories
+
+    selection = select_subcategories(args.fc, args.fs)
+    if not selection:
+        print("❌ Tidak ada sub-kategori yang cocok dengan --fc/--fs")
+        return 2
+    try:
+        char_map = read_char_map(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ --char-map: {e}")
+        return 2
+
+    config = {
+        'output_dir': args.output_dir,
+        'listing': args.listing,
+        'workers': args.workers,
+        'delay': args.delay,
+        'page_delay': args.page_delay,
+        'max_manuscripts': args.limit,
+        'flat': args.flat,
+        'index_width': args.index_width,
+        'progress_file': args.progress_file,
+        'log_file': args.log_file,
+        'base_url': args.base_url,
+        'archive_dir': args.archive_dir,
+        'max_body_bytes': megabytes(args.max_body_size),
+        'memory_budget': megabytes(args.memory_budget),
+        'catalog': not args.no_catalog,
+        'normalize': not args.no_normalize,
+        'char_map': char_map,
+        'boilerplate_model': args.strip_boilerplate and os.path.abspath(args.strip_boilerplate),
+        'listing_retries': args.listing_retries,
+        'listing_checkpoint_dir': args.listing_checkpoint_dir and os.path.abspath(args.listing_checkpoint_dir),
+        'breaker_failures': args.breaker_failures,
+        'breaker_cooldown': args.breaker_cooldown,
+        'batch_size': args.batch_size,
+    }
+    plan = build_schedule(args, selection) if args.schedule else None
+    added = seed_queue(WorkQueue(args.queue_db), selection, config,
+                       resume=not args.no_resume, plan=plan)
+    print(f"✅ {added} tugas listing baru di {args.queue_db}")
+    print(f"⚙️  Politeness budget: {args.delay}s antar request naskah untuk SEMUA worker")
+    return 0
+
+def cmd_queue_worker(args):
+    """Jalankan satu worker sampai antrian habis"""
+    from crawl_queue import QueueWorker, WorkQueue
+
+    if not os.path.exists(args.queue_db):
+        print(f"❌ {args.queue_db} belum ada. Jalankan: python scraper_cli.py queue init ...")
+        return 2
+    QueueWorker(WorkQueue(args.queue_db), args.worker_id, args.workers, args.log_dir).run()
+    return 0
+
+def cmd_queue_run(args):
+    """Jalankan N worker process lokal, tunggu selesai, lalu merge"""
+    import subprocess
+    from crawl_queue import default_worker_id
+
+    if not os.path.exists(args.queue_db):
+        print(f"❌ {args.queue_db} belum ada. Jalankan: python scraper_cli.py queue init ...")
+        return 2
+
+    command = [sys.executable, os.path.abspath(__file__), 'queue', 'worker',
+               '--queue-db', args.queue_db, '--log-dir', args.log_dir]
+    if args.workers:
+        command += ['--workers', str(args.workers)]
+
+    prefix = default_worker_id()
+    processes = [
+        subprocess.Popen(command + ['--worker-id', f"{prefix}-{i}"])
+        for i in range(1, args.processes + 1)
+    ]
+    try:
+        codes = [process.wait() for process in processes]
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+        raise
+
+    status = cmd_queue_merge(args)
+    return status or (1 if any(codes) else 0)
+
+def cmd_queue_status(args):
+    from crawl_queue import WorkQueue, print_status
+
+    print_status(WorkQueue(args.queue_db))
+    return 0
+
+def cmd_queue_merge(args):
+    """Gabungkan log worker + tulis ringkasan & progress sub-kategori yang tuntas"""
+    from crawl_queue import WorkQueue, merge_results
+
+    summary = merge_results(WorkQueue(args.queue_db), args.log_dir)
+    print(f"\n🔗 Merge: {summary['completed']} sub-kategori selesai, "
+          f"{summary['errors']} error, {summary['open']} masih berjalan")
+    if summary['worker_log']:
+        path, rows = summary['worker_log']
+        print(f"📊 Log worker gabungan: {path} ({rows} baris)")
+    return 1 if summary['errors'] else 0
+
+def cmd_reextract(args):
+    """Ekstraksi ulang corpus dari arsip WARC tanpa akses jaringan"""
+    from warc_archive import reextract_archive
+
+    try:
+        char_map = read_char_map(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ --char-map: {e}")
+        return 2
+    summary = reextract_archive(args.archive_dir, args.output_dir, args.workers,
+                                args.flat, args.index_width, not args.no_normalize, char_map,
+                                args.strip_boilerplate)
+    if summary is None:
+        return 2
+    return 1 if summary['failed'] else 0
+
+# ==================== ARGUMENTS ====================
+
+def add_schedule_arguments(parser):
+    """Argumen estimasi ukuran & penjadwalan LPT"""
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                        help="Jumlah worker process yang akan dijalankan (default: jumlah CPU)")
+    parser.add_argument('--probe', choices=['none', 'missing', 'all'], default='missing',
+                        help="Probe listing untuk estimasi ukuran: none, missing (tanpa history), all "
+                             "(default: missing)")
+
+def add_normalize_arguments(parser):
+    """Argumen pembersihan teks: normalisasi & boilerplate (scrape, queue init, reextract)"""
+    parser.add_argument('--strip-boilerplate', nargs='?', const=BOILERPLATE_MODEL_FILE, default=None,
+                        metavar='MODEL',
+                        help=f"Buang boilerplate lintas halaman dengan model dari boilerplate.py "
+                             f"(default model: {BOILERPLATE_MODEL_FILE})")
+    parser.add_argument('--no-normalize', action='store_true',
+                        help="Simpan teks apa adanya (tanpa NFC, pemetaan karakter, perapian whitespace)")
+    parser.add_argument('--char-map', default=None,
+                        help='JSON pemetaan karakter tambahan untuk normalisasi {"dari": "ke"}')
+
+def read_char_map(args):
+    """Pemetaan karakter dari --char-map (None jika tidak ada)"""
+    from text_normalize import load_char_map
+
+    return load_char_map(args.char_map) if args.char_map else None
+
+def add_scrape_arguments(parser):
+    """Argumen bersama untuk mode-mode scraping"""
+    from scraper_engine import (
+        BASE_OUTPUT_DIR, BASE_URL, DELAY_BETWEEN_CATEGORIES, DELAY_BETWEEN_PAGES,
+        BREAKER_COOLDOWN, BREAKER_FAILURES, DELAY_BETWEEN_REQUESTS, LISTING_CHECKPOINT_DIR, LISTING_RETRIES,
+        LISTING_STRATEGIES, LOG_FILE, MAX_BODY_BYTES, MEMORY_BUDGET_BYTES, PROGRESS_FILE,
+    )
+
+    selection = parser.add_argument_group("pilihan sub-kategori")
+    selection.add_argument('--all', action='store_true', help="Semua kategori & sub-kategori")
+    selection.add_argument('--fc', type=int, nargs='+', help="ID kategori (semua sub-kategorinya)")
+    selection.add_argument('--fs', type=int, nargs='+', help="ID sub-kategori")
+
+    parser.add_argument('--listing', choices=sorted(LISTING_STRATEGIES), default='ajax',
+                        help="Strategi listing (default: ajax)")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Jumlah worker download paralel (default: 1)")
+    parser.add_argument('--delay', type=float, default=DELAY_BETWEEN_REQUESTS,
+                        help=f"Jarak minimum antar request naskah, semua worker (default: {DELAY_BETWEEN_REQUESTS}s)")
+    parser.add_argument('--page-delay', type=float, default=DELAY_BETWEEN_PAGES,
+                        help=f"Jarak minimum antar request listing (default: {DELAY_BETWEEN_PAGES}s)")
+    parser.add_argument('--category-delay', type=float, default=DELAY_BETWEEN_CATEGORIES,
+                        help=f"Jeda antar sub-kategori (default: {DELAY_BETWEEN_CATEGORIES}s)")
+    parser.add_argument('--limit', type=int, default=None,
+                        help="Maksimal naskah per sub-kategori")
+    parser.add_argument('--output-dir', default=BASE_OUTPUT_DIR,
+                        help=f"Folder output (default: {BASE_OUTPUT_DIR})")
+    parser.add_argument('--flat', action='store_true',
+                        help="Simpan semua naskah langsung di --output-dir (tanpa folder kategori)")
+    parser.add_argument('--index-width', type=int, default=4,
+                        help="Jumlah digit nomor urut nama file (default: 4)")
+    parser.add_argument('--no-resume', action='store_true',
+                        help="Abaikan progress, scrape ulang sub-kategori yang sudah selesai")
+    parser.add_argument('--progress-file', default=PROGRESS_FILE,
+                        help=f"File progress (default: {PROGRESS_FILE})")
+    parser.add_argument('--log-file', default=LOG_FILE,
+                        help=f"File log CSV (default: {LOG_FILE})")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help=f"Base URL situs (default: {BASE_URL})")
+    parser.add_argument('--archive-dir', default=None,
+                        help="Arsipkan respons mentah ke file .warc.gz di folder ini")
+    parser.add_argument('--max-body-size', type=float, default=MAX_BODY_BYTES / 1024 / 1024,
+                        help=f"Batas ukuran halaman naskah dalam MB, 0 = tanpa batas "
+                             f"(default: {MAX_BODY_BYTES // 1024 // 1024})")
+    parser.add_argument('--memory-budget', type=float, default=MEMORY_BUDGET_BYTES / 1024 / 1024,
+                        help=f"Total MB body naskah yang diproses bersamaan; halaman besar mengurangi "
+                             f"konkurensi, 0 = tanpa batas (default: {MEMORY_BUDGET_BYTES // 1024 // 1024})")
+    parser.add_argument('--no-catalog', action='store_true',
+                        help="Jangan catat naskah ke catalog.jsonl di --output-dir")
+
+    failures = parser.add_argument_group("kegagalan host")
+    failures.add_argument('--listing-retries', type=int, default=LISTING_RETRIES,
+                          help=f"Percobaan ulang per halaman listing, backoff eksponensial (default: {LISTING_RETRIES})")
+    failures.add_argument('--listing-checkpoint-dir', default=LISTING_CHECKPOINT_DIR,
+                          help=f"Folder checkpoint listing per offset, '' = nonaktif (default: {LISTING_CHECKPOINT_DIR})")
+    failures.add_argument('--breaker-failures', type=int, default=BREAKER_FAILURES,
+                          help=f"Kegagalan host berturut-turut sebelum semua worker dijeda, 0 = nonaktif "
+                               f"(default: {BREAKER_FAILURES})")
+    failures.add_argument('--breaker-cooldown', type=float, default=BREAKER_COOLDOWN,
+                          help=f"Detik jeda circuit breaker, dua kali lipat jika host masih gagal "
+                               f"(default: {BREAKER_COOLDOWN})")
+    add_normalize_arguments(parser)
+
+def add_queue_parser(subparsers):
+    """Sub-perintah `queue` (crawl terdistribusi)"""
+    queue_parser = subparsers.add_parser('queue', help="Crawl terdistribusi dengan antrian SQLite bersama")
+    queue_subparsers = queue_parser.add_subparsers(dest='queue_command', required=True)
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--queue-db', default=QUEUE_DB,
+                        help=f"File database antrian (default: {QUEUE_DB})")
+    common.add_argument('--log-dir', default=WORKER_LOG_DIR,
+                        help=f"Folder log CSV per worker (default: {WORKER_LOG_DIR})")
+
+    init_parser = queue_subparsers.add_parser('init', parents=[common],
+                                              help="Isi antrian dengan sub-kategori terpilih")
+    add_scrape_arguments(init_parser)
+    init_parser.add_argument('--batch-size', type=int, default=QUEUE_BATCH_SIZE,
+                             help=f"Naskah per tugas batch (default: {QUEUE_BATCH_SIZE})")
+    init_parser.add_argument('--schedule', action='store_true',
+                             help="Pecah sub-kategori besar + prioritas LPT berdasarkan estimasi ukuran")
+    add_schedule_arguments(init_parser)
+    init_parser.set_defaults(handler=cmd_queue_init)
+
+    worker_parser = queue_subparsers.add_parser('worker', parents=[common],
+                                                help="Jalankan satu worker sampai antrian habis")
+    worker_parser.add_argument('--worker-id', default=None, help="ID worker (default: host-pid)")
+    worker_parser.add_argument('--workers', type=int, default=None,
+                               help="Thread download per worker (default: nilai saat init)")
+    worker_parser.set_defaults(handler=cmd_queue_worker)
+
+    run_parser = queue_subparsers.add_parser('run', parents=[common],
+                                             help="Jalankan N worker lokal lalu merge")
+    run_parser.add_argument('--processes', type=int, default=os.cpu_count() or 1,
+                            help="Jumlah worker process (default: jumlah CPU)")
+    run_parser.add_argument('--workers', type=int, default=None,
+                            help="Thread download per worker (default: nilai saat init)")
+    run_parser.set_defaults(handler=cmd_queue_run)
+
+    status_parser = queue_subparsers.add_parser('status', parents=[common], help="Status tugas & worker")
+    status_parser.set_defaults(handler=cmd_queue_status)
+
+    merge_parser = queue_subparsers.add_parser('merge', parents=[common],
+                                               help="Gabungkan log & progress worker")
+    merge_parser.set_defaults(handler=cmd_queue_merge)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Scraper sastra.org (non-interaktif)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = subparsers.add_parser('list', help="Daftar kategori & sub-kategori")
+    list_parser.set_defaults(handler=cmd_list)
+
+    scrape_parser = subparsers.add_parser('scrape', help="Scrape sub-kategori terpilih")
+    add_scrape_arguments(scrape_parser)
+    # scraper_engine (add_scrape_arguments) sudah meng-import stage_profiler
+    from stage_profiler import DEFAULT_SAMPLE_INTERVAL, PROFILE_OUTPUT_FILE
+    from crawl_state import FETCH_HISTORY_FILE
+    from crawl_status import STATUS_FILE, STATUS_HOST, STATUS_INTERVAL
+
+    scrape_parser.add_argument('--history-file', default=FETCH_HISTORY_FILE,
+                               help=f"Riwayat fetch & hash isi per URL (default: {FETCH_HISTORY_FILE})")
+
+    budget = scrape_parser.add_argument_group("mode budget waktu")
+    budget.add_argument('--time-budget', default=None,
+                        help="Batas waktu crawl, mis. 90m, 2h, 1h30m (naskah diprioritaskan berdasarkan nilai)")
+    budget.add_argument('--weight', action='append', metavar='NAMA=BOBOT',
+                        help="Bobot kategori / sub-kategori (bisa diulang, default 1)")
+
+    profile = scrape_parser.add_argument_group("profiling")
+    profile.add_argument('--profile', action='store_true',
+                         help="Jalankan sampling profiler, tulis stack folded per tahap")
+    profile.add_argument('--profile-output', default=PROFILE_OUTPUT_FILE,
+                         help=f"File stack folded (default: {PROFILE_OUTPUT_FILE})")
+    profile.add_argument('--profile-interval', type=float, default=DEFAULT_SAMPLE_INTERVAL * 1000,
+                         help=f"Interval sampling dalam ms (default: {DEFAULT_SAMPLE_INTERVAL * 1000:g})")
+
+    status = scrape_parser.add_argument_group("status live")
+    status.add_argument('--status-file', default=STATUS_FILE,
+                        help=f"File status JSON yang ditulis ulang berkala (default: {STATUS_FILE})")
+    status.add_argument('--status-interval', type=float, default=STATUS_INTERVAL,
+                        help=f"Detik antar penulisan file status (default: {STATUS_INTERVAL})")
+    status.add_argument('--status-port', type=int, default=None,
+                        help=f"Jalankan endpoint HTTP /status & /health di {STATUS_HOST}:PORT (0 = port bebas)")
+    status.add_argument('--no-status', action='store_true',
+                        help="Jangan tulis file status (endpoint HTTP tetap jalan jika --status-port diisi)")
+    scrape_parser.set_defaults(handler=cmd_scrape)
+
+    refresh_parser = subparsers.add_parser('refresh', help="Fetch ulang naskah yang paling mungkin berubah")
+    add_scrape_arguments(refresh_parser)
+    refresh_parser.add_argument('--budget', type=int, default=REFRESH_BUDGET,
+                                help=f"Maksimal request naskah (default: {REFRESH_BUDGET})")
+    refresh_parser.add_argument('--min-probability', type=float, default=REFRESH_MIN_PROBABILITY,
+                                help=f"Lewati naskah dengan peluang berubah di bawah ini "
+                                     f"(default: {REFRESH_MIN_PROBABILITY})")
+    refresh_parser.add_argument('--history-file', default=FETCH_HISTORY_FILE,
+                                help=f"Riwayat fetch & hash isi per URL (default: {FETCH_HISTORY_FILE})")
+    refresh_parser.add_argument('--seed', action='store_true',
+                                help="Catat dulu naskah di --output-dir yang belum punya hash (waktu = mtime)")
+    refresh_parser.add_argument('--dry-run', action='store_true', help="Tampilkan rencana saja")
+    refresh_parser.set_defaults(handler=cmd_refresh)
+
+    plan_parser = subparsers.add_parser('plan', help="Estimasi ukuran & rencana crawl LPT")
+    add_scrape_arguments(plan_parser)
+    add_schedule_arguments(plan_parser)
+    plan_parser.set_defaults(handler=cmd_plan)
+
+    add_queue_parser(subparsers)
+
+    from scraper_engine import BASE_OUTPUT_DIR
+
+    reextract_parser = subparsers.add_parser('reextract', help="Ekstraksi ulang corpus dari arsip WARC (offline)")
+    reextract_parser.add_argument('--archive-dir', default=ARCHIVE_DIR,
+                                  help=f"Folder arsip .warc.gz (default: {ARCHIVE_DIR})")
+    reextract_parser.add_argument('--output-dir', default=BASE_OUTPUT_DIR,
+                                  help=f"Folder corpus yang ditulis ulang (default: {BASE_OUTPUT_DIR})")
+    reextract_parser.add_argument('--workers', type=int, default=None,
+                                  help="Jumlah worker process (default: jumlah CPU)")
+    reextract_parser.add_argument('--flat', action='store_true',
+                                  help="Tulis semua naskah langsung di --output-dir")
+    reextract_parser.add_argument('--index-width', type=int, default=4,
+                                  help="Jumlah digit nomor urut nama file (default: 4)")
+    add_normalize_arguments(reextract_parser)
+    reextract_parser.set_defaults(handler=cmd_reextract)
+
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    needs_selection = args.command in ('scrape', 'plan') or getattr(args, 'queue_command', None) == 'init'
+    if needs_selection and not (args.all or args.fc or args.fs):
+        parser.error("pilih sub-kategori dengan --all, --fc, atau --fs")
+
+    try:
+        return args.handler(args)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  Scraping dibatalkan oleh user")
+        print("💾 Progress tersimpan! Jalankan ulang perintah yang sama untuk melanjutkan.\n")
+        return 130
+
+if __name__ == "__main__":
+    sys.exit(main())
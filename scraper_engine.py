@@ -0,0 +1,1191 @@
+"""
+Engine Scraper Sastra.org
+Satu engine yang bisa di-import untuk semua mode scraping (menggantikan
+scraper.py, scraper_ajax.py, scraper_advanced.py, scraper_multi_kategori.py
+dan logika di scraper_multi_kategori_all.py).
+
+Strategi listing (pluggable, lihat LISTING_STRATEGIES):
+    ajax        - endpoint AJAX koleksi.inx.php (default, paling lengkap)
+    limitstart  - halaman koleksi Joomla dengan ?limitstart=N
+    start       - halaman koleksi Joomla dengan ?start=N
+
+Modul ini hanya meng-import library standar saat di-load; `requests` dan
+`bs4` baru di-import ketika benar-benar melakukan fetch/parse.
+Untuk menjalankan dari command line, pakai scraper_cli.py.
+
+Body respons di-stream per chunk ke SpooledTemporaryFile; halaman naskah
+langsung di-feed ke stream_extract.ManuscriptExtractor selama download.
+MemoryBudget membatasi total body yang sedang diproses sehingga halaman besar
+otomatis mengurangi konkurensi.
+
+Setiap tahap (rate limit, fetch, decode, parse, get_text, nama file, tulis)
+diukur oleh stage_profiler.PROFILER per sub-kategori.
+
+Halaman listing yang gagal di-retry dengan backoff; halaman yang sudah diambil
+dicatat per offset (crawl_state.ListingCheckpoint) sehingga listing yang tetap
+gagal (ListingIncomplete) dilanjutkan dari offset itu pada run berikutnya, dan
+sub-kategori baru ditandai selesai setelah listing lengkap. should_stop (mis.
+deadline --time-budget) menghentikan listing di antara halaman (ListingTruncated)
+tanpa menghapus checkpoint. CircuitBreaker
+menjeda semua worker saat host gagal berturut-turut.
+"""
+
+import os
+import re
+import csv
+import json
+import time
+import hashlib
+import tempfile
+import threading
+import urllib.parse
+from datetime import datetime
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+
+from stage_profiler import PROFILER, stage
+
+# ==================== KONFIGURASI ====================
+
+BASE_URL = "https://www.sastra.org"
+AJAX_PATH = "/sastra/koleksi/koleksi.inx.php"
+
+# Headers untuk request
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/142.0.0.0 Safari/537.36',
+    'Accept': '*/*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://www.sastra.org/koleksi',
+    'X-Requested-With': 'XMLHttpRequest',
+}
+
+# Rate limiting (dalam detik)
+DELAY_BETWEEN_REQUESTS = 2  # Jarak minimum antar request naskah (global, semua worker)
+DELAY_BETWEEN_CATEGORIES = 5  # Delay antar sub-kategori
+DELAY_BETWEEN_PAGES = 1  # Jarak minimum antar request listing
+REQUEST_TIMEOUT = 30
+ITEMS_PER_PAGE = 20
+
+# Listing yang gagal & circuit breaker host
+LISTING_RETRIES = 4           # Percobaan ulang per halaman listing sebelum sub-kategori dianggap gagal
+LISTING_BACKOFF = 5           # Detik jeda retry pertama (dua kali lipat setiap retry)
+LISTING_BACKOFF_MAX = 120
+BREAKER_FAILURES = 5          # Kegagalan host berturut-turut sebelum semua worker dijeda (0 = nonaktif)
+BREAKER_COOLDOWN = 30         # Detik jeda pertama (dua kali lipat jika request percobaan gagal lagi)
+BREAKER_COOLDOWN_MAX = 600
+
+# Streaming body respons
+STREAM_CHUNK_SIZE = 64 * 1024
+SPOOL_MEMORY_BYTES = 1024 * 1024        # Body lebih besar dari ini di-spool ke disk
+MAX_BODY_BYTES = 32 * 1024 * 1024       # Halaman lebih besar dari ini ditolak
+MEMORY_BUDGET_BYTES = 64 * 1024 * 1024  # Total body naskah yang boleh diproses bersamaan
+
+# Output configuration
+BASE_OUTPUT_DIR = "data_naskah_sastra_org"
+ON_DEMAND_INDEX = 0  # Nomor urut naskah yang diambil di luar listing (manuscript_service.py)
+LOG_FILE = "scraping_log.csv"
+PROGRESS_FILE = "scraping_progress.json"
+LISTING_CHECKPOINT_DIR = "listing_checkpoints"  # Checkpoint listing per offset (lihat crawl_state.py)
+
+# ==================== DATABASE KATEGORI ====================
+
+CATEGORIES = {
+    "Agama dan Kepercayaan": {
+        "fc": 10,
+        "subcategories": [
+            {"fs": 48, "name": "Kebatinan dan Mistik"},
+            {"fs": 30, "name": "Kitab Suci"},
+            {"fs": 39, "name": "Suluk"},
+            {"fs": 58, "name": "Wulang"},
+        ]
+    },
+    "Arsip dan Sejarah": {
+        "fc": 9,
+        "subcategories": [
+            {"fs": 76, "name": "Editorial"},
+            {"fs": 31, "name": "Galeri"},
+            {"fs": 71, "name": "Hukum dan Pemerintahan"},
+            {"fs": 51, "name": "Kasunanan"},
+            {"fs": 49, "name": "Mangkunagaran"},
+            {"fs": 33, "name": "Mayor J F T"},
+            {"fs": 37, "name": "Radya Pustaka"},
+            {"fs": 22, "name": "Radya Pustaka Surat-menyurat"},
+            {"fs": 26, "name": "Ranggawarsita R Ng"},
+            {"fs": 32, "name": "Sasradiningrat II K R A"},
+            {"fs": 44, "name": "Surakarta"},
+            {"fs": 81, "name": "Surat-menyurat"},
+            {"fs": 50, "name": "Umum"},
+        ]
+    },
+    "Bahasa dan Budaya": {
+        "fc": 12,
+        "subcategories": [
+            {"fs": 36, "name": "Adat dan Tradisi"},
+            {"fs": 62, "name": "Bacaan Huruf Jawa"},
+            {"fs": 59, "name": "Gending dan Notasi"},
+            {"fs": 67, "name": "Kagunan"},
+            {"fs": 41, "name": "Kamus dan Leksikon"},
+            {"fs": 23, "name": "Karawitan"},
+            {"fs": 68, "name": "Panembrama dan Iber"},
+            {"fs": 52, "name": "Pawukon dan Primbon"},
+            {"fs": 53, "name": "Pengetahuan Bahasa"},
+            {"fs": 63, "name": "Wayang"},
+        ]
+    },
+    "Kisah Cerita dan Kronikal": {
+        "fc": 11,
+        "subcategories": [
+            {"fs": 46, "name": "Babad"},
+            {"fs": 43, "name": "Babad Giyanti"},
+            {"fs": 42, "name": "Babad Tanah Jawi"},
+            {"fs": 47, "name": "Cerita"},
+            {"fs": 64, "name": "Dongeng"},
+            {"fs": 72, "name": "Mahabharata"},
+            {"fs": 73, "name": "Menak"},
+            {"fs": 65, "name": "Novel"},
+            {"fs": 25, "name": "Riwayat dan Perjalanan"},
+            {"fs": 34, "name": "Serat Centhini"},
+        ]
+    },
+    "Koran Majalah dan Jurnal": {
+        "fc": 13,
+        "subcategories": [
+            {"fs": 45, "name": "Almanak"},
+            {"fs": 54, "name": "Candrakanta"},
+            {"fs": 57, "name": "Kajawen"},
+            {"fs": 28, "name": "Kawi"},
+            {"fs": 75, "name": "Kumandang Teyosupi"},
+            {"fs": 55, "name": "Mardi Siwi"},
+            {"fs": 56, "name": "Narpawandawa"},
+            {"fs": 27, "name": "Pusaka Jawi"},
+            {"fs": 35, "name": "Sasadara"},
+            {"fs": 61, "name": "Umum"},
+            {"fs": 74, "name": "Wara Susila"},
+        ]
+    }
+}
+
+# ==================== HELPER FUNCTIONS ====================
+
+def clean_filename(text):
+    """Bersihkan nama file dari karakter tidak valid"""
+    text = re.sub(r'[<>:"/\\|?*]', '', text)
+    text = text.strip()
+    return text[:200]
+
+def clean_folder_name(text):
+    """Bersihkan nama folder dari karakter tidak valid"""
+    text = re.sub(r'[<>:"/\\|?*]', '', text)
+    text = text.replace(' ', '_')
+    text = text.strip()
+    return text
+
+def slugify(text):
+    """Slug URL sastra.org: "Kisah, Cerita dan Kronikal" -> "kisah-cerita-dan-kronikal" """
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+def subcategory_key(category_name, subcategory_name):
+    """Key sub-kategori di file progress"""
+    return f"{category_name}_{subcategory_name}"
+
+def select_subcategories(fc=None, fs=None):
+    """Pilih sub-kategori berdasarkan daftar fc/fs (kosong = semua)
+
+    Return list (category_name, fc, subcategory) sesuai urutan CATEGORIES.
+    """
+    fc = set(fc or [])
+    fs = set(fs or [])
+    selected = []
+    for category_name, category_data in CATEGORIES.items():
+        for subcategory in category_data['subcategories']:
+            if (fc or fs) and category_data['fc'] not in fc and subcategory['fs'] not in fs:
+                continue
+            selected.append((category_name, category_data['fc'], subcategory))
+    return selected
+
+_progress_lock = threading.Lock()
+
+def load_progress(progress_file=PROGRESS_FILE):
+    """Load progress dari file JSON"""
+    if os.path.exists(progress_file):
+        with open(progress_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    return {"completed_categories": [], "completed_subcategories": []}
+
+def save_progress(progress, progress_file=PROGRESS_FILE):
+    """Save progress ke file JSON (tulis ke .tmp lalu replace)"""
+    tmp_path = progress_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(progress, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, progress_file)
+
+def mark_progress(field, value, progress_file=PROGRESS_FILE):
+    """Tambahkan satu entri ke progress (selalu load ulang agar tidak menimpa entri lain)"""
+    with _progress_lock:
+        progress = load_progress(progress_file)
+        entries = progress.setdefault(field, [])
+        if value not in entries:
+            entries.append(value)
+            save_progress(progress, progress_file)
+
+def log_to_csv(category, subcategory, manuscripts_count, status, error_msg='', log_file=LOG_FILE):
+    """Log hasil scraping ke CSV"""
+    file_exists = os.path.exists(log_file)
+
+    with open(log_file, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        if not file_exists:
+            writer.writerow(['Timestamp', 'Category', 'Subcategory', 'Manuscripts', 'Status', 'Error'])
+
+        writer.writerow([
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            category,
+            subcategory,
+            manuscripts_count,
+            status,
+            error_msg
+        ])
+
+# ==================== FETCH LAYER ====================
+
+class RateLimiter:
+    """Jarak minimum antar request, dibagi oleh semua thread (politeness budget)"""
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+        self.waits = 0
+        self.waited = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_time)
+            self._next_time = start_at + self.min_interval
+            if start_at > now:
+                self.waits += 1
+                self.waited += start_at - now
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def backlog(self):
+        """Detik sampai slot request berikutnya kosong (antrian di limiter)"""
+        return max(0.0, self._next_time - time.monotonic())
+
+class BodyTooLarge(Exception):
+    """Body respons melebihi batas max_bytes"""
+
+class MemoryBudget:
+    """Batas total byte body yang sedang diproses, dibagi oleh semua thread
+
+    acquire() menunggu selama reservasi baru melebihi limit; satu body yang
+    lebih besar dari limit tetap boleh jalan asalkan sendirian.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self.waits = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, size):
+        with self._condition:
+            if self.in_use and self.in_use + size > self.limit:
+                self.waits += 1
+                self._condition.wait_for(lambda: not self.in_use or self.in_use + size <= self.limit)
+            self._add(size)
+        return size
+
+    def grow(self, size):
+        """Tambah reservasi tanpa menunggu (body ternyata lebih besar dari Content-Length)"""
+        with self._condition:
+            self._add(size)
+
+    def _add(self, size):
+        self.in_use += size
+        self.peak = max(self.peak, self.in_use)
+
+    def release(self, size):
+        with self._condition:
+            self.in_use -= size
+            self._condition.notify_all()
+
+class CircuitBreaker:
+    """Circuit breaker host, dibagi oleh semua thread yang memakai Fetcher yang sama
+
+    Setelah `threshold` kegagalan host berturut-turut (koneksi/timeout, HTTP 5xx/429)
+    breaker terbuka: semua request menunggu selama cooldown alih-alih menghabiskan
+    retry. Setelah cooldown hanya satu request percobaan yang lewat (half-open);
+    berhasil -> tertutup lagi, gagal -> terbuka lagi dengan cooldown dua kali lipat.
+    Hanya hasil request pemilik token percobaan yang mengubah status half-open;
+    request lain yang masih berjalan tidak ikut menutup/membuka breaker.
+    """
+
+    def __init__(self, threshold=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN, max_cooldown=BREAKER_COOLDOWN_MAX):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.failures = 0          # Kegagalan berturut-turut
+        self.open_until = None     # time.monotonic() akhir cooldown; None = tertutup
+        self.opened_at = None
+        self.probe = None          # Token request percobaan yang sedang berjalan (half-open)
+        self.opens = 0
+        self.paused = 0.0          # Total detik breaker terbuka
+        self._condition = threading.Condition()
+
+    @property
+    def state(self):
+        if self.open_until is None:
+            return 'closed'
+        return 'half_open' if self.probe is not None or time.monotonic() >= self.open_until else 'open'
+
+    def wait(self):
+        """Blok selama breaker terbuka; setelah cooldown hanya satu thread (probe) yang lewat.
+        Return token percobaan untuk thread probe, None untuk request biasa"""
+        with self._condition:
+            while self.open_until is not None:
+                remaining = self.open_until - time.monotonic()
+                if remaining > 0:
+                    self._condition.wait(remaining)
+                elif self.probe is None:
+                    self.probe = object()
+                    return self.probe
+                else:
+                    self._condition.wait()
+            return None
+
+    def record(self, ok, token=None):
+        """Hasil satu request: True (host menjawab), False (kegagalan host), None (tidak menentukan).
+        token = hasil wait(); hanya request percobaan yang menutup/membuka ulang breaker half-open"""
+        with self._condition:
+            probe = token is not None and token is self.probe
+            if probe:
+                self.probe = None
+            now = time.monotonic()
+            if ok:
+                self.failures = 0
+                if probe:
+                    self.paused += now - self.opened_at
+                    self.open_until = None
+                    self.cooldown = self.base_cooldown
+                    print(f"🟢 Circuit breaker tertutup: host merespons lagi, worker dilanjutkan")
+            elif ok is False:
+                self.failures += 1
+                if probe:
+                    self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+                    self.open_until = now + self.cooldown
+                    print(f"🔴 Request percobaan gagal, circuit breaker terbuka lagi {self.cooldown:g}s")
+                elif self.open_until is None and self.failures >= self.threshold:
+                    self.opens += 1
+                    self.opened_at = now
+                    self.open_until = now + self.cooldown
+                    print(f"🔴 Circuit breaker terbuka: {self.failures} kegagalan host berturut-turut, "
+                          f"semua worker dijeda {self.cooldown:g}s")
+            self._condition.notify_all()
+
+    def state_info(self):
+        """Ringkasan untuk status crawl"""
+        with self._condition:
+            paused = self.paused + (time.monotonic() - self.opened_at if self.open_until is not None else 0)
+            return {
+                'state': self.state,
+                'failures': self.failures,
+                'opens': self.opens,
+                'cooldown_seconds': self.cooldown,
+                'reopen_in_seconds': round(max(0.0, self.open_until - time.monotonic()), 1)
+                if self.open_until is not None else None,
+                'paused_seconds': round(paused, 1),
+            }
+
+class ListingIncomplete(Exception):
+    """Halaman listing tetap gagal setelah retry; listing sub-kategori belum lengkap"""
+
+    def __init__(self, subcategory_name, offset, found, error):
+        super().__init__(f"listing {subcategory_name} terhenti di offset {offset} "
+                         f"({found} naskah sebelumnya tersimpan di checkpoint): {error}")
+        self.offset = offset
+        self.found = found
+
+class ListingTruncated(Exception):
+    """Listing dihentikan should_stop di antara halaman (mis. deadline); records = hasil parsial"""
+
+    def __init__(self, subcategory_name, offset, records):
+        super().__init__(f"listing {subcategory_name} dihentikan di offset {offset} "
+                         f"({len(records)} naskah tersimpan di checkpoint)")
+        self.offset = offset
+        self.records = records
+
+class Fetcher:
+    """HTTP GET dengan session bersama, header default, timeout, rate limit, dan circuit breaker"""
+
+    def __init__(self, headers=None, timeout=REQUEST_TIMEOUT, archive=None, breaker=None):
+        import requests
+
+        self.session = requests.Session()
+        self.session.headers.update(headers or HEADERS)
+        self.timeout = timeout
+        self.archive = archive  # warc_archive.WarcWriter (opsional)
+        self.breaker = breaker  # CircuitBreaker (opsional)
+        self._host_errors = (requests.ConnectionError, requests.Timeout)
+        self._http_error = requests.HTTPError
+
+    def transient(self, error):
+        """Kegagalan host yang layak di-retry (sama dengan yang dihitung circuit breaker):
+        koneksi/timeout, HTTP 5xx/429"""
+        if isinstance(error, self._host_errors):
+            return True
+        response = getattr(error, 'response', None)
+        return (isinstance(error, self._http_error) and response is not None
+                and (response.status_code >= 500 or response.status_code == 429))
+
+    @contextmanager
+    def stream(self, url, limiter=None, metadata=None, consumer=None, max_bytes=MAX_BODY_BYTES, budget=None):
+        """GET url dengan body di-stream per chunk ke SpooledTemporaryFile (dan ke consumer(chunk)).
+
+        Yield (response, body) setelah body habis dibaca; raise untuk status HTTP error atau
+        body > max_bytes. Reservasi MemoryBudget dan spool dilepas saat keluar dari blok.
+        metadata (kind, category, subcategory, index) ikut diarsip jika ada archive.
+        """
+        listing = (metadata or {}).get('kind') == 'listing'
+        token = None
+        if self.breaker:
+            with stage('breaker_wait'):
+                token = self.breaker.wait()
+        if limiter:
+            with stage('listing_wait' if listing else 'rate_limit'):
+                limiter.wait()
+        # stream=True memisahkan waktu sampai header (connect + TTFB) dari download body
+        with stage('listing_fetch' if listing else 'connect_ttfb'):
+            try:
+                response = self.session.get(url, timeout=self.timeout, stream=True)
+            except Exception as e:
+                if self.breaker:
+                    self.breaker.record(False if isinstance(e, self._host_errors) else None, token)
+                raise
+        if self.breaker:
+            self.breaker.record(response.status_code < 500 and response.status_code != 429, token)
+
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MEMORY_BYTES)
+        reserved = 0
+        try:
+            length = response.headers.get('Content-Length', '')
+            expected = int(length) if length.isdigit() else None
+            # Content-Length = ukuran terkompresi, jadi batas bawah ukuran body
+            if max_bytes and expected and expected > max_bytes:
+                raise BodyTooLarge(f"body {expected:,} byte > batas {max_bytes:,}")
+            if budget:
+                with stage('memory_wait'):
+                    reserved = budget.acquire(expected or STREAM_CHUNK_SIZE)
+
+            size = 0
+            with stage('listing_fetch' if listing else 'download'):
+                for chunk in response.iter_content(STREAM_CHUNK_SIZE):
+                    size += len(chunk)
+                    if max_bytes and size > max_bytes:
+                        raise BodyTooLarge(f"body > batas {max_bytes:,} byte")
+                    if budget and size > reserved:
+                        budget.grow(size - reserved)
+                        reserved = size
+                    body.write(chunk)
+                    if consumer:
+                        consumer(chunk)
+            body.seek(0)
+
+            if self.archive:
+                # Respons error juga diarsip (berguna untuk diagnosa)
+                self.archive.write_exchange(response, metadata, body)
+                body.seek(0)
+            response.raise_for_status()
+            yield response, body
+        finally:
+            response.close()
+            body.close()
+            if reserved:
+                budget.release(reserved)
+
+    def get(self, url, limiter=None, metadata=None):
+        """GET url (raise untuk status HTTP error), return response dengan body di memori"""
+        with self.stream(url, limiter, metadata, max_bytes=None) as (response, body):
+            response._content = body.read()
+        return response
+
+# ==================== LISTING STRATEGIES ====================
+
+def absolute_url(href, base_url=BASE_URL):
+    """Lengkapi href relatif menjadi URL penuh"""
+    return href if href.startswith('http') else f"{base_url}{href}"
+
+# Baris listing AJAX:
+#   <a class="ysl-lnk" href=".../1010-..." title="Koleksi #1010">Judul, Pengarang, Tahun, #1024 (Jilid 01).</a>
+#   ... Tanggal diunggah: 12-Sep-2010. Jumlah kata: 14.005. ...
+LISTING_LABEL_PATTERN = re.compile(r"^(?P<head>.*?),?\s*#(?P<source_id>\d+)\s*(?:\((?P<volume>[^)]*)\))?\s*\.?$")
+KOLEKSI_ID_PATTERN = re.compile(r"#(\d+)")
+URL_ID_PATTERN = re.compile(r"/(\d+)-[^/]*$")
+UPLOAD_DATE_PATTERN = re.compile(r"Tanggal diunggah:\s*(\d{1,2})-([A-Za-z]{3})-(\d{4})")
+WORD_COUNT_PATTERN = re.compile(r"Jumlah kata:\s*([\d.]+)")
+MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'mei': 5, 'jun': 6, 'jul': 7,
+    'aug': 8, 'agu': 8, 'agt': 8, 'sep': 9, 'oct': 10, 'okt': 10, 'nov': 11, 'dec': 12, 'des': 12,
+}
+
+class ListingRecord:
+    """Metadata satu naskah dari baris listing (compact: __slots__, serialisasi list)"""
+
+    __slots__ = ('url', 'koleksi_id', 'title', 'author', 'year', 'source_id', 'volume', 'uploaded', 'word_count')
+
+    # Field -> kunci header file naskah (urutan = urutan baris header)
+    HEADER_FIELDS = (
+        ('title', 'Judul singkat'), ('author', 'Penulis'), ('year', 'Tahun'), ('source_id', 'ID'),
+        ('volume', 'Jilid'), ('koleksi_id', 'Koleksi'), ('uploaded', 'Diunggah'), ('word_count', 'Jumlah kata'),
+    )
+
+    def __init__(self, url, koleksi_id=None, title=None, author=None, year=None, source_id=None,
+                 volume=None, uploaded=None, word_count=None):
+        self.url = url
+        self.koleksi_id = koleksi_id
+        self.title = title
+        self.author = author
+        self.year = year
+        self.source_id = source_id
+        self.volume = volume
+        self.uploaded = uploaded
+        self.word_count = word_count
+
+    def to_row(self):
+        """List nilai sesuai __slots__ (untuk JSON antrian)"""
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row):
+        """Kebalikan to_row; string = URL saja (payload lama)"""
+        return cls(row) if isinstance(row, str) else cls(*row)
+
+    @classmethod
+    def from_header(cls, url, header):
+        """Metadata listing yang tersimpan di header file naskah (None jika tidak ada)"""
+        fields = {name: header[label] for name, label in cls.HEADER_FIELDS if label in header}
+        return cls(url, **fields) if fields else None
+
+    def header_fields(self):
+        """[(kunci header, nilai)] untuk field yang terisi"""
+        return [(label, getattr(self, name)) for name, label in self.HEADER_FIELDS
+                if getattr(self, name) is not None]
+
+    def __repr__(self):
+        return f"ListingRecord({self.url!r}, title={self.title!r})"
+
+def parse_listing_label(label):
+    """"Judul, Pengarang, Tahun, #ID (Jilid)." -> dict (field yang tidak ada = None)"""
+    label = label.strip()
+    match = LISTING_LABEL_PATTERN.match(label)
+    if not match:
+        return {'title': label.rstrip('.').strip() or None}
+
+    parts = [part.strip() for part in match.group('head').split(',') if part.strip()]
+    fields = {'source_id': match.group('source_id'), 'volume': match.group('volume')}
+    # Tahun = bagian terakhir yang mengandung angka; pengarang boleh mengandung koma
+    if len(parts) > 1 and any(c.isdigit() for c in parts[-1]):
+        fields['year'] = parts.pop()
+    fields['title'] = parts[0] if parts else None
+    fields['author'] = ', '.join(parts[1:]) or None
+    return fields
+
+def parse_upload_date(text):
+    """"Tanggal diunggah: 12-Sep-2010" -> "2010-09-12" """
+    match = UPLOAD_DATE_PATTERN.search(text)
+    if not match:
+        return None
+    day, month, year = match.groups()
+    number = MONTHS.get(month.lower())
+    return f"{year}-{number:02d}-{int(day):02d}" if number else f"{day}-{month}-{year}"
+
+def parse_word_count(text):
+    """"Jumlah kata: 14.005" -> 14005"""
+    match = WORD_COUNT_PATTERN.search(text)
+    return int(match.group(1).replace('.', '')) if match and match.group(1).strip('.') else None
+
+class ListingStrategy:
+    """Dasar strategi listing: ambil halaman per offset sampai tidak ada link baru"""
+
+    name = None
+
+    def __init__(self, base_url=BASE_URL, items_per_page=ITEMS_PER_PAGE):
+        self.base_url = base_url
+        self.items_per_page = items_per_page
+
+    def page_url(self, fc, fs, offset):
+        raise NotImplementedError
+
+    def extract_links(self, content, category_name, subcategory_name):
+        raise NotImplementedError
+
+    def extract_listing(self, content, category_name, subcategory_name):
+        """ListingRecord per link halaman listing (default: hanya URL)"""
+        return [ListingRecord(url) for url in self.extract_links(content, category_name, subcategory_name)]
+
+    def fetch_page(self, fetcher, limiter, url, metadata, retries=LISTING_RETRIES):
+        """GET satu halaman listing dengan retry + backoff eksponensial untuk kegagalan host
+        sementara (Fetcher.transient); error lain dan yang tetap gagal langsung di-raise"""
+        for attempt in range(retries + 1):
+            try:
+                return fetcher.get(url, limiter, metadata)
+            except Exception as e:
+                if attempt == retries or not fetcher.transient(e):
+                    print(f"❌ Error: {e}")
+                    raise
+                delay = min(LISTING_BACKOFF * 2 ** attempt, LISTING_BACKOFF_MAX)
+                print(f"⚠️  Error: {e} — coba lagi dalam {delay}s ({attempt + 1}/{retries})...", end=' ')
+                time.sleep(delay)
+
+    def list_records(self, fetcher, limiter, fc, fs, category_name, subcategory_name, max_links=None,
+                     start_offset=0, stop_offset=None, checkpoint=None, retries=LISTING_RETRIES,
+                     should_stop=None):
+        """Ambil semua ListingRecord satu sub-kategori (opsional hanya rentang offset [start, stop)).
+
+        checkpoint (crawl_state.ListingCheckpoint): halaman yang sudah tercatat tidak diambil
+        ulang, dan setiap halaman baru dicatat. Halaman yang tetap gagal setelah `retries`
+        percobaan (atau gagal bukan karena host, mis. 404) -> raise ListingIncomplete
+        (bukan daftar parsial). should_stop() dicek
+        sebelum setiap halaman; jika True -> raise ListingTruncated berisi hasil parsial."""
+        all_links = []
+        seen = set()
+        offset = start_offset
+        resumed = checkpoint.resume() if checkpoint else None
+        if resumed:
+            offset, rows = resumed
+            all_links = [ListingRecord.from_row(row) for row in rows]
+            seen = {record.url for record in all_links}
+            print(f"  ↩️  Lanjut dari checkpoint: offset {offset} ({len(all_links)} naskah sudah tercatat)")
+
+        while max_links is None or len(all_links) < max_links:
+            if stop_offset is not None and offset >= stop_offset:
+                break
+            if should_stop and should_stop():
+                raise ListingTruncated(subcategory_name, offset, all_links[:max_links] if max_links else all_links)
+            url = self.page_url(fc, fs, offset)
+            print(f"  Offset {offset}...", end=' ')
+
+            try:
+                response = self.fetch_page(fetcher, limiter, url, {
+                    'kind': 'listing', 'category': category_name, 'subcategory': subcategory_name,
+                }, retries)
+            except Exception as e:
+                raise ListingIncomplete(subcategory_name, offset, len(all_links), e) from e
+
+            page_links = []
+            with stage('listing_parse'):
+                found = self.extract_listing(response.content, category_name, subcategory_name)
+            for record in found:
+                # Hanya ambil URL unik yang belum ada
+                if record.url not in seen:
+                    seen.add(record.url)
+                    page_links.append(record)
+                    all_links.append(record)
+
+            print(f"✅ +{len(page_links)} naskah (Total: {len(all_links)})")
+
+            # Jika tidak ada link baru, berarti sudah habis
+            if not page_links:
+                break
+
+            if checkpoint:
+                checkpoint.page(offset, offset + self.items_per_page, [record.to_row() for record in page_links])
+            offset += self.items_per_page
+
+        return all_links[:max_links] if max_links else all_links
+
+class AjaxListing(ListingStrategy):
+    """Endpoint AJAX koleksi.inx.php (tabel hasil, link a.ysl-lnk)"""
+
+    name = 'ajax'
+
+    def page_url(self, fc, fs, offset):
+        param = {
+            "sn": "koleksi",
+            "ui": "691aa8f9f3caa",
+            "us": 0,
+            "koleksi": {
+                "cs": "adens",
+                "fc": fc,
+                "fs": fs,
+                "nr": self.items_per_page,
+                "ps": offset,
+                "sk": "",
+                "sl": 2,
+                "el": "judul"
+            }
+        }
+        param_encoded = urllib.parse.quote(json.dumps(param, separators=(',', ':')))
+        return f"{self.base_url}{AJAX_PATH}?param={param_encoded}"
+
+    def extract_links(self, content, category_name, subcategory_name):
+        return [record.url for record in self.extract_listing(content, category_name, subcategory_name)]
+
+    def extract_listing(self, content, category_name, subcategory_name):
+        """Judul, pengarang, tahun, ID, jilid, tanggal unggah & jumlah kata dari setiap baris tabel"""
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, 'html.parser')
+        records = []
+        for link in soup.find_all('a', class_='ysl-lnk', href=True):
+            url = absolute_url(link['href'], self.base_url)
+            row = link.find_parent('tr') or link.parent
+            row_text = row.get_text(' ', strip=True)
+            koleksi = KOLEKSI_ID_PATTERN.search(link.get('title', '')) or URL_ID_PATTERN.search(url)
+            records.append(ListingRecord(
+                url,
+                koleksi_id=koleksi.group(1) if koleksi else None,
+                uploaded=parse_upload_date(row_text),
+                word_count=parse_word_count(row_text),
+                **parse_listing_label(link.get_text(' ', strip=True)),
+            ))
+        return records
+
+class LimitstartListing(ListingStrategy):
+    """Halaman koleksi Joomla dengan parameter ?limitstart=N"""
+
+    name = 'limitstart'
+    offset_param = 'limitstart'
+
+    def page_url(self, fc, fs, offset):
+        return f"{self.base_url}/koleksi?cid={fc}&sid={fs}&{self.offset_param}={offset}"
+
+    def extract_links(self, content, category_name, subcategory_name):
+        from bs4 import BeautifulSoup
+
+        # Link naskah berada di bawah /<slug-kategori>/<slug-sub-kategori>/
+        path_prefix = f"/{slugify(category_name)}/{slugify(subcategory_name)}/"
+        soup = BeautifulSoup(content, 'html.parser')
+        return [
+            absolute_url(link['href'], self.base_url)
+            for link in soup.find_all('a', href=True)
+            if path_prefix in link['href']
+        ]
+
+class StartListing(LimitstartListing):
+    """Halaman koleksi Joomla dengan parameter ?start=N (halaman pertama tanpa parameter)"""
+
+    name = 'start'
+    offset_param = 'start'
+
+    def page_url(self, fc, fs, offset):
+        if offset == 0:
+            return f"{self.base_url}/koleksi?cid={fc}&sid={fs}"
+        return super().page_url(fc, fs, offset)
+
+LISTING_STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (AjaxListing, LimitstartListing, StartListing)
+}
+
+# ==================== SCRAPING FUNCTIONS ====================
+
+def parse_manuscript_html(content, url):
+    """Ekstrak judul & konten naskah dari HTML halaman naskah (bytes atau str)"""
+    import io
+    from stream_extract import ManuscriptExtractor
+
+    extractor = ManuscriptExtractor()
+    if isinstance(content, str):
+        with stage('parse'):
+            extractor.feed(content)
+        title, text = extractor.result()
+    else:
+        extractor.feed_bytes(content)
+        title, text = extractor.finish(io.BytesIO(content))
+    return {'title': title, 'url': url, 'content': text}
+
+def scrape_manuscript(url, fetcher, limiter=None, metadata=None, max_bytes=MAX_BODY_BYTES, budget=None):
+    """Scrape konten naskah dari URL (body di-stream langsung ke extractor)"""
+    from stream_extract import ManuscriptExtractor
+
+    try:
+        extractor = ManuscriptExtractor()
+        with fetcher.stream(url, limiter, metadata, extractor.feed_bytes, max_bytes, budget) as (_, body):
+            title, text = extractor.finish(body)
+        return {'title': title, 'url': url, 'content': text}
+    except Exception as e:
+        print(f"  ❌ Error scraping {url}: {e}")
+        return None
+
+def subcategory_output_dir(output_dir, category_name, subcategory_name, flat=False):
+    """Folder output sub-kategori (nested: kategori/sub-kategori)"""
+    if flat:
+        return output_dir
+    return os.path.join(output_dir, clean_folder_name(category_name), clean_folder_name(subcategory_name))
+
+def manuscript_filename(manuscript, index, index_width=4):
+    """Nama file naskah: "0001_Judul.txt" """
+    return f"{index:0{index_width}d}_{clean_filename(manuscript['title'])}.txt"
+
+def manuscript_header_fields(manuscript):
+    """[(kunci, nilai)] header naskah: Judul, URL, lalu metadata listing (jika ada)"""
+    fields = [('Judul', manuscript['title']), ('URL', manuscript['url'])]
+    record = manuscript.get('listing')
+    if record:
+        fields += record.header_fields()
+    return fields
+
+def manuscript_header(manuscript):
+    """Header file naskah: baris "kunci: nilai", lalu garis pemisah"""
+    lines = [f"{label}: {value}" for label, value in manuscript_header_fields(manuscript)]
+    return "\n".join(lines) + "\n" + "=" * 80 + "\n\n"
+
+def write_manuscript_file(filepath, manuscript, content, catalog=None, catalog_path=None):
+    """Tulis header + isi sebagai utf-8; bytes yang sama dicatat di katalog (path: catalog_path atau filepath)"""
+    data = (manuscript_header(manuscript) + content).encode('utf-8')
+    with open(filepath, 'wb') as f:
+        f.write(data)
+    if catalog:
+        header = {label: str(value).strip() for label, value in manuscript_header_fields(manuscript)}
+        catalog.record(catalog_path or filepath, header, data)
+
+def existing_manuscripts(output_dir):
+    """{index: [(path, header)]} untuk file naskah yang sudah ada (hanya header yang dibaca)"""
+    from corpus import read_header
+
+    found = {}
+    if not os.path.isdir(output_dir):
+        return found
+    for filename in os.listdir(output_dir):
+        prefix, sep, _ = filename.partition('_')
+        if sep and prefix.isdigit() and filename.endswith('.txt'):
+            path = os.path.join(output_dir, filename)
+            found.setdefault(int(prefix), []).append((path, read_header(path)))
+    return found
+
+def listing_matches(record, header):
+    """File naskah = naskah di baris listing dan tidak berubah (tanggal unggah & jumlah kata sama)"""
+    if header.get('URL') != record.url:
+        return False
+    for value, label in ((record.uploaded, 'Diunggah'), (record.word_count, 'Jumlah kata')):
+        if value is not None and label in header and header[label] != str(value):
+            return False
+    return True
+
+def has_listing_metadata(header):
+    return any(label in header for _, label in ListingRecord.HEADER_FIELDS)
+
+def update_manuscript_header(path, record, catalog=None):
+    """Tulis ulang header file lama dengan metadata listing (isi naskah tidak diubah)"""
+    from corpus import read_manuscript
+
+    header, body = read_manuscript(path)
+    manuscript = {'title': header.get('Judul', ''), 'url': header.get('URL', record.url), 'listing': record}
+    tmp_path = path + '.tmp'
+    write_manuscript_file(tmp_path, manuscript, body, catalog, catalog_path=path)
+    os.replace(tmp_path, path)
+
+def clean_manuscript(manuscript, normalizer=None, boilerplate=None, category_name=None, subcategory_name=None):
+    """Buang boilerplate lalu normalisasi isi naskah di tempat (judul tidak diubah agar nama file tetap)"""
+    if not manuscript:
+        return manuscript
+    if boilerplate:
+        with stage('boilerplate'):
+            manuscript['content'] = boilerplate(manuscript['content'], category_name, subcategory_name)
+    if normalizer:
+        with stage('normalize'):
+            manuscript['content'] = normalizer(manuscript['content'])
+    return manuscript
+
+def save_manuscript(manuscript, index, output_dir, index_width=4, catalog=None):
+    """Simpan naskah ke file txt (dan catat di katalog jika ada)"""
+    if not manuscript:
+        return False
+
+    with stage('clean_filename'):
+        filename = manuscript_filename(manuscript, index, index_width)
+    filepath = os.path.join(output_dir, filename)
+
+    try:
+        with stage('write'):
+            write_manuscript_file(filepath, manuscript, manuscript['content'], catalog)
+
+        return True
+    except Exception as e:
+        print(f"  ❌ Error saving {filename}: {e}")
+        return False
+
+# ==================== MAIN SCRAPING LOGIC ====================
+
+class Scraper:
+    """Scraper multi sub-kategori dengan worker thread dan rate limit bersama"""
+
+    def __init__(self, output_dir=BASE_OUTPUT_DIR, listing='ajax', workers=1,
+                 delay=DELAY_BETWEEN_REQUESTS, page_delay=DELAY_BETWEEN_PAGES,
+                 category_delay=DELAY_BETWEEN_CATEGORIES, max_manuscripts=None,
+                 flat=False, index_width=4, resume=True,
+                 progress_file=PROGRESS_FILE, log_file=LOG_FILE, base_url=BASE_URL, archive_dir=None,
+                 max_body_bytes=MAX_BODY_BYTES, memory_budget=MEMORY_BUDGET_BYTES, catalog=True,
+                 normalize=True, char_map=None, boilerplate_model=None,
+                 listing_retries=LISTING_RETRIES, listing_checkpoint_dir=LISTING_CHECKPOINT_DIR,
+                 breaker_failures=BREAKER_FAILURES, breaker_cooldown=BREAKER_COOLDOWN):
+        self.output_dir = output_dir
+        self.listing = LISTING_STRATEGIES[listing](base_url=base_url)
+        self.workers = max(1, workers)
+        self.category_delay = category_delay
+        self.max_manuscripts = max_manuscripts
+        self.flat = flat
+        self.index_width = index_width
+        self.resume = resume
+        self.progress_file = progress_file
+        self.log_file = log_file
+        archive = None
+        if archive_dir:
+            from warc_archive import WarcWriter
+            archive = WarcWriter(archive_dir)
+        # Dibagi semua thread: host yang gagal berturut-turut menjeda listing & download sekaligus
+        self.breaker = CircuitBreaker(breaker_failures, breaker_cooldown) if breaker_failures else None
+        self.fetcher = Fetcher(archive=archive, breaker=self.breaker)
+        self.listing_retries = listing_retries
+        self.listing_checkpoint_dir = listing_checkpoint_dir
+        self.request_limiter = RateLimiter(delay)
+        self.page_limiter = RateLimiter(page_delay)
+        self.max_body_bytes = max_body_bytes
+        self.memory_budget = MemoryBudget(memory_budget) if memory_budget else None
+        self.catalog = None
+        if catalog:
+            from manuscript_catalog import ManuscriptCatalog
+            self.catalog = ManuscriptCatalog(output_dir)
+        self.normalizer = None
+        if normalize:
+            from text_normalize import TextNormalizer
+            self.normalizer = TextNormalizer(char_map)
+        self.boilerplate = None
+        if boilerplate_model:
+            from boilerplate import BoilerplateStripper
+            self.boilerplate = BoilerplateStripper.load(boilerplate_model)
+        self.status = None  # crawl_status.CrawlStatus (opsional, dipasang oleh CLI)
+        self.history = None  # crawl_state.FetchHistory (opsional, hash isi untuk crawl_refresh.py)
+
+    def clean(self, manuscript, category_name, subcategory_name):
+        """Boilerplate + normalisasi sebelum disimpan (dipanggil di thread worker)"""
+        return clean_manuscript(manuscript, self.normalizer, self.boilerplate, category_name, subcategory_name)
+
+    def print_cleanup_summary(self):
+        if self.boilerplate:
+            self.boilerplate.print_summary()
+        if self.normalizer:
+            self.normalizer.print_summary()
+
+    def record_history(self, url, key, index, output_dir, manuscript, category_name, subcategory_name):
+        """Catat fetch sukses + hash isi di fetch history (jika dipasang)"""
+        if self.history is None:
+            return
+        from crawl_state import content_hash
+
+        path = os.path.join(output_dir, manuscript_filename(manuscript, index, self.index_width))
+        self.history.record(url, key, index, path, content_hash(manuscript['content']),
+                            category=category_name, subcategory=subcategory_name)
+
+    def output_dir_for(self, category_name, subcategory_name):
+        """Folder output sub-kategori (nested: kategori/sub-kategori)"""
+        return subcategory_output_dir(self.output_dir, category_name, subcategory_name, self.flat)
+
+    def list_links(self, category_name, fc, subcategory, start_offset=0, stop_offset=None):
+        """URL naskah satu sub-kategori"""
+        return [record.url for record in self.list_records(category_name, fc, subcategory, start_offset, stop_offset)]
+
+    def list_records(self, category_name, fc, subcategory, start_offset=0, stop_offset=None, should_stop=None):
+        """Listing naskah satu sub-kategori (ListingRecord) dengan strategi yang dipilih
+        (should_stop: lihat ListingStrategy.list_records)"""
+        if self.max_manuscripts is not None:
+            stop_offset = self.max_manuscripts if stop_offset is None else min(stop_offset, self.max_manuscripts)
+        offset_info = ''
+        if start_offset or stop_offset is not None:
+            offset_info = f", offset {start_offset}-{stop_offset if stop_offset is not None else '...'}"
+        print(f"\n{'='*80}")
+        print(f"📂 Kategori: {category_name}")
+        print(f"📁 Sub-kategori: {subcategory['name']}")
+        print(f"🔍 Mengambil daftar naskah (fc={fc}, fs={subcategory['fs']}, listing={self.listing.name}{offset_info})...")
+        print(f"{'='*80}\n")
+
+        max_links = None if stop_offset is None else max(0, stop_offset - start_offset)
+        key = subcategory_key(category_name, subcategory['name'])
+        checkpoint = None
+        if self.listing_checkpoint_dir:
+            from crawl_state import ListingCheckpoint
+            # Host & batas rentang ikut menentukan isi listing: checkpoint lain tidak dipakai ulang
+            scope = hashlib.sha1(f"{self.listing.base_url}|{stop_offset}".encode()).hexdigest()[:8]
+            checkpoint = ListingCheckpoint(self.listing_checkpoint_dir,
+                                           f"{slugify(key)}_{self.listing.name}_{start_offset}_{scope}")
+        with PROFILER.context(key):
+            links = self.listing.list_records(
+                self.fetcher, self.page_limiter, fc, subcategory['fs'],
+                category_name, subcategory['name'], max_links,
+                start_offset=start_offset, stop_offset=stop_offset,
+                checkpoint=checkpoint, retries=self.listing_retries, should_stop=should_stop
+            )
+        # Listing lengkap: checkpoint tidak diperlukan lagi (ListingIncomplete/ListingTruncated tidak sampai sini)
+        if checkpoint:
+            checkpoint.clear()
+        print(f"\n✅ Selesai! Total: {len(links)} naskah\n")
+        return links
+
+    def download(self, index, link, total, output_dir, metadata=None, submitted_at=None):
+        """Worker: scrape + simpan satu naskah (link: ListingRecord atau URL;
+        submitted_at: perf_counter saat masuk antrian pool)"""
+        record = link if isinstance(link, ListingRecord) else ListingRecord(link)
+        metadata = dict(metadata or {}, kind='manuscript', index=index)
+        key = subcategory_key(metadata.get('category'), metadata.get('subcategory'))
+        if submitted_at is not None:
+            PROFILER.record('queue_wait', time.perf_counter() - submitted_at, key)
+        token = self.status.start_item(key) if self.status else None
+        with PROFILER.context(key):
+            manuscript = scrape_manuscript(record.url, self.fetcher, self.request_limiter, metadata,
+                                           self.max_body_bytes, self.memory_budget)
+            if manuscript:
+                manuscript['listing'] = record
+            self.clean(manuscript, metadata.get('category'), metadata.get('subcategory'))
+            ok = save_manuscript(manuscript, index, output_dir, self.index_width, self.catalog)
+        if self.status:
+            self.status.finish_item(key, token, ok)
+        if ok:
+            self.record_history(record.url, key, index, output_dir, manuscript,
+                                metadata.get('category'), metadata.get('subcategory'))
+        print(f"  [{index}/{total}] {'✅' if ok else '❌'} {record.url[:70]}")
+        return ok
+
+    def adopt_on_demand(self, path, index, url):
+        """Naskah hasil manuscript_service.py (nomor ON_DEMAND_INDEX) mendapat nomor urut listing-nya"""
+        from corpus import read_header
+
+        title_part = os.path.basename(path).split('_', 1)[1]
+        new_path = os.path.join(os.path.dirname(path), f"{index:0{self.index_width}d}_{title_part}")
+        os.replace(path, new_path)
+        if self.catalog:
+            with open(new_path, 'rb') as f:
+                data = f.read()
+            self.catalog.remove(path)
+            self.catalog.record(new_path, read_header(new_path), data)
+        if self.history is not None:
+            self.history.move(url, index, new_path)
+        return new_path
+
+    def skip_known(self, output_dir, indexed_links):
+        """Buang (index, record) yang filenya sudah ada & cocok dengan listing, return (sisa, jumlah dilewati).
+        File lama tanpa metadata listing cukup ditulis ulang header-nya, tanpa fetch; naskah yang
+        sudah diambil manuscript_service.py cukup diberi nomor urut."""
+        existing = existing_manuscripts(output_dir)
+        on_demand = existing.get(ON_DEMAND_INDEX, [])
+        remaining, skipped = [], 0
+        for index, link in indexed_links:
+            record = link if isinstance(link, ListingRecord) else ListingRecord(link)
+            match = next(((path, header) for path, header in existing.get(index, []) + on_demand
+                          if listing_matches(record, header)), None)
+            if match is None:
+                remaining.append((index, record))
+                continue
+            path, header = match
+            if match in on_demand:
+                on_demand.remove(match)
+                path = self.adopt_on_demand(path, index, record.url)
+            if not has_listing_metadata(header) and record.header_fields():
+                update_manuscript_header(path, record, self.catalog)
+            skipped += 1
+        return remaining, skipped
+
+    def download_links(self, category_name, subcategory_name, indexed_links, total=None):
+        """Download daftar (index, link) ke folder sub-kategori, return jumlah sukses.
+        Saat resume, naskah yang sudah ada dan tidak berubah menurut listing tidak di-fetch."""
+        output_dir = self.output_dir_for(category_name, subcategory_name)
+        os.makedirs(output_dir, exist_ok=True)
+        total = total or len(indexed_links)
+        metadata = {'category': category_name, 'subcategory': subcategory_name}
+        skipped = 0
+        if self.resume:
+            indexed_links, skipped = self.skip_known(output_dir, indexed_links)
+            if skipped:
+                print(f"⏭️  {skipped} naskah sudah ada & tidak berubah (tidak di-fetch)")
+            if self.status:
+                self.status.skipped(subcategory_key(category_name, subcategory_name), skipped)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            submitted_at = time.perf_counter()
+            results = list(executor.map(
+                lambda item: self.download(item[0], item[1], total, output_dir, metadata, submitted_at),
+                indexed_links
+            ))
+        if self.history is not None:
+            self.history.save()
+        return skipped + sum(results)
+
+    def scrape_subcategory(self, category_name, fc, subcategory):
+        """Scrape satu sub-kategori, return ringkasan hasil"""
+        subcategory_name = subcategory['name']
+        key = subcategory_key(category_name, subcategory_name)
+        result = {'category': category_name, 'subcategory': subcategory_name,
+                  'found': 0, 'success': 0, 'status': 'SKIPPED'}
+
+        # Cek apakah sudah pernah di-scrape
+        if self.resume and key in load_progress(self.progress_file).get('completed_subcategories', []):
+            print(f"⏭️  SKIP: {subcategory_name} (sudah selesai)")
+            return result
+
+        output_dir = self.output_dir_for(category_name, subcategory_name)
+        os.makedirs(output_dir, exist_ok=True)
+
+        try:
+            manuscript_links = self.list_records(category_name, fc, subcategory)
+            result['found'] = len(manuscript_links)
+            if self.status:
+                self.status.listed(key, len(manuscript_links))
+
+            if not manuscript_links:
+                print(f"⚠️  Tidak ada naskah ditemukan\n")
+                log_to_csv(category_name, subcategory_name, 0, 'NO_DATA', log_file=self.log_file)
+                mark_progress('completed_subcategories', key, self.progress_file)
+                result['status'] = 'NO_DATA'
+                return result
+
+            print(f"\n📥 Mulai download {len(manuscript_links)} naskah ({self.workers} worker)...")
+            total = len(manuscript_links)
+            result['success'] = self.download_links(
+                category_name, subcategory_name, list(enumerate(manuscript_links, 1))
+            )
+
+            print(f"\n✅ {subcategory_name}: {result['success']}/{total} berhasil")
+            print(f"📁 Tersimpan di: {output_dir}\n")
+
+            log_to_csv(category_name, subcategory_name, result['success'], 'SUCCESS', log_file=self.log_file)
+            mark_progress('completed_subcategories', key, self.progress_file)
+            result['status'] = 'SUCCESS'
+
+        except Exception as e:
+            # Termasuk ListingIncomplete: tidak ditandai selesai, run berikutnya lanjut dari checkpoint
+            print(f"\n❌ Error di {subcategory_name}: {e}\n")
+            log_to_csv(category_name, subcategory_name, 0, 'ERROR', str(e), log_file=self.log_file)
+            result['status'] = 'ERROR'
+            result['error'] = str(e)
+
+        return result
+
+    def run(self, selection):
+        """Scrape daftar (category_name, fc, subcategory), return list ringkasan"""
+        results = []
+        for position, (category_name, fc, subcategory) in enumerate(selection, 1):
+            print(f"\n[{position}/{len(selection)}] ", end='')
+            key = subcategory_key(category_name, subcategory['name'])
+            if self.status:
+                self.status.begin_subcategory(key)
+            result = self.scrape_subcategory(category_name, fc, subcategory)
+            results.append(result)
+            if self.status:
+                self.status.end_subcategory(key, result['status'], result.get('error'))
+
+            # Delay antar sub-kategori (tidak perlu kalau di-skip)
+            if position < len(selection) and result['status'] != 'SKIPPED':
+                print(f"⏳ Waiting {self.category_delay}s before next subcategory...\n")
+                time.sleep(self.category_delay)
+
+        # Kategori dianggap selesai jika semua sub-kategorinya selesai
+        completed = set(load_progress(self.progress_file).get('completed_subcategories', []))
+        for category_name, category_data in CATEGORIES.items():
+            if all(subcategory_key(category_name, sub['name']) in completed
+                   for sub in category_data['subcategories']):
+                mark_progress('completed_categories', category_name, self.progress_file)
+
+        return results
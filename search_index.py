@@ -0,0 +1,576 @@
+"""
+Indeks Pencarian Lokal (Inverted Index + BM25) untuk Korpus Sastra.org
+Mengganti grep puluhan ribu file dengan indeks on-disk yang bisa di-query dalam milidetik.
+
+Struktur folder indeks (INDEX_DIR):
+    meta.json              - sumber corpus, daftar segmen, jumlah dokumen, total panjang
+    documents.jsonl        - tabel dokumen (judul, URL, kategori, path)
+    documents.idx          - offset byte tiap baris documents.jsonl (uint64)
+    doclens.bin            - panjang dokumen dalam token (uint32, 0 = dihapus)
+    seg_XXXX.lex           - leksikon terurut "term<TAB>offset<TAB>length<TAB>df"
+    seg_XXXX.post          - posting list terkompresi (varint delta doc_id + tf)
+
+Saat query, leksikon dan posting dibaca via mmap (binary search di leksikon).
+Update inkremental hanya mengindeks file baru/berubah ke segmen baru; versi
+lama ditandai terhapus lewat doclens = 0. Compact menggabungkan semua segmen
+menjadi satu dan membuang dokumen terhapus (otomatis setelah update jika segmen
+> COMPACT_MAX_SEGMENTS atau dokumen terhapus > COMPACT_MAX_DEAD_RATIO).
+
+CARA PAKAI:
+    python search_index.py build                    # bangun ulang indeks penuh
+    python search_index.py build --source corpus.pack   # dari file .pack
+    python search_index.py update                   # indeks naskah baru/berubah saja
+    python search_index.py compact                  # gabungkan segmen, buang dokumen terhapus
+    python search_index.py query "serat centhini" -k 10
+    python search_index.py query "babad" --category Kisah_Cerita_dan_Kronikal
+    python search_index.py stats
+"""
+
+import os
+import sys
+import json
+import math
+import mmap
+import time
+import heapq
+import shutil
+import argparse
+from array import array
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from corpus import BASE_DIR, CorpusReader
+from text_utils import tokenize
+
+# ==================== KONFIGURASI ====================
+
+INDEX_DIR = "search_index"
+BM25_K1 = 1.2
+BM25_B = 0.75
+DEFAULT_TOP_K = 10
+SEGMENT_MAX_POSTINGS = 2_000_000  # Flush segmen setiap ~2 juta pasangan (term, dokumen)
+COMPACT_MAX_SEGMENTS = 8          # Update otomatis compact jika segmen lebih dari ini
+COMPACT_MAX_DEAD_RATIO = 0.2      # ... atau jika proporsi dokumen terhapus melebihi ini
+FILES_PER_TASK = 32
+
+# ==================== VARINT ====================
+
+def encode_varint(value, out):
+    """Tulis integer non-negatif sebagai varint ke bytearray"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def decode_postings(data):
+    """Decode posting list varint, yield (doc_id, tf)"""
+    doc_id = 0
+    value = shift = 0
+    expect_tf = False
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        if expect_tf:
+            yield doc_id, value
+        else:
+            doc_id += value
+        expect_tf = not expect_tf
+        value = shift = 0
+
+# ==================== FILE HELPERS ====================
+
+def _path(index_dir, name):
+    return os.path.join(index_dir, name)
+
+def _write_atomic(filepath, data, mode='wb'):
+    """Tulis file ke .tmp lalu replace, supaya reader tidak melihat file setengah jadi"""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, mode, **({} if 'b' in mode else {'encoding': 'utf-8'})) as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+
+def load_meta(index_dir=INDEX_DIR):
+    """Load meta.json indeks (None jika indeks belum ada)"""
+    meta_path = _path(index_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def load_documents(index_dir=INDEX_DIR):
+    """Load seluruh tabel dokumen (dipakai saat update, bukan saat query)"""
+    documents = []
+    with open(_path(index_dir, 'documents.jsonl'), 'r', encoding='utf-8') as f:
+        for line in f:
+            documents.append(json.loads(line))
+    doclens = array('I')
+    with open(_path(index_dir, 'doclens.bin'), 'rb') as f:
+        doclens.frombytes(f.read())
+    return documents, doclens
+
+# ==================== BUILD / UPDATE ====================
+
+def scan_corpus(source=BASE_DIR):
+    """Daftar file naskah beserta ukuran & mtime ('record' = corpus.ManuscriptRecord, tidak disimpan)"""
+    files = []
+    for category_name, subcategory_name, records in CorpusReader(source).subcategories():
+        for record in records:
+            size, mtime = record.signature()
+            files.append({
+                'path': record.path,
+                'category': category_name,
+                'subcategory': subcategory_name,
+                'size': size,
+                'mtime': mtime,
+                'record': record,
+            })
+    return files
+
+def tokenize_files(records):
+    """Worker: return [(judul, url, {term: tf})] untuk sekumpulan corpus.ManuscriptRecord"""
+    results = []
+    for record in records:
+        try:
+            header, body = record.read()
+        except (OSError, UnicodeDecodeError):
+            results.append(None)
+            continue
+        title = header.get('Judul', record.filename)
+        # Judul ikut diindeks supaya pencarian judul juga kena
+        results.append((title, header.get('URL'), dict(Counter(tokenize(title + '\n' + body)))))
+    return results
+
+def write_segment(index_dir, segment_name, postings):
+    """Tulis satu segmen: leksikon terurut + posting list terkompresi"""
+    lexicon_lines = []
+    data = bytearray()
+    for term in sorted(postings, key=lambda t: t.encode('utf-8')):
+        entries = postings[term]
+        offset = len(data)
+        previous = 0
+        for doc_id, tf in entries:
+            encode_varint(doc_id - previous, data)
+            encode_varint(tf, data)
+            previous = doc_id
+        lexicon_lines.append(f"{term}\t{offset}\t{len(data) - offset}\t{len(entries)}\n")
+
+    _write_atomic(_path(index_dir, f'{segment_name}.post'), bytes(data))
+    _write_atomic(_path(index_dir, f'{segment_name}.lex'), ''.join(lexicon_lines).encode('utf-8'))
+
+def index_files(index_dir, files, documents, doclens, meta, workers=None):
+    """Tokenisasi file secara paralel lalu tulis ke satu/lebih segmen baru"""
+    postings = {}
+    postings_count = 0
+
+    def flush():
+        nonlocal postings, postings_count
+        if not postings:
+            return
+        meta['next_segment'] += 1
+        segment_name = f"seg_{meta['next_segment']:04d}"
+        write_segment(index_dir, segment_name, postings)
+        meta['segments'].append(segment_name)
+        print(f"   💾 Segmen {segment_name}: {len(postings):,} term, {postings_count:,} posting")
+        postings, postings_count = {}, 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batches = [files[i:i + FILES_PER_TASK] for i in range(0, len(files), FILES_PER_TASK)]
+        futures = [executor.submit(tokenize_files, [f['record'] for f in batch]) for batch in batches]
+
+        for batch, future in zip(batches, futures):
+            for file_info, result in zip(batch, future.result()):
+                if result is None:
+                    continue
+                title, url, term_counts = result
+                doc_id = len(documents)
+                documents.append({
+                    'doc_id': doc_id,
+                    'title': title,
+                    'url': url,
+                    **{key: value for key, value in file_info.items() if key != 'record'},
+                })
+                doclens.append(sum(term_counts.values()))
+
+                for term, tf in term_counts.items():
+                    postings.setdefault(term, []).append((doc_id, tf))
+                postings_count += len(term_counts)
+
+            if postings_count >= SEGMENT_MAX_POSTINGS:
+                flush()
+    flush()
+
+def save_tables(index_dir, documents, doclens, meta):
+    """Tulis tabel dokumen, offset, panjang dokumen, lalu meta.json (terakhir)"""
+    lines = []
+    offsets = array('Q')
+    position = 0
+    for doc in documents:
+        line = (json.dumps(doc, ensure_ascii=False) + '\n').encode('utf-8')
+        offsets.append(position)
+        position += len(line)
+        lines.append(line)
+
+    live = [length for length in doclens if length]
+    meta['documents'] = len(live)
+    meta['total_length'] = sum(live)
+    meta['updated_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+
+    _write_atomic(_path(index_dir, 'documents.jsonl'), b''.join(lines))
+    _write_atomic(_path(index_dir, 'documents.idx'), offsets.tobytes())
+    _write_atomic(_path(index_dir, 'doclens.bin'), doclens.tobytes())
+    _write_atomic(_path(index_dir, 'meta.json'), json.dumps(meta, indent=2), mode='w')
+
+def build_index(index_dir=INDEX_DIR, workers=None, source=BASE_DIR):
+    """Bangun ulang indeks dari nol (source: folder corpus atau file .pack)"""
+    if not os.path.exists(source):
+        print(f"❌ {source} tidak ditemukan!")
+        return
+
+    start = time.time()
+    if os.path.exists(index_dir):
+        shutil.rmtree(index_dir)
+    os.makedirs(index_dir)
+
+    files = scan_corpus(source)
+    print(f"📚 Mengindeks {len(files):,} naskah ke {index_dir}/ ...")
+
+    meta = {'segments': [], 'next_segment': 0, 'source': source}
+    documents, doclens = [], array('I')
+    index_files(index_dir, files, documents, doclens, meta, workers)
+    save_tables(index_dir, documents, doclens, meta)
+
+    print(f"✅ Indeks selesai: {meta['documents']:,} dokumen, "
+          f"{len(meta['segments'])} segmen ({time.time() - start:.1f}s)")
+
+def update_index(index_dir=INDEX_DIR, workers=None, source=None):
+    """Update inkremental: indeks file baru/berubah, tandai yang hilang sebagai terhapus
+    (source default: sumber saat build)"""
+    meta = load_meta(index_dir)
+    if meta is None:
+        print("ℹ️  Indeks belum ada, membangun dari nol...")
+        build_index(index_dir, workers, source or BASE_DIR)
+        return
+    source = source or meta.get('source', BASE_DIR)
+    if not os.path.exists(source):
+        print(f"❌ {source} tidak ditemukan!")
+        return
+    meta['source'] = source
+
+    start = time.time()
+    documents, doclens = load_documents(index_dir)
+    current = {
+        doc['path']: doc for doc in documents if doclens[doc['doc_id']]
+    }
+
+    files = scan_corpus(source)
+    changed = []
+    seen = set()
+    for file_info in files:
+        seen.add(file_info['path'])
+        existing = current.get(file_info['path'])
+        if existing and existing['size'] == file_info['size'] and existing['mtime'] == file_info['mtime']:
+            continue
+        if existing:
+            doclens[existing['doc_id']] = 0
+        changed.append(file_info)
+
+    removed = [doc for path, doc in current.items() if path not in seen]
+    for doc in removed:
+        doclens[doc['doc_id']] = 0
+
+    if not changed and not removed:
+        print("✅ Indeks sudah up-to-date")
+        return
+
+    print(f"🔄 Update indeks: {len(changed):,} baru/berubah, {len(removed):,} dihapus")
+    index_files(index_dir, changed, documents, doclens, meta, workers)
+    save_tables(index_dir, documents, doclens, meta)
+
+    print(f"✅ Update selesai: {meta['documents']:,} dokumen aktif, "
+          f"{len(meta['segments'])} segmen ({time.time() - start:.1f}s)")
+
+    dead_ratio = 1 - meta['documents'] / len(doclens) if len(doclens) else 0
+    if len(meta['segments']) > COMPACT_MAX_SEGMENTS or dead_ratio > COMPACT_MAX_DEAD_RATIO:
+        compact_index(index_dir)
+
+def read_lexicon(index_dir, segment_name, number):
+    """Yield (term_bytes, nomor segmen, offset, length) dari leksikon segmen (sudah terurut)"""
+    with open(_path(index_dir, f'{segment_name}.lex'), 'rb') as f:
+        for line in f:
+            term, offset, length, _ = line.rstrip(b'\n').split(b'\t')
+            yield term, number, int(offset), int(length)
+
+def compact_index(index_dir=INDEX_DIR):
+    """Gabungkan semua segmen menjadi satu, buang posting dokumen terhapus (doclens = 0)
+    dan nomori ulang doc_id. Leksikon segmen di-merge secara streaming (k-way merge)."""
+    meta = load_meta(index_dir)
+    if meta is None:
+        print(f"❌ Indeks tidak ditemukan di {index_dir}/")
+        return
+    start = time.time()
+    documents, doclens = load_documents(index_dir)
+    old_segments = list(meta['segments'])
+
+    # doc_id lama -> baru (hanya dokumen aktif, urutan dipertahankan)
+    new_ids = {}
+    live_documents, live_doclens = [], array('I')
+    for doc in documents:
+        if doclens[doc['doc_id']]:
+            new_ids[doc['doc_id']] = len(live_documents)
+            live_doclens.append(doclens[doc['doc_id']])
+            live_documents.append(dict(doc, doc_id=len(live_documents)))
+
+    meta['next_segment'] += 1
+    segment_name = f"seg_{meta['next_segment']:04d}"
+    postings_files = [open(_path(index_dir, f'{name}.post'), 'rb') for name in old_segments]
+    lexicon_lines = []
+    terms = 0
+    try:
+        with open(_path(index_dir, f'{segment_name}.post.tmp'), 'wb') as out:
+            position = 0
+            merged = heapq.merge(*(
+                read_lexicon(index_dir, name, number) for number, name in enumerate(old_segments)
+            ))
+            current, data, df = None, bytearray(), 0
+            previous = 0
+
+            def flush_term():
+                nonlocal position, terms
+                if df:
+                    out.write(data)
+                    lexicon_lines.append(b'%s\t%d\t%d\t%d\n' % (current, position, len(data), df))
+                    position += len(data)
+                    terms += 1
+
+            # Segmen berurutan menurut doc_id, jadi posting per term tetap terurut
+            for term, number, offset, length in merged:
+                if term != current:
+                    flush_term()
+                    current, data, df, previous = term, bytearray(), 0, 0
+                source = postings_files[number]
+                source.seek(offset)
+                for doc_id, tf in decode_postings(source.read(length)):
+                    new_id = new_ids.get(doc_id)
+                    if new_id is None:
+                        continue
+                    encode_varint(new_id - previous, data)
+                    encode_varint(tf, data)
+                    previous = new_id
+                    df += 1
+            flush_term()
+    finally:
+        for f in postings_files:
+            f.close()
+
+    os.replace(_path(index_dir, f'{segment_name}.post.tmp'), _path(index_dir, f'{segment_name}.post'))
+    _write_atomic(_path(index_dir, f'{segment_name}.lex'), b''.join(lexicon_lines))
+    meta['segments'] = [segment_name]
+    save_tables(index_dir, live_documents, live_doclens, meta)
+    for name in old_segments:
+        for suffix in ('.lex', '.post'):
+            os.remove(_path(index_dir, name + suffix))
+
+    print(f"🗜️  Compact: {len(old_segments)} segmen -> 1, {len(documents) - len(live_documents):,} dokumen "
+          f"terhapus dibuang, {terms:,} term ({time.time() - start:.1f}s)")
+
+# ==================== QUERY ====================
+
+def _map_file(filepath):
+    """mmap read-only (None untuk file kosong, karena mmap tidak bisa panjang 0)"""
+    with open(filepath, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def lexicon_lookup(lexicon, term):
+    """Binary search term di leksikon mmap, return (offset, length, df) atau None"""
+    if lexicon is None:
+        return None
+    lo, hi = 0, len(lexicon)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        start = lexicon.rfind(b'\n', lo, mid)
+        start = lo if start == -1 else start + 1
+        end = lexicon.find(b'\n', start)
+        key, offset, length, df = lexicon[start:end].split(b'\t')
+        if key == term:
+            return int(offset), int(length), int(df)
+        if key < term:
+            lo = end + 1
+        else:
+            hi = start
+    return None
+
+class SearchIndex:
+    """Reader indeks on-disk; semua file besar dibaca via mmap"""
+
+    def __init__(self, index_dir=INDEX_DIR):
+        self.index_dir = index_dir
+        self.meta = load_meta(index_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"Indeks tidak ditemukan di {index_dir}/ (jalankan: build)")
+
+        self.segments = [
+            (_map_file(_path(index_dir, f'{name}.lex')), _map_file(_path(index_dir, f'{name}.post')))
+            for name in self.meta['segments']
+        ]
+        self._doclens_map = _map_file(_path(index_dir, 'doclens.bin'))
+        self.doclens = memoryview(self._doclens_map).cast('I') if self._doclens_map else []
+        self._offsets_map = _map_file(_path(index_dir, 'documents.idx'))
+        self.offsets = memoryview(self._offsets_map).cast('Q') if self._offsets_map else []
+        self._documents = open(_path(index_dir, 'documents.jsonl'), 'rb')
+
+        self.doc_count = self.meta['documents']
+        self.avg_length = self.meta['total_length'] / self.doc_count if self.doc_count else 0
+
+    def close(self):
+        # memoryview harus dilepas dulu sebelum mmap-nya bisa ditutup
+        for view in (self.doclens, self.offsets):
+            if isinstance(view, memoryview):
+                view.release()
+        for lexicon, postings in self.segments:
+            for mm in (lexicon, postings):
+                if mm is not None:
+                    mm.close()
+        for mm in (self._doclens_map, self._offsets_map):
+            if mm is not None:
+                mm.close()
+        self._documents.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def document(self, doc_id):
+        """Ambil satu baris tabel dokumen via offset (tanpa load seluruh tabel)"""
+        self._documents.seek(self.offsets[doc_id])
+        return json.loads(self._documents.readline())
+
+    def postings(self, term):
+        """Gabungan posting list term dari semua segmen (hanya dokumen aktif)"""
+        term_bytes = term.encode('utf-8')
+        doclens = self.doclens
+        result = []
+        for lexicon, postings in self.segments:
+            entry = lexicon_lookup(lexicon, term_bytes)
+            if entry is None:
+                continue
+            offset, length, _ = entry
+            result.extend(
+                (doc_id, tf) for doc_id, tf in decode_postings(postings[offset:offset + length])
+                if doclens[doc_id]
+            )
+        return result
+
+    def search(self, query, top_k=DEFAULT_TOP_K, category=None, subcategory=None):
+        """Cari dengan skor BM25, return list (skor, dokumen)"""
+        scores = Counter()
+        doclens, avg_length = self.doclens, self.avg_length or 1
+
+        for term in set(tokenize(query)):
+            postings = self.postings(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings:
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * doclens[doc_id] / avg_length)
+                scores[doc_id] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+        results = []
+        # Ambil kandidat teratas dulu, filter kategori dilakukan setelahnya
+        candidates = heapq.nlargest(
+            top_k if not (category or subcategory) else len(scores),
+            scores.items(), key=lambda item: item[1]
+        )
+        for doc_id, score in candidates:
+            doc = self.document(doc_id)
+            if category and doc['category'] != category:
+                continue
+            if subcategory and doc['subcategory'] != subcategory:
+                continue
+            results.append((score, doc))
+            if len(results) >= top_k:
+                break
+        return results
+
+def run_query(query, top_k=DEFAULT_TOP_K, category=None, subcategory=None, as_json=False):
+    """CLI query: print hasil BM25"""
+    start = time.perf_counter()
+    with SearchIndex() as index:
+        results = index.search(query, top_k, category, subcategory)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if as_json:
+        print(json.dumps([
+            {'score': round(score, 4), **doc} for score, doc in results
+        ], indent=2, ensure_ascii=False))
+        return
+
+    print(f"\n🔍 \"{query}\" — {len(results)} hasil ({elapsed_ms:.1f} ms)\n")
+    for rank, (score, doc) in enumerate(results, 1):
+        print(f"{rank:2}. [{score:6.2f}] {doc['title']}")
+        print(f"     {doc['category']} > {doc['subcategory']}")
+        print(f"     {doc['url'] or doc['path']}")
+
+def print_stats(index_dir=INDEX_DIR):
+    """Ringkasan isi indeks"""
+    meta = load_meta(index_dir)
+    if meta is None:
+        print(f"❌ Indeks tidak ditemukan di {index_dir}/")
+        return
+    size = sum(
+        os.path.getsize(_path(index_dir, name)) for name in os.listdir(index_dir)
+    )
+    print(f"📊 Indeks {index_dir}/")
+    print(f"   Sumber        : {meta.get('source', BASE_DIR)}")
+    print(f"   Dokumen aktif : {meta['documents']:,}")
+    print(f"   Segmen        : {len(meta['segments'])}")
+    print(f"   Rata-rata     : {meta['total_length'] / max(meta['documents'], 1):,.0f} token/dokumen")
+    print(f"   Ukuran        : {size / (1024 * 1024):.2f} MB")
+    print(f"   Diperbarui    : {meta.get('updated_at')}")
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Indeks & pencarian BM25 lokal untuk korpus sastra.org")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text, source_default in (
+            ('build', "Bangun ulang indeks penuh", BASE_DIR),
+            ('update', "Indeks naskah baru/berubah saja", "sumber saat build")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--workers', type=int, default=None, help="Jumlah worker process")
+        sub.add_argument('--source', default=BASE_DIR if name == 'build' else None,
+                         help=f"Folder corpus atau file .pack (default: {source_default})")
+
+    query = subparsers.add_parser('query', help="Cari naskah (BM25)")
+    query.add_argument('query', help="Teks pencarian")
+    query.add_argument('-k', '--top-k', type=int, default=DEFAULT_TOP_K, help="Jumlah hasil")
+    query.add_argument('--category', help="Filter nama folder kategori")
+    query.add_argument('--subcategory', help="Filter nama folder sub-kategori")
+    query.add_argument('--json', action='store_true', help="Output JSON")
+
+    subparsers.add_parser('compact', help="Gabungkan segmen & buang dokumen terhapus")
+    subparsers.add_parser('stats', help="Ringkasan indeks")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        if args.command == 'build':
+            build_index(workers=args.workers, source=args.source)
+        elif args.command == 'update':
+            update_index(workers=args.workers, source=args.source)
+        elif args.command == 'query':
+            run_query(args.query, args.top_k, args.category, args.subcategory, args.json)
+        elif args.command == 'compact':
+            compact_index()
+        elif args.command == 'stats':
+            print_stats()
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
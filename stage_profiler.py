@@ -0,0 +1,204 @@
+"""
+Profiler Tahap Scraping
+Mengukur waktu setiap tahap per naskah, dikelompokkan per sub-kategori:
+
+    queue_wait      menunggu giliran di thread pool download
+    breaker_wait    dijeda circuit breaker (host gagal berturut-turut)
+    rate_limit      menunggu RateLimiter (politeness budget)
+    memory_wait     menunggu MemoryBudget (halaman besar sedang diproses)
+    connect_ttfb    koneksi + menunggu header respons (requests tidak
+                    memisahkan connect dan TTFB)
+    download        membaca body respons (termasuk feed ke extractor)
+    decode          bytes -> str
+    parse           HTMLParser inkremental (stream_extract)
+    get_text        gabungkan string judul & konten
+    boilerplate     buang boilerplate lintas halaman (boilerplate.py)
+    normalize       normalisasi teks (NFC, pemetaan karakter, whitespace)
+    clean_filename  clean_filename / manuscript_filename
+    write           menulis file naskah
+    listing_*       tahap yang sama untuk halaman listing
+
+Waktu tahap bersifat eksklusif (tahap bersarang tidak dihitung dobel) dan
+dijumlah per thread, sehingga total bisa melebihi durasi wall-clock saat
+memakai banyak worker.
+
+Mode --profile menambahkan sampling profiler: thread terpisah mengambil
+sys._current_frames() setiap interval dan menulis stack dalam format
+"folded" (flamegraph.pl / speedscope) dengan frame akar = tahap yang sedang
+berjalan di thread tersebut. Berbeda dengan cProfile, sampler ini melihat
+semua thread worker sekaligus.
+"""
+
+import os
+import sys
+import time
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+# ==================== KONFIGURASI ====================
+
+PROFILE_OUTPUT_FILE = "profile_stacks.folded"
+DEFAULT_SAMPLE_INTERVAL = 0.005  # detik
+
+STAGE_ORDER = [
+    'queue_wait', 'breaker_wait', 'rate_limit', 'memory_wait', 'connect_ttfb', 'download', 'decode', 'parse', 'get_text',
+    'boilerplate', 'normalize', 'clean_filename', 'write', 'listing_wait', 'listing_fetch', 'listing_parse',
+]
+NO_CONTEXT = '(tanpa sub-kategori)'
+
+# ==================== PROFILER ====================
+
+class StageProfiler:
+    """Akumulasi waktu eksklusif per (sub-kategori, tahap), aman untuk banyak thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._active = {}  # thread ident -> stack tahap (dibaca sampler)
+        self.totals = defaultdict(lambda: defaultdict(float))
+        self.counts = defaultdict(Counter)
+        self._sampler = None
+
+    def _stack(self):
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+            self._active[threading.get_ident()] = stack
+        return stack
+
+    def current_context(self):
+        return getattr(self._local, 'context', None) or NO_CONTEXT
+
+    @contextmanager
+    def context(self, key):
+        """Kelompokkan tahap di thread ini ke sub-kategori `key`"""
+        previous = getattr(self._local, 'context', None)
+        self._local.context = key
+        try:
+            yield
+        finally:
+            self._local.context = previous
+
+    @contextmanager
+    def stage(self, name):
+        """Ukur satu tahap (waktu tahap bersarang dikurangkan dari induknya)"""
+        stack = self._stack()
+        entry = [name, time.perf_counter(), 0.0]
+        stack.append(entry)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - entry[1]
+            if stack:
+                stack[-1][2] += elapsed
+            self.record(name, elapsed - entry[2])
+
+    def record(self, name, seconds, key=None):
+        key = key or self.current_context()
+        with self._lock:
+            self.totals[key][name] += seconds
+            self.counts[key][name] += 1
+
+    def current_stages(self):
+        """{thread ident: tahap teratas} untuk sampler"""
+        return {ident: stack[-1][0] for ident, stack in list(self._active.items()) if stack}
+
+    def reset(self):
+        with self._lock:
+            self.totals.clear()
+            self.counts.clear()
+
+    # ---------- Sampling profiler ----------
+
+    def start_sampling(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self._sampler = StackSampler(self, interval)
+        self._sampler.start()
+
+    def stop_sampling(self, output_file=PROFILE_OUTPUT_FILE):
+        """Hentikan sampler, tulis stack folded, return jumlah sampel"""
+        if not self._sampler:
+            return 0
+        self._sampler.stop()
+        samples = self._sampler.write(output_file)
+        self._sampler = None
+        return samples
+
+    # ---------- Ringkasan ----------
+
+    def summary(self):
+        """{key: [(tahap, detik, jumlah)]} terurut sesuai STAGE_ORDER"""
+        with self._lock:
+            result = {}
+            for key, stages in self.totals.items():
+                names = sorted(stages, key=lambda n: STAGE_ORDER.index(n) if n in STAGE_ORDER else len(STAGE_ORDER))
+                result[key] = [(name, stages[name], self.counts[key][name]) for name in names]
+            return result
+
+    def print_summary(self):
+        """Tabel waktu per tahap untuk setiap sub-kategori + total"""
+        summary = self.summary()
+        if not summary:
+            return
+        overall = defaultdict(float)
+        overall_counts = Counter()
+
+        print(f"\n{'='*80}")
+        print(f"⏱️  WAKTU PER TAHAP (detik-thread, eksklusif)")
+        print(f"{'='*80}")
+        for key, stages in summary.items():
+            total = sum(seconds for _, seconds, _ in stages) or 1
+            manuscripts = dict((name, count) for name, _, count in stages).get('write', 0)
+            print(f"\n📁 {key} ({manuscripts:,} naskah, {total:,.1f}s)")
+            for name, seconds, count in stages:
+                overall[name] += seconds
+                overall_counts[name] += count
+                bar = '█' * int(seconds / total * 30)
+                print(f"   {name:<15} {seconds:>9.2f}s {seconds / total * 100:>5.1f}%  "
+                      f"{seconds / count * 1000:>8.1f}ms/x  {bar}")
+
+        total = sum(overall.values()) or 1
+        print(f"\n📊 TOTAL")
+        for name in sorted(overall, key=lambda n: -overall[n]):
+            print(f"   {name:<15} {overall[name]:>9.2f}s {overall[name] / total * 100:>5.1f}%  "
+                  f"{overall[name] / overall_counts[name] * 1000:>8.1f}ms/x")
+
+class StackSampler(threading.Thread):
+    """Sampling profiler: stack semua thread yang sedang berada di suatu tahap"""
+
+    def __init__(self, profiler, interval):
+        super().__init__(daemon=True, name='stack-sampler')
+        self.profiler = profiler
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        own = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            stages = self.profiler.current_stages()
+            for ident, frame in sys._current_frames().items():
+                if ident == own or ident not in stages:
+                    continue
+                frames = []
+                while frame is not None:
+                    code = frame.f_code
+                    frames.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                frames.append(f"stage:{stages[ident]}")
+                self.stacks[';'.join(reversed(frames))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+    def write(self, output_file):
+        with open(output_file, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return sum(self.stacks.values())
+
+# Instance global yang dipakai scraper_engine
+PROFILER = StageProfiler()
+stage = PROFILER.stage
@@ -0,0 +1,291 @@
+"""
+Ekstraksi Naskah Inkremental (HTMLParser stdlib)
+Pengganti BeautifulSoup untuk halaman naskah: body di-feed per chunk selama
+download sehingga tidak perlu membangun pohon DOM maupun menyimpan seluruh
+HTML di memori. Hasilnya identik dengan versi BeautifulSoup sebelumnya:
+
+    title   = soup.find('h1').get_text(strip=True)
+    content = (soup.find('div', class_='item-page') or soup.find('article'))
+              .get_text(separator='\\n', strip=True)
+
+Aturan bs4 + html.parser yang diikuti:
+    - end tag menutup elemen terbuka terakhir dengan nama sama (end tag tanpa
+      pasangan diabaikan), void element (br, img, ...) tidak pernah dibuka
+    - teks di dalam script/style/template/rt/rp tidak ikut get_text
+    - komentar, doctype, processing instruction memutus string dan tidak ikut;
+      CDATA ikut sebagai string tersendiri
+    - referensi entity / numerik dikonversi dengan tabel bs4
+
+Encoding dipilih seperti UnicodeDammit: BOM, deklarasi charset di awal
+dokumen, utf-8, lalu windows-1252 (dengan replace). Jika decode gagal di
+tengah stream, ekstraksi diulang dari body yang sudah di-spool. Satu beda:
+untuk dokumen tanpa deklarasi, bs4 mencoba tebakan charset_normalizer dulu
+sebelum utf-8; di sini tebakan baru dipakai jika utf-8 gagal (tebakan butuh
+seluruh body, dan dokumen utf-8 valid hampir selalu ditebak utf-8).
+"""
+
+import codecs
+from html.parser import HTMLParser
+
+from stage_profiler import stage
+
+# ==================== KONFIGURASI ====================
+
+SNIFF_BYTES = 4096  # Awal dokumen yang dicari BOM / deklarasi charset-nya
+REPLAY_CHUNK = 64 * 1024
+FALLBACK_ENCODINGS = ['utf-8', 'windows-1252']
+
+TITLE = 'title'
+ITEM_PAGE = 'item_page'
+ARTICLE = 'article'
+
+# Fallback jika elemen tidak ditemukan (sama dengan versi BeautifulSoup)
+UNTITLED = "Untitled"
+NO_CONTENT = "Konten tidak ditemukan"
+
+# ==================== ENCODING ====================
+
+def sniff_encoding(prefix):
+    """(encoding, panjang BOM) dari BOM atau deklarasi charset; encoding None jika tidak ada"""
+    from bs4.dammit import EncodingDetector
+
+    for bom, encoding in ((codecs.BOM_UTF8, 'utf-8'), (codecs.BOM_UTF16_LE, 'utf-16-le'),
+                          (codecs.BOM_UTF16_BE, 'utf-16-be')):
+        if prefix.startswith(bom):
+            return encoding, len(bom)
+
+    declared = EncodingDetector.find_declared_encoding(prefix, is_html=True, search_entire_document=True)
+    if declared:
+        try:
+            return codecs.lookup(declared).name, 0
+        except LookupError:
+            pass
+    return None, 0
+
+def guess_encoding(body):
+    """Tebakan charset_normalizer (dipakai bs4 untuk dokumen tanpa deklarasi), None jika tidak tersedia"""
+    try:
+        from charset_normalizer import detect
+    except ImportError:
+        return None
+    body.seek(0)
+    encoding = detect(body.read())['encoding']
+    try:
+        return codecs.lookup(encoding).name if encoding else None
+    except LookupError:
+        return None
+
+# ==================== EXTRACTOR ====================
+
+class ManuscriptExtractor(HTMLParser):
+    """Judul (h1 pertama) + konten (div.item-page pertama, atau article) secara streaming
+
+    Pakai: feed_bytes(chunk) selama download, lalu finish(body) -> (judul, konten).
+    Untuk input str cukup feed(text) lalu result().
+    """
+
+    def __init__(self):
+        from bs4.builder import HTMLTreeBuilder
+        from bs4.dammit import EntitySubstitution
+
+        super().__init__(convert_charrefs=False)
+        self.empty_elements = HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS
+        self.string_containers = set(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS)
+        self.entities = EntitySubstitution.HTML_ENTITY_TO_CHARACTER
+        self.encodings = []
+        self.encoding_index = 0
+        self.bom_length = 0
+        self.declared = False
+        self.needs_replay = False
+        self._sniff_buffer = b''
+        self.decoder = None
+        self._start_document()
+
+    def _start_document(self):
+        self.reset()
+        self.stack = []            # (nama tag, label target yang dibuka tag ini)
+        self.open_labels = set()
+        self.done = set()          # label yang elemennya sudah ditutup (hanya elemen pertama)
+        self.found = set()
+        self.captured = {TITLE: [], ITEM_PAGE: [], ARTICLE: []}
+        self.in_container = 0
+        self.already_closed = []   # void element dari <br>: </br> berikutnya diabaikan (seperti bs4)
+        self._data = []
+
+    # ---------- Input bytes ----------
+
+    def _use_encoding(self, index):
+        self.encoding_index = index
+        last = index == len(self.encodings) - 1
+        self.decoder = codecs.getincrementaldecoder(self.encodings[index])(errors='replace' if last else 'strict')
+
+    def feed_bytes(self, chunk, final=False):
+        """Feed satu chunk body; decode ditunda sampai SNIFF_BYTES pertama terkumpul"""
+        if self.needs_replay:
+            return
+        if self.decoder is None:
+            self._sniff_buffer += chunk
+            if len(self._sniff_buffer) < SNIFF_BYTES and not final:
+                return
+            chunk, self._sniff_buffer = self._sniff_buffer, b''
+            encoding, self.bom_length = sniff_encoding(chunk)
+            self.declared = encoding is not None
+            self.encodings = ([encoding] if encoding else []) + [e for e in FALLBACK_ENCODINGS if e != encoding]
+            self._use_encoding(0)
+            chunk = chunk[self.bom_length:]
+        try:
+            with stage('decode'):
+                text = self.decoder.decode(chunk, final)
+        except UnicodeDecodeError:
+            # Encoding salah: sisa stream diabaikan, diulang dari spool dengan kandidat berikutnya
+            self.needs_replay = True
+            return
+        with stage('parse'):
+            self.feed(text)
+
+    def replay(self, body):
+        """Ulang ekstraksi dari file body (seekable) dengan kandidat encoding berikutnya"""
+        if not self.declared:
+            # utf-8 gagal: seperti bs4, coba tebakan charset_normalizer sebelum windows-1252
+            guess = guess_encoding(body)
+            if guess and guess not in self.encodings:
+                self.encodings.insert(self.encoding_index + 1, guess)
+        while self.needs_replay:
+            self._start_document()
+            self.needs_replay = False
+            self._use_encoding(self.encoding_index + 1)
+            body.seek(self.bom_length)
+            for chunk in iter(lambda: body.read(REPLAY_CHUNK), b''):
+                self.feed_bytes(chunk)
+                if self.needs_replay:
+                    break
+            else:
+                self.feed_bytes(b'', final=True)
+
+    def finish(self, body=None):
+        """Akhiri stream (ulang dari `body` jika encoding salah), return (judul, konten)"""
+        self.feed_bytes(b'', final=True)
+        if self.needs_replay:
+            self.replay(body)
+        return self.result()
+
+    def result(self):
+        """(judul, konten) dengan fallback yang sama seperti versi BeautifulSoup"""
+        with stage('parse'):
+            self.close()
+            self._flush()
+
+        with stage('get_text'):
+            title = ''.join(self.captured[TITLE]) if TITLE in self.found else UNTITLED
+            label = ITEM_PAGE if ITEM_PAGE in self.found else ARTICLE
+            if label in self.found:
+                content = '\n'.join(self.captured[label])
+            else:
+                content = NO_CONTENT
+        return title, content
+
+    # ---------- Event HTMLParser ----------
+
+    def _flush(self):
+        """Akhiri satu string (setara endData bs4) dan simpan ke target yang terbuka"""
+        if not self._data:
+            return
+        text = ''.join(self._data).strip()
+        self._data = []
+        if text and not self.in_container:
+            for label in self.open_labels:
+                self.captured[label].append(text)
+
+    def handle_startendtag(self, tag, attrs):
+        self._open(tag, attrs)
+        self._close(tag)
+
+    def handle_starttag(self, tag, attrs):
+        self._open(tag, attrs)
+        if tag in self.empty_elements:
+            self.already_closed.append(tag)
+
+    def handle_endtag(self, tag):
+        if tag in self.already_closed:
+            self.already_closed.remove(tag)
+            return
+        self._close(tag)
+
+    def _open(self, tag, attrs):
+        self._flush()
+        if tag in self.empty_elements:
+            return
+
+        if tag == 'h1':
+            label = TITLE
+        elif tag == 'div' and 'item-page' in self._classes(attrs):
+            label = ITEM_PAGE
+        elif tag == 'article':
+            label = ARTICLE
+        else:
+            label = None
+
+        labels = ()
+        if label and label not in self.done and label not in self.open_labels:
+            labels = (label,)
+            self.open_labels.add(label)
+            self.found.add(label)
+        if tag in self.string_containers:
+            self.in_container += 1
+        self.stack.append((tag, labels))
+
+    @staticmethod
+    def _classes(attrs):
+        value = ''
+        for name, attr_value in attrs:
+            if name == 'class':
+                value = attr_value or ''  # atribut dobel: yang terakhir menang
+        return value.split() + [value]
+
+    def _close(self, tag):
+        self._flush()
+        for position in range(len(self.stack) - 1, -1, -1):
+            if self.stack[position][0] == tag:
+                break
+        else:
+            return
+        while len(self.stack) > position:
+            name, labels = self.stack.pop()
+            if name in self.string_containers:
+                self.in_container -= 1
+            for label in labels:
+                self.open_labels.discard(label)
+                self.done.add(label)
+
+    def handle_data(self, data):
+        self._data.append(data)
+
+    def handle_entityref(self, name):
+        self.handle_data(self.entities.get(name, f"&{name}"))
+
+    def handle_charref(self, name):
+        from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+
+        dereferenced, _, extra = BeautifulSoupHTMLParser._dereference_numeric_character_reference(name)
+        if dereferenced:
+            self.handle_data(dereferenced)
+        if extra:
+            self.handle_data(extra)
+
+    # Komentar / deklarasi memutus string, isinya tidak ikut get_text
+    def handle_comment(self, data):
+        self._flush()
+
+    def handle_decl(self, decl):
+        self._flush()
+
+    def handle_pi(self, data):
+        self._flush()
+
+    def unknown_decl(self, data):
+        self._flush()
+        if data.upper().startswith('CDATA['):
+            text = data[len('CDATA['):].strip()
+            if text:
+                for label in self.open_labels:
+                    self.captured[label].append(text)
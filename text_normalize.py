@@ -0,0 +1,233 @@
+"""
+Normalisasi Teks Naskah (antara ekstraksi dan penyimpanan)
+Dijalankan di thread worker download, sebelum save_manuscript:
+
+    1. pemetaan karakter (str.translate, tabel dikompilasi sekali):
+       spasi non-standar (NBSP, thin space, ...) -> spasi biasa,
+       karakter tak terlihat (zero-width space, soft hyphen, BOM) dibuang,
+       ditambah pemetaan dari --char-map (JSON {"dari": "ke"})
+    2. Unicode NFC (huruf + diakritik gabung -> satu code point; dilewati
+       jika teks sudah NFC)
+    3. whitespace: spasi/tab beruntun -> satu spasi, spasi di awal/akhir baris
+       dibuang, lebih dari satu baris kosong -> satu baris kosong
+
+Hanya isi naskah yang dinormalisasi; judul tidak diubah agar nama file
+naskah yang sudah ada tetap sama. Byte yang dihemat dicatat per
+sub-kategori (konteks stage_profiler).
+
+CARA PAKAI (validasi atas corpus yang sudah ada, file tidak diubah):
+    python text_normalize.py                       # ringkasan byte dihemat per sub-kategori
+    python text_normalize.py --compare --show 20   # tampilkan baris mentah vs normal berdampingan
+    python text_normalize.py --compare --file "data_naskah_sastra_org/.../0001_Judul.txt"
+    python text_normalize.py --char-map peta.json  # dengan pemetaan karakter tambahan
+"""
+
+import os
+import re
+import json
+import argparse
+import threading
+import unicodedata
+from collections import defaultdict
+
+from stage_profiler import PROFILER
+
+# ==================== KONFIGURASI ====================
+
+# Karakter -> pengganti (None = dibuang)
+DEFAULT_CHAR_MAP = {
+    '\u00a0': ' ',  # no-break space
+    **{chr(code): ' ' for code in range(0x2000, 0x200b)},  # en quad ... hair space
+    '\u202f': ' ',  # narrow no-break space
+    '\u205f': ' ',  # medium mathematical space
+    '\u3000': ' ',  # ideographic space
+    '\t': ' ',
+    '\r': None,
+    '\u200b': None,  # zero-width space
+    '\u2060': None,  # word joiner
+    '\ufeff': None,  # BOM / zero-width no-break space
+    '\u00ad': None,  # soft hyphen
+}
+
+SPACE_RUN = re.compile(r' {2,}')
+LINE_EDGE_SPACE = re.compile(r' ?\n ?')
+BLANK_LINE_RUN = re.compile(r'\n{3,}')
+
+COMPARE_WIDTH = 60  # Lebar satu kolom tampilan berdampingan
+
+# ==================== NORMALIZER ====================
+
+def load_char_map(path):
+    """JSON {"dari": "ke"} (string kosong / null = dibuang) -> dict untuk TextNormalizer"""
+    with open(path, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    for source in mapping:
+        if len(source) != 1:
+            raise ValueError(f"Kunci pemetaan harus satu karakter: {source!r}")
+    return {source: target or None for source, target in mapping.items()}
+
+class TextNormalizer:
+    """Normalisasi NFC + pemetaan karakter + whitespace, dengan statistik byte per sub-kategori"""
+
+    def __init__(self, char_map=None):
+        self.char_map = dict(DEFAULT_CHAR_MAP, **(char_map or {}))
+        self.table = str.maketrans(self.char_map)
+        self._lock = threading.Lock()
+        self.raw_bytes = defaultdict(int)
+        self.normalized_bytes = defaultdict(int)
+        self.documents = defaultdict(int)
+
+    def normalize(self, text):
+        text = text.translate(self.table)
+        if not unicodedata.is_normalized('NFC', text):
+            text = unicodedata.normalize('NFC', text)
+        text = SPACE_RUN.sub(' ', text)
+        text = LINE_EDGE_SPACE.sub('\n', text)
+        text = BLANK_LINE_RUN.sub('\n\n', text)
+        return text.strip()
+
+    def __call__(self, text, key=None):
+        """Normalisasi + catat byte sebelum/sesudah untuk sub-kategori `key` (default: konteks profiler)"""
+        normalized = self.normalize(text)
+        self.record(key or PROFILER.current_context(), len(text.encode('utf-8')), len(normalized.encode('utf-8')))
+        return normalized
+
+    def record(self, key, raw_bytes, normalized_bytes, documents=1):
+        with self._lock:
+            self.raw_bytes[key] += raw_bytes
+            self.normalized_bytes[key] += normalized_bytes
+            self.documents[key] += documents
+
+    def stats(self):
+        """{key: (dokumen, byte mentah, byte normal)} (untuk digabung antar proses)"""
+        with self._lock:
+            return {key: (self.documents[key], self.raw_bytes[key], self.normalized_bytes[key])
+                    for key in self.raw_bytes}
+
+    def merge(self, stats):
+        for key, (documents, raw_bytes, normalized_bytes) in stats.items():
+            self.record(key, raw_bytes, normalized_bytes, documents)
+
+    def print_summary(self):
+        """Byte yang dihemat normalisasi per sub-kategori + total"""
+        stats = self.stats()
+        if not stats:
+            return
+        print(f"\n{'='*80}")
+        print(f"🧹 NORMALISASI TEKS (byte dihemat)")
+        print(f"{'='*80}")
+        total_raw = total_normalized = 0
+        for key in sorted(stats):
+            documents, raw_bytes, normalized_bytes = stats[key]
+            total_raw += raw_bytes
+            total_normalized += normalized_bytes
+            print(f"   {key[:45]:<45} {documents:>6,} naskah  {format_saving(raw_bytes, normalized_bytes)}")
+        print(f"\n📊 TOTAL: {format_saving(total_raw, total_normalized)}")
+
+def format_saving(raw_bytes, normalized_bytes):
+    saved = raw_bytes - normalized_bytes
+    return f"{saved / 1024:>10,.1f} KB ({saved / (raw_bytes or 1) * 100:>5.2f}%)"
+
+# ==================== MODE BANDINGKAN ====================
+
+def changed_lines(raw, normalized, limit):
+    """Pasangan (baris mentah, baris normal) yang berbeda, maksimal `limit`"""
+    import difflib
+
+    pairs = []
+    raw_lines, normalized_lines = raw.split('\n'), normalized.split('\n')
+    matcher = difflib.SequenceMatcher(None, raw_lines, normalized_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        left, right = raw_lines[i1:i2], normalized_lines[j1:j2]
+        for position in range(max(len(left), len(right))):
+            pairs.append((left[position] if position < len(left) else None,
+                          right[position] if position < len(right) else None))
+            if len(pairs) >= limit:
+                return pairs
+    return pairs
+
+def visible(line):
+    """Tampilkan karakter tak terlihat/whitespace agar beda mentah vs normal kelihatan"""
+    if line is None:
+        return '∅'
+    shown = []
+    for char in line:
+        if char == ' ':
+            shown.append('·')
+        elif char == '\t':
+            shown.append('→')
+        elif char == '\r':
+            shown.append('␍')
+        elif unicodedata.category(char) in ('Zs', 'Cf', 'Mn'):
+            shown.append(f"<U+{ord(char):04X}>")
+        else:
+            shown.append(char)
+    return ''.join(shown) or '(kosong)'
+
+def print_comparison(path, raw, normalized, limit):
+    pairs = changed_lines(raw, normalized, limit)
+    if not pairs:
+        return
+    print(f"\n📄 {path}")
+    print(f"   {'MENTAH':<{COMPARE_WIDTH}} │ NORMAL")
+    for left, right in pairs:
+        print(f"   {visible(left)[:COMPARE_WIDTH]:<{COMPARE_WIDTH}} │ {visible(right)[:COMPARE_WIDTH]}")
+
+def compare_file(normalizer, source, key, show):
+    """Normalisasi isi satu naskah (path atau record, tanpa menulis), return jumlah ketidak-idempotenan"""
+    from corpus import as_record
+
+    record = as_record(source)
+    body = record.body()
+    normalized = normalizer(body, key)
+    if show:
+        print_comparison(record.path, body, normalized, show)
+    return int(normalizer.normalize(normalized) != normalized)
+
+def compare_corpus(base_dir, normalizer, show=0, max_files=None):
+    """Normalisasi seluruh corpus (folder atau .pack) di memori, return (jumlah file, jumlah tidak idempoten)"""
+    from corpus import CorpusReader
+
+    files = unstable = 0
+    for category_name, subcategory_name, records in CorpusReader(base_dir).subcategories():
+        key = f"{category_name}/{subcategory_name}"
+        for record in records:
+            if max_files and files >= max_files:
+                return files, unstable
+            unstable += compare_file(normalizer, record, key, show)
+            files += 1
+    return files, unstable
+
+# ==================== MAIN ====================
+
+def main():
+    from corpus import BASE_DIR
+
+    parser = argparse.ArgumentParser(description='Validasi normalisasi teks atas corpus (file tidak diubah)')
+    parser.add_argument('--source', '--dir', dest='source', default=BASE_DIR,
+                        help=f'Folder corpus atau file .pack (default: {BASE_DIR})')
+    parser.add_argument('--file', help='Bandingkan satu file naskah saja')
+    parser.add_argument('--compare', action='store_true', help='Tampilkan baris mentah vs normal berdampingan')
+    parser.add_argument('--show', type=int, default=10, help='Maksimal baris berbeda per file (default: 10)')
+    parser.add_argument('--max-files', type=int, default=None, help='Batasi jumlah file yang diperiksa')
+    parser.add_argument('--char-map', help='JSON pemetaan karakter tambahan {"dari": "ke"}')
+    args = parser.parse_args()
+
+    normalizer = TextNormalizer(load_char_map(args.char_map) if args.char_map else None)
+    show = args.show if args.compare else 0
+    if args.file:
+        files, unstable = 1, compare_file(normalizer, args.file, os.path.dirname(args.file), show or args.show)
+    elif not os.path.exists(args.source):
+        print(f"❌ {args.source} tidak ditemukan!")
+        return
+    else:
+        files, unstable = compare_corpus(args.source, normalizer, show, args.max_files)
+
+    normalizer.print_summary()
+    print(f"\n✅ {files:,} file diperiksa, "
+          f"{'semua idempoten' if not unstable else f'{unstable:,} TIDAK idempoten (normalize 2x berbeda)'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""
+Utilitas Teks Naskah Jawa/Indonesia
+Tokenizer bersama untuk analisis korpus hasil scraping sastra.org
+"""
+
+import re
+
+# Token = rangkaian huruf (Latin beraksen maupun aksara Jawa), boleh disambung
+# apostrof atau tanda hubung: "bola-bali", "ng'ajeng", "anak-anak" tetap satu token.
+# Tanda diakritik gabung (U+0300-U+036F) dan blok aksara Jawa (U+A980-U+A9DF)
+# ditambahkan manual karena tidak termasuk \w di modul re.
+_LETTER = r"(?:[^\W\d_]|[\u0300-\u036f\ua980-\ua9df])"
+TOKEN_PATTERN = re.compile(rf"{_LETTER}+(?:['’\-]{_LETTER}+)*")
+
+
+def tokenize(text):
+    """Pecah teks menjadi token huruf kecil (cocok untuk teks Jawa/Indonesia)"""
+    return TOKEN_PATTERN.findall(text.lower())
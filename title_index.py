@@ -0,0 +1,377 @@
+"""
+Indeks Trigram Judul (Fuzzy Title Lookup) untuk Korpus Sastra.org
+Mencocokkan judul dari pengguna / metadata Pinecone ke naskah di corpus tanpa
+scan linear + string distance. Ejaan Jawa bervariasi ("Sêrat Centhini" /
+"Serat Centini", "Ronggowarsito" / "Ranggawarsita", "Tjarios" / "Carios"),
+jadi setiap judul dilipat dulu (fold_title) sebelum dipecah menjadi trigram:
+  - diakritik dibuang (ê/é/è -> e, dst.), huruf kecil, tanda baca -> spasi
+  - ejaan lama: dj -> j, tj -> c, oe -> u
+  - aspirasi/retrofleks: dh -> d, th -> t
+  - o -> a (pelafalan Jawa "a" jejeg ditulis o atau a)
+
+Setiap naskah diindeks lewat beberapa judul: Judul (teks <h1> dari
+scrape_manuscript), "Judul singkat" dari tabel listing, dan nama file.
+
+Struktur folder indeks (TITLE_INDEX_DIR):
+    meta.json        - jumlah naskah / judul / trigram, sumber, waktu build
+    titles.jsonl     - tabel naskah (judul, judul singkat, URL, ID, path)
+    titles.idx       - offset byte tiap baris titles.jsonl (uint64)
+    keys.txt         - judul terlipat, satu per baris
+    keys.bin         - doc_id (uint32) + jumlah trigram (uint16) per judul
+    trigrams.lex     - "trigram<TAB>offset<TAB>jumlah", terurut
+    trigrams.post    - posting list: id judul (uint32) per trigram
+
+Query: hitung trigram yang sama lewat posting list (Counter di C), skor Dice,
+lalu kandidat teratas di-rerank dengan difflib pada judul terlipat.
+
+CARA PAKAI:
+    python title_index.py build                          # dari data_naskah_sastra_org/
+    python title_index.py build --source korpus.pack
+    python title_index.py query "Serat Centini" -k 5
+    python title_index.py query "Babad Tanah Jawi" "Wulangreh" --json
+    node backend/check-titles.cjs | python title_index.py query --stdin --json
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import heapq
+import argparse
+import unicodedata
+from array import array
+from datetime import datetime
+from collections import Counter
+from itertools import chain
+
+from corpus import BASE_DIR, CorpusReader
+
+# ==================== KONFIGURASI ====================
+
+TITLE_INDEX_DIR = "title_index"
+DEFAULT_TOP_K = 5
+MIN_SCORE = 0.3              # Skor akhir minimal agar dianggap cocok
+RERANK_CANDIDATES = 50       # Kandidat Dice teratas yang di-rerank difflib
+FREQUENT_GRAM_RATIO = 0.02   # Trigram di >2% judul dianggap umum saat query
+CANDIDATE_DICE = 0.4         # Judul yang hanya berbagi trigram umum (Dice < ini) boleh terlewat
+MAX_TRIGRAMS = 0xFFFF        # Batas uint16 jumlah trigram per judul
+
+# Urutan penting: dj/tj/oe sebelum aturan satu huruf
+VARIANT_RULES = (
+    ('dj', 'j'),
+    ('tj', 'c'),
+    ('oe', 'u'),
+    ('dh', 'd'),
+    ('th', 't'),
+    ('o', 'a'),
+)
+NON_ALNUM = re.compile(r'[\W_]+')
+INDEX_PREFIX = re.compile(r'^\d+_')
+
+# ==================== NORMALISASI ====================
+
+def fold_title(text):
+    """Judul -> bentuk terlipat untuk pencocokan ("Sêrat Centhini" -> "serat centini")"""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    text = ' '.join(NON_ALNUM.sub(' ', text).split())
+    for source, target in VARIANT_RULES:
+        text = text.replace(source, target)
+    return text
+
+def trigrams(folded):
+    """Himpunan trigram per kata (gaya pg_trgm: dua spasi di depan, satu di belakang)"""
+    grams = set()
+    for word in folded.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+def filename_title(filename):
+    """"0001_Serat_Centhini.txt" -> "Serat Centhini" """
+    stem = filename[:-len('.txt')] if filename.endswith('.txt') else filename
+    return INDEX_PREFIX.sub('', stem).replace('_', ' ')
+
+# ==================== FILE HELPERS ====================
+
+def _path(index_dir, name):
+    return os.path.join(index_dir, name)
+
+def _write_atomic(filepath, data):
+    """Tulis file ke .tmp lalu replace, supaya reader tidak melihat file setengah jadi"""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, filepath)
+
+def load_meta(index_dir=TITLE_INDEX_DIR):
+    """Load meta.json indeks (None jika indeks belum ada)"""
+    meta_path = _path(index_dir, 'meta.json')
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# ==================== BUILD ====================
+
+def build_title_index(source=BASE_DIR, index_dir=TITLE_INDEX_DIR):
+    """Bangun ulang indeks judul dari header semua naskah di corpus (folder atau pack)"""
+    start = time.perf_counter()
+    print(f"🔨 Membangun indeks judul dari {source} ...")
+    os.makedirs(index_dir, exist_ok=True)
+
+    documents = []
+    keys = []           # judul terlipat
+    key_docs = array('I')
+    key_lengths = array('H')
+    postings = {}
+    for record in CorpusReader(source).records():
+        header = record.header
+        title = header.get('Judul') or filename_title(record.filename)
+        doc_id = len(documents)
+        documents.append({
+            'title': title,
+            'short_title': header.get('Judul singkat'),
+            'url': header.get('URL'),
+            'source_id': header.get('ID'),
+            'category': record.category,
+            'subcategory': record.subcategory,
+            'path': record.path,
+        })
+        seen = set()
+        for variant in (title, header.get('Judul singkat'), filename_title(record.filename)):
+            folded = fold_title(variant)
+            if not folded or folded in seen:
+                continue
+            seen.add(folded)
+            grams = trigrams(folded)
+            key_id = len(keys)
+            keys.append(folded)
+            key_docs.append(doc_id)
+            key_lengths.append(min(len(grams), MAX_TRIGRAMS))
+            for gram in grams:
+                postings.setdefault(gram, array('I')).append(key_id)
+
+    # titles.jsonl + offset baris
+    lines = [json.dumps(doc, ensure_ascii=False).encode('utf-8') + b'\n' for doc in documents]
+    offsets = array('Q')
+    position = 0
+    for line in lines:
+        offsets.append(position)
+        position += len(line)
+    _write_atomic(_path(index_dir, 'titles.jsonl'), b''.join(lines))
+    _write_atomic(_path(index_dir, 'titles.idx'), offsets.tobytes())
+    _write_atomic(_path(index_dir, 'keys.txt'), '\n'.join(keys).encode('utf-8'))
+    _write_atomic(_path(index_dir, 'keys.bin'), key_docs.tobytes() + key_lengths.tobytes())
+
+    lexicon_lines = []
+    data = array('I')
+    for gram in sorted(postings):
+        lexicon_lines.append(f"{gram}\t{len(data)}\t{len(postings[gram])}\n")
+        data.extend(postings[gram])
+    _write_atomic(_path(index_dir, 'trigrams.post'), data.tobytes())
+    _write_atomic(_path(index_dir, 'trigrams.lex'), ''.join(lexicon_lines).encode('utf-8'))
+
+    meta = {
+        'documents': len(documents),
+        'keys': len(keys),
+        'trigrams': len(postings),
+        'postings': len(data),
+        'source': source,
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+    }
+    _write_atomic(_path(index_dir, 'meta.json'), json.dumps(meta, indent=2).encode('utf-8'))
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ {len(documents):,} naskah, {len(keys):,} judul, {len(postings):,} trigram "
+          f"({len(data):,} posting) dalam {elapsed:.1f}s → {index_dir}/")
+    return meta
+
+# ==================== QUERY ====================
+
+class TitleIndex:
+    """Indeks judul on-disk; tabel naskah dibaca per baris hanya untuk hasil query"""
+
+    def __init__(self, index_dir=TITLE_INDEX_DIR):
+        self.meta = load_meta(index_dir)
+        if self.meta is None:
+            raise FileNotFoundError(f"Indeks judul tidak ditemukan di {index_dir}/ (jalankan: build)")
+        self.index_dir = index_dir
+
+        with open(_path(index_dir, 'keys.txt'), 'r', encoding='utf-8') as f:
+            self.keys = f.read().split('\n')
+        with open(_path(index_dir, 'keys.bin'), 'rb') as f:
+            data = f.read()
+        count = self.meta['keys']
+        self.key_docs = array('I')
+        self.key_docs.frombytes(data[:count * self.key_docs.itemsize])
+        self.key_lengths = array('H')
+        self.key_lengths.frombytes(data[count * self.key_docs.itemsize:])
+
+        self.lexicon = {}
+        with open(_path(index_dir, 'trigrams.lex'), 'r', encoding='utf-8') as f:
+            for line in f:
+                gram, offset, length = line.rstrip('\n').split('\t')
+                self.lexicon[gram] = (int(offset), int(length))
+        self.postings = array('I')
+        with open(_path(index_dir, 'trigrams.post'), 'rb') as f:
+            self.postings.frombytes(f.read())
+
+        self.offsets = array('Q')
+        with open(_path(index_dir, 'titles.idx'), 'rb') as f:
+            self.offsets.frombytes(f.read())
+        self._titles = open(_path(index_dir, 'titles.jsonl'), 'rb')
+
+    def close(self):
+        self._titles.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def document(self, doc_id):
+        self._titles.seek(self.offsets[doc_id])
+        return json.loads(self._titles.readline())
+
+    def candidates(self, folded, limit=RERANK_CANDIDATES):
+        """[(dice, key_id)] teratas berdasarkan trigram yang sama.
+        Posting list trigram paling umum ("  s", "ser", "at ") hanya menambah hitungan
+        judul yang sudah muncul lewat trigram lain; judul yang hanya berbagi trigram
+        umum itu pasti ber-Dice < CANDIDATE_DICE sehingga boleh terlewat."""
+        grams = trigrams(folded)
+        lists = []
+        for gram in grams:
+            entry = self.lexicon.get(gram)
+            if entry:
+                offset, length = entry
+                lists.append(self.postings[offset:offset + length])
+        if not lists:
+            return []
+        lists.sort(key=len)
+        size = len(grams)
+        # u trigram yang dilewati -> Dice judul tak terlihat <= 2u / (|Q| + u)
+        skip = min(int(CANDIDATE_DICE * size / (2 - CANDIDATE_DICE)), len(lists) - 1)
+        frequent_limit = self.meta['keys'] * FREQUENT_GRAM_RATIO
+        while skip and len(lists[-skip]) <= frequent_limit:
+            skip -= 1
+        split = len(lists) - skip
+
+        shared = Counter(chain.from_iterable(lists[:split]))
+        seen = set(shared)
+        for postings in lists[split:]:
+            shared.update(seen.intersection(postings))
+        return sorted(self._top_dice(shared, size, limit), reverse=True)
+
+    def _top_dice(self, shared, size, limit):
+        """Heap (dice, key_id) terbaik; berhenti saat batas atas 2c/(|Q|+c) tidak bisa menyaingi"""
+        top = []
+        for key_id, common in shared.most_common():
+            if len(top) >= limit and 2 * common / (size + common) <= top[0][0]:
+                break
+            item = (2 * common / (size + self.key_lengths[key_id]), key_id)
+            if len(top) < limit:
+                heapq.heappush(top, item)
+            elif item > top[0]:
+                heapq.heapreplace(top, item)
+        return top
+
+    def lookup(self, query, k=DEFAULT_TOP_K, min_score=MIN_SCORE):
+        """[(skor 0..1, dokumen, judul terlipat yang cocok)] terbaik per naskah, skor menurun"""
+        from difflib import SequenceMatcher
+
+        folded = fold_title(query)
+        if not folded:
+            return []
+        best = {}
+        for dice, key_id in self.candidates(folded):
+            key = self.keys[key_id]
+            score = (dice + SequenceMatcher(None, folded, key, autojunk=False).ratio()) / 2
+            doc_id = self.key_docs[key_id]
+            if score >= min_score and score > best.get(doc_id, (0,))[0]:
+                best[doc_id] = (score, key)
+        top = heapq.nlargest(k, best.items(), key=lambda item: item[1][0])
+        return [(score, self.document(doc_id), key) for doc_id, (score, key) in top]
+
+# ==================== CLI ====================
+
+def run_queries(queries, top_k=DEFAULT_TOP_K, min_score=MIN_SCORE, as_json=False, index_dir=TITLE_INDEX_DIR):
+    """CLI query: print hasil per judul (JSON: satu baris per query)"""
+    load_start = time.perf_counter()
+    with TitleIndex(index_dir) as index:
+        load_ms = (time.perf_counter() - load_start) * 1000
+        if not as_json:
+            print(f"📂 Indeks {index.meta['documents']:,} naskah dimuat ({load_ms:.1f} ms)")
+        for query in queries:
+            start = time.perf_counter()
+            results = index.lookup(query, top_k, min_score)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            if as_json:
+                print(json.dumps({
+                    'query': query,
+                    'folded': fold_title(query),
+                    'results': [{'score': round(score, 4), 'matched': key, **doc} for score, doc, key in results],
+                }, ensure_ascii=False))
+                continue
+
+            print(f"\n🔍 \"{query}\" → \"{fold_title(query)}\" — {len(results)} hasil ({elapsed_ms:.2f} ms)")
+            for rank, (score, doc, key) in enumerate(results, 1):
+                print(f"{rank:2}. [{score:.3f}] {doc['title']}")
+                print(f"     {doc['category']} > {doc['subcategory']}  (cocok: {key})")
+                print(f"     {doc['url'] or doc['path']}")
+
+def print_stats(index_dir=TITLE_INDEX_DIR):
+    """Ringkasan isi indeks"""
+    meta = load_meta(index_dir)
+    if meta is None:
+        print(f"❌ Indeks judul tidak ditemukan di {index_dir}/")
+        return
+    size = sum(os.path.getsize(_path(index_dir, name)) for name in os.listdir(index_dir))
+    print(f"📊 Indeks judul {index_dir}/")
+    print(f"   Naskah   : {meta['documents']:,}")
+    print(f"   Judul    : {meta['keys']:,}")
+    print(f"   Trigram  : {meta['trigrams']:,} ({meta['postings']:,} posting)")
+    print(f"   Ukuran   : {size / 1024:,.1f} KB")
+    print(f"   Sumber   : {meta['source']}")
+    print(f"   Dibangun : {meta['built_at']}")
+
+def parse_args():
+    """Argumen command line"""
+    parser = argparse.ArgumentParser(description="Indeks trigram & pencarian fuzzy judul naskah sastra.org")
+    parser.add_argument('--index-dir', default=TITLE_INDEX_DIR, help=f"Folder indeks (default: {TITLE_INDEX_DIR})")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help="Bangun ulang indeks judul")
+    build.add_argument('--source', default=BASE_DIR, help=f"Folder corpus atau file .pack (default: {BASE_DIR})")
+
+    query = subparsers.add_parser('query', help="Cari naskah berdasarkan judul (fuzzy)")
+    query.add_argument('titles', nargs='*', help="Judul yang dicari")
+    query.add_argument('--stdin', action='store_true', help="Baca judul dari stdin (satu per baris)")
+    query.add_argument('-k', '--top-k', type=int, default=DEFAULT_TOP_K, help="Jumlah hasil per judul")
+    query.add_argument('--min-score', type=float, default=MIN_SCORE, help=f"Skor minimal (default: {MIN_SCORE})")
+    query.add_argument('--json', action='store_true', help="Output JSON (satu baris per judul)")
+
+    subparsers.add_parser('stats', help="Ringkasan indeks")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    try:
+        if args.command == 'build':
+            build_title_index(args.source, args.index_dir)
+        elif args.command == 'query':
+            titles = list(args.titles)
+            if args.stdin:
+                titles += [line.strip().lstrip('- ').strip() for line in sys.stdin if line.strip()]
+            if not titles:
+                print("❌ Tidak ada judul untuk dicari")
+                sys.exit(1)
+            run_queries(titles, args.top_k, args.min_score, args.json, args.index_dir)
+        elif args.command == 'stats':
+            print_stats(args.index_dir)
+    except FileNotFoundError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
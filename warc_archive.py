@@ -0,0 +1,397 @@
+"""
+Arsip Respons Mentah (WARC) + Re-ekstraksi Offline
+Fetch layer (scraper_engine.Fetcher) bisa menyimpan setiap request/respons
+mentah beserta header ke file WARC 1.1 terkompresi (.warc.gz, satu gzip
+member per record sehingga bisa dibaca acak dan tahan crash). Setiap record
+membawa field tambahan:
+
+    Nala-Kind          listing / manuscript
+    Nala-Category      nama kategori
+    Nala-Subcategory   nama sub-kategori
+    Nala-Index         nomor urut naskah (nama file 0001_...)
+
+Body disimpan setelah di-decode oleh requests (gzip/deflate), sehingga header
+Content-Encoding / Transfer-Encoding dibuang dan Content-Length disesuaikan
+agar record tetap konsisten.
+
+`reextract` menjalankan ulang parse_manuscript_html + pembersihan teks
+(boilerplate opsional, normalisasi) atas
+arsip secara paralel (per file WARC) dan menulis ulang corpus tanpa akses
+jaringan. Untuk URL yang diarsip lebih dari sekali, record terbaru yang
+dipakai. File lama dengan nomor urut sama tetapi judul berbeda dihapus agar
+tidak dobel. Metadata baris listing AJAX yang ikut diarsip (judul, pengarang,
+tahun, ID, ...) ditulis kembali ke header naskah seperti saat crawl.
+
+CARA PAKAI (lewat scraper_cli.py):
+    python scraper_cli.py scrape --fs 42 --archive-dir warc
+    python scraper_cli.py reextract --archive-dir warc --workers 8
+"""
+
+import os
+import glob
+import uuid
+import zlib
+import base64
+import socket
+import hashlib
+import threading
+import urllib.parse
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+from scraper_engine import (
+    AJAX_PATH, BASE_OUTPUT_DIR, AjaxListing, ListingRecord, clean_manuscript, manuscript_filename,
+    parse_manuscript_html, save_manuscript, subcategory_key, subcategory_output_dir,
+)
+from stage_profiler import PROFILER
+
+# ==================== KONFIGURASI ====================
+
+ARCHIVE_DIR = "warc"
+MAX_WARC_FILE_BYTES = 64 * 1024 * 1024  # Rotasi file; file kecil = re-ekstraksi lebih paralel
+WARC_VERSION = b"WARC/1.1"
+READ_CHUNK = 1 << 20
+
+DROPPED_RESPONSE_HEADERS = {'content-encoding', 'transfer-encoding', 'content-length'}
+
+# ==================== WRITER ====================
+
+def warc_date():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+def iter_parts(parts):
+    """Chunk bytes dari daftar bagian: bytes atau file seekable (dibaca dari awal)"""
+    for part in parts:
+        if isinstance(part, bytes):
+            yield part
+        else:
+            part.seek(0)
+            yield from iter(lambda: part.read(READ_CHUNK), b'')
+
+def part_length(part):
+    if isinstance(part, bytes):
+        return len(part)
+    part.seek(0, os.SEEK_END)
+    return part.tell()
+
+def sha1_digest(*parts):
+    digest = hashlib.sha1()
+    for chunk in iter_parts(parts):
+        digest.update(chunk)
+    return "sha1:" + base64.b32encode(digest.digest()).decode('ascii')
+
+def header_value(value):
+    """Nilai header satu baris (WARC 1.1 mengizinkan UTF-8)"""
+    return str(value).replace('\r', ' ').replace('\n', ' ')
+
+class WarcWriter:
+    """Penulis .warc.gz thread-safe dengan rotasi ukuran file"""
+
+    def __init__(self, directory=ARCHIVE_DIR, max_file_bytes=MAX_WARC_FILE_BYTES):
+        self.directory = directory
+        self.max_file_bytes = max_file_bytes
+        # Nama unik per proses: aman dipakai banyak worker di folder yang sama
+        self.prefix = f"nala-{datetime.now().strftime('%Y%m%d%H%M%S')}-{socket.gethostname()}-{os.getpid()}"
+        self._lock = threading.Lock()
+        self._file = None
+        self._serial = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _open_next(self):
+        if self._file:
+            self._file.close()
+        self._serial += 1
+        path = os.path.join(self.directory, f"{self.prefix}-{self._serial:05d}.warc.gz")
+        self._file = open(path, 'ab')
+        info = (
+            "software: nala-pustaka scraper_engine\r\n"
+            "format: WARC File Format 1.1\r\n"
+            f"hostname: {socket.gethostname()}\r\n"
+        ).encode('utf-8')
+        self._write_record({
+            'WARC-Type': 'warcinfo',
+            'WARC-Filename': os.path.basename(path),
+            'Content-Type': 'application/warc-fields',
+        }, info)
+
+    def _write_record(self, fields, *block):
+        """Tulis satu record sebagai satu gzip member (caller memegang lock).
+        block = bagian-bagian isi record: bytes atau file body (di-stream per chunk)"""
+        fields = {
+            'WARC-Record-ID': f"<urn:uuid:{uuid.uuid4()}>",
+            'WARC-Date': warc_date(),
+            **fields,
+            'WARC-Block-Digest': sha1_digest(*block),
+            'Content-Length': str(sum(part_length(part) for part in block)),
+        }
+        header = WARC_VERSION + b"\r\n" + b"".join(
+            f"{name}: {header_value(value)}\r\n".encode('utf-8') for name, value in fields.items()
+        )
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in iter_parts((header + b"\r\n", *block, b"\r\n\r\n")):
+            self._file.write(compressor.compress(chunk))
+        self._file.write(compressor.flush())
+        self._file.flush()
+        return fields['WARC-Record-ID']
+
+    def write_exchange(self, response, metadata=None, body=None):
+        """Arsipkan request + respons requests.Response beserta metadata Nala-*.
+        body: file body yang sudah di-stream (default response.content)"""
+        request = response.request
+        path = request.path_url
+        request_block = (
+            f"{request.method} {path} HTTP/1.1\r\n".encode('utf-8')
+            + b"".join(f"{k}: {header_value(v)}\r\n".encode('utf-8') for k, v in request.headers.items())
+            + b"\r\n"
+        )
+
+        if body is None:
+            body = response.content
+        version = {10: 'HTTP/1.0', 11: 'HTTP/1.1'}.get(getattr(response.raw, 'version', 11), 'HTTP/1.1')
+        status_line = f"{version} {response.status_code} {response.reason or ''}".rstrip()
+        response_headers = [
+            f"{k}: {header_value(v)}\r\n" for k, v in response.headers.items()
+            if k.lower() not in DROPPED_RESPONSE_HEADERS
+        ]
+        response_headers.append(f"Content-Length: {part_length(body)}\r\n")
+        response_head = (status_line + "\r\n" + "".join(response_headers) + "\r\n").encode('utf-8')
+
+        extra = {f"Nala-{name.capitalize()}": value for name, value in (metadata or {}).items()
+                 if value is not None}
+        with self._lock:
+            if self._file is None or self._file.tell() >= self.max_file_bytes:
+                self._open_next()
+            response_id = self._write_record({
+                'WARC-Type': 'response',
+                'WARC-Target-URI': response.url,
+                'Content-Type': 'application/http; msgtype=response',
+                'WARC-Payload-Digest': sha1_digest(body),
+                **extra,
+            }, response_head, body)
+            self._write_record({
+                'WARC-Type': 'request',
+                'WARC-Target-URI': response.url,
+                'WARC-Concurrent-To': response_id,
+                'Content-Type': 'application/http; msgtype=request',
+                **extra,
+            }, request_block)
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+# ==================== READER ====================
+
+def _read_member(f, chunk):
+    """Dekompresi satu gzip member mulai dari `chunk` + sisa file.
+    Return (data, panjang_terkompresi, sisa_byte_setelah_member)"""
+    decompressor = zlib.decompressobj(31)
+    parts = []
+    consumed = 0
+    data = chunk
+    while True:
+        parts.append(decompressor.decompress(data))
+        if decompressor.eof:
+            leftover = decompressor.unused_data
+            return b"".join(parts), consumed + len(data) - len(leftover), leftover
+        consumed += len(data)
+        data = f.read(READ_CHUNK)
+        if not data:
+            raise EOFError("record WARC terpotong")
+
+def parse_record(data):
+    """bytes record -> (fields dict, block bytes)"""
+    head, _, rest = data.partition(b"\r\n\r\n")
+    lines = head.decode('utf-8').split("\r\n")
+    fields = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        fields[name.strip()] = value.strip()
+    length = int(fields.get('Content-Length', len(rest)))
+    return fields, rest[:length]
+
+def iter_records(path):
+    """Yield (offset, fields, block) setiap record di satu .warc.gz"""
+    with open(path, 'rb') as f:
+        offset = 0
+        buffer = b""
+        while True:
+            if not buffer:
+                buffer = f.read(READ_CHUNK)
+                if not buffer:
+                    return
+            try:
+                data, length, buffer = _read_member(f, buffer)
+            except (EOFError, zlib.error) as e:
+                # Record terakhir terpotong (mis. proses mati saat menulis)
+                print(f"  ⚠️  {os.path.basename(path)} @ {offset}: {e}")
+                return
+            fields, block = parse_record(data)
+            yield offset, fields, block
+            offset += length
+
+def read_record(path, offset):
+    """Baca satu record di offset tertentu"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data, _, _ = _read_member(f, f.read(READ_CHUNK))
+    return parse_record(data)
+
+def parse_http_response(block):
+    """Block respons -> (status, headers dict, body)"""
+    head, _, body = block.partition(b"\r\n\r\n")
+    lines = head.decode('iso-8859-1').split("\r\n")
+    status = int(lines[0].split(' ', 2)[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        headers[name.strip().lower()] = value.strip()
+    return status, headers, body
+
+def list_archive_files(archive_dir=ARCHIVE_DIR):
+    return sorted(glob.glob(os.path.join(archive_dir, '**', '*.warc.gz'), recursive=True))
+
+# ==================== RE-EKSTRAKSI ====================
+
+def scan_listing(url, block, fields):
+    """Baris listing AJAX -> [ListingRecord.to_row()] (strategi lain tidak membawa metadata)"""
+    parsed = urllib.parse.urlsplit(url)
+    if parsed.path != AJAX_PATH:
+        return []
+    _, _, body = parse_http_response(block)
+    listing = AjaxListing(base_url=f"{parsed.scheme}://{parsed.netloc}")
+    return [record.to_row() for record in listing.extract_listing(
+        body, fields.get('Nala-Category', ''), fields.get('Nala-Subcategory', ''))]
+
+def scan_archive_file(path):
+    """Worker: index respons 200 -> ([(url, tanggal, path, offset, kategori, sub, index)],
+    {url naskah: (tanggal, baris listing)})"""
+    entries, listings = [], {}
+    for offset, fields, block in iter_records(path):
+        if fields.get('WARC-Type') != 'response':
+            continue
+        if not block.startswith(b"HTTP/") or block.split(b" ", 2)[1] != b"200":
+            continue
+        date = fields.get('WARC-Date', '')
+        if fields.get('Nala-Kind') == 'listing':
+            for row in scan_listing(fields['WARC-Target-URI'], block, fields):
+                if row[0] not in listings or date > listings[row[0]][0]:
+                    listings[row[0]] = (date, row)
+            continue
+        if fields.get('Nala-Kind') != 'manuscript':
+            continue
+        try:
+            index = int(fields['Nala-Index'])
+        except (KeyError, ValueError):
+            continue
+        entries.append((fields['WARC-Target-URI'], date, path, offset,
+                        fields.get('Nala-Category', ''), fields.get('Nala-Subcategory', ''), index))
+    return entries, listings
+
+def remove_stale_files(output_dir, index, keep_filename, index_width, catalog=None):
+    """Hapus file lain dengan nomor urut sama (judul hasil ekstraksi lama)"""
+    removed = 0
+    for path in glob.glob(os.path.join(glob.escape(output_dir), f"{index:0{index_width}d}_*.txt")):
+        if os.path.basename(path) != keep_filename:
+            os.remove(path)
+            if catalog:
+                catalog.remove(path)
+            removed += 1
+    return removed
+
+def extract_records(path, records, output_dir, flat, index_width, normalize=True, char_map=None,
+                    boilerplate_model=None):
+    """Worker: parse ulang record terpilih di satu file WARC dan tulis ke corpus.
+    records: [(offset, kategori, sub, index, baris listing atau None)].
+    Return (ditulis, gagal, dihapus, statistik normalisasi, statistik boilerplate)"""
+    from manuscript_catalog import ManuscriptCatalog
+    from text_normalize import TextNormalizer
+
+    catalog = ManuscriptCatalog(output_dir)
+    normalizer = TextNormalizer(char_map) if normalize else None
+    boilerplate = None
+    if boilerplate_model:
+        from boilerplate import BoilerplateStripper
+        boilerplate = BoilerplateStripper.load(boilerplate_model)
+    written = failed = removed = 0
+    for offset, category_name, subcategory_name, index, row in records:
+        try:
+            fields, block = read_record(path, offset)
+            _, _, body = parse_http_response(block)
+            manuscript = parse_manuscript_html(body, fields['WARC-Target-URI'])
+        except Exception as e:
+            print(f"  ❌ {os.path.basename(path)} @ {offset}: {e}")
+            failed += 1
+            continue
+        if row:
+            manuscript['listing'] = ListingRecord.from_row(row)
+        with PROFILER.context(subcategory_key(category_name, subcategory_name)):
+            clean_manuscript(manuscript, normalizer, boilerplate, category_name, subcategory_name)
+
+        target_dir = subcategory_output_dir(output_dir, category_name, subcategory_name, flat)
+        os.makedirs(target_dir, exist_ok=True)
+        if save_manuscript(manuscript, index, target_dir, index_width, catalog):
+            written += 1
+            if not flat:
+                filename = manuscript_filename(manuscript, index, index_width)
+                removed += remove_stale_files(target_dir, index, filename, index_width, catalog)
+        else:
+            failed += 1
+    return (written, failed, removed, normalizer.stats() if normalizer else {},
+            boilerplate.stats() if boilerplate else {})
+
+def reextract_archive(archive_dir=ARCHIVE_DIR, output_dir=BASE_OUTPUT_DIR, workers=None,
+                      flat=False, index_width=4, normalize=True, char_map=None, boilerplate_model=None):
+    """Scan arsip (paralel), pilih record terbaru per URL, ekstraksi ulang (paralel)"""
+    from boilerplate import BoilerplateStripper
+    from text_normalize import TextNormalizer
+
+    files = list_archive_files(archive_dir)
+    if not files:
+        print(f"❌ Tidak ada file .warc.gz di {archive_dir}/")
+        return None
+
+    print(f"\n{'='*80}")
+    print(f"♻️  RE-EKSTRAKSI OFFLINE dari {len(files)} file WARC")
+    print(f"{'='*80}\n")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        latest, listings = {}, {}
+        for entries, file_listings in executor.map(scan_archive_file, files):
+            for url, date, path, offset, category_name, subcategory_name, index in entries:
+                if url not in latest or date > latest[url][0]:
+                    latest[url] = (date, path, offset, category_name, subcategory_name, index)
+            for url, (date, row) in file_listings.items():
+                if url not in listings or date > listings[url][0]:
+                    listings[url] = (date, row)
+        with_listing = sum(1 for url in latest if url in listings)
+        print(f"🔍 {len(latest):,} naskah unik di arsip ({with_listing:,} dengan metadata listing)")
+
+        by_file = {}
+        for url, (_, path, offset, category_name, subcategory_name, index) in latest.items():
+            row = listings[url][1] if url in listings else None
+            by_file.setdefault(path, []).append((offset, category_name, subcategory_name, index, row))
+
+        futures = [
+            executor.submit(extract_records, path, sorted(records, key=lambda r: r[0]), output_dir, flat,
+                            index_width, normalize, char_map, boilerplate_model)
+            for path, records in by_file.items()
+        ]
+        written = failed = removed = 0
+        normalizer = TextNormalizer(char_map)
+        boilerplate = BoilerplateStripper({})
+        for future in futures:
+            file_written, file_failed, file_removed, normalize_stats, boilerplate_stats = future.result()
+            written += file_written
+            failed += file_failed
+            removed += file_removed
+            normalizer.merge(normalize_stats)
+            boilerplate.merge(boilerplate_stats)
+        boilerplate.print_summary()
+        normalizer.print_summary()
+
+    print(f"\n✅ {written:,} naskah ditulis ulang ke {output_dir}/ "
+          f"({failed:,} gagal, {removed:,} file judul lama dihapus)")
+    return {'manuscripts': len(latest), 'written': written, 'failed': failed, 'removed': removed}